@@ -0,0 +1,283 @@
+"""
+Micro benchmarks for the math core, run with
+
+    uv run python benchmarks/bench_math.py --save      # record a baseline
+    uv run python benchmarks/bench_math.py             # compare against it
+
+Timings are the best of several repeats (in seconds per call) so they are fairly stable,
+the baseline is machine specific so record a new one before changing the math types and
+compare against it afterwards.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+from ncca.ngl import (
+    BezierCurve,
+    Mat4,
+    Transform,
+    Vec3,
+    Vec3Array,
+    look_at,
+    perspective,
+)
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+DEFAULT_THRESHOLD = 0.15
+
+# name -> function returning the callable to time, setup is done outside of the timing
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    "decorator to register a benchmark, the function does the setup and returns what to time"
+
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+@benchmark("vec3_add")
+def _vec3_add():
+    a = Vec3(1.0, 2.0, 3.0)
+    b = Vec3(4.0, 5.0, 6.0)
+    return lambda: a + b
+
+
+@benchmark("vec3_mul_scalar")
+def _vec3_mul_scalar():
+    a = Vec3(1.0, 2.0, 3.0)
+    return lambda: a * 2.5
+
+
+@benchmark("vec3_cross")
+def _vec3_cross():
+    a = Vec3(1.0, 2.0, 3.0)
+    b = Vec3(4.0, 5.0, 6.0)
+    return lambda: a.cross(b)
+
+
+@benchmark("vec3_normalize")
+def _vec3_normalize():
+    a = Vec3(1.0, 2.0, 3.0)
+    return lambda: a.normalize()
+
+
+@benchmark("mat4_mat_mul")
+def _mat4_mat_mul():
+    a = Mat4.rotate_x(25.0)
+    b = Mat4.rotate_y(-40.0)
+    return lambda: a._mat_mul(b)
+
+
+@benchmark("mat4_inverse_general")
+def _mat4_inverse_general():
+    a = Mat4.from_list([[2, 0, 1, 0], [0, 3, 0, 1], [1, 0, 4, 0], [0, 1, 0, 5]])
+    return a.inverse
+
+
+@benchmark("mat4_inverse_rigid")
+def _mat4_inverse_rigid():
+    a = Mat4.translate(1.0, 2.0, 3.0) @ Mat4.rotate_y(30.0)
+    return a.inverse
+
+
+@benchmark("transform_get_matrix")
+def _transform_get_matrix():
+    tx = Transform()
+
+    def run():
+        tx.set_rotation(10.0, 20.0, 30.0)
+        tx.set_scale(1.0, 2.0, 1.0)
+        tx.set_position(1.0, 2.0, 3.0)
+        return tx.get_matrix()
+
+    return run
+
+
+@benchmark("transform_get_matrix_position")
+def _transform_get_matrix_position():
+    tx = Transform()
+    tx.set_rotation(10.0, 20.0, 30.0)
+
+    def run():
+        tx.set_position(1.0, 2.0, 3.0)
+        return tx.get_matrix()
+
+    return run
+
+
+@benchmark("look_at")
+def _look_at():
+    eye = Vec3(2.0, 2.0, 2.0)
+    look = Vec3(0.0, 0.0, 0.0)
+    up = Vec3(0.0, 1.0, 0.0)
+    return lambda: look_at(eye, look, up)
+
+
+@benchmark("perspective")
+def _perspective():
+    return lambda: perspective(45.0, 1.5, 0.1, 100.0)
+
+
+@benchmark("vec3_array_to_numpy")
+def _vec3_array_to_numpy():
+    a = Vec3Array(np.arange(30000, dtype=np.float32))
+    return a.to_numpy
+
+
+@benchmark("bezier_get_point_on_curve")
+def _bezier_get_point_on_curve():
+    curve = BezierCurve()
+    for p in ((-5, 0, 0), (-2, 5, 1), (2, -5, -1), (5, 0, 0)):
+        curve.add_point(*p)
+    return lambda: curve.get_point_on_curve(0.35)
+
+
+def run_benchmarks(names=None, repeat=5, min_time=0.05):
+    """
+    Run the benchmarks.
+
+    Args:
+        names (iterable, optional): The benchmarks to run, defaults to all of them.
+        repeat (int): The number of timing runs, the fastest is used.
+        min_time (float): The minimum time in seconds for each run, used to pick the loop count.
+
+    Returns:
+        dict: benchmark name to the best time per call in seconds.
+    """
+    results = {}
+    for name in names if names is not None else BENCHMARKS:
+        timer = timeit.Timer(BENCHMARKS[name]())
+        number = 1
+        while timer.timeit(number) < min_time:
+            number *= 2
+        results[name] = min(timer.repeat(repeat=repeat, number=number)) / number
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare results against baseline timings.
+
+    Args:
+        results (dict): benchmark name to time as returned by run_benchmarks.
+        baseline (dict): the baseline timings in the same format.
+        threshold (float): the fractional slow down that counts as a regression e.g 0.15 for 15%.
+
+    Returns:
+        list: (name, baseline, current, change, regressed) for each result, baseline and change
+            are None if the benchmark isn't in the baseline.
+    """
+    rows = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            rows.append((name, None, current, None, False))
+        else:
+            change = (current - base) / base
+            rows.append((name, base, current, change, change > threshold))
+    return rows
+
+
+def load_baseline(path):
+    "load the timings from a baseline file, an empty dict if it doesn't exist"
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def save_baseline(path, results):
+    "save timings to a baseline file along with the versions used to generate them"
+    data = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def _format_time(seconds):
+    return "-" if seconds is None else f"{seconds * 1e6:10.3f}"
+
+
+def print_report(rows, threshold, file=None):
+    "print a table of the comparison"
+    print(
+        f"{'benchmark':32} {'baseline us':>11} {'current us':>11} {'change':>9}",
+        file=file,
+    )
+    for name, base, current, change, regressed in rows:
+        change_text = "new" if change is None else f"{change * 100:+8.1f}%"
+        flag = "  REGRESSION" if regressed else ""
+        print(
+            f"{name:32} {_format_time(base):>11} {_format_time(current):>11} {change_text:>9}{flag}",
+            file=file,
+        )
+    regressions = sum(1 for row in rows if row[4])
+    if regressions:
+        print(
+            f"{regressions} benchmark(s) slower than the {threshold * 100:.0f}% threshold",
+            file=file,
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the ncca.ngl math types")
+    parser.add_argument(
+        "--baseline",
+        default=DEFAULT_BASELINE,
+        help="baseline JSON file (default %(default)s)",
+    )
+    parser.add_argument(
+        "--save", action="store_true", help="save the results as the new baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="fractional slow down flagged as a regression (default %(default)s)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="timing runs per benchmark"
+    )
+    parser.add_argument(
+        "-k",
+        "--filter",
+        default="",
+        help="only run benchmarks whose name contains this string",
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="list the benchmarks and exit"
+    )
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+    names = [name for name in BENCHMARKS if args.filter in name]
+    results = run_benchmarks(names, repeat=args.repeat)
+    rows = compare(results, load_baseline(args.baseline), args.threshold)
+    print_report(rows, args.threshold)
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"saved baseline to {args.baseline}")
+        return 0
+    return 1 if any(row[4] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
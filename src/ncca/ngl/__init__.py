@@ -11,11 +11,13 @@ from .base_mesh import BaseMesh, Face
 from .bbox import BBox
 from .bezier_curve import BezierCurve
 from .first_person_camera import FirstPersonCamera
+from .gltf import Gltf, GltfError
 from .image import Image, ImageModes
 from .log import logger
-from .mat2 import Mat2
+from .mat2 import Mat2, Mat2Error
 from .mat3 import Mat3, Mat3Error, Mat3NotSquare
-from .mat4 import Mat4, Mat4Error, Mat4NotSquare
+from .mat4 import Mat4, Mat4Error, Mat4NotSquare, Mat4Type
+from .mat4_array import Mat4Array
 from .multi_buffer_vao import MultiBufferVAO
 from .obj import (
     Obj,
@@ -24,10 +26,12 @@ from .obj import (
     ObjParseUVError,
     ObjParseVertexError,
 )
+from .obj_parser import ObjArrays
 from .plane import Plane
 from .primitives import Primitives, Prims
 from .pyside_event_handling_mixin import PySideEventHandlingMixin
 from .quaternion import Quaternion
+from .quaternion_array import QuaternionArray
 from .random import Random
 from .shader import MatrixTranspose, Shader, ShaderType
 from .shader_lib import DefaultShader, ShaderLib
@@ -37,6 +41,7 @@ from .simple_vao import SimpleVAO
 from .text import Text
 from .texture import Texture
 from .transform import Transform, TransformRotationOrder
+from .transform_array import TransformArray
 from .util import calc_normal, clamp, frustum, lerp, look_at, ortho, perspective
 from .vao_factory import VAOFactory, VAOType
 from .vec2 import Vec2
@@ -58,10 +63,15 @@ all = [
     Mat2,
     Mat3,
     Mat4,
+    Mat4Array,
+    Mat4Type,
     MultiBufferVAO,
+    Gltf,
     Obj,
+    ObjArrays,
     Plane,
     Quaternion,
+    QuaternionArray,
     MatrixTranspose,
     Shader,
     ShaderProgram,
@@ -82,6 +92,7 @@ all = [
     ObjParseNormalError,
     ObjParseUVError,
     ObjParseFaceError,
+    GltfError,
     clamp,
     lerp,
     look_at,
@@ -89,10 +100,12 @@ all = [
     ortho,
     frustum,
     Transform,
+    TransformArray,
     TransformRotationOrder,
     Random,
     Text,
     calc_normal,
+    Mat2Error,
     Mat3Error,
     Mat4Error,
     Mat3NotSquare,
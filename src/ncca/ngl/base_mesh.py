@@ -1,12 +1,62 @@
-from dataclasses import dataclass
+from itertools import chain, repeat
 
 import numpy as np
 import OpenGL.GL as gl
 
-from . import vao_factory
+from . import mesh_quantize, mesh_simplify, vao_factory
 from .abstract_vao import VertexData
 from .bbox import BBox
 from .log import logger
+from .mesh_normals import corner_normals, vertex_normals
+from .mesh_optimizer import optimize_index_data
+from .simple_index_vao import IndexVertexData
+from .triangulate import triangulate_faces
+from .vec3 import Vec3
+
+
+def _face_arrays(faces) -> tuple[np.ndarray, np.ndarray]:
+    "internal function to get the number of corners of each face and the vertex index of each corner"
+    sizes = np.fromiter(
+        (len(face.vertex) for face in faces), dtype=np.int64, count=len(faces)
+    )
+    face_vertex = np.fromiter(
+        chain.from_iterable(face.vertex for face in faces),
+        dtype=np.int64,
+        count=int(sizes.sum()),
+    )
+    return sizes, face_vertex
+
+
+def _vec3_values(values) -> np.ndarray:
+    "internal function to convert a list of Vec3 to a (N,3) float64 array"
+    return np.array([(v.x, v.y, v.z) for v in values], dtype=np.float64).reshape(-1, 3)
+
+
+def _uv_values(values) -> np.ndarray:
+    "internal function to convert a list of Vec2 or Vec3 uvs to a (N,2) float64 array"
+    return np.array([(v.x, v.y) for v in values], dtype=np.float64).reshape(-1, 2)
+
+
+def weld_vertices(mesh_data: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Weld identical vertices of interleaved vertex data so each unique position, normal and uv
+    is only stored once, the rows are compared as bytes by sorting them with np.unique.
+
+    Args:
+        mesh_data: The x,y,z,nx,ny,nz,u,v float32 vertex data, flat or (N,8).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The (M,8) unique vertices in the order they are first
+            used and the (N,) uint32 index of each vertex of mesh_data in them.
+    """
+    mesh_data = np.ascontiguousarray(mesh_data, dtype=np.float32).reshape(-1, 8)
+    rows = mesh_data.view(np.dtype((np.void, mesh_data.itemsize * 8))).ravel()
+    _, first, inverse = np.unique(rows, return_index=True, return_inverse=True)
+    # renumber in order of first use so the vertices keep the locality of the faces
+    order = np.argsort(first)
+    rank = np.empty(len(order), dtype=np.uint32)
+    rank[order] = np.arange(len(order), dtype=np.uint32)
+    return mesh_data[first[order]], rank[inverse.ravel()]
 
 
 class Face:
@@ -34,7 +84,19 @@ class BaseMesh:
         self.normals: list = []
         self.uv: list = []
         self.faces: list[Face] = []
+        # interleaved x,y,z,nx,ny,nz,u,v triangle data, if set create_vao uses it instead of the faces
+        self.mesh_data = None
+        # if set mesh_data is already welded (see weld_vertices) and these are its element indices
+        self.mesh_indices = None
+        # material names and the index of the material of each face, -1 for none
+        self.materials: list[str] = []
+        self.face_materials: list[int] = []
+        # (material name, first vertex, vertex count) of each material in the VAO, faces are
+        # sorted by material so each is drawn with one call, empty if there are no materials
+        self.draw_ranges: list[tuple] = []
         self.vao = None
+        # with a compact VAO the matrix for the shader's dequantize uniform, None otherwise
+        self.dequantize = None
         self.bbox = None
         self.min_x: float = 0.0
         self.max_x: float = 0.0
@@ -54,15 +116,28 @@ class BaseMesh:
         """
         return all(len(f.vertex) == 3 for f in self.faces)
 
-    def create_vao(self, reset_vao: bool = False) -> None:
+    def create_vao(
+        self,
+        reset_vao: bool = False,
+        weld: bool = False,
+        optimize: bool = False,
+        compact: bool = False,
+    ) -> None:
         """
         Create a Vertex Array Object (VAO) for the mesh.
-        Only supports triangular meshes.
+        Quads and polygons are split into triangles, see triangulate.triangulate_faces.
 
         Args:
             reset_vao: If True, will not create a new VAO if one already exists.
-        Raises:
-            RuntimeError: If the mesh is not composed entirely of triangles.
+            weld: If True weld identical vertices (see weld_vertices) and create an indexed VAO,
+                with uint16 indices if there are few enough vertices. Data that is already welded
+                (mesh_indices is set) always makes an indexed VAO.
+            optimize: If True weld and reorder the triangles and vertices for the vertex cache
+                (see mesh_optimizer.optimize_index_data), slow for large meshes so best used
+                once when the mesh data is prepared.
+            compact: If True upload 12 bytes per vertex rather than 32 (see mesh_quantize), draw
+                with a shader that decodes them such as DefaultShader.COMPACT_DIFFUSE and set its
+                dequantize uniform to self.dequantize.
         """
         if reset_vao:
             if self.vao is not None:
@@ -72,71 +147,179 @@ class BaseMesh:
             if self.vao is not None:
                 logger.warning("Creating new VAO")
 
-        data_pack_type = 0
-        if self.is_triangular():
-            data_pack_type = gl.GL_TRIANGLES
-        if data_pack_type == 0:
-            logger.error("Can only create VBO from all Triangle data at present")
-            raise RuntimeError("Can only create VBO from all Triangle data at present")
-
-        @dataclass
-        class VertData:
-            """
-            Structure for a single vertex's data, including position, normal, and UV.
-            """
-
-            x: float = 0.0
-            y: float = 0.0
-            z: float = 0.0
-            nx: float = 0.0
-            ny: float = 0.0
-            nz: float = 0.0
-            u: float = 0.0
-            v: float = 0.0
-
-            def as_array(self) -> np.ndarray:
-                return np.array(
-                    [self.x, self.y, self.z, self.nx, self.ny, self.nz, self.u, self.v],
-                    dtype=np.float32,
+        if self.mesh_data is not None:
+            self._create_vao_from_data(
+                self.mesh_data,
+                gl.GL_TRIANGLES,
+                weld,
+                optimize,
+                compact,
+                self.mesh_indices,
+            )
+            self._set_bbox()
+            return
+
+        mesh_data = self._pack_triangles()
+        self._create_vao_from_data(mesh_data, gl.GL_TRIANGLES, weld, optimize, compact)
+        self.calc_dimensions()
+        self._set_bbox()
+
+    def _pack_triangles(self) -> np.ndarray:
+        """
+        Triangulate the faces and gather the x,y,z,nx,ny,nz,u,v data of each triangle corner with
+        numpy indexing. If the mesh has no normals smooth angle weighted normals are generated
+        (see calc_normals), otherwise normals and uvs are left as 0.0 for faces without them.
+
+        Returns:
+            np.ndarray: (N,8) float32 vertex data in the order of _faces_by_material.
+
+        Raises:
+            ObjParseFaceError: If a face uses a vertex, normal or uv the mesh doesn't have.
+        """
+        faces = self._faces_by_material()
+        sizes, face_vertex = _face_arrays(faces)
+
+        def check_range(index, count, name, used=None):
+            "raise for the first face with an index outside of the count values"
+            bad = (index < 0) | (index >= count)
+            if used is not None:
+                bad &= used
+            if bad.any():
+                from .obj_parser import ObjParseFaceError  # note relative import here
+
+                corner = int(np.argmax(bad))
+                ends = np.cumsum(sizes)
+                face = faces[int(np.searchsorted(ends, corner, side="right"))]
+                raise ObjParseFaceError(
+                    f"face {self.faces.index(face)} uses {name} index {int(index[corner])} "
+                    f"but the mesh only has {count}"
                 )
 
-        vbo_mesh: list[VertData] = []
-        for face in self.faces:
-            for i in range(3):
-                d = VertData()
-                d.x = self.vertex[face.vertex[i]].x
-                d.y = self.vertex[face.vertex[i]].y
-                d.z = self.vertex[face.vertex[i]].z
-                if self.normals and self.uv:
-                    d.nx = self.normals[face.normal[i]].x
-                    d.ny = self.normals[face.normal[i]].y
-                    d.nz = self.normals[face.normal[i]].z
-                    d.u = self.uv[face.uv[i]].x
-                    d.v = 1 - self.uv[face.uv[i]].y  # Flip V for OpenGL
-                elif self.normals and not self.uv:
-                    d.nx = self.normals[face.normal[i]].x
-                    d.ny = self.normals[face.normal[i]].y
-                    d.nz = self.normals[face.normal[i]].z
-                elif not self.normals and self.uv:
-                    d.u = self.uv[face.uv[i]].x
-                    d.v = 1 - self.uv[face.uv[i]].y
-                vbo_mesh.append(d)
-
-        mesh_data = np.concatenate([v.as_array() for v in vbo_mesh]).astype(np.float32)
-        self.vao = vao_factory.VAOFactory.create_vao(
-            vao_factory.VAOType.SIMPLE, data_pack_type
-        )
+        def corner_index(name, available):
+            "the index of each triangle corner and a mask of the corners whose face has them"
+            lists = [getattr(face, name) for face in faces]
+            lengths = np.fromiter(map(len, lists), dtype=np.int64, count=len(lists))
+            used = lengths == sizes
+            if used.all():
+                values = chain.from_iterable(lists)
+            else:
+                values = chain.from_iterable(
+                    values if has_values else repeat(0, size)
+                    for values, has_values, size in zip(
+                        lists, used.tolist(), sizes.tolist()
+                    )
+                )
+            index = np.fromiter(values, dtype=np.int64, count=int(sizes.sum()))
+            used = np.repeat(used, sizes)
+            check_range(index, len(available), name, used)
+            return index[corners], used[corners]
+
+        positions = _vec3_values(self.vertex)
+        check_range(face_vertex, len(positions), "vertex")
+        corners = triangulate_faces(positions, face_vertex, sizes)[0].reshape(-1)
+        mesh_data = np.zeros((len(corners), 8), dtype=np.float32)
+        mesh_data[:, 0:3] = positions[face_vertex[corners]]
+        if self.normals:
+            index, used = corner_index("normal", self.normals)
+            mesh_data[used, 3:6] = _vec3_values(self.normals)[index[used]]
+        elif len(corners):
+            normals = corner_normals(positions, face_vertex, sizes)
+            mesh_data[:, 3:6] = normals[corners]
+        if self.uv:
+            index, used = corner_index("uv", self.uv)
+            uv = _uv_values(self.uv)[index[used]]
+            mesh_data[used, 6] = uv[:, 0]
+            mesh_data[used, 7] = 1 - uv[:, 1]  # Flip V for OpenGL
+        return mesh_data
+
+    def _faces_by_material(self) -> list[Face]:
+        """
+        Get the faces grouped by material in the order each is first used (keeping the order of
+        the faces within a material) and set draw_ranges to match.
+
+        Returns:
+            list[Face]: The faces in the order they are added to the VAO.
+        """
+        self.draw_ranges = []
+        materials = self.face_materials
+        if len(materials) != len(self.faces) or all(m < 0 for m in materials):
+            return self.faces
+        rank = {}
+        for m in materials:
+            rank.setdefault(m, len(rank))
+        order = sorted(range(len(self.faces)), key=lambda i: rank[materials[i]])
+        first = end = 0
+        for i, face in enumerate(order):
+            end += max(len(self.faces[face].vertex) - 2, 0) * 3
+            if i + 1 == len(order) or materials[order[i + 1]] != materials[face]:
+                count = end - first
+                name = self.materials[materials[face]] if materials[face] >= 0 else None
+                self.draw_ranges.append((name, first, count))
+                first += count
+        return [self.faces[i] for i in order]
+
+    def _create_vao_from_data(
+        self,
+        mesh_data: np.ndarray,
+        mode: int,
+        weld: bool = False,
+        optimize: bool = False,
+        compact: bool = False,
+        indices: np.ndarray = None,
+    ) -> None:
+        """
+        Create the VAO from interleaved x,y,z,nx,ny,nz,u,v float32 vertex data.
+
+        Args:
+            mesh_data: The vertex data, flat or (N,8).
+            mode: The OpenGL primitive type to draw.
+            weld: If True weld the vertices and create a SimpleIndexVAO, the indices are in the
+                same order as mesh_data so draw_ranges are unchanged.
+            optimize: If True weld then optimize the indexed data, triangles are only reordered
+                within each of the draw_ranges.
+            compact: If True pack the vertices with mesh_quantize.pack_compact and set dequantize.
+            indices: Element indices if mesh_data is already welded, it isn't welded again.
+        """
+        if indices is not None or weld or optimize:
+            if indices is None:
+                vertices, indices = weld_vertices(mesh_data)
+            else:
+                vertices = np.asarray(mesh_data).reshape(-1, 8)
+            # indices up to 65535 fit in a short
+            if len(vertices) <= 1 << 16:
+                index_type = gl.GL_UNSIGNED_SHORT
+            else:
+                index_type = gl.GL_UNSIGNED_INT
+            data = IndexVertexData(vertices, len(vertices), indices, index_type)
+            if optimize:
+                ranges = [(first, count) for _, first, count in self.draw_ranges]
+                data = optimize_index_data(data, ranges or None)
+            vao_type = vao_factory.VAOType.SIMPLE_INDEX
+        else:
+            data = VertexData(mesh_data, mesh_data.size // 8)
+            vao_type = vao_factory.VAOType.SIMPLE
+        self.dequantize = None
+        if compact:
+            packed, self.dequantize = mesh_quantize.pack_compact(data.data)
+            # quantize after optimizing as the optimizer reads the float positions
+            data.data = packed.view(np.uint8)
+        self.vao = vao_factory.VAOFactory.create_vao(vao_type, mode)
         with self.vao as vao:
-            mesh_size = len(mesh_data) // 8
-            vao.set_data(VertexData(mesh_data, mesh_size))
-            # vertex
-            vao.set_vertex_attribute_pointer(0, 3, gl.GL_FLOAT, 8 * 4, 0)
-            # normals
-            vao.set_vertex_attribute_pointer(1, 3, gl.GL_FLOAT, 8 * 4, 3 * 4)
-            # uvs
-            vao.set_vertex_attribute_pointer(2, 2, gl.GL_FLOAT, 8 * 4, 6 * 4)
-            vao.set_num_indices(mesh_size)
-        self.calc_dimensions()
+            vao.set_data(data)
+            if compact:
+                mesh_quantize.set_compact_attribute_pointers(vao)
+            else:
+                # vertex
+                vao.set_vertex_attribute_pointer(0, 3, gl.GL_FLOAT, 8 * 4, 0)
+                # normals
+                vao.set_vertex_attribute_pointer(1, 3, gl.GL_FLOAT, 8 * 4, 3 * 4)
+                # uvs
+                vao.set_vertex_attribute_pointer(2, 2, gl.GL_FLOAT, 8 * 4, 6 * 4)
+            if vao_type == vao_factory.VAOType.SIMPLE:
+                vao.set_num_indices(data.size)
+
+    def _set_bbox(self) -> None:
+        "set the bbox from the min / max extents"
         self.bbox = BBox.from_extents(
             self.min_x, self.max_x, self.min_y, self.max_y, self.min_z, self.max_z
         )
@@ -148,23 +331,181 @@ class BaseMesh:
         """
         if not self.vertex:
             return
-        self.min_x = self.max_x = self.vertex[0].x
-        self.min_y = self.max_y = self.vertex[0].y
-        self.min_z = self.max_z = self.vertex[0].z
-        for v in self.vertex:
-            self.min_x = min(self.min_x, v.x)
-            self.max_x = max(self.max_x, v.x)
-            self.min_y = min(self.min_y, v.y)
-            self.max_y = max(self.max_y, v.y)
-            self.min_z = min(self.min_z, v.z)
-            self.max_z = max(self.max_z, v.z)
-
-    def draw(self) -> None:
+        positions = _vec3_values(self.vertex)
+        self.min_x, self.min_y, self.min_z = positions.min(axis=0).tolist()
+        self.max_x, self.max_y, self.max_z = positions.max(axis=0).tolist()
+
+    def calc_normals(
+        self, weighting: str = "angle", crease_angle: float = None
+    ) -> None:
+        """
+        Generate normals for the mesh from its faces, replacing any it has. The face normals are
+        averaged around each vertex with numpy (see mesh_normals).
+
+        Args:
+            weighting: "angle" to weight each face by its angle at the vertex or "area" to
+                weight by face area.
+            crease_angle: Angle in degrees, faces meeting at a sharper angle don't share normals
+                so hard edges stay sharp. Defaults to smoothing across all edges.
+
+        Raises:
+            ValueError: If weighting isn't "angle" or "area".
+        """
+        sizes, face_vertex = _face_arrays(self.faces)
+        positions = _vec3_values(self.vertex)
+        if crease_angle is None:
+            normals = vertex_normals(positions, face_vertex, sizes, weighting)
+            face_normal = face_vertex
+        else:
+            normals = corner_normals(
+                positions, face_vertex, sizes, weighting, crease_angle
+            )
+            # corners with the same normal share it
+            normals, face_normal = np.unique(normals, axis=0, return_inverse=True)
+            face_normal = face_normal.reshape(-1)
+        self.normals = [Vec3(x, y, z) for x, y, z in normals.tolist()]
+        face_normal = face_normal.tolist()
+        first = 0
+        for face, size in zip(self.faces, sizes.tolist()):
+            face.normal = face_normal[first : first + size]
+            first += size
+
+    def simplify(
+        self,
+        target_count: int = 0,
+        target_error: float = None,
+        preserve_borders: bool = False,
+        preserve_seams: bool = True,
+    ) -> "BaseMesh":
+        """
+        Create a simplified copy of the mesh by quadric error edge collapse (see
+        mesh_simplify.simplify), the copy holds the triangles as mesh_data so call create_vao on
+        it to draw it. Material boundaries are treated as seams so draw_ranges stay valid.
+
+        Args:
+            target_count: Number of triangles to reduce to. Defaults to 0 so only target_error
+                limits the simplification.
+            target_error: The largest error allowed relative to the mesh size, 0.01 is 1%.
+            preserve_borders: If True vertices on open borders aren't moved.
+            preserve_seams: If True vertices on uv and normal seams only collapse along the seam.
+
+        Returns:
+            BaseMesh: The simplified mesh with the materials and texture of this one.
+        """
+        vertices, indices = self._welded()
+        return self._simplified(
+            vertices,
+            indices,
+            target_count,
+            target_error,
+            preserve_borders,
+            preserve_seams,
+        )[0]
+
+    def _welded(self) -> tuple[np.ndarray, np.ndarray]:
+        "internal function to get the unique vertices and the indices of the triangles"
+        if self.mesh_indices is not None:
+            return np.asarray(self.mesh_data).reshape(-1, 8), self.mesh_indices
+        if self.mesh_data is not None:
+            return weld_vertices(self.mesh_data)
+        return weld_vertices(self._pack_triangles())
+
+    def _simplified(
+        self,
+        vertices,
+        indices,
+        target_count,
+        target_error,
+        preserve_borders,
+        preserve_seams,
+    ) -> tuple["BaseMesh", np.ndarray]:
+        """
+        internal simplify of welded data (see simplify), the simplified indices into vertices
+        are returned with the new mesh so levels of detail can be chained without welding again
+        """
+        triangles = len(indices) // 3
+        ranges = [(first, count) for _, first, count in self.draw_ranges]
+        indices, ranges, error = mesh_simplify.simplify(
+            vertices,
+            indices,
+            target_count,
+            target_error,
+            ranges or None,
+            preserve_borders,
+            preserve_seams,
+        )
+        logger.info(
+            f"simplified {triangles} triangles to {len(indices) // 3} "
+            f"with error {error:.3g}"
+        )
+        lod = BaseMesh()
+        lod.mesh_data = vertices[indices]
+        lod.materials = list(self.materials)
+        lod.draw_ranges = [
+            (name, first, count)
+            for (name, _, _), (first, count) in zip(self.draw_ranges, ranges)
+        ]
+        lod.texture_id = self.texture_id
+        lod.texture = self.texture
+        if len(indices):
+            lod.min_x, lod.min_y, lod.min_z = lod.mesh_data[:, :3].min(axis=0).tolist()
+            lod.max_x, lod.max_y, lod.max_z = lod.mesh_data[:, :3].max(axis=0).tolist()
+        return lod, indices
+
+    def generate_lods(
+        self,
+        ratios=(0.5, 0.25, 0.125),
+        target_error: float = None,
+        preserve_borders: bool = False,
+        preserve_seams: bool = True,
+    ) -> list["BaseMesh"]:
+        """
+        Create a chain of simplified levels of detail, each level is simplified from the one
+        before so the whole chain costs little more than the first level.
+
+        Args:
+            ratios: The fraction of the triangles of this mesh kept by each level.
+            target_error: The largest error allowed relative to the mesh size for each level,
+                levels stop early (and may repeat) if it is reached.
+            preserve_borders: If True vertices on open borders aren't moved.
+            preserve_seams: If True vertices on uv and normal seams only collapse along the seam.
+
+        Returns:
+            list[BaseMesh]: The simplified meshes in the order of ratios.
+        """
+        # weld once, every level indexes the same vertices
+        vertices, indices = self._welded()
+        triangles = len(indices) // 3
+        lods = []
+        mesh = self
+        for ratio in ratios:
+            mesh, indices = mesh._simplified(
+                vertices,
+                indices,
+                int(triangles * ratio),
+                target_error,
+                preserve_borders,
+                preserve_seams,
+            )
+            lods.append(mesh)
+        return lods
+
+    def draw(self, bind_material=None) -> None:
         """
         Draw the mesh using its VAO and bound texture (if any).
+
+        Args:
+            bind_material: Optional function called with the name of each material (None for
+                faces without one) before its faces are drawn, otherwise the whole mesh is drawn
+                in one call.
         """
         if self.vao:
             if self.texture_id:
                 gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture_id)
             with self.vao as vao:
-                vao.draw()
+                if bind_material is None or not self.draw_ranges:
+                    vao.draw()
+                else:
+                    for name, first, count in self.draw_ranges:
+                        bind_material(name)
+                        vao.draw_range(first, count)
@@ -0,0 +1,386 @@
+"""
+Base class for the VecArray containers, the values are stored in a single (N,k) float32 numpy
+array and the whole array is processed with vectorized numpy calls.
+"""
+
+import numpy as np
+
+
+def _make_view_type(vec_type, components):
+    """
+    Build a subclass of vec_type whose components read and write a row of the array,
+    this means all the usual Vec methods work on elements without copying them out.
+    """
+
+    def __init__(self, row):
+        self._row = row
+
+    # the row is already packed float32 so these don't need to copy
+    def tobytes(self):
+        return self._row.tobytes()
+
+    def __buffer__(self, flags):
+        return memoryview(self._row)
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is not None and self._row.dtype != dtype:
+            return self._row.astype(dtype)
+        return self._row.copy() if copy else self._row
+
+    def _create_property(index):
+        def getter(self):
+            return float(self._row[index])
+
+        def setter(self, value):
+            if not isinstance(value, (int, float)):
+                raise ValueError("need float or int")
+            self._row[index] = value
+
+        return property(getter, setter)
+
+    namespace = {
+        "__slots__": ["_row"],
+        "__init__": __init__,
+        "tobytes": tobytes,
+        "__buffer__": __buffer__,
+        "__array__": __array__,
+        "__doc__": f"A {vec_type.__name__} which is a view of a row of an array",
+    }
+    for index, name in enumerate(components):
+        namespace[name] = _create_property(index)
+    return type(f"{vec_type.__name__}View", (vec_type,), namespace)
+
+
+class BaseVecArray:
+    """
+    A class to hold an array of vectors in a contiguous float32 numpy array, sub classes set the
+    vector type and the component names.
+    """
+
+    _vec_type = None
+    _components = ""
+    # stop numpy trying to broadcast over us so ndarray + VecArray uses our methods
+    __array_ufunc__ = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._view_type = _make_view_type(cls._vec_type, cls._components)
+
+    def __init__(self, values=None):
+        """
+        Initializes the array.
+
+        Args:
+            values (iterable | int | numpy.ndarray, optional): An iterable of Vec objects, an integer
+                or a numpy array of shape (N,k) or (N*k,). If an integer, the array is initialized
+                with that many default Vecs. Defaults to None (an empty array).
+        """
+        width = len(self._components)
+        self._count = 0
+        if values is None:
+            self._buffer = np.zeros((0, width), dtype=np.float32)
+        elif isinstance(values, int):
+            default = np.array(list(self._vec_type()), dtype=np.float32)
+            self._buffer = np.tile(default, (values, 1))
+        elif isinstance(values, np.ndarray):
+            if values.size % width != 0:
+                raise ValueError(f"array size must be a multiple of {width}")
+            self._buffer = np.array(values, dtype=np.float32).reshape(-1, width)
+        else:
+            self._buffer = self._to_rows(values)
+        self._count = len(self._buffer)
+
+    @classmethod
+    def _from_array(cls, array):
+        "internal method to wrap an existing (N,k) float32 array without copying"
+        v = cls.__new__(cls)
+        v._buffer = array
+        v._count = len(array)
+        return v
+
+    def _to_rows(self, values):
+        "internal method to convert an iterable of Vecs to an (N,k) array"
+        name = self._vec_type.__name__
+        rows = []
+        for v in values:
+            if not isinstance(v, self._vec_type):
+                raise TypeError(f"All elements must be of type {name}")
+            rows.append(list(v))
+        return np.array(rows, dtype=np.float32).reshape(-1, len(self._components))
+
+    @property
+    def _data(self):
+        "the used part of the storage, the buffer may have spare capacity for appends"
+        return self._buffer[: self._count]
+
+    def _reserve(self, count):
+        "grow the buffer (doubling like std::vector) so it can hold count elements"
+        if count > len(self._buffer):
+            capacity = max(count, 2 * len(self._buffer), 8)
+            buffer = np.zeros((capacity, len(self._components)), dtype=np.float32)
+            buffer[: self._count] = self._data
+            self._buffer = buffer
+
+    def __getitem__(self, index):
+        """
+        Get the element at the specified index.
+
+        Args:
+            index (int | slice): The index of the element.
+
+        Returns:
+            Vec | VecArray: A Vec which is a view into the array so changes write through, or
+                a new array sharing the same data for a slice. As with a std::vector views are
+                not updated if the array grows.
+        """
+        if isinstance(index, (int, np.integer)):
+            return self._view_type(self._data[index])
+        return self._from_array(self._data[index])
+
+    def __setitem__(self, index, value):
+        """
+        Set the element at the specified index.
+
+        Args:
+            index (int | slice): The index of the element to set.
+            value (Vec | VecArray): The new value.
+        """
+        if isinstance(value, self._vec_type):
+            self._data[index] = list(value)
+        elif isinstance(value, type(self)):
+            self._data[index] = value._data
+        else:
+            name = self._vec_type.__name__
+            raise TypeError(f"Only {name} objects can be assigned")
+
+    def __len__(self):
+        """
+        Return the number of elements in the array.
+        """
+        return self._count
+
+    def __iter__(self):
+        """
+        Return an iterator for the array, each element is a view into the array.
+        """
+        data = self._data
+        for i in range(self._count):
+            yield self._view_type(data[i])
+
+    def append(self, value):
+        """
+        Append a Vec object to the array.
+
+        Args:
+            value (Vec): The Vec object to append.
+        """
+        if not isinstance(value, self._vec_type):
+            name = self._vec_type.__name__
+            raise TypeError(f"Only {name} objects can be appended")
+        self._reserve(self._count + 1)
+        self._buffer[self._count] = list(value)
+        self._count += 1
+
+    def extend(self, values):
+        """
+        Extend the array by appending elements from the iterable.
+
+        Args:
+            values (iterable | VecArray | numpy.ndarray): The values to append.
+
+        Raises:
+            TypeError: If any element in values is not the correct Vec type.
+        """
+        if isinstance(values, BaseVecArray):
+            rows = values._data
+        elif isinstance(values, np.ndarray):
+            rows = values.reshape(-1, len(self._components))
+        else:
+            rows = self._to_rows(values)
+        self._reserve(self._count + len(rows))
+        self._buffer[self._count : self._count + len(rows)] = rows
+        self._count += len(rows)
+
+    def _operand(self, rhs):
+        "internal method to convert the rhs of an operator to something numpy can broadcast"
+        if isinstance(rhs, BaseVecArray):
+            return rhs._data
+        elif isinstance(rhs, self._vec_type):
+            return np.array(list(rhs), dtype=np.float32)
+        elif isinstance(rhs, np.ndarray):
+            # a (N,) array is one scalar per element so make it broadcast against (N,k),
+            # a (k,) array is treated as a single vector
+            if rhs.ndim == 1 and len(rhs) != len(self._components):
+                return rhs[:, np.newaxis]
+            return rhs
+        elif isinstance(rhs, (int, float)):
+            return rhs
+        return None
+
+    def _binary_op(self, rhs, op):
+        "internal method to apply op to the whole array and return a new array"
+        value = self._operand(rhs)
+        if value is None:
+            return NotImplemented
+        return self._from_array(op(self._data, value).astype(np.float32, copy=False))
+
+    def __add__(self, rhs):
+        """
+        vector addition a+b
+
+        Args:
+            rhs (VecArray | Vec | numpy.ndarray): Either an array of the same length or a single
+                value added to every element.
+        Returns:
+            VecArray: A new array that is the result of the addition.
+        """
+        return self._binary_op(rhs, np.add)
+
+    def __radd__(self, lhs):
+        return self.__add__(lhs)
+
+    def __sub__(self, rhs):
+        """
+        vector subtraction a-b
+
+        Args:
+            rhs (VecArray | Vec | numpy.ndarray): Either an array of the same length or a single
+                value subtracted from every element.
+        Returns:
+            VecArray: A new array that is the result of the subtraction.
+        """
+        return self._binary_op(rhs, np.subtract)
+
+    def __mul__(self, rhs):
+        """
+        piecewise multiplication
+
+        Args:
+            rhs (float | numpy.ndarray | VecArray | Vec): A scalar, an (N,) array of per element
+                scalars or vectors to multiply piecewise.
+        Returns:
+            VecArray: A new array that is the result of the multiplication.
+        """
+        return self._binary_op(rhs, np.multiply)
+
+    def __rmul__(self, lhs):
+        return self.__mul__(lhs)
+
+    def __truediv__(self, rhs):
+        """
+        piecewise division
+
+        Args:
+            rhs (float | numpy.ndarray | VecArray | Vec): A scalar, an (N,) array of per element
+                scalars or vectors to divide by piecewise.
+        Returns:
+            VecArray: A new array that is the result of the division.
+        """
+        return self._binary_op(rhs, np.true_divide)
+
+    def dot(self, rhs):
+        """
+        dot product of every element with rhs
+
+        Args:
+            rhs (VecArray | Vec): Either an array of the same length or a single vector.
+        Returns:
+            numpy.ndarray: (N,) dot products.
+        """
+        value = self._operand(rhs)
+        if value is None:
+            raise TypeError(f"can't dot with {rhs=}")
+        return np.sum(self._data * value, axis=1, dtype=np.float32)
+
+    def length_squared(self):
+        """
+        length of every vector squared
+
+        Returns:
+            numpy.ndarray: (N,) squared lengths.
+        """
+        return np.einsum("ij,ij->i", self._data, self._data)
+
+    def length(self):
+        """
+        length of every vector
+
+        Returns:
+            numpy.ndarray: (N,) lengths.
+        """
+        return np.sqrt(self.length_squared())
+
+    def normalize(self):
+        """
+        normalize every vector in the array to unit length (in place)
+
+        Returns:
+            VecArray: this array.
+        Raises:
+            ZeroDivisionError: If any of the vectors has zero length.
+        """
+        lengths = self.length()
+        if np.any(lengths == 0.0):
+            raise ZeroDivisionError(
+                f"{type(self).__name__}.normalize array contains a zero length vector"
+            )
+        data = self._data
+        data /= lengths[:, np.newaxis]
+        return self
+
+    def transform(self, matrix):
+        """
+        Transform every element by a Mat4, this is the same as Vec4 @ Mat4 with missing
+        components set to z=0.0 and w=1.0 (so Vec3 are treated as points).
+
+        Args:
+            matrix (Mat4 | numpy.ndarray): The 4x4 matrix to transform by.
+        Returns:
+            VecArray: A new array of the transformed values.
+        """
+        m = np.asarray(matrix.m if hasattr(matrix, "m") else matrix, dtype=np.float32)
+        width = len(self._components)
+        if width == 4:
+            return self._from_array(self._data @ m)
+        # implicit w=1.0 so add the translation row rather than building a (N,4) array
+        result = self._data @ m[:width, :width] + m[3, :width]
+        return self._from_array(result.astype(np.float32, copy=False))
+
+    def to_list(self):
+        """
+        Convert the array to a single flat list of floats.
+
+        Returns:
+            list: The components of each element concatenated.
+        """
+        return self._data.ravel().tolist()
+
+    def to_numpy(self):
+        """
+        Get the array as a flat numpy array, this is a view of the storage (no copy) so it can be
+        passed straight to OpenGL.
+
+        Returns:
+            numpy.ndarray: A (N*k,) float32 numpy array of the vector data.
+        """
+        return self._data.reshape(-1)
+
+    def _element_repr(self, row):
+        "repr of one element, using the shortest float32 representation of each value"
+        values = ",".join(np.format_float_positional(v, trim="-") for v in row)
+        return f"{self._vec_type.__name__} [{values}]"
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self})"
+
+    def __str__(self):
+        return f"[{', '.join(self._element_repr(row) for row in self._data)}]"
+
+    def sizeof(self):
+        """
+        Return the size of the array in bytes.
+
+        Returns:
+            int: The size of the array in bytes.
+        """
+        return self._data.nbytes
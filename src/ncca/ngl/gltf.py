@@ -0,0 +1,464 @@
+"""
+glTF 2.0 loading for .gltf (JSON with external or embedded buffers) and binary .glb files. Buffers
+are memory mapped and accessors are numpy views of them, VAOs are created directly from the byte
+ranges of the accessors so no per vertex Python objects are made and the data isn't converted.
+
+Indexed primitives use a SimpleIndexVAO, their attributes are uploaded as one span of the buffer
+when they are next to each other (as most exporters write them) or packed together otherwise.
+Primitives without indices use a MultiBufferVAO with a buffer for each buffer view. Attributes
+use the locations of ATTRIBUTE_LOCATIONS so POSITION, NORMAL and TEXCOORD_0 match the other VAOs.
+UVs are used as stored, glTF puts v = 0 at the top of the image.
+"""
+
+import base64
+import json
+from pathlib import Path
+from urllib.parse import unquote
+
+import numpy as np
+import OpenGL.GL as gl
+
+from . import vao_factory
+from .abstract_vao import VertexData
+from .log import logger
+from .mat4 import Mat4
+from .simple_index_vao import IndexVertexData
+
+# shader attribute location of each glTF attribute, others aren't added to the VAOs
+ATTRIBUTE_LOCATIONS = {
+    "POSITION": 0,
+    "NORMAL": 1,
+    "TEXCOORD_0": 2,
+    "COLOR_0": 3,
+    "TANGENT": 4,
+    "TEXCOORD_1": 5,
+    "JOINTS_0": 6,
+    "WEIGHTS_0": 7,
+}
+_json_chunk = 0x4E4F534A  # "JSON"
+_bin_chunk = 0x004E4942  # "BIN\0"
+# glTF component types are the OpenGL type enums
+_component_types = {
+    gl.GL_BYTE: np.dtype("i1"),
+    gl.GL_UNSIGNED_BYTE: np.dtype("u1"),
+    gl.GL_SHORT: np.dtype("<i2"),
+    gl.GL_UNSIGNED_SHORT: np.dtype("<u2"),
+    gl.GL_UNSIGNED_INT: np.dtype("<u4"),
+    gl.GL_FLOAT: np.dtype("<f4"),
+}
+_type_sizes = {
+    "SCALAR": 1,
+    "VEC2": 2,
+    "VEC3": 3,
+    "VEC4": 4,
+    "MAT2": 4,
+    "MAT3": 9,
+    "MAT4": 16,
+}
+# bytes of padding allowed between attribute ranges uploaded as one span
+_max_gap = 4
+
+
+class GltfError(Exception):
+    """Exception for invalid or unsupported glTF files"""
+
+    pass
+
+
+def _node_matrix(node) -> np.ndarray:
+    "internal function to get the local transform of a node as a column vector 4x4 matrix"
+    if "matrix" in node:
+        # stored column major
+        return np.array(node["matrix"], dtype=np.float64).reshape(4, 4).T
+    x, y, z, w = node.get("rotation", (0.0, 0.0, 0.0, 1.0))
+    rotation = np.array(
+        [
+            [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+            [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+            [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+        ]
+    )
+    matrix = np.eye(4)
+    matrix[:3, :3] = rotation * np.asarray(node.get("scale", (1.0, 1.0, 1.0)))
+    matrix[:3, 3] = node.get("translation", (0.0, 0.0, 0.0))
+    return matrix
+
+
+class _Stream:
+    "internal class for a byte range of a buffer and the attributes read from it"
+
+    def __init__(self, buffer, start, end):
+        self.buffer = buffer
+        self.start = start
+        self.end = end
+        # (location, components, component type, normalized, stride, start) of each attribute
+        self.attributes = []
+
+
+class GltfPrimitive:
+    """
+    A glTF mesh primitive, its attributes and indices are numpy views of the file's buffers.
+    """
+
+    def __init__(self, gltf, primitive: dict):
+        """
+        Create the primitive from its glTF JSON.
+
+        Args:
+            gltf: The Gltf the primitive is from.
+            primitive: The primitive's JSON object.
+        """
+        self._gltf = gltf
+        self._attribute_accessors: dict[str, int] = primitive["attributes"]
+        self.attributes: dict[str, np.ndarray] = {
+            name: gltf.accessor(index)
+            for name, index in self._attribute_accessors.items()
+        }
+        self._indices_accessor = primitive.get("indices")
+        self.indices = None
+        if self._indices_accessor is not None:
+            self.indices = gltf.accessor(self._indices_accessor)
+        # glTF modes are the OpenGL primitive enums
+        self.mode: int = primitive.get("mode", gl.GL_TRIANGLES)
+        self.material = primitive.get("material")
+        self.vao = None
+
+    def _streams(self) -> list[_Stream]:
+        "internal function to group the attributes by the buffer view they are read from"
+        gltf = self._gltf
+        streams = {}
+        for name, index in self._attribute_accessors.items():
+            location = ATTRIBUTE_LOCATIONS.get(name)
+            if location is None:
+                logger.debug(f"glTF attribute {name} isn't used")
+                continue
+            accessor = gltf.json["accessors"][index]
+            component_type = accessor["componentType"]
+            components = _type_sizes[accessor["type"]]
+            size = _component_types[component_type].itemsize * components
+            view_index = accessor.get("bufferView")
+            if view_index is None or "sparse" in accessor:
+                # only these accessors need their data made
+                data = np.ascontiguousarray(self.attributes[name]).view(np.uint8)
+                stream = streams[name] = _Stream(data.reshape(-1), 0, data.size)
+                start, stride = 0, size
+            else:
+                view = gltf.json["bufferViews"][view_index]
+                stride = view.get("byteStride", size)
+                start = view.get("byteOffset", 0) + accessor.get("byteOffset", 0)
+                end = start + max(accessor["count"] - 1, 0) * stride + size
+                stream = streams.get(view_index)
+                if stream is None:
+                    buffer = gltf.buffers[view["buffer"]]
+                    stream = streams[view_index] = _Stream(buffer, start, end)
+                stream.start = min(stream.start, start)
+                stream.end = max(stream.end, end)
+            stream.attributes.append(
+                (
+                    location,
+                    components,
+                    component_type,
+                    accessor.get("normalized", False),
+                    stride,
+                    start,
+                )
+            )
+        return list(streams.values())
+
+    def _vertex_buffer(self, streams) -> tuple[np.ndarray, list[int]]:
+        """
+        internal function to get the vertex data of an indexed primitive as one array and the
+        offset of each stream in it, a view of the buffer if the streams are next to each other
+        """
+        start = min(stream.start for stream in streams)
+        end = max(stream.end for stream in streams)
+        used = sum(stream.end - stream.start for stream in streams)
+        if all(stream.buffer is streams[0].buffer for stream in streams) and (
+            end - start <= used + _max_gap * len(streams)
+        ):
+            return streams[0].buffer[start:end], [s.start - start for s in streams]
+        # pack the ranges with each one 4 byte aligned
+        offsets = []
+        total = 0
+        for stream in streams:
+            offsets.append(total)
+            total += (stream.end - stream.start + 3) & ~3
+        data = np.zeros(total, dtype=np.uint8)
+        for stream, offset in zip(streams, offsets):
+            data[offset : offset + stream.end - stream.start] = stream.buffer[
+                stream.start : stream.end
+            ]
+        return data, offsets
+
+    def create_vao(self) -> None:
+        """
+        Create the VAO from the accessor byte ranges, a SimpleIndexVAO if the primitive has
+        indices otherwise a MultiBufferVAO.
+
+        Raises:
+            GltfError: If the primitive has no POSITION attribute.
+        """
+        if "POSITION" not in self.attributes:
+            raise GltfError("glTF primitive has no POSITION attribute")
+        count = len(self.attributes["POSITION"])
+        streams = self._streams()
+        if self.indices is not None:
+            data, offsets = self._vertex_buffer(streams)
+            index_type = self._gltf.json["accessors"][self._indices_accessor][
+                "componentType"
+            ]
+            self.vao = vao_factory.VAOFactory.create_vao(
+                vao_factory.VAOType.SIMPLE_INDEX, self.mode
+            )
+            with self.vao as vao:
+                vao.set_data(IndexVertexData(data, count, self.indices, index_type))
+                for stream, offset in zip(streams, offsets):
+                    self._set_pointers(vao, stream, offset)
+            return
+        self.vao = vao_factory.VAOFactory.create_vao(
+            vao_factory.VAOType.MULTI_BUFFER, self.mode
+        )
+        with self.vao as vao:
+            for index, stream in enumerate(streams):
+                data = stream.buffer[stream.start : stream.end]
+                # leaves the new buffer bound for the attribute pointers
+                vao.set_data(VertexData(data, count), index)
+                self._set_pointers(vao, stream, 0)
+            vao.set_num_indices(count)
+
+    @staticmethod
+    def _set_pointers(vao, stream, offset) -> None:
+        "internal function to set the attribute pointers of a stream starting at offset"
+        for location, components, type, normalized, stride, start in stream.attributes:
+            vao.set_vertex_attribute_pointer(
+                location,
+                components,
+                type,
+                stride,
+                offset + start - stream.start,
+                normalized,
+            )
+
+    def draw(self) -> None:
+        """
+        Draw the primitive, create_vao must have been called.
+        """
+        if self.vao:
+            with self.vao as vao:
+                vao.draw()
+
+
+class GltfMesh:
+    """
+    A glTF mesh, a list of primitives drawn together.
+    """
+
+    def __init__(self, gltf, mesh: dict):
+        """
+        Create the mesh from its glTF JSON.
+
+        Args:
+            gltf: The Gltf the mesh is from.
+            mesh: The mesh's JSON object.
+        """
+        self.name: str = mesh.get("name", "")
+        self.primitives: list[GltfPrimitive] = [
+            GltfPrimitive(gltf, primitive) for primitive in mesh["primitives"]
+        ]
+
+    def create_vao(self) -> None:
+        """
+        Create the VAOs of the primitives.
+        """
+        for primitive in self.primitives:
+            primitive.create_vao()
+
+    def draw(self) -> None:
+        """
+        Draw the primitives.
+        """
+        for primitive in self.primitives:
+            primitive.draw()
+
+
+class Gltf:
+    """
+    glTF 2.0 loader, the buffers are memory mapped (or decoded from data uris) and only read when
+    they are used.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty glTF asset.
+        """
+        self.json: dict = {}
+        self.buffers: list[np.ndarray] = []
+        self.meshes: list[GltfMesh] = []
+        self._accessors: dict[int, np.ndarray] = {}
+
+    @classmethod
+    def from_file(cls, file: str) -> "Gltf":
+        """
+        Create a Gltf from a .gltf or .glb file.
+
+        Args:
+            file: Path to the file.
+
+        Returns:
+            Gltf: The loaded asset.
+        """
+        gltf = cls()
+        gltf.load(file)
+        return gltf
+
+    def load(self, file: str) -> None:
+        """
+        Load a .gltf or .glb file, the format is found from the start of the file.
+
+        Args:
+            file: Path to the file.
+
+        Raises:
+            GltfError: If the file isn't a glTF 2.0 asset or a buffer has no data.
+        """
+        path = Path(file)
+        with open(path, "rb") as f:
+            binary_file = f.read(4) == b"glTF"
+        binary = None
+        if binary_file:
+            data = np.memmap(path, dtype=np.uint8, mode="r")
+            _, version, length = np.frombuffer(data[:12], "<u4").tolist()
+            if version != 2:
+                raise GltfError(f"{file} is glb version {version} not 2")
+            offset = 12
+            while offset + 8 <= min(length, len(data)):
+                size, chunk_type = np.frombuffer(data[offset : offset + 8], "<u4")
+                chunk = data[offset + 8 : offset + 8 + int(size)]
+                if chunk_type == _json_chunk:
+                    self.json = json.loads(chunk.tobytes())
+                elif chunk_type == _bin_chunk and binary is None:
+                    binary = chunk
+                offset += 8 + int(size)
+        else:
+            self.json = json.loads(path.read_text(encoding="utf-8"))
+        version = str(self.json.get("asset", {}).get("version", ""))
+        if not version.startswith("2."):
+            raise GltfError(f"{file} is not a glTF 2.0 asset")
+        self.buffers = []
+        for index, buffer in enumerate(self.json.get("buffers", [])):
+            uri = buffer.get("uri")
+            if uri is None:
+                if binary is None:
+                    raise GltfError(f"buffer {index} of {file} has no data")
+                data = binary
+            elif uri.startswith("data:"):
+                encoded = uri.split(",", 1)[1]
+                data = np.frombuffer(base64.b64decode(encoded), dtype=np.uint8)
+            else:
+                data = np.memmap(path.parent / unquote(uri), dtype=np.uint8, mode="r")
+            self.buffers.append(data[: buffer["byteLength"]])
+        self._accessors = {}
+        self.meshes = [GltfMesh(self, mesh) for mesh in self.json.get("meshes", [])]
+
+    def _view(self, view_index, offset, dtype, count, components) -> np.ndarray:
+        "internal function to get a numpy view of count values in a buffer view"
+        view = self.json["bufferViews"][view_index]
+        buffer = self.buffers[view["buffer"]]
+        stride = view.get("byteStride", dtype.itemsize * components)
+        offset += view.get("byteOffset", 0)
+        values = np.ndarray(
+            (count, components), dtype, buffer, offset, (stride, dtype.itemsize)
+        )
+        return values[:, 0] if components == 1 else values
+
+    def accessor(self, index: int) -> np.ndarray:
+        """
+        Get the data of an accessor as a read only numpy view of its buffer, sparse accessors and
+        accessors without a buffer view are copies.
+
+        Args:
+            index: The accessor index.
+
+        Returns:
+            np.ndarray: (count,) values for SCALAR accessors, (count, components) otherwise.
+        """
+        values = self._accessors.get(index)
+        if values is not None:
+            return values
+        accessor = self.json["accessors"][index]
+        dtype = _component_types[accessor["componentType"]]
+        components = _type_sizes[accessor["type"]]
+        count = accessor["count"]
+        if "bufferView" in accessor:
+            values = self._view(
+                accessor["bufferView"],
+                accessor.get("byteOffset", 0),
+                dtype,
+                count,
+                components,
+            )
+        else:
+            shape = (count,) if components == 1 else (count, components)
+            values = np.zeros(shape, dtype)
+        sparse = accessor.get("sparse")
+        if sparse:
+            values = values.copy()
+            indices = sparse["indices"]
+            replaced = self._view(
+                indices["bufferView"],
+                indices.get("byteOffset", 0),
+                _component_types[indices["componentType"]],
+                sparse["count"],
+                1,
+            )
+            values[replaced] = self._view(
+                sparse["values"]["bufferView"],
+                sparse["values"].get("byteOffset", 0),
+                dtype,
+                sparse["count"],
+                components,
+            )
+        self._accessors[index] = values
+        return values
+
+    def create_vaos(self) -> None:
+        """
+        Create the VAOs of all of the meshes.
+        """
+        for mesh in self.meshes:
+            mesh.create_vao()
+
+    def mesh_instances(self, scene: int = None) -> list[tuple[Mat4, GltfMesh]]:
+        """
+        Get the world transform of each node with a mesh by walking the node hierarchy.
+
+        Args:
+            scene: The scene index, defaults to the asset's default scene.
+
+        Returns:
+            list[tuple[Mat4, GltfMesh]]: The transform and mesh of each node with a mesh, each
+                mesh once with the identity if the asset has no nodes.
+        """
+        nodes = self.json.get("nodes", [])
+        if not nodes:
+            return [(Mat4.identity(), mesh) for mesh in self.meshes]
+        scenes = self.json.get("scenes", [])
+        if scenes:
+            roots = scenes[scene if scene is not None else self.json.get("scene", 0)]
+            roots = roots.get("nodes", [])
+        else:
+            children = {child for node in nodes for child in node.get("children", [])}
+            roots = [i for i in range(len(nodes)) if i not in children]
+        instances = []
+        stack = [(root, np.eye(4)) for root in reversed(roots)]
+        while stack:
+            index, parent = stack.pop()
+            node = nodes[index]
+            world = parent @ _node_matrix(node)
+            if "mesh" in node:
+                # Mat4 stores the transpose so the translation is in the last row
+                instances.append(
+                    (Mat4.from_list(world.T.tolist()), self.meshes[node["mesh"]])
+                )
+            stack.extend((child, world) for child in reversed(node.get("children", [])))
+        return instances
@@ -1,4 +1,4 @@
-import copy
+import numpy as np
 
 from .vec2 import Vec2
 
@@ -12,6 +12,7 @@ _identity = [[1.0, 0.0], [0.0, 1.0]]
 
 class Mat2:
     __slots__ = ["m"]
+    _float32_storage = False  # class wide default storage for new matrices
 
     def __init__(self, m=None):
         """
@@ -22,11 +23,91 @@ class Mat2:
                         If not provided, an identity matrix is created.
         """
         if m is None:
-            self.m = copy.deepcopy(_identity)
+            self.m = [row[:] for row in _identity]
         elif isinstance(m, list) and len(m) == 4 and not isinstance(m[0], list):
             self.m = [m[0:2], m[2:4]]
         else:
             self.m = m
+        if Mat2._float32_storage:
+            self.m = np.array(self.m, dtype=np.float32).reshape(2, 2)
+
+    @classmethod
+    def set_float32_storage(cls, enabled: bool = True) -> None:
+        """
+        Set the storage used by all new matrices.
+
+        Args:
+            enabled (bool): True for contiguous float32 numpy storage, False for python lists.
+        """
+        cls._float32_storage = enabled
+
+    @classmethod
+    def from_numpy(cls, array) -> "Mat2":
+        """
+        Create a float32 backed Mat2, no copy is made if array is already a contiguous (2,2) float32 array.
+
+        Args:
+            array (np.ndarray): 4 values in the same row order as the list constructor.
+
+        Returns:
+            Mat2: A new float32 backed Mat2 object.
+
+        Raises:
+            Mat2Error: If array doesn't have 4 values.
+        """
+        values = np.ascontiguousarray(array, dtype=np.float32)
+        if values.size != 4:
+            raise Mat2Error(f"Mat2 needs 4 values not {values.size}")
+        v = cls.__new__(cls)
+        v.m = values.reshape(2, 2)
+        return v
+
+    @property
+    def is_float32(self) -> bool:
+        """
+        Check the storage type.
+
+        Returns:
+            bool: True if the matrix is held in contiguous float32 storage.
+        """
+        return isinstance(self.m, np.ndarray)
+
+    def as_float32(self) -> np.ndarray:
+        """
+        Get the matrix as a contiguous (2,2) float32 array in row order (transpose for OpenGL).
+
+        Returns:
+            np.ndarray: The storage itself if float32 backed (no copy) else a new array.
+        """
+        if isinstance(self.m, np.ndarray):
+            return self.m
+        return np.array(self.m, dtype=np.float32)
+
+    def tobytes(self) -> bytes:
+        """
+        Pack the matrix as float32 values in the same column-major order as get_matrix.
+
+        Returns:
+            bytes: The 4 packed float32 values, ideal for UBOs.
+        """
+        return self.as_float32().T.tobytes()
+
+    def __buffer__(self, flags):
+        """
+        Buffer protocol (python 3.12+), memoryview(m) is a (2,2) float32 copy in the same
+        column-major order as get_matrix and tobytes.
+        """
+        return memoryview(np.ascontiguousarray(self.as_float32().T))
+
+    def __array__(self, dtype=None, copy=None):
+        """
+        NumPy array protocol, np.asarray(m) is (2,2) in the same column-major order as
+        get_matrix and to_numpy, a transposed view of the storage if float32 backed.
+        """
+        array = self.as_float32().T
+        if dtype is not None and array.dtype != dtype:
+            return array.astype(dtype)
+        return array.copy() if copy else array
 
     @classmethod
     def from_list(cls, m: list[float]):
@@ -45,6 +126,8 @@ class Mat2:
         Returns:
             list[float]: A flat list of floats.
         """
+        if isinstance(self.m, np.ndarray):
+            return self.m.T.ravel().tolist()
         return [item for sublist in zip(*self.m) for item in sublist]
 
     def to_numpy(self):
@@ -54,8 +137,6 @@ class Mat2:
         Returns:
             np.ndarray: The matrix as a NumPy array.
         """
-        import numpy as np
-
         return np.array(self.get_matrix()).reshape([2, 2])
 
     @classmethod
@@ -66,9 +147,7 @@ class Mat2:
         Returns:
             Mat2: A new identity Mat2 object.
         """
-        ret = cls()
-        ret.m = copy.deepcopy(_identity)
-        return ret
+        return cls()
 
     def __matmul__(self, rhs):
         """
@@ -90,9 +169,10 @@ class Mat2:
         if isinstance(rhs, Mat2):
             return self._mat_mul(rhs)
         elif isinstance(rhs, Vec2):
+            m = self.m.tolist() if isinstance(self.m, np.ndarray) else self.m
             return Vec2(
-                rhs.x * self.m[0][0] + rhs.y * self.m[0][1],
-                rhs.x * self.m[1][0] + rhs.y * self.m[1][1],
+                rhs.x * m[0][0] + rhs.y * m[0][1],
+                rhs.x * m[1][0] + rhs.y * m[1][1],
             )
         else:
             raise ValueError(f"Can only multiply by Mat2 or Vec2, not {type(rhs)}")
@@ -107,6 +187,8 @@ class Mat2:
         Returns:
             Mat2: Result of matrix multiplication.
         """
+        if isinstance(self.m, np.ndarray) or isinstance(other.m, np.ndarray):
+            return Mat2.from_numpy(np.matmul(self.m, other.m, dtype=np.float32))
         ret = Mat2()
         for i in range(2):
             for j in range(2):
@@ -120,9 +202,10 @@ class Mat2:
         Returns:
             str: The string representation.
         """
-        return f"Mat2({self.m[0]}, {self.m[1]})"
+        m = self.m.tolist() if isinstance(self.m, np.ndarray) else self.m
+        return f"Mat2({m[0]}, {m[1]})"
 
     def to_list(self):
         "convert matrix to list in column-major order"
         # flatten to single array
-        return [item for sublist in zip(*self.m) for item in sublist]
+        return self.get_matrix()
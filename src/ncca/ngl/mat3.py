@@ -10,9 +10,11 @@ all matrix values are stored in a 3x3 list in the format
      [0.0,1.0,0.0],
      [0.0,1.0,0.0]]
 
+optionally the values can be stored in a contiguous (3,3) float32 numpy array instead, this can be
+passed directly to OpenGL without conversion, m[i][j] indexing works the same for both.
+
 """
 
-import copy
 import functools
 import math
 import operator
@@ -39,13 +41,96 @@ class Mat3:
     """Simple Mat3 class for basic affine transforms"""
 
     __slots__ = ["m"]
-    """m : list
+    """m : list | numpy.ndarray
         the matrix values
     """
+    _float32_storage = False  # class wide default storage for new matrices
 
     def __init__(self):
         """construct to identity matrix"""
-        self.m = copy.deepcopy(_identity)
+        if Mat3._float32_storage:
+            self.m = np.identity(3, dtype=np.float32)
+        else:
+            self.m = [row[:] for row in _identity]
+
+    @classmethod
+    def set_float32_storage(cls, enabled: bool = True) -> None:
+        """set the storage used by all new matrices
+
+        Parameters
+        ----------
+            enabled : bool
+                True for contiguous float32 numpy storage, False for python lists
+        """
+        cls._float32_storage = enabled
+
+    @classmethod
+    def from_numpy(cls, array):
+        """class method to create a float32 backed Mat3 from 9 values
+
+        Parameters
+        ----------
+            array : numpy.ndarray | list
+                9 values, no copy is made if this is already a contiguous (3,3) float32 array
+
+        Returns
+        -------
+            Mat3
+                new float32 backed Mat3
+
+        :raises:
+            Mat3NotSquare : if we don't get 9 values
+        """
+        values = np.ascontiguousarray(array, dtype=np.float32)
+        if values.size != 9:
+            raise Mat3NotSquare
+        v = cls.__new__(cls)
+        v.m = values.reshape(3, 3)
+        return v
+
+    @property
+    def is_float32(self) -> bool:
+        """True if the matrix is held in contiguous float32 storage"""
+        return isinstance(self.m, np.ndarray)
+
+    def as_float32(self):
+        """return the matrix as a contiguous (3,3) float32 array
+
+        Returns
+        -------
+        numpy.ndarray
+           the storage itself if the matrix is float32 backed (no copy) else a new array
+        """
+        if isinstance(self.m, np.ndarray):
+            return self.m
+        return np.array(self.m, dtype=np.float32)
+
+    def tobytes(self):
+        """pack the matrix as float32 values
+
+        Returns
+        -------
+        bytes
+           the 9 float32 elements in the same order as get_matrix, ideal for UBOs
+        """
+        return self.as_float32().tobytes()
+
+    def __buffer__(self, flags):
+        """buffer protocol (python 3.12+), memoryview(m) is a (3,3) float32 view of float32 backed storage"""
+        return memoryview(self.as_float32())
+
+    def __array__(self, dtype=None, copy=None):
+        """numpy array protocol, np.asarray(m) returns the storage itself if float32 backed"""
+        array = self.as_float32()
+        if dtype is not None and array.dtype != dtype:
+            return array.astype(dtype)
+        return array.copy() if copy else array
+
+    def _rows(self):
+        """internal function to get the values as a list of lists for fast scalar access"""
+        if isinstance(self.m, np.ndarray):
+            return self.m.tolist()
+        return self.m
 
     def get_matrix(self):
         """return matrix elements as list ideal for OpenGL
@@ -57,7 +142,7 @@ class Mat3:
            for OpenGL or Renderman consumption
         """
 
-        return functools.reduce(operator.concat, self.m)
+        return functools.reduce(operator.concat, self._rows())
 
     def to_numpy(self):
         "return matrix as a numpy array ideal for WebGPU etc"
@@ -87,6 +172,9 @@ class Mat3:
 
         """
         v = Mat3()
+        if Mat3._float32_storage:
+            v.m = np.zeros((3, 3), dtype=np.float32)
+            return v
         v.m = [[0.0, 0.0, 0.0], [0.0, 0.0, 0.0], [0.0, 0.0, 0.0]]
         return v
 
@@ -120,11 +208,11 @@ class Mat3:
         if not v._is_square():
             if len(lst) == 9:  # can convert
                 v.m = [lst[0:3], lst[3:6], lst[6:]]
-                return v
             else:
                 raise Mat3NotSquare
-        else:
-            return v
+        if Mat3._float32_storage:
+            v.m = np.array(v.m, dtype=np.float32)
+        return v
 
     def _is_square(self) -> bool:
         """ensure matrix is square"""
@@ -132,7 +220,10 @@ class Mat3:
 
     def transpose(self):
         """transpose this matrix"""
-        self.m = [list(item) for item in zip(*self.m)]
+        if isinstance(self.m, np.ndarray):
+            self.m = self.m.T.copy()
+        else:
+            self.m = [list(item) for item in zip(*self.m)]
 
     def get_transpose(self):
         """return a new matrix as the transpose of ourself
@@ -142,9 +233,9 @@ class Mat3:
             Mat3
                 The transpose of the current matrix
         """
-        m = Mat3()
-        m.m = [list(item) for item in zip(*self.m)]
-        return m
+        if isinstance(self.m, np.ndarray):
+            return Mat3.from_numpy(self.m.T)
+        return Mat3.from_list([list(item) for item in zip(*self.m)])
 
     @classmethod
     def scale(cls, x: float, y: float, z: float):
@@ -299,6 +390,9 @@ class Mat3:
             if rhs is not a number
         """
         if isinstance(rhs, (int, float)):
+            if isinstance(self.m, np.ndarray):
+                self.m *= rhs
+                return self
             for i in range(0, len(self.m)):
                 for j in range(0, len(self.m[i])):
                     self.m[i][j] *= rhs
@@ -307,6 +401,9 @@ class Mat3:
 
     def _mat_mul(self, rhs):
         "matrix mult internal function"
+        if isinstance(self.m, np.ndarray) or isinstance(rhs.m, np.ndarray):
+            # ret[i][j] = sum(rhs[i][k] * self[k][j]) which is rhs @ self, result stays float32
+            return Mat3.from_numpy(np.matmul(rhs.m, self.m, dtype=np.float32))
         # fmt: off
         a00 = self.m[0][0] # cache values for speed? (works in C++ not sure about python)
         a01 = self.m[0][1]
@@ -348,16 +445,19 @@ class Mat3:
         if isinstance(rhs, Mat3):
             return self._mat_mul(rhs)
         elif isinstance(rhs, Vec3):
+            m = self._rows()
             return Vec3(
-                rhs.x * self.m[0][0] + rhs.y * self.m[0][1] + rhs.z * self.m[0][2],
-                rhs.x * self.m[1][0] + rhs.y * self.m[1][1] + rhs.z * self.m[1][2],
-                rhs.x * self.m[2][0] + rhs.y * self.m[2][1] + rhs.z * self.m[2][2],
+                rhs.x * m[0][0] + rhs.y * m[0][1] + rhs.z * m[0][2],
+                rhs.x * m[1][0] + rhs.y * m[1][1] + rhs.z * m[1][2],
+                rhs.x * m[2][0] + rhs.y * m[2][1] + rhs.z * m[2][2],
             )
         else:
             raise Mat3Error
 
     def _add(self, rhs):
         "internal add function"
+        if isinstance(self.m, np.ndarray) or isinstance(rhs.m, np.ndarray):
+            return Mat3.from_numpy(np.add(self.m, rhs.m, dtype=np.float32))
         temp = Mat3()
         for i in range(0, len(temp.m)):
             temp.m[i] = [a + b for a, b in zip(self.m[i], rhs.m[i])]
@@ -373,6 +473,8 @@ class Mat3:
 
     def _sub(self, rhs):
         "internal subtract function"
+        if isinstance(self.m, np.ndarray) or isinstance(rhs.m, np.ndarray):
+            return Mat3.from_numpy(np.subtract(self.m, rhs.m, dtype=np.float32))
         temp = Mat3()
         for i in range(0, len(temp.m)):
             temp.m[i] = [a - b for a, b in zip(self.m[i], rhs.m[i])]
@@ -388,69 +490,58 @@ class Mat3:
 
     def determinant(self):
         "determinant of matrix"
+        m = self._rows()
         return (
-            +self.m[0][0] * (self.m[1][1] * self.m[2][2] - self.m[2][1] * self.m[1][2])
-            - self.m[0][1] * (self.m[1][0] * self.m[2][2] - self.m[1][2] * self.m[2][0])
-            + self.m[0][2] * (self.m[1][0] * self.m[2][1] - self.m[1][1] * self.m[2][0])
+            +m[0][0] * (m[1][1] * m[2][2] - m[2][1] * m[1][2])
+            - m[0][1] * (m[1][0] * m[2][2] - m[1][2] * m[2][0])
+            + m[0][2] * (m[1][0] * m[2][1] - m[1][1] * m[2][0])
         )
 
     def to_list(self):
         "convert matrix to list"
         # flatten to single array
-        return functools.reduce(operator.concat, self.m)
+        return functools.reduce(operator.concat, self._rows())
 
     def inverse(self):
         "Inverse of matrix raise MatrixError if not calculable"
+        m = self._rows()
         det = self.determinant()
         try:
             invdet = 1 / det
-            tmp = Mat3()
+            tmp = [[0.0] * 3 for _ in range(3)]
             # minor matrix + co-factor
-            tmp.m[0][0] = (
-                +(self.m[1][1] * self.m[2][2] - self.m[1][2] * self.m[2][1]) * invdet
-            )
-            tmp.m[1][0] = (
-                -(self.m[1][0] * self.m[2][2] - self.m[1][2] * self.m[2][0]) * invdet
-            )
-            tmp.m[2][0] = (
-                +(self.m[1][0] * self.m[2][1] - self.m[1][1] * self.m[2][0]) * invdet
-            )
+            tmp[0][0] = +(m[1][1] * m[2][2] - m[1][2] * m[2][1]) * invdet
+            tmp[1][0] = -(m[1][0] * m[2][2] - m[1][2] * m[2][0]) * invdet
+            tmp[2][0] = +(m[1][0] * m[2][1] - m[1][1] * m[2][0]) * invdet
 
-            tmp.m[0][1] = (
-                -(self.m[0][1] * self.m[2][2] - self.m[0][2] * self.m[2][1]) * invdet
-            )
-            tmp.m[1][1] = (
-                +(self.m[0][0] * self.m[2][2] - self.m[0][2] * self.m[2][0]) * invdet
-            )
-            tmp.m[2][1] = (
-                -(self.m[0][0] * self.m[2][1] - self.m[0][1] * self.m[2][0]) * invdet
-            )
+            tmp[0][1] = -(m[0][1] * m[2][2] - m[0][2] * m[2][1]) * invdet
+            tmp[1][1] = +(m[0][0] * m[2][2] - m[0][2] * m[2][0]) * invdet
+            tmp[2][1] = -(m[0][0] * m[2][1] - m[0][1] * m[2][0]) * invdet
 
-            tmp.m[0][2] = (
-                +(self.m[0][1] * self.m[1][2] - self.m[0][2] * self.m[1][1]) * invdet
-            )
-            tmp.m[1][2] = (
-                -(self.m[0][0] * self.m[1][2] - self.m[0][2] * self.m[1][0]) * invdet
-            )
-            tmp.m[2][2] = (
-                +(self.m[0][0] * self.m[1][1] - self.m[0][1] * self.m[1][0]) * invdet
-            )
+            tmp[0][2] = +(m[0][1] * m[1][2] - m[0][2] * m[1][1]) * invdet
+            tmp[1][2] = -(m[0][0] * m[1][2] - m[0][2] * m[1][0]) * invdet
+            tmp[2][2] = +(m[0][0] * m[1][1] - m[0][1] * m[1][0]) * invdet
 
-            return tmp
+            if isinstance(self.m, np.ndarray):
+                return Mat3.from_numpy(tmp)
+            return Mat3.from_list(tmp)
         except ZeroDivisionError:
             raise Mat3Error
 
     def __str__(self):
         """return string representation"""
-        return f"[{self.m[0]}\n{self.m[1]}\n{self.m[2]}]"
+        m = self._rows()
+        return f"[{m[0]}\n{m[1]}\n{m[2]}]"
 
     def __repr__(self):
         """return string representation"""
-        return f"Mat3({self.m})"
+        return f"Mat3({self._rows()})"
 
     @classmethod
     def from_mat4(cls, mat4):
         """Create a Mat3 from a Mat4"""
+        if isinstance(mat4.m, np.ndarray):
+            return Mat3.from_numpy(mat4.m[:3, :3])
         return Mat3.from_list(
             [
                 mat4.m[0][0],
@@ -2,7 +2,7 @@
 Simple Mat4 class which can be used with the Vec4 class
 """
 
-import copy
+import enum
 import functools
 import math
 import operator
@@ -22,6 +22,22 @@ class Mat4NotSquare(Exception):
     pass
 
 
+class Mat4Type(enum.IntEnum):
+    """
+    Classification of a Mat4, each type is a special case of the ones after it so the type of
+    a @ b is max(a, b). Rigid here means the upper 3x3 is orthonormal (rotations and reflections).
+    """
+
+    IDENTITY = 0
+    TRANSLATION = 1
+    RIGID = 2
+    AFFINE = 3
+    GENERAL = 4
+
+
+# allowed error of the dot products of the rows of a RIGID matrix, float32 products drift a little
+_orthonormal_tolerance = 1e-4
+
 _identity = [
     [1.0, 0.0, 0.0, 0.0],
     [0.0, 1.0, 0.0, 0.0],
@@ -31,30 +47,137 @@ _identity = [
 
 
 class Mat4:
-    __slots__ = ["m"]
+    """
+    Mat4 class, by default the values are held as a list of lists, optionally they can be held in a
+    contiguous (4,4) float32 numpy array which can be passed directly to OpenGL without any conversion.
+    m[i][j] indexing works the same for both.
+    """
+
+    __slots__ = ["m", "_type"]
+    _float32_storage = False  # class wide default storage for new matrices
 
     def __init__(self):
-        "construct to identity matrix"
-        self.m = copy.deepcopy(_identity)
+        "construct to identity matrix, the type is GENERAL as this is normally filled in by hand"
+        if Mat4._float32_storage:
+            self.m = np.identity(4, dtype=np.float32)
+        else:
+            self.m = [
+                row[:] for row in _identity
+            ]  # floats are immutable so a deepcopy is not needed
+        self._type = Mat4Type.GENERAL
+
+    @property
+    def matrix_type(self) -> Mat4Type:
+        "the classification of the matrix used to pick fast paths, set this if you edit m by hand"
+        return self._type
+
+    @matrix_type.setter
+    def matrix_type(self, value: Mat4Type) -> None:
+        self._type = Mat4Type(value)
+
+    def _from_rows(self, rows, matrix_type):
+        "internal function to wrap a new list of lists with the same storage type as self, avoids the deepcopy in Mat4()"
+        ret = Mat4.__new__(Mat4)
+        if isinstance(self.m, np.ndarray) or Mat4._float32_storage:
+            ret.m = np.array(rows, dtype=np.float32)
+        else:
+            ret.m = rows
+        ret._type = matrix_type
+        return ret
+
+    def _type_is_valid(self) -> bool:
+        "cheap check that the structure of m still matches the type in case m has been edited"
+        m = self._rows()
+        if m[0][3] != 0.0 or m[1][3] != 0.0 or m[2][3] != 0.0 or m[3][3] != 1.0:
+            return False
+        if self._type <= Mat4Type.TRANSLATION:
+            if (
+                m[0][:3] != [1.0, 0.0, 0.0]
+                or m[1][:3] != [0.0, 1.0, 0.0]
+                or m[2][:3] != [0.0, 0.0, 1.0]
+            ):
+                return False
+            if self._type == Mat4Type.IDENTITY:
+                return m[3][:3] == [0.0, 0.0, 0.0]
+        elif self._type == Mat4Type.RIGID:
+            # the transpose is only the inverse if the rows of the upper 3x3 are orthonormal
+            for i in range(3):
+                for j in range(i, 3):
+                    dot = m[i][0] * m[j][0] + m[i][1] * m[j][1] + m[i][2] * m[j][2]
+                    if abs(dot - (1.0 if i == j else 0.0)) > _orthonormal_tolerance:
+                        return False
+        return True
+
+    @classmethod
+    def set_float32_storage(cls, enabled: bool = True) -> None:
+        "set all new matrices to use contiguous float32 storage (True) or python lists (False)"
+        cls._float32_storage = enabled
+
+    @classmethod
+    def from_numpy(cls, array):
+        "class method to create a float32 backed Mat4 from 16 values, no copy is made if already (4,4) float32"
+        values = np.ascontiguousarray(array, dtype=np.float32)
+        if values.size != 16:
+            raise Mat4NotSquare
+        v = cls.__new__(cls)
+        v.m = values.reshape(4, 4)
+        v._type = Mat4Type.GENERAL
+        return v
+
+    @property
+    def is_float32(self) -> bool:
+        "True if the matrix is held in contiguous float32 storage"
+        return isinstance(self.m, np.ndarray)
+
+    def as_float32(self):
+        "return the matrix as a contiguous (4,4) float32 array, this is the storage itself if float32 backed"
+        if isinstance(self.m, np.ndarray):
+            return self.m
+        return np.array(self.m, dtype=np.float32)
+
+    def tobytes(self):
+        "pack the matrix as float32 values in the same order as get_matrix, ideal for UBOs"
+        return self.as_float32().tobytes()
+
+    def __buffer__(self, flags):
+        "buffer protocol (python 3.12+), memoryview(m) is a (4,4) float32 view of float32 backed storage"
+        return memoryview(self.as_float32())
+
+    def __array__(self, dtype=None, copy=None):
+        "numpy array protocol, np.asarray(m) returns the storage itself if float32 backed"
+        array = self.as_float32()
+        if dtype is not None and array.dtype != dtype:
+            return array.astype(dtype)
+        return array.copy() if copy else array
+
+    def _rows(self):
+        "internal function to get the values as a list of lists for fast scalar access"
+        if isinstance(self.m, np.ndarray):
+            return self.m.tolist()
+        return self.m
 
     def get_matrix(self):
         "return matrix elements as list ideal for OpenGL etc"
-        return functools.reduce(operator.concat, self.m)
+        return functools.reduce(operator.concat, self._rows())
 
     def to_numpy(self):
         "return matrix as a numpy array ideal for WebGPU etc"
-        return np.array(self.get_matrix(), dtype=np.float32).reshape([4, 4])
+        return np.array(self.m, dtype=np.float32)
 
     @classmethod
     def identity(cls):
         "class method to return a new identity matrix"
         v = Mat4()
+        v._type = Mat4Type.IDENTITY
         return v
 
     @classmethod
     def zero(cls):
         "class method to return a zero matrix"
         v = Mat4()
+        if Mat4._float32_storage:
+            v.m = np.zeros((4, 4), dtype=np.float32)
+            return v
         v.m = [
             [0.0, 0.0, 0.0, 0.0],
             [0.0, 0.0, 0.0, 0.0],
@@ -63,6 +186,16 @@ class Mat4:
         ]
         return v
 
+    def set_identity(self):
+        "set this matrix to the identity in place, no new storage is allocated"
+        if isinstance(self.m, np.ndarray):
+            self.m[...] = np.identity(4, dtype=np.float32)
+        else:
+            for row, values in zip(self.m, _identity):
+                row[:] = values
+        self._type = Mat4Type.IDENTITY
+        return self
+
     @classmethod
     def from_list(cls, lst):
         "class method to create mat4 from list"
@@ -71,11 +204,11 @@ class Mat4:
         if not v._is_square():
             if len(lst) == 16:  # can convert
                 v.m = [lst[0:4], lst[4:8], lst[8:12], lst[12:16]]
-                return v
             else:
                 raise Mat4NotSquare
-        else:
-            return v
+        if Mat4._float32_storage:
+            v.m = np.array(v.m, dtype=np.float32)
+        return v
 
     def _is_square(self) -> bool:
         "ensure matrix is square"
@@ -84,17 +217,22 @@ class Mat4:
     def to_list(self):
         "convert matrix to list"
         # flatten to single array
-        return functools.reduce(operator.concat, self.m)
+        return functools.reduce(operator.concat, self._rows())
 
     def transpose(self):
         "transpose this matrix"
-        self.m = [list(item) for item in zip(*self.m)]
+        if isinstance(self.m, np.ndarray):
+            self.m = self.m.T.copy()
+        else:
+            self.m = [list(item) for item in zip(*self.m)]
+        if self._type != Mat4Type.IDENTITY:
+            self._type = Mat4Type.GENERAL
 
     def get_transpose(self):
         "return a new matrix as the transpose of ourself"
-        m = Mat4()
-        m.m = [list(item) for item in zip(*self.m)]
-        return m
+        if isinstance(self.m, np.ndarray):
+            return Mat4.from_numpy(self.m.T)
+        return Mat4.from_list([list(item) for item in zip(*self.m)])
 
     @classmethod
     def scale(cls, x: float, y: float, z: float):
@@ -103,6 +241,11 @@ class Mat4:
         a.m[0][0] = x
         a.m[1][1] = y
         a.m[2][2] = z
+        # a scale of +/-1 is a reflection which is still orthonormal
+        if abs(x) == 1.0 and abs(y) == 1.0 and abs(z) == 1.0:
+            a._type = Mat4Type.RIGID
+        else:
+            a._type = Mat4Type.AFFINE
         return a
 
     @classmethod
@@ -112,6 +255,7 @@ class Mat4:
         a.m[3][0] = x
         a.m[3][1] = y
         a.m[3][2] = z
+        a._type = Mat4Type.TRANSLATION
         return a
 
     @classmethod
@@ -125,6 +269,7 @@ class Mat4:
         a.m[1][2] = sr
         a.m[2][1] = -sr
         a.m[2][2] = cr
+        a._type = Mat4Type.RIGID
         return a
 
     @classmethod
@@ -138,6 +283,7 @@ class Mat4:
         a.m[0][2] = -sr
         a.m[2][0] = sr
         a.m[2][2] = cr
+        a._type = Mat4Type.RIGID
         return a
 
     @classmethod
@@ -151,6 +297,7 @@ class Mat4:
         a.m[0][1] = sr
         a.m[1][0] = -sr
         a.m[1][1] = cr
+        a._type = Mat4Type.RIGID
         return a
 
     def __getitem__(self, idx):
@@ -160,6 +307,7 @@ class Mat4:
     def __setitem__(self, idx, item):
         "set items remember this is a list of lists [[4],[4],[4],[4]]"
         self.m[idx] = item
+        self._type = Mat4Type.GENERAL
 
     def __mul__(self, rhs):
         """Multiply matrix by scalar
@@ -173,14 +321,36 @@ class Mat4:
             if rhs is not a number
         """
         if isinstance(rhs, (int, float)):
+            self._type = Mat4Type.GENERAL
+            if isinstance(self.m, np.ndarray):
+                self.m *= rhs
+                return self
             for i in range(0, len(self.m)):
                 for j in range(0, len(self.m[i])):
                     self.m[i][j] *= rhs
             return self
         raise Mat4Error
 
-    def _mat_mul(self, rhs):
-        "matrix mult internal function"
+    def _mat_mul(self, rhs, out=None):
+        "matrix mult internal function, the result type is the most general of the two, out is written to if given"
+        # m can be edited by hand (Mat4.identity() often is) but each type's check is a full test
+        # of the structure of the product so it is only checked where the type is used
+        matrix_type = max(self._type, rhs._type)
+        if isinstance(self.m, np.ndarray) or isinstance(rhs.m, np.ndarray):
+            # ret[i][j] = sum(rhs[i][k] * self[k][j]) which is rhs @ self, result stays float32
+            if out is None:
+                ret = Mat4.from_numpy(np.matmul(rhs.m, self.m, dtype=np.float32))
+            elif isinstance(out.m, np.ndarray):
+                # numpy copies the inputs if they overlap out so a @ b into a is safe
+                np.matmul(rhs.m, self.m, out=out.m, dtype=np.float32)
+                ret = out
+            else:
+                ret = out
+                values = np.matmul(rhs.m, self.m, dtype=np.float32).tolist()
+                for row, value in zip(ret.m, values):
+                    row[:] = value
+            ret._type = matrix_type
+            return ret
         # fmt: off
         a00 = self.m[0][0] # cache values for speed? (works in C++ not sure about python)
         a01 = self.m[0][1]
@@ -214,7 +384,8 @@ class Mat4:
         b31 = rhs.m[3][1]
         b32 = rhs.m[3][2]
         b33 = rhs.m[3][3]
-        ret=Mat4() # result mat4
+        # everything is cached above so it is safe for out to be self or rhs
+        ret = Mat4() if out is None else out
         ret.m[0][0] = b00 * a00 + b01 * a10 + b02 * a20 + b03 * a30
         ret.m[0][1] = b00 * a01 + b01 * a11 + b02 * a21 + b03 * a31
         ret.m[0][2] = b00 * a02 + b01 * a12 + b02 * a22 + b03 * a32
@@ -231,36 +402,102 @@ class Mat4:
         ret.m[3][1] = b30 * a01 + b31 * a11 + b32 * a21 + b33 * a31
         ret.m[3][2] = b30 * a02 + b31 * a12 + b32 * a22 + b33 * a32
         ret.m[3][3] = b30 * a03 + b31 * a13 + b32 * a23 + b33 * a33
+        ret._type = matrix_type
         return ret
         # fmt: on
 
     def __matmul__(self, rhs):
-        from .vec4 import Vec4  # note relative import here
+        from .mat4_array import Mat4Array  # note relative import here
+        from .vec4 import Vec4
 
         "multiply matrix by another matrix"
         if isinstance(rhs, Mat4):
             return self._mat_mul(rhs)
+        elif isinstance(rhs, Mat4Array):
+            return rhs.__rmatmul__(self)
         elif isinstance(rhs, (Vec4, Vec4)):
+            m = self._rows()
             # fmt: off
             return Vec4(
-                rhs.x * self.m[0][0] + rhs.y * self.m[0][1]+ rhs.z * self.m[0][2]+ rhs.w * self.m[0][3],
-                rhs.x * self.m[1][0]+ rhs.y * self.m[1][1]+ rhs.z * self.m[1][2]+ rhs.w * self.m[1][3],
-                rhs.x * self.m[2][0]+ rhs.y * self.m[2][1]+ rhs.z * self.m[2][2]+ rhs.w * self.m[2][3],
-                rhs.x * self.m[3][0]+ rhs.y * self.m[3][1]+ rhs.z * self.m[3][2]+ rhs.w * self.m[3][3])
+                rhs.x * m[0][0] + rhs.y * m[0][1]+ rhs.z * m[0][2]+ rhs.w * m[0][3],
+                rhs.x * m[1][0]+ rhs.y * m[1][1]+ rhs.z * m[1][2]+ rhs.w * m[1][3],
+                rhs.x * m[2][0]+ rhs.y * m[2][1]+ rhs.z * m[2][2]+ rhs.w * m[2][3],
+                rhs.x * m[3][0]+ rhs.y * m[3][1]+ rhs.z * m[3][2]+ rhs.w * m[3][3])
             # fmt: on
         else:
             raise Mat4Error
 
-    def __str__(self):
-        return f"[{self.m[0]}\n{self.m[1]}\n{self.m[2]}\n{self.m[3]}]"
+    @staticmethod
+    def _points(values):
+        "internal function to get a Vec3Array or array of 3N values as a (N,3) float32 array"
+        if hasattr(values, "to_numpy"):
+            values = values.to_numpy()
+        values = np.asarray(values, dtype=np.float32)
+        if values.size % 3 != 0:
+            raise ValueError("need a Vec3Array or an array of 3N values")
+        return values.reshape(-1, 3)
+
+    def transform_points(self, points, perspective_divide: bool = False):
+        "transform (N,3) points as Vec4(x,y,z,1) @ self in one pass, optionally dividing by w, returns (N,3) float32"
+        m = np.asarray(self.m, dtype=np.float32)
+        p = self._points(points)
+        result = p @ m[:3, :3] + m[3, :3]
+        if perspective_divide:
+            w = p @ m[:3, 3] + m[3, 3]
+            result /= w[:, np.newaxis]
+        return result
+
+    def transform_directions(self, directions):
+        "transform (N,3) directions as Vec4(x,y,z,0) @ self so the translation is ignored, returns (N,3) float32"
+        m = np.asarray(self.m, dtype=np.float32)
+        return self._points(directions) @ m[:3, :3]
+
+    def transform_normals(self, normals, normalize: bool = True):
+        "transform (N,3) normals by the inverse transpose of the upper 3x3, raise Mat4Error if singular, returns (N,3) float32"
+        m = np.asarray(self.m, dtype=np.float64)[:3, :3]
+        # rigid matrices are orthonormal so the inverse transpose is the matrix itself
+        if self._type > Mat4Type.RIGID or not self._type_is_valid():
+            try:
+                m = np.linalg.inv(m).T
+            except np.linalg.LinAlgError:
+                raise Mat4Error("matrix is singular")
+        result = self._points(normals) @ m.astype(np.float32)
+        if normalize:
+            lengths = np.linalg.norm(result, axis=1, keepdims=True)
+            np.divide(result, lengths, out=result, where=lengths > 0.0)
+        return result
 
-    def _addfunc(self, rhs):
-        "internal add function"
+    def __str__(self):
+        m = self._rows()
+        return f"[{m[0]}\n{m[1]}\n{m[2]}\n{m[3]}]"
+
+    def _addfunc(self, rhs, out=None):
+        "internal add function, out is written to if given"
+        if out is not None:
+            if isinstance(out.m, np.ndarray):
+                np.add(self.m, rhs.m, out=out.m, dtype=np.float32)
+            else:
+                for row, a, b in zip(out.m, self._rows(), rhs._rows()):
+                    row[:] = [x + y for x, y in zip(a, b)]
+            out._type = Mat4Type.GENERAL
+            return out
+        if isinstance(self.m, np.ndarray) or isinstance(rhs.m, np.ndarray):
+            return Mat4.from_numpy(np.add(self.m, rhs.m, dtype=np.float32))
         temp = Mat4()
         for i in range(0, len(temp.m)):
             temp.m[i] = [a + b for a, b in zip(self.m[i], rhs.m[i])]
         return temp
 
+    @staticmethod
+    def mul_into(a, b, out):
+        "out = a @ b without allocating a new matrix, out can be a or b, returns out"
+        return a._mat_mul(b, out)
+
+    @staticmethod
+    def add_into(a, b, out):
+        "out = a + b without allocating a new matrix, out can be a or b, returns out"
+        return a._addfunc(b, out)
+
     def __add__(self, rhs):
         "piecewise addition of elements"
         return self._addfunc(rhs)
@@ -271,6 +508,8 @@ class Mat4:
 
     def _sub(self, rhs):
         "internal sub function"
+        if isinstance(self.m, np.ndarray) or isinstance(rhs.m, np.ndarray):
+            return Mat4.from_numpy(np.subtract(self.m, rhs.m, dtype=np.float32))
         temp = Mat4()
         for i in range(0, len(temp.m)):
             temp.m[i] = [a - b for a, b in zip(self.m[i], rhs.m[i])]
@@ -287,170 +526,232 @@ class Mat4:
     def determinant(self):
         "determinant of matrix"
         # Our matrices are 4.4 only, so we can just write the full formula instead of a complex algorithm.
+        m = self._rows()
         return (
-            self.m[0][0] * self.m[1][1] * self.m[2][2] * self.m[3][3]
-            - self.m[0][0] * self.m[1][1] * self.m[2][3] * self.m[3][2]
-            + self.m[0][0] * self.m[1][2] * self.m[2][3] * self.m[3][1]
-            - self.m[0][0] * self.m[1][2] * self.m[2][1] * self.m[3][3]
-            + self.m[0][0] * self.m[1][3] * self.m[2][1] * self.m[3][2]
-            - self.m[0][0] * self.m[1][3] * self.m[2][2] * self.m[3][1]
-            - self.m[1][0] * self.m[2][1] * self.m[3][2] * self.m[0][3]
-            + self.m[1][0] * self.m[2][1] * self.m[0][2] * self.m[3][3]
-            - self.m[1][0] * self.m[3][1] * self.m[0][2] * self.m[2][3]
-            + self.m[1][0] * self.m[3][1] * self.m[2][2] * self.m[0][3]
-            - self.m[1][0] * self.m[0][1] * self.m[2][2] * self.m[3][3]
-            + self.m[1][0] * self.m[0][1] * self.m[3][2] * self.m[2][3]
-            + self.m[2][0] * self.m[3][1] * self.m[0][2] * self.m[1][3]
-            - self.m[2][0] * self.m[3][1] * self.m[1][2] * self.m[0][3]
-            + self.m[2][0] * self.m[0][1] * self.m[1][2] * self.m[3][3]
-            - self.m[2][0] * self.m[0][1] * self.m[3][2] * self.m[1][3]
-            + self.m[2][0] * self.m[1][1] * self.m[3][2] * self.m[0][3]
-            - self.m[2][0] * self.m[1][1] * self.m[0][2] * self.m[3][3]
-            - self.m[3][0] * self.m[0][1] * self.m[1][2] * self.m[2][3]
-            + self.m[3][0] * self.m[0][1] * self.m[2][2] * self.m[1][3]
-            - self.m[3][0] * self.m[1][1] * self.m[2][2] * self.m[0][3]
-            + self.m[3][0] * self.m[1][1] * self.m[0][2] * self.m[2][3]
-            - self.m[3][0] * self.m[2][1] * self.m[0][2] * self.m[1][3]
-            + self.m[3][0] * self.m[2][1] * self.m[1][2] * self.m[0][3]
+            m[0][0] * m[1][1] * m[2][2] * m[3][3]
+            - m[0][0] * m[1][1] * m[2][3] * m[3][2]
+            + m[0][0] * m[1][2] * m[2][3] * m[3][1]
+            - m[0][0] * m[1][2] * m[2][1] * m[3][3]
+            + m[0][0] * m[1][3] * m[2][1] * m[3][2]
+            - m[0][0] * m[1][3] * m[2][2] * m[3][1]
+            - m[1][0] * m[2][1] * m[3][2] * m[0][3]
+            + m[1][0] * m[2][1] * m[0][2] * m[3][3]
+            - m[1][0] * m[3][1] * m[0][2] * m[2][3]
+            + m[1][0] * m[3][1] * m[2][2] * m[0][3]
+            - m[1][0] * m[0][1] * m[2][2] * m[3][3]
+            + m[1][0] * m[0][1] * m[3][2] * m[2][3]
+            + m[2][0] * m[3][1] * m[0][2] * m[1][3]
+            - m[2][0] * m[3][1] * m[1][2] * m[0][3]
+            + m[2][0] * m[0][1] * m[1][2] * m[3][3]
+            - m[2][0] * m[0][1] * m[3][2] * m[1][3]
+            + m[2][0] * m[1][1] * m[3][2] * m[0][3]
+            - m[2][0] * m[1][1] * m[0][2] * m[3][3]
+            - m[3][0] * m[0][1] * m[1][2] * m[2][3]
+            + m[3][0] * m[0][1] * m[2][2] * m[1][3]
+            - m[3][0] * m[1][1] * m[2][2] * m[0][3]
+            + m[3][0] * m[1][1] * m[0][2] * m[2][3]
+            - m[3][0] * m[2][1] * m[0][2] * m[1][3]
+            + m[3][0] * m[2][1] * m[1][2] * m[0][3]
         )
 
     def inverse(self):
-        "Inverse of matrix raise MatrixError if not calculable"
+        "Inverse of matrix raise MatrixError if not calculable, uses a closed form fast path if the type allows"
+        if self._type != Mat4Type.GENERAL:
+            if self._type_is_valid():
+                return self._inverse_affine()
+            self._type = Mat4Type.GENERAL  # m has been edited by hand
+        return self._inverse_general()
+
+    def inverse_affine(self):
+        "Inverse of a matrix with a last column of [0,0,0,1] raise Mat4Error if not affine or singular"
+        if self._type == Mat4Type.GENERAL or not self._type_is_valid():
+            m = self._rows()
+            if m[0][3] != 0.0 or m[1][3] != 0.0 or m[2][3] != 0.0 or m[3][3] != 1.0:
+                raise Mat4Error("matrix is not affine")
+            self._type = Mat4Type.AFFINE
+        return self._inverse_affine()
+
+    def _inverse_affine(self):
+        "internal closed form inverse, the type must be valid and not GENERAL"
+        m = self._rows()
+        # fmt: off
+        if self._type == Mat4Type.IDENTITY:
+            tmp = [[1.0, 0.0, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0], [0.0, 0.0, 0.0, 1.0]]
+        elif self._type == Mat4Type.TRANSLATION:
+            tmp = [[1.0, 0.0, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0],
+                   [-m[3][0], -m[3][1], -m[3][2], 1.0]]
+        else:
+            if self._type == Mat4Type.RIGID:
+                # orthonormal so the inverse of the upper 3x3 is the transpose
+                i00, i01, i02 = m[0][0], m[1][0], m[2][0]
+                i10, i11, i12 = m[0][1], m[1][1], m[2][1]
+                i20, i21, i22 = m[0][2], m[1][2], m[2][2]
+            else:
+                # inverse of the upper 3x3 is the adjugate / determinant
+                c00 = m[1][1] * m[2][2] - m[1][2] * m[2][1]
+                c01 = m[1][2] * m[2][0] - m[1][0] * m[2][2]
+                c02 = m[1][0] * m[2][1] - m[1][1] * m[2][0]
+                det = m[0][0] * c00 + m[0][1] * c01 + m[0][2] * c02
+                if det == 0.0:
+                    raise Mat4Error
+                invdet = 1.0 / det
+                i00 = c00 * invdet
+                i10 = c01 * invdet
+                i20 = c02 * invdet
+                i01 = (m[0][2] * m[2][1] - m[0][1] * m[2][2]) * invdet
+                i11 = (m[0][0] * m[2][2] - m[0][2] * m[2][0]) * invdet
+                i21 = (m[0][1] * m[2][0] - m[0][0] * m[2][1]) * invdet
+                i02 = (m[0][1] * m[1][2] - m[0][2] * m[1][1]) * invdet
+                i12 = (m[0][2] * m[1][0] - m[0][0] * m[1][2]) * invdet
+                i22 = (m[0][0] * m[1][1] - m[0][1] * m[1][0]) * invdet
+            tx, ty, tz = m[3][0], m[3][1], m[3][2]
+            tmp = [
+                [i00, i01, i02, 0.0],
+                [i10, i11, i12, 0.0],
+                [i20, i21, i22, 0.0],
+                [-(tx * i00 + ty * i10 + tz * i20), -(tx * i01 + ty * i11 + tz * i21), -(tx * i02 + ty * i12 + tz * i22), 1.0],
+            ]
+        # fmt: on
+        return self._from_rows(tmp, self._type)
+
+    def _inverse_general(self):
+        "internal full 4x4 inverse using the cofactors"
+        m = self._rows()
         try:
             det = self.determinant()
-            tmp = Mat4()
+            tmp = [[0.0] * 4 for _ in range(4)]
             invdet = 1.0 / det
-            tmp.m[0][0] = (
-                self.m[1][1] * self.m[2][2] * self.m[3][3]
-                + self.m[1][2] * self.m[2][3] * self.m[3][1]
-                + self.m[1][3] * self.m[2][1] * self.m[3][2]
-                - self.m[1][1] * self.m[3][2] * self.m[2][3]
-                - self.m[1][2] * self.m[2][1] * self.m[3][3]
-                - self.m[1][3] * self.m[2][2] * self.m[3][1]
+            tmp[0][0] = (
+                m[1][1] * m[2][2] * m[3][3]
+                + m[1][2] * m[2][3] * m[3][1]
+                + m[1][3] * m[2][1] * m[3][2]
+                - m[1][1] * m[3][2] * m[2][3]
+                - m[1][2] * m[2][1] * m[3][3]
+                - m[1][3] * m[2][2] * m[3][1]
             ) * invdet
-            tmp.m[0][1] = (
-                self.m[0][1] * self.m[2][3] * self.m[3][2]
-                + self.m[0][2] * self.m[2][1] * self.m[3][3]
-                + self.m[0][3] * self.m[2][2] * self.m[3][1]
-                - self.m[0][1] * self.m[2][2] * self.m[3][3]
-                - self.m[0][2] * self.m[2][3] * self.m[3][1]
-                - self.m[0][3] * self.m[2][1] * self.m[3][2]
+            tmp[0][1] = (
+                m[0][1] * m[2][3] * m[3][2]
+                + m[0][2] * m[2][1] * m[3][3]
+                + m[0][3] * m[2][2] * m[3][1]
+                - m[0][1] * m[2][2] * m[3][3]
+                - m[0][2] * m[2][3] * m[3][1]
+                - m[0][3] * m[2][1] * m[3][2]
             ) * invdet
-            tmp.m[0][2] = (
-                self.m[0][1] * self.m[1][2] * self.m[3][3]
-                + self.m[0][2] * self.m[1][3] * self.m[3][1]
-                + self.m[0][3] * self.m[1][1] * self.m[3][2]
-                - self.m[0][1] * self.m[1][3] * self.m[3][2]
-                - self.m[0][2] * self.m[1][1] * self.m[3][3]
-                - self.m[0][3] * self.m[1][2] * self.m[3][1]
+            tmp[0][2] = (
+                m[0][1] * m[1][2] * m[3][3]
+                + m[0][2] * m[1][3] * m[3][1]
+                + m[0][3] * m[1][1] * m[3][2]
+                - m[0][1] * m[1][3] * m[3][2]
+                - m[0][2] * m[1][1] * m[3][3]
+                - m[0][3] * m[1][2] * m[3][1]
             ) * invdet
-            tmp.m[0][3] = (
-                self.m[0][1] * self.m[1][3] * self.m[2][2]
-                + self.m[0][2] * self.m[1][1] * self.m[2][3]
-                + self.m[0][3] * self.m[1][2] * self.m[2][1]
-                - self.m[0][1] * self.m[1][2] * self.m[2][3]
-                - self.m[0][2] * self.m[1][3] * self.m[2][1]
-                - self.m[0][3] * self.m[1][1] * self.m[2][2]
+            tmp[0][3] = (
+                m[0][1] * m[1][3] * m[2][2]
+                + m[0][2] * m[1][1] * m[2][3]
+                + m[0][3] * m[1][2] * m[2][1]
+                - m[0][1] * m[1][2] * m[2][3]
+                - m[0][2] * m[1][3] * m[2][1]
+                - m[0][3] * m[1][1] * m[2][2]
             ) * invdet
-            tmp.m[1][0] = (
-                self.m[1][0] * self.m[2][3] * self.m[3][2]
-                + self.m[1][2] * self.m[2][0] * self.m[3][3]
-                + self.m[1][3] * self.m[2][2] * self.m[3][0]
-                - self.m[1][0] * self.m[2][2] * self.m[3][3]
-                - self.m[1][2] * self.m[2][3] * self.m[3][0]
-                - self.m[1][3] * self.m[2][0] * self.m[3][2]
+            tmp[1][0] = (
+                m[1][0] * m[2][3] * m[3][2]
+                + m[1][2] * m[2][0] * m[3][3]
+                + m[1][3] * m[2][2] * m[3][0]
+                - m[1][0] * m[2][2] * m[3][3]
+                - m[1][2] * m[2][3] * m[3][0]
+                - m[1][3] * m[2][0] * m[3][2]
             ) * invdet
-            tmp.m[1][1] = (
-                self.m[0][0] * self.m[2][2] * self.m[3][3]
-                + self.m[0][2] * self.m[2][3] * self.m[3][0]
-                + self.m[0][3] * self.m[2][0] * self.m[3][2]
-                - self.m[0][0] * self.m[2][3] * self.m[3][2]
-                - self.m[0][2] * self.m[2][0] * self.m[3][3]
-                - self.m[0][3] * self.m[2][2] * self.m[3][0]
+            tmp[1][1] = (
+                m[0][0] * m[2][2] * m[3][3]
+                + m[0][2] * m[2][3] * m[3][0]
+                + m[0][3] * m[2][0] * m[3][2]
+                - m[0][0] * m[2][3] * m[3][2]
+                - m[0][2] * m[2][0] * m[3][3]
+                - m[0][3] * m[2][2] * m[3][0]
             ) * invdet
-            tmp.m[1][2] = (
-                self.m[0][0] * self.m[1][3] * self.m[3][2]
-                + self.m[0][2] * self.m[1][0] * self.m[3][3]
-                + self.m[0][3] * self.m[1][2] * self.m[3][0]
-                - self.m[0][0] * self.m[1][2] * self.m[3][3]
-                - self.m[0][2] * self.m[1][3] * self.m[3][0]
-                - self.m[0][3] * self.m[1][0] * self.m[3][2]
+            tmp[1][2] = (
+                m[0][0] * m[1][3] * m[3][2]
+                + m[0][2] * m[1][0] * m[3][3]
+                + m[0][3] * m[1][2] * m[3][0]
+                - m[0][0] * m[1][2] * m[3][3]
+                - m[0][2] * m[1][3] * m[3][0]
+                - m[0][3] * m[1][0] * m[3][2]
             ) * invdet
-            tmp.m[1][3] = (
-                self.m[0][0] * self.m[1][2] * self.m[2][3]
-                + self.m[0][2] * self.m[1][3] * self.m[2][0]
-                + self.m[0][3] * self.m[1][0] * self.m[2][2]
-                - self.m[0][0] * self.m[1][3] * self.m[2][2]
-                - self.m[0][2] * self.m[1][0] * self.m[2][3]
-                - self.m[0][3] * self.m[1][2] * self.m[2][0]
+            tmp[1][3] = (
+                m[0][0] * m[1][2] * m[2][3]
+                + m[0][2] * m[1][3] * m[2][0]
+                + m[0][3] * m[1][0] * m[2][2]
+                - m[0][0] * m[1][3] * m[2][2]
+                - m[0][2] * m[1][0] * m[2][3]
+                - m[0][3] * m[1][2] * m[2][0]
             ) * invdet
-            tmp.m[2][0] = (
-                self.m[1][0] * self.m[2][1] * self.m[3][3]
-                + self.m[1][1] * self.m[2][3] * self.m[3][0]
-                + self.m[1][3] * self.m[2][0] * self.m[3][1]
-                - self.m[1][0] * self.m[2][3] * self.m[3][1]
-                - self.m[1][1] * self.m[2][0] * self.m[3][3]
-                - self.m[1][3] * self.m[2][1] * self.m[3][0]
+            tmp[2][0] = (
+                m[1][0] * m[2][1] * m[3][3]
+                + m[1][1] * m[2][3] * m[3][0]
+                + m[1][3] * m[2][0] * m[3][1]
+                - m[1][0] * m[2][3] * m[3][1]
+                - m[1][1] * m[2][0] * m[3][3]
+                - m[1][3] * m[2][1] * m[3][0]
             ) * invdet
-            tmp.m[2][1] = (
-                self.m[0][0] * self.m[2][3] * self.m[3][1]
-                + self.m[0][1] * self.m[2][0] * self.m[3][3]
-                + self.m[0][3] * self.m[2][1] * self.m[3][0]
-                - self.m[0][0] * self.m[2][1] * self.m[3][3]
-                - self.m[0][1] * self.m[2][3] * self.m[3][0]
-                - self.m[0][3] * self.m[2][0] * self.m[3][1]
+            tmp[2][1] = (
+                m[0][0] * m[2][3] * m[3][1]
+                + m[0][1] * m[2][0] * m[3][3]
+                + m[0][3] * m[2][1] * m[3][0]
+                - m[0][0] * m[2][1] * m[3][3]
+                - m[0][1] * m[2][3] * m[3][0]
+                - m[0][3] * m[2][0] * m[3][1]
             ) * invdet
-            tmp.m[2][2] = (
-                self.m[0][0] * self.m[1][1] * self.m[3][3]
-                + self.m[0][1] * self.m[1][3] * self.m[3][0]
-                + self.m[0][3] * self.m[1][0] * self.m[3][1]
-                - self.m[0][0] * self.m[1][3] * self.m[3][1]
-                - self.m[0][1] * self.m[1][0] * self.m[3][3]
-                - self.m[0][3] * self.m[1][1] * self.m[3][0]
+            tmp[2][2] = (
+                m[0][0] * m[1][1] * m[3][3]
+                + m[0][1] * m[1][3] * m[3][0]
+                + m[0][3] * m[1][0] * m[3][1]
+                - m[0][0] * m[1][3] * m[3][1]
+                - m[0][1] * m[1][0] * m[3][3]
+                - m[0][3] * m[1][1] * m[3][0]
             ) * invdet
-            tmp.m[2][3] = (
-                self.m[0][0] * self.m[1][3] * self.m[2][1]
-                + self.m[0][1] * self.m[1][0] * self.m[2][3]
-                + self.m[0][3] * self.m[1][1] * self.m[2][0]
-                - self.m[0][0] * self.m[1][1] * self.m[2][3]
-                - self.m[0][1] * self.m[1][3] * self.m[2][0]
-                - self.m[0][3] * self.m[1][0] * self.m[2][1]
+            tmp[2][3] = (
+                m[0][0] * m[1][3] * m[2][1]
+                + m[0][1] * m[1][0] * m[2][3]
+                + m[0][3] * m[1][1] * m[2][0]
+                - m[0][0] * m[1][1] * m[2][3]
+                - m[0][1] * m[1][3] * m[2][0]
+                - m[0][3] * m[1][0] * m[2][1]
             ) * invdet
-            tmp.m[3][0] = (
-                self.m[1][0] * self.m[2][2] * self.m[3][1]
-                + self.m[1][1] * self.m[2][0] * self.m[3][2]
-                + self.m[1][2] * self.m[2][1] * self.m[3][0]
-                - self.m[1][0] * self.m[2][1] * self.m[3][2]
-                - self.m[1][1] * self.m[2][2] * self.m[3][0]
-                - self.m[1][2] * self.m[2][0] * self.m[3][1]
+            tmp[3][0] = (
+                m[1][0] * m[2][2] * m[3][1]
+                + m[1][1] * m[2][0] * m[3][2]
+                + m[1][2] * m[2][1] * m[3][0]
+                - m[1][0] * m[2][1] * m[3][2]
+                - m[1][1] * m[2][2] * m[3][0]
+                - m[1][2] * m[2][0] * m[3][1]
             ) * invdet
-            tmp.m[3][1] = (
-                self.m[0][0] * self.m[2][1] * self.m[3][2]
-                + self.m[0][1] * self.m[2][2] * self.m[3][0]
-                + self.m[0][2] * self.m[2][0] * self.m[3][1]
-                - self.m[0][0] * self.m[2][2] * self.m[3][1]
-                - self.m[0][1] * self.m[2][0] * self.m[3][2]
-                - self.m[0][2] * self.m[2][1] * self.m[3][0]
+            tmp[3][1] = (
+                m[0][0] * m[2][1] * m[3][2]
+                + m[0][1] * m[2][2] * m[3][0]
+                + m[0][2] * m[2][0] * m[3][1]
+                - m[0][0] * m[2][2] * m[3][1]
+                - m[0][1] * m[2][0] * m[3][2]
+                - m[0][2] * m[2][1] * m[3][0]
             ) * invdet
-            tmp.m[3][2] = (
-                self.m[0][0] * self.m[1][2] * self.m[3][1]
-                + self.m[0][1] * self.m[1][0] * self.m[3][2]
-                + self.m[0][2] * self.m[1][1] * self.m[3][0]
-                - self.m[0][0] * self.m[1][1] * self.m[3][2]
-                - self.m[0][1] * self.m[1][2] * self.m[3][0]
-                - self.m[0][2] * self.m[1][0] * self.m[3][1]
+            tmp[3][2] = (
+                m[0][0] * m[1][2] * m[3][1]
+                + m[0][1] * m[1][0] * m[3][2]
+                + m[0][2] * m[1][1] * m[3][0]
+                - m[0][0] * m[1][1] * m[3][2]
+                - m[0][1] * m[1][2] * m[3][0]
+                - m[0][2] * m[1][0] * m[3][1]
             ) * invdet
-            tmp.m[3][3] = (
-                self.m[0][0] * self.m[1][1] * self.m[2][2]
-                + self.m[0][1] * self.m[1][2] * self.m[2][0]
-                + self.m[0][2] * self.m[1][0] * self.m[2][1]
-                - self.m[0][0] * self.m[1][2] * self.m[2][1]
-                - self.m[0][1] * self.m[1][0] * self.m[2][2]
-                - self.m[0][2] * self.m[1][1] * self.m[2][0]
+            tmp[3][3] = (
+                m[0][0] * m[1][1] * m[2][2]
+                + m[0][1] * m[1][2] * m[2][0]
+                + m[0][2] * m[1][0] * m[2][1]
+                - m[0][0] * m[1][2] * m[2][1]
+                - m[0][1] * m[1][0] * m[2][2]
+                - m[0][2] * m[1][1] * m[2][0]
             ) * invdet
-            return tmp
+            return self._from_rows(tmp, Mat4Type.GENERAL)
         except ZeroDivisionError:
             raise Mat4Error
 
     def __repr__(self) -> str:
-        return f"Mat4({self.m})"
+        return f"Mat4({self._rows()})"
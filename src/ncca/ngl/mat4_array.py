@@ -0,0 +1,432 @@
+"""
+A container for batches of ngl.Mat4 matrices held in a single (N,4,4) float32 numpy array.
+
+All operations are vectorized so a whole stack of matrices is processed in a few numpy calls,
+the layout of each matrix is the same as Mat4 so the data can be uploaded to OpenGL directly.
+"""
+
+import numpy as np
+
+from .mat4 import Mat4, Mat4Error
+
+# rotation order to the sequence of axis rotations applied, matches Transform.rot_order
+_rot_order = {
+    "xyz": "zyx",
+    "yzx": "xzy",
+    "zxy": "yxz",
+    "xzy": "yzx",
+    "yxz": "zxy",
+    "zyx": "xyz",
+}
+
+
+class Mat4Array:
+    """
+    A class to hold a stack of Mat4 matrices and perform batched operations on them.
+    """
+
+    def __init__(self, values=None):
+        """
+        Initializes the Mat4Array.
+
+        Args:
+            values (iterable | int | numpy.ndarray, optional): An iterable of Mat4 objects, an integer
+                or a numpy array of shape (N,4,4) or (N,16). If an integer, the array is initialized
+                with that many identity matrices. Defaults to None (an empty array).
+        """
+        if values is None:
+            self._data = np.zeros((0, 4, 4), dtype=np.float32)
+        elif isinstance(values, int):
+            self._data = np.tile(np.identity(4, dtype=np.float32), (values, 1, 1))
+        elif isinstance(values, np.ndarray):
+            if values.size % 16 != 0:
+                raise ValueError("array size must be a multiple of 16")
+            self._data = np.ascontiguousarray(values, dtype=np.float32).reshape(
+                -1, 4, 4
+            )
+        else:
+            values = list(values)
+            for v in values:
+                if not isinstance(v, Mat4):
+                    raise TypeError("All elements must be of type Mat4")
+            self._data = np.array([v.m for v in values], dtype=np.float32).reshape(
+                -1, 4, 4
+            )
+
+    @classmethod
+    def _from_array(cls, array):
+        "internal method to wrap an existing (N,4,4) float32 array without copying"
+        v = cls.__new__(cls)
+        v._data = array
+        return v
+
+    @classmethod
+    def identity(cls, count: int) -> "Mat4Array":
+        """
+        Create an array of identity matrices.
+
+        Args:
+            count (int): The number of matrices.
+
+        Returns:
+            Mat4Array: count identity matrices.
+        """
+        return cls(count)
+
+    @classmethod
+    def translate(cls, translations) -> "Mat4Array":
+        """
+        Create an array of translation matrices.
+
+        Args:
+            translations (array_like): (N,3) x,y,z translation values.
+
+        Returns:
+            Mat4Array: N translation matrices.
+        """
+        t = np.asarray(translations, dtype=np.float32).reshape(-1, 3)
+        result = cls(len(t))
+        result._data[:, 3, :3] = t
+        return result
+
+    @classmethod
+    def scale(cls, scales) -> "Mat4Array":
+        """
+        Create an array of scale matrices.
+
+        Args:
+            scales (array_like): (N,3) x,y,z scale values.
+
+        Returns:
+            Mat4Array: N scale matrices.
+        """
+        s = np.asarray(scales, dtype=np.float32).reshape(-1, 3)
+        result = cls(len(s))
+        result._data[:, 0, 0] = s[:, 0]
+        result._data[:, 1, 1] = s[:, 1]
+        result._data[:, 2, 2] = s[:, 2]
+        return result
+
+    @classmethod
+    def _rotate(cls, angles, axis: str) -> "Mat4Array":
+        "internal function to build rotations around a Cartesian axis, same layout as Mat4.rotate_*"
+        beta = np.radians(np.asarray(angles, dtype=np.float64).reshape(-1))
+        sr = np.sin(beta).astype(np.float32)
+        cr = np.cos(beta).astype(np.float32)
+        result = cls(len(beta))
+        m = result._data
+        if axis == "x":
+            m[:, 1, 1] = cr
+            m[:, 1, 2] = sr
+            m[:, 2, 1] = -sr
+            m[:, 2, 2] = cr
+        elif axis == "y":
+            m[:, 0, 0] = cr
+            m[:, 0, 2] = -sr
+            m[:, 2, 0] = sr
+            m[:, 2, 2] = cr
+        else:
+            m[:, 0, 0] = cr
+            m[:, 0, 1] = sr
+            m[:, 1, 0] = -sr
+            m[:, 1, 1] = cr
+        return result
+
+    @classmethod
+    def rotate_x(cls, angles) -> "Mat4Array":
+        """
+        Create an array of rotations around the X axis.
+
+        Args:
+            angles (array_like): N angles in degrees.
+
+        Returns:
+            Mat4Array: N rotation matrices.
+        """
+        return cls._rotate(angles, "x")
+
+    @classmethod
+    def rotate_y(cls, angles) -> "Mat4Array":
+        """
+        Create an array of rotations around the Y axis.
+
+        Args:
+            angles (array_like): N angles in degrees.
+
+        Returns:
+            Mat4Array: N rotation matrices.
+        """
+        return cls._rotate(angles, "y")
+
+    @classmethod
+    def rotate_z(cls, angles) -> "Mat4Array":
+        """
+        Create an array of rotations around the Z axis.
+
+        Args:
+            angles (array_like): N angles in degrees.
+
+        Returns:
+            Mat4Array: N rotation matrices.
+        """
+        return cls._rotate(angles, "z")
+
+    @classmethod
+    def from_trs(
+        cls, translations=None, rotations=None, scales=None, order: str = "xyz"
+    ) -> "Mat4Array":
+        """
+        Create an array of model matrices from translate, rotate and scale arrays,
+        the result matches Transform.get_matrix for each element.
+
+        Args:
+            translations (array_like, optional): (N,3) positions.
+            rotations (array_like, optional): (N,3) x,y,z rotations in degrees.
+            scales (array_like, optional): (N,3) scale values.
+            order (str): rotation order as used by Transform e.g. "xyz" or "zyx".
+
+        Returns:
+            Mat4Array: N transform matrices.
+
+        Raises:
+            ValueError: If no arrays are given, the arrays are different lengths or the order is unknown.
+        """
+        if order not in _rot_order:
+            raise ValueError(f"unknown rotation order {order}")
+        given = [
+            np.asarray(a, dtype=np.float32).reshape(-1, 3)
+            for a in (translations, rotations, scales)
+            if a is not None
+        ]
+        if not given:
+            raise ValueError("need at least one of translations, rotations or scales")
+        count = len(given[0])
+        if any(len(a) != count for a in given):
+            raise ValueError(
+                "translations, rotations and scales must be the same length"
+            )
+
+        if scales is not None:
+            m = cls.scale(scales)._data
+        else:
+            m = cls(count)._data
+        if rotations is not None:
+            r = np.asarray(rotations, dtype=np.float32).reshape(-1, 3)
+            # Transform uses rz@ry@rx@scale for xyz, in numpy terms scale @ rx @ ry @ rz
+            for axis in reversed(_rot_order[order]):
+                m = np.matmul(m, cls._rotate(r[:, "xyz".index(axis)], axis)._data)
+        if translations is not None:
+            m[:, 3, :3] = np.asarray(translations, dtype=np.float32).reshape(-1, 3)
+        return cls._from_array(m)
+
+    def __getitem__(self, index):
+        """
+        Get the Mat4 at the specified index.
+
+        Args:
+            index (int | slice): The index of the element.
+
+        Returns:
+            Mat4 | Mat4Array: A float32 backed Mat4 which is a view into the array so changes
+                write through, or a Mat4Array for a slice.
+        """
+        if isinstance(index, (int, np.integer)):
+            return Mat4.from_numpy(self._data[index])
+        return Mat4Array._from_array(self._data[index])
+
+    def __setitem__(self, index, value):
+        """
+        Set the Mat4 at the specified index.
+
+        Args:
+            index (int): The index of the element to set.
+            value (Mat4): The new Mat4 object.
+        """
+        if not isinstance(value, Mat4):
+            raise TypeError("Only Mat4 objects can be assigned")
+        self._data[index] = value.m
+
+    def __len__(self):
+        """
+        Return the number of elements in the array.
+        """
+        return len(self._data)
+
+    def __iter__(self):
+        """
+        Return an iterator for the array, each element is a Mat4 view.
+        """
+        for i in range(len(self._data)):
+            yield Mat4.from_numpy(self._data[i])
+
+    def append(self, value):
+        """
+        Append a Mat4 object to the array.
+
+        Args:
+            value (Mat4): The Mat4 object to append.
+        """
+        if not isinstance(value, Mat4):
+            raise TypeError("Only Mat4 objects can be appended")
+        self._data = np.concatenate(
+            (self._data, np.asarray(value.m, dtype=np.float32).reshape(1, 4, 4))
+        )
+
+    def extend(self, values):
+        """
+        Extend the array by appending elements from the iterable.
+
+        Args:
+            values (iterable | Mat4Array): Mat4 objects to append.
+
+        Raises:
+            TypeError: If any element in values is not a Mat4.
+        """
+        if not isinstance(values, Mat4Array):
+            values = Mat4Array(values)
+        self._data = np.concatenate((self._data, values._data))
+
+    def _mat_mul(self, lhs, rhs):
+        "internal batched multiply, Mat4 a @ b is b.m @ a.m in numpy terms"
+        return Mat4Array._from_array(np.matmul(rhs, lhs, dtype=np.float32))
+
+    def __matmul__(self, rhs):
+        """
+        Batched matrix multiplication.
+
+        Args:
+            rhs (Mat4Array | Mat4): Either an array of the same length (element wise multiply)
+                or a single Mat4 applied to every element.
+
+        Returns:
+            Mat4Array: The result of self[i] @ rhs[i] (or self[i] @ rhs) for every element.
+
+        Raises:
+            Mat4Error: If rhs is the wrong type or length.
+        """
+        if isinstance(rhs, Mat4Array):
+            if len(rhs) != len(self):
+                raise Mat4Error("Mat4Array sizes must match for multiplication")
+            return self._mat_mul(self._data, rhs._data)
+        elif isinstance(rhs, Mat4):
+            return self._mat_mul(self._data, rhs.m)
+        return NotImplemented
+
+    def __rmatmul__(self, lhs):
+        """
+        Batched matrix multiplication with a single Mat4 on the left.
+
+        Args:
+            lhs (Mat4): The matrix applied to every element.
+
+        Returns:
+            Mat4Array: The result of lhs @ self[i] for every element.
+        """
+        if isinstance(lhs, Mat4):
+            return self._mat_mul(lhs.m, self._data)
+        return NotImplemented
+
+    def transpose(self) -> "Mat4Array":
+        """
+        Return a new array with every matrix transposed.
+
+        Returns:
+            Mat4Array: The transposed matrices.
+        """
+        return Mat4Array._from_array(
+            np.ascontiguousarray(self._data.transpose(0, 2, 1))
+        )
+
+    def determinant(self) -> np.ndarray:
+        """
+        Calculate the determinant of every matrix.
+
+        Returns:
+            numpy.ndarray: (N,) determinants.
+        """
+        return np.linalg.det(self._data.astype(np.float64))
+
+    def inverse(self) -> "Mat4Array":
+        """
+        Return a new array with every matrix inverted, the inverse is calculated in double precision.
+
+        Returns:
+            Mat4Array: The inverse matrices.
+
+        Raises:
+            Mat4Error: If any of the matrices is singular.
+        """
+        try:
+            inverse = np.linalg.inv(self._data.astype(np.float64))
+        except np.linalg.LinAlgError:
+            raise Mat4Error("Mat4Array contains a singular matrix")
+        return Mat4Array._from_array(inverse.astype(np.float32))
+
+    def inverse_affine(self, rigid: bool = False) -> "Mat4Array":
+        """
+        Return a new array with every matrix inverted assuming they are all affine (last column
+        [0,0,0,1]), this only needs the inverse of the upper 3x3 so is much cheaper than inverse.
+
+        Args:
+            rigid (bool): If True the upper 3x3 of every matrix is orthonormal (rotation only) and
+                is inverted with a transpose.
+
+        Returns:
+            Mat4Array: The inverse matrices.
+
+        Raises:
+            Mat4Error: If any matrix is not affine or is singular.
+        """
+        data = self._data
+        last = data[:, :, 3]
+        if not np.array_equal(
+            last, np.broadcast_to(np.array([0, 0, 0, 1], np.float32), last.shape)
+        ):
+            raise Mat4Error("Mat4Array contains a matrix which is not affine")
+        if rigid:
+            linear = data[:, :3, :3].transpose(0, 2, 1)
+        else:
+            try:
+                linear = np.linalg.inv(data[:, :3, :3].astype(np.float64))
+            except np.linalg.LinAlgError:
+                raise Mat4Error("Mat4Array contains a singular matrix")
+        result = np.zeros_like(data)
+        result[:, :3, :3] = linear
+        # row vector layout so the new translation is -t @ inverse(A)
+        result[:, 3, :3] = -np.matmul(data[:, 3:4, :3], linear)[:, 0, :]
+        result[:, 3, 3] = 1.0
+        return Mat4Array._from_array(result)
+
+    def to_list(self):
+        """
+        Convert the array to a single flat list of floats in the same order as Mat4.get_matrix.
+
+        Returns:
+            list: The matrix values concatenated.
+        """
+        return self._data.ravel().tolist()
+
+    def to_numpy(self):
+        """
+        Get the matrices as a numpy array, this is the backing store (no copy) so it can be
+        passed straight to OpenGL e.g. ShaderProgram.set_uniform_matrix4fv.
+
+        Returns:
+            numpy.ndarray: The (N,4,4) float32 array.
+        """
+        return self._data
+
+    def __repr__(self):
+        return f"Mat4Array({self._data.tolist()!r})"
+
+    def __str__(self):
+        return str(self._data.tolist())
+
+    def sizeof(self):
+        """
+        Return the size of the array in bytes.
+
+        Returns:
+            int: The size of the array in bytes.
+        """
+        return self._data.nbytes
@@ -0,0 +1,190 @@
+"""
+A binary cache of the triangle data of parsed meshes so large OBJ files only need to be parsed
+once. Each mesh is saved as .npy files in a __nglcache__ directory next to it (or in a given
+cache directory) which are loaded with numpy memory mapping so they can be passed straight to a
+VAO. Entries are keyed on the path, modification time and size of the mesh and the loader
+version so a mesh is parsed again if the file or the loader changes. Welded data (the unique
+vertices and their element indices) is kept in its own entry so it is only welded once.
+"""
+
+import glob
+import hashlib
+import io
+import os
+from pathlib import Path
+
+import numpy as np
+
+from .base_mesh import weld_vertices
+from .log import logger
+from .mesh_normals import fill_triangle_normals
+from .obj_parser import write_triangles
+
+# increase this when the parser or the layout of the cached data changes
+LOADER_VERSION = 3
+CACHE_DIR_NAME = "__nglcache__"
+# bounds is written last so an entry is only complete once it exists
+_arrays = ("vertices", "indices", "ranges", "materials", "bounds")
+
+
+def _hash(text):
+    return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+
+def cache_paths(path, cache_dir=None, weld=False) -> dict:
+    """
+    Get the cache files for a mesh.
+
+    Args:
+        path (str | os.PathLike): Path to the mesh file, it must exist.
+        cache_dir (str | os.PathLike, optional): Directory for the cache, defaults to __nglcache__
+            next to the mesh.
+        weld (bool, optional): If True the files of the welded data of the mesh.
+
+    Returns:
+        dict: "vertices", "indices", "ranges", "materials" and "bounds" to the path of their .npy file.
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    directory = (
+        Path(cache_dir) if cache_dir is not None else path.parent / CACHE_DIR_NAME
+    )
+    key = _hash(f"{stat.st_mtime_ns}:{stat.st_size}:{LOADER_VERSION}")
+    name = f"{path}:weld" if weld else str(path)
+    prefix = f"{path.name}.{_hash(name)}.{key}"
+    return {name: directory / f"{prefix}.{name}.npy" for name in _arrays}
+
+
+def load_mesh_cache(path, cache_dir=None, weld=False):
+    """
+    Load the cached triangle data for a mesh, the arrays are read only memory maps of the cache.
+
+    Args:
+        path (str | os.PathLike): Path to the mesh file.
+        cache_dir (str | os.PathLike, optional): Directory for the cache, see cache_paths.
+        weld (bool, optional): If True load the welded data.
+
+    Returns:
+        dict | None: "vertices" (N,8) float32 x,y,z,nx,ny,nz,u,v triangle data (the unique
+            vertices if welded), "indices" uint32 element indices (empty if the vertices are drawn
+            in order), "ranges" (M,3) int64
+            material index, first vertex and vertex count of each material, "materials" the
+            material names, "bounds" (2,3) float32 min and max vertex position and "draw_ranges"
+            the ranges in the format of BaseMesh.draw_ranges, or None if there is no valid cache
+            for the file.
+    """
+    paths = cache_paths(path, cache_dir, weld)
+    if not paths["bounds"].exists():
+        return None
+    try:
+        cached = {name: np.load(paths[name], mmap_mode="r") for name in _arrays}
+    except (OSError, ValueError) as error:
+        logger.warning(f"ignoring unreadable mesh cache for {path} : {error}")
+        return None
+    materials = cached["materials"].tolist()
+    cached["draw_ranges"] = [
+        (materials[material] if material >= 0 else None, first, count)
+        for material, first, count in cached["ranges"].tolist()
+    ]
+    return cached
+
+
+def _npy_header(shape, dtype):
+    "internal function to get the .npy header for an array"
+    header = io.BytesIO()
+    np.lib.format.write_array_header_1_0(
+        header,
+        {
+            "descr": np.lib.format.dtype_to_descr(np.dtype(dtype)),
+            "fortran_order": False,
+            "shape": shape,
+        },
+    )
+    return header.getvalue()
+
+
+def _remove_stale(paths):
+    "internal function to remove older cache entries for the same mesh"
+    current = paths["bounds"]
+    # name.pathhash.key.array.npy
+    prefix = glob.escape(current.name.rsplit(".", 3)[0])
+    for old in current.parent.glob(f"{prefix}.*.npy"):
+        if old not in paths.values():
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+
+def build_mesh_cache(path, cache_dir=None, memory_limit=None, weld=False):
+    """
+    Parse an OBJ file and save its triangle data to the cache, the file is streamed (see
+    ObjArrays.iter_blocks) so the whole file is never held in memory. If the file has no normals
+    smooth normals are generated from the cached triangles (see mesh_normals.fill_triangle_normals).
+
+    Args:
+        path (str | os.PathLike): Path to the OBJ file.
+        cache_dir (str | os.PathLike, optional): Directory for the cache, see cache_paths.
+        memory_limit (int, optional): Approximate ceiling in bytes on the memory used to parse each block.
+        weld (bool, optional): If True weld the triangle data (see base_mesh.weld_vertices) and
+            save the unique vertices and indices, welding needs all the data in memory.
+
+    Returns:
+        dict | None: The cached data as returned by load_mesh_cache, None if the cache couldn't
+            be written in which case a warning is logged.
+    """
+    paths = cache_paths(path, cache_dir, weld)
+    temp = {
+        name: p.with_name(f"{p.name}.{os.getpid()}.tmp") for name, p in paths.items()
+    }
+    try:
+        paths["bounds"].parent.mkdir(parents=True, exist_ok=True)
+        with open(temp["vertices"], "wb") as sink:
+            # the .npy header is padded so it doesn't change size with the number of rows
+            header = _npy_header((0, 8), np.float32)
+            sink.write(header)
+            count, bounds, draw_ranges = write_triangles(
+                path, sink, memory_limit=memory_limit
+            )
+            final_header = _npy_header((count, 8), np.float32)
+            if len(final_header) != len(header):
+                raise ValueError("unexpected .npy header size")
+            sink.seek(0)
+            sink.write(final_header)
+        if count:
+            # files without normals get smooth normals like BaseMesh._pack_triangles
+            triangles = np.load(temp["vertices"], mmap_mode="r+")
+            if fill_triangle_normals(triangles):
+                triangles.flush()
+            del triangles
+        indices = np.zeros(0, dtype=np.uint32)
+        if weld:
+            triangles = np.load(temp["vertices"], mmap_mode="r")
+            vertices, indices = weld_vertices(triangles)
+            del triangles
+            with open(temp["vertices"], "wb") as sink:
+                np.save(sink, vertices)
+        materials = [name for name, _, _ in draw_ranges if name is not None]
+        ranges = [
+            (materials.index(name) if name is not None else -1, first, count)
+            for name, first, count in draw_ranges
+        ]
+        for name, array in (
+            ("indices", indices),
+            ("ranges", np.array(ranges, dtype=np.int64).reshape(-1, 3)),
+            ("materials", np.array(materials, dtype=str)),
+            ("bounds", bounds),
+        ):
+            with open(temp[name], "wb") as sink:
+                np.save(sink, array)
+        for name in _arrays:
+            os.replace(temp[name], paths[name])
+    except OSError as error:
+        logger.warning(f"unable to write mesh cache for {path} : {error}")
+        return None
+    finally:
+        for p in temp.values():
+            if p.exists():
+                p.unlink()
+    _remove_stale(paths)
+    return load_mesh_cache(path, cache_dir, weld)
@@ -0,0 +1,204 @@
+"""
+Normal generation for meshes without normals. Face normals come from numpy cross products of all
+of the faces at once (the Newell normal so quads and polygons work too) and are scatter added to
+the vertices with np.bincount, weighted by face area or by the angle of each face corner. With a
+crease angle each face corner only averages the faces at its vertex within that angle of its own
+face so hard edges stay sharp, which splits the vertices along the creases.
+
+Faces are given as flat arrays of the vertex index of each corner and the number of corners of
+each face, as in ObjArrays. Normals follow the right hand rule so counter clockwise faces point
+towards the viewer. Interleaved triangle data (such as the streamed OBJ data of mesh_cache) is
+welded by position first so its normals match those of the indexed faces.
+"""
+
+import numpy as np
+
+_weightings = ("area", "angle")
+# the most corner pairs compared at once by corner_normals with a crease angle
+_pair_chunk_size = 1 << 20
+
+
+def _corner_neighbours(face_sizes):
+    "internal function to get the index of the next and previous corner of each face corner"
+    sizes = np.asarray(face_sizes, dtype=np.int64)
+    offsets = np.repeat(np.cumsum(sizes) - sizes, sizes)
+    local = np.arange(int(sizes.sum())) - offsets
+    size = np.repeat(sizes, sizes)
+    return offsets + (local + 1) % size, offsets + (local - 1) % size
+
+
+def _normalize(vectors):
+    "internal function to normalize rows, zero length rows are left as zero"
+    lengths = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, lengths, out=np.zeros_like(vectors), where=lengths > 0.0)
+
+
+def face_normals(positions, face_vertex, face_sizes) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate the normal and area of each face.
+
+    Args:
+        positions (array_like): (N,3) vertex positions.
+        face_vertex (array_like): The vertex index of each face corner.
+        face_sizes (array_like): The number of corners of each face.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (F,3) float64 unit normals (zero for degenerate faces)
+            and the (F,) area of each face.
+    """
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    face_vertex = np.asarray(face_vertex, dtype=np.int64)
+    sizes = np.asarray(face_sizes, dtype=np.int64)
+    following, _ = _corner_neighbours(sizes)
+    points = positions[face_vertex]
+    crosses = np.cross(points, points[following])
+    face = np.repeat(np.arange(len(sizes)), sizes)
+    normals = np.stack(
+        [np.bincount(face, crosses[:, i], minlength=len(sizes)) for i in range(3)],
+        axis=1,
+    )
+    areas = np.linalg.norm(normals, axis=1) / 2.0
+    return _normalize(normals), areas
+
+
+def _corner_weights(positions, face_vertex, face_sizes, areas, weighting):
+    "internal function to get the weight of each face corner's contribution to its vertex normal"
+    if weighting not in _weightings:
+        raise ValueError(f"weighting must be one of {_weightings} not {weighting!r}")
+    sizes = np.asarray(face_sizes, dtype=np.int64)
+    if weighting == "area":
+        return np.repeat(areas, sizes)
+    following, previous = _corner_neighbours(sizes)
+    points = positions[face_vertex]
+    a = _normalize(points[following] - points)
+    b = _normalize(points[previous] - points)
+    return np.arccos(np.clip(np.einsum("ij,ij->i", a, b), -1.0, 1.0))
+
+
+def vertex_normals(positions, face_vertex, face_sizes, weighting="angle") -> np.ndarray:
+    """
+    Calculate smooth vertex normals by averaging the normals of the faces around each vertex.
+
+    Args:
+        positions (array_like): (N,3) vertex positions.
+        face_vertex (array_like): The vertex index of each face corner.
+        face_sizes (array_like): The number of corners of each face.
+        weighting (str, optional): "angle" to weight each face by its angle at the vertex, which
+            doesn't depend on how the faces are split, or "area" to weight by face area.
+
+    Returns:
+        np.ndarray: (N,3) float64 unit normals, zero for vertices not used by any face.
+
+    Raises:
+        ValueError: If weighting isn't "angle" or "area".
+    """
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    face_vertex = np.asarray(face_vertex, dtype=np.int64)
+    normals, areas = face_normals(positions, face_vertex, face_sizes)
+    weights = _corner_weights(positions, face_vertex, face_sizes, areas, weighting)
+    contributions = np.repeat(normals, face_sizes, axis=0) * weights[:, None]
+    summed = np.stack(
+        [
+            np.bincount(face_vertex, contributions[:, i], minlength=len(positions))
+            for i in range(3)
+        ],
+        axis=1,
+    )
+    return _normalize(summed)
+
+
+def corner_normals(
+    positions, face_vertex, face_sizes, weighting="angle", crease_angle=None
+) -> np.ndarray:
+    """
+    Calculate the normal of each face corner, with a crease angle faces meeting at a sharper
+    angle don't share normals.
+
+    Args:
+        positions (array_like): (N,3) vertex positions.
+        face_vertex (array_like): The vertex index of each face corner.
+        face_sizes (array_like): The number of corners of each face.
+        weighting (str, optional): "angle" or "area", see vertex_normals.
+        crease_angle (float, optional): Angle in degrees, faces at a vertex are only averaged
+            with each other if their normals are within this angle. Defaults to smoothing all of
+            the faces at each vertex.
+
+    Returns:
+        np.ndarray: (C,3) float64 unit normals of each corner.
+
+    Raises:
+        ValueError: If weighting isn't "angle" or "area".
+    """
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    face_vertex = np.asarray(face_vertex, dtype=np.int64)
+    if crease_angle is None:
+        normals = vertex_normals(positions, face_vertex, face_sizes, weighting)
+        return normals[face_vertex]
+    if len(face_vertex) == 0:
+        return np.zeros((0, 3))
+    normals, areas = face_normals(positions, face_vertex, face_sizes)
+    weights = _corner_weights(positions, face_vertex, face_sizes, areas, weighting)
+    corner_face_normals = np.repeat(normals, face_sizes, axis=0)
+    min_cosine = np.cos(np.radians(crease_angle))
+    # every pair of corners at the same vertex, sorted so each vertex's corners are together
+    order = np.argsort(face_vertex, kind="stable")
+    counts = np.bincount(face_vertex, minlength=len(positions))
+    starts = np.cumsum(counts) - counts
+    sorted_vertex = face_vertex[order]
+    pair_counts = counts[sorted_vertex]
+    # a high valence vertex has valence squared pairs so they are made a chunk of corners at a
+    # time, each corner has all of its pairs in one chunk
+    pair_ends = np.cumsum(pair_counts)
+    splits = np.searchsorted(
+        pair_ends, np.arange(_pair_chunk_size, pair_ends[-1], _pair_chunk_size)
+    )
+    splits = np.unique(np.concatenate(([0], splits, [len(order)])))
+    summed = np.zeros((len(face_vertex), 3))
+    for first, last in zip(splits[:-1].tolist(), splits[1:].tolist()):
+        chunk_counts = pair_counts[first:last]
+        local = np.repeat(np.arange(last - first), chunk_counts)
+        pair_starts = np.cumsum(chunk_counts) - chunk_counts
+        other = order[
+            np.repeat(starts[sorted_vertex[first:last]], chunk_counts)
+            + np.arange(len(local))
+            - np.repeat(pair_starts, chunk_counts)
+        ]
+        corner = order[first:last][local]
+        cosines = np.einsum(
+            "ij,ij->i", corner_face_normals[corner], corner_face_normals[other]
+        )
+        # the corner's own face is always used even if it is degenerate
+        smooth = (cosines >= min_cosine) | (corner == other)
+        local, other = local[smooth], other[smooth]
+        contributions = corner_face_normals[other] * weights[other, None]
+        summed[order[first:last]] = np.stack(
+            [
+                np.bincount(local, contributions[:, i], minlength=last - first)
+                for i in range(3)
+            ],
+            axis=1,
+        )
+    return _normalize(summed)
+
+
+def fill_triangle_normals(mesh_data, weighting="angle") -> bool:
+    """
+    Give interleaved triangle data without normals smooth normals, in place. The corners are
+    welded by position so the face normals of the triangles around each position are averaged as
+    vertex_normals would for the indexed faces, the data can be a writeable memory map.
+
+    Args:
+        mesh_data (np.ndarray): (N,8) float32 x,y,z,nx,ny,nz,u,v triangle data.
+        weighting (str, optional): "angle" or "area", see vertex_normals.
+
+    Returns:
+        bool: True if normals were generated, False if the data already has normals.
+    """
+    if len(mesh_data) == 0 or mesh_data[:, 3:6].any():
+        return False
+    positions, corner_vertex = np.unique(mesh_data[:, :3], axis=0, return_inverse=True)
+    corner_vertex = corner_vertex.reshape(-1)
+    sizes = np.full(len(corner_vertex) // 3, 3)
+    normals = vertex_normals(positions, corner_vertex, sizes, weighting)
+    mesh_data[:, 3:6] = normals[corner_vertex]
+    return True
@@ -0,0 +1,358 @@
+"""
+Index buffer optimization for indexed triangle meshes, usually applied once to welded data (see
+BaseMesh.create_vao) or offline. Triangles are reordered for the post transform vertex cache using
+Tom Forsyth's linear speed vertex cache optimisation, optionally reordered in clusters to reduce
+overdraw (Sander et al. "Fast Triangle Reordering for Vertex Locality and Reduced Overdraw") and
+the vertices are then reordered into the order they are fetched.
+
+Cache efficiency is reported as ACMR (average cache miss ratio, transformed vertices per
+triangle, 0.5 is ideal for large regular meshes and 3.0 the worst) and ATVR (average transformed
+vertex ratio, transformed vertices per vertex, 1.0 is ideal).
+"""
+
+from collections import deque
+
+import numpy as np
+
+from .log import logger
+from .simple_index_vao import IndexVertexData
+
+# size of the FIFO cache used to measure ACMR / ATVR, a typical size for modern GPUs
+CACHE_SIZE = 32
+# Forsyth scoring parameters, the LRU cache modelled while optimizing
+_cache_size = 32
+_cache_decay_power = 1.5
+_last_triangle_score = 0.75
+_valence_boost_scale = 2.0
+_valence_boost_power = 0.5
+# valences above this use the same (tiny) boost
+_max_valence = 64
+
+
+def _cache_scores():
+    "internal function to get the score of each LRU cache position"
+    scores = np.empty(_cache_size)
+    scores[:3] = _last_triangle_score
+    position = np.arange(3, _cache_size)
+    scores[3:] = (1.0 - (position - 3) / (_cache_size - 3)) ** _cache_decay_power
+    return scores.tolist()
+
+
+def _valence_scores():
+    "internal function to get the score boost of each remaining valence"
+    valence = np.arange(1, _max_valence + 1)
+    boost = _valence_boost_scale * valence**-_valence_boost_power
+    return [0.0] + boost.tolist()
+
+
+def cache_stats(
+    indices, vertex_count=None, cache_size=CACHE_SIZE
+) -> tuple[float, float]:
+    """
+    Measure the post transform vertex cache efficiency of a triangle index buffer with a FIFO
+    cache model.
+
+    Args:
+        indices (array_like): Triangle vertex indices, 3 per triangle.
+        vertex_count (int, optional): The number of vertices, defaults to the number referenced.
+        cache_size (int, optional): Entries in the modelled cache. Defaults to CACHE_SIZE.
+
+    Returns:
+        tuple[float, float]: The ACMR and ATVR, 0.0 for empty data.
+    """
+    indices = np.asarray(indices).ravel()
+    if len(indices) == 0:
+        return 0.0, 0.0
+    if vertex_count is None:
+        vertex_count = len(np.unique(indices))
+    cached = set()
+    fifo = deque()
+    misses = 0
+    for index in indices.tolist():
+        if index not in cached:
+            misses += 1
+            cached.add(index)
+            fifo.append(index)
+            if len(fifo) > cache_size:
+                cached.discard(fifo.popleft())
+    return misses / (len(indices) // 3), misses / vertex_count
+
+
+def _triangle_misses(indices, cache_size):
+    "internal function to get the number of FIFO cache misses of each triangle"
+    cached = set()
+    fifo = deque()
+    misses = []
+    for triangle in indices.reshape(-1, 3).tolist():
+        count = 0
+        for index in triangle:
+            if index not in cached:
+                count += 1
+                cached.add(index)
+                fifo.append(index)
+                if len(fifo) > cache_size:
+                    cached.discard(fifo.popleft())
+        misses.append(count)
+    return np.array(misses, dtype=np.int64)
+
+
+def optimize_vertex_cache(indices, vertex_count=None) -> np.ndarray:
+    """
+    Reorder triangles so vertices are reused while they are still in the post transform cache,
+    using Forsyth's linear speed algorithm. Each step adds the best scoring triangle that uses a
+    vertex in the modelled LRU cache, only the scores of the triangles of the cached vertices are
+    updated so the cost per triangle is bounded by the cache size.
+
+    Args:
+        indices (array_like): Triangle vertex indices, 3 per triangle.
+        vertex_count (int, optional): The number of vertices, defaults to the largest index + 1.
+
+    Returns:
+        np.ndarray: The reordered indices with the same dtype, each triangle keeps its winding.
+    """
+    indices = np.asarray(indices)
+    triangles = indices.reshape(-1, 3)
+    triangle_count = len(triangles)
+    if triangle_count == 0:
+        return indices.copy()
+    if vertex_count is None:
+        vertex_count = int(triangles.max()) + 1
+    # triangles of each vertex as slices of one array
+    corners = triangles.ravel().astype(np.int64)
+    order = np.argsort(corners, kind="stable")
+    counts = np.bincount(corners, minlength=vertex_count)
+    starts = np.concatenate(([0], np.cumsum(counts)))
+    adjacency = (order // 3).tolist()
+    starts = starts.tolist()
+    valence = counts.tolist()
+    cache_scores = _cache_scores()
+    valence_scores = _valence_scores()
+
+    def vertex_score(position, live):
+        if live == 0:
+            return -1.0
+        score = cache_scores[position] if position >= 0 else 0.0
+        return score + valence_scores[min(live, _max_valence)]
+
+    # number of live triangles at the front of each vertex's adjacency slice
+    live = list(valence)
+    vertex_scores = [vertex_score(-1, v) for v in live]
+    corner_list = triangles.tolist()
+    triangle_scores = [
+        vertex_scores[a] + vertex_scores[b] + vertex_scores[c]
+        for a, b, c in corner_list
+    ]
+    emitted = [False] * triangle_count
+    output = []
+    cache = []
+    best = int(np.argmax(triangle_scores))
+    cursor = 0
+    for _ in range(triangle_count):
+        if best < 0:
+            # nothing in the cache has live triangles so take the next unused one
+            while emitted[cursor]:
+                cursor += 1
+            best = cursor
+        emitted[best] = True
+        triangle = corner_list[best]
+        output.append(best)
+        for vertex in triangle:
+            # remove the triangle from the live part of the vertex's adjacency
+            start = starts[vertex]
+            end = start + live[vertex] - 1
+            i = adjacency.index(best, start, end + 1)
+            adjacency[i], adjacency[end] = adjacency[end], adjacency[i]
+            live[vertex] -= 1
+        new_cache = list(triangle)
+        new_cache.extend(v for v in cache if v not in triangle)
+        # update the scores of the vertices that moved, entered or left the cache
+        candidates = []
+        for position, vertex in enumerate(new_cache):
+            if position >= _cache_size:
+                position = -1
+            score = vertex_score(position, live[vertex])
+            delta = score - vertex_scores[vertex]
+            vertex_scores[vertex] = score
+            start = starts[vertex]
+            triangles_of_vertex = adjacency[start : start + live[vertex]]
+            for t in triangles_of_vertex:
+                triangle_scores[t] += delta
+            if position >= 0:
+                candidates.extend(triangles_of_vertex)
+        best = max(candidates, key=triangle_scores.__getitem__, default=-1)
+        cache = new_cache[:_cache_size]
+    return triangles[output].reshape(indices.shape)
+
+
+def _clusters(triangles, misses, target, cache_size):
+    """
+    internal function to split vertex cache ordered triangles into (start, end, misses) clusters,
+    the misses are counted from a cold cache as that is the most each cluster costs once the
+    clusters are reordered
+    """
+    clusters = []
+    restarts = (misses == 3).tolist()
+    cached = set()
+    fifo = deque()
+    start = 0
+    cluster_misses = 0
+    for i, triangle in enumerate(triangles.tolist()):
+        if restarts[i] and i > start:
+            clusters.append((start, i, cluster_misses))
+            start = i
+            cluster_misses = 0
+            cached.clear()
+            fifo.clear()
+        for index in triangle:
+            if index not in cached:
+                cluster_misses += 1
+                cached.add(index)
+                fifo.append(index)
+                if len(fifo) > cache_size:
+                    cached.discard(fifo.popleft())
+        # split once the cluster's own ACMR is within the target
+        if i + 1 - start >= cache_size and cluster_misses <= target * (i + 1 - start):
+            clusters.append((start, i + 1, cluster_misses))
+            start = i + 1
+            cluster_misses = 0
+            cached.clear()
+            fifo.clear()
+    if start < len(triangles):
+        clusters.append((start, len(triangles), cluster_misses))
+    return clusters
+
+
+def _merge(triangles, first, second, cache_size):
+    "internal function to join two neighbouring clusters"
+    start, end = first[0], second[1]
+    return start, end, int(_triangle_misses(triangles[start:end], cache_size).sum())
+
+
+def optimize_overdraw(indices, positions, threshold=1.05, cache_size=CACHE_SIZE):
+    """
+    Reorder clusters of triangles so those facing out from the centre of the mesh are drawn
+    first, which reduces overdraw as they usually hide the others. Clusters start where the cache
+    restarts (a triangle with 3 misses) and are split further once their ACMR from a cold cache,
+    which is how they are drawn after reordering, is within threshold of the ACMR of the whole
+    buffer. Clusters that end above it are joined to the one before so the ACMR after is at most
+    threshold times the ACMR before, use this after optimize_vertex_cache.
+
+    Args:
+        indices (array_like): Triangle vertex indices, 3 per triangle.
+        positions (array_like): (N,3) vertex positions.
+        threshold (float, optional): Allowed ACMR increase, 1.05 is up to 5% worse. Lower values
+            give fewer, larger clusters and 1.0 or less keeps the order.
+        cache_size (int, optional): Entries in the modelled cache. Defaults to CACHE_SIZE.
+
+    Returns:
+        np.ndarray: The reordered indices with the same dtype.
+    """
+    indices = np.asarray(indices)
+    triangles = indices.reshape(-1, 3)
+    if len(triangles) == 0:
+        return indices.copy()
+    misses = _triangle_misses(indices, cache_size)
+    target = threshold * misses.sum() / len(triangles)
+    clusters = []
+    for cluster in _clusters(triangles, misses, target, cache_size):
+        clusters.append(cluster)
+        while len(clusters) > 1 and clusters[-1][2] > target * (
+            clusters[-1][1] - clusters[-1][0]
+        ):
+            last = clusters.pop()
+            clusters[-1] = _merge(triangles, clusters[-1], last, cache_size)
+    # only the first cluster can still be above the target, join it to the next until the
+    # total is within it, a single cluster is the original order
+    while len(clusters) > 1 and sum(c[2] for c in clusters) > target * len(triangles):
+        clusters[:2] = [_merge(triangles, clusters[0], clusters[1], cache_size)]
+    if len(clusters) == 1:
+        return indices.copy()
+    boundaries = [c[0] for c in clusters]
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    corners = positions[triangles]
+    # area weighted normals and centroids
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    areas = np.linalg.norm(normals, axis=1)
+    centroids = corners.mean(axis=1)
+    weights = areas if areas.sum() > 0.0 else np.ones(len(areas))
+    centre = (centroids * weights[:, None]).sum(axis=0) / weights.sum()
+    boundaries = np.array(boundaries)
+    cluster_normals = np.add.reduceat(normals, boundaries)
+    cluster_weights = np.add.reduceat(weights, boundaries)
+    cluster_centroids = np.add.reduceat(centroids * weights[:, None], boundaries)
+    cluster_centroids /= np.maximum(cluster_weights, 1e-30)[:, None]
+    lengths = np.linalg.norm(cluster_normals, axis=1)
+    cluster_normals /= np.maximum(lengths, 1e-30)[:, None]
+    keys = np.einsum("ij,ij->i", cluster_centroids - centre, cluster_normals)
+    ends = np.append(boundaries[1:], len(triangles))
+    order = np.argsort(-keys, kind="stable")
+    triangle_order = np.concatenate([np.arange(boundaries[c], ends[c]) for c in order])
+    return triangles[triangle_order].reshape(indices.shape)
+
+
+def optimize_vertex_fetch(vertices, indices) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Reorder vertices into the order they are first used by the index buffer so vertex fetches
+    are sequential in memory, unused vertices are removed.
+
+    Args:
+        vertices (np.ndarray): Vertex data with one row per vertex.
+        indices (array_like): Triangle vertex indices.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The reordered vertices and the remapped indices with the
+            same dtype.
+    """
+    indices = np.asarray(indices)
+    used, first, inverse = np.unique(
+        indices.ravel(), return_index=True, return_inverse=True
+    )
+    order = np.argsort(first)
+    rank = np.empty(len(order), dtype=indices.dtype)
+    rank[order] = np.arange(len(order))
+    return vertices[used[order]], rank[inverse.ravel()].reshape(indices.shape)
+
+
+def optimize_index_data(
+    data, ranges=None, overdraw=False, threshold=1.05
+) -> IndexVertexData:
+    """
+    Optimize indexed vertex data for the vertex cache, optionally overdraw, and vertex fetch,
+    the ACMR and ATVR before and after are logged.
+
+    Args:
+        data (IndexVertexData): The data to optimize, the first 3 values of each vertex are the
+            position.
+        ranges (list, optional): (first index, index count) ranges that are drawn separately,
+            such as the materials of BaseMesh.draw_ranges, triangles are only reordered within
+            each range so the ranges stay valid. Defaults to the whole buffer.
+        overdraw (bool, optional): If True also reorder for overdraw, see optimize_overdraw.
+        threshold (float, optional): Allowed ACMR increase for the overdraw reordering.
+
+    Returns:
+        IndexVertexData: New data with the same index type and usage mode.
+    """
+    vertices = np.asarray(data.data).reshape(data.size, -1)
+    indices = np.asarray(data.indices)
+    if ranges is None:
+        ranges = [(0, len(indices))]
+    before = cache_stats(indices, data.size)
+    optimized = indices.copy()
+    for first, count in ranges:
+        part = optimize_vertex_cache(indices[first : first + count], data.size)
+        if overdraw:
+            part = optimize_overdraw(part, vertices[:, :3], threshold)
+        optimized[first : first + count] = part
+    vertices, optimized = optimize_vertex_fetch(vertices, optimized)
+    after = cache_stats(optimized, len(vertices))
+    logger.info(
+        f"vertex cache ACMR {before[0]:.3f} -> {after[0]:.3f}, "
+        f"ATVR {before[1]:.3f} -> {after[1]:.3f}"
+    )
+    return IndexVertexData(
+        np.ascontiguousarray(vertices),
+        len(vertices),
+        optimized,
+        data.index_type,
+        data.mode,
+    )
@@ -0,0 +1,163 @@
+"""
+Compact vertex formats for VAOs. The interleaved x,y,z,nx,ny,nz,u,v float32 data (32 bytes per
+vertex) is quantized to
+
+- positions as normalized int16 against the bounding box, decoded with a dequantize matrix
+  uniform which maps the [-1, 1] cube back to the bounding box
+- normals octahedral encoded (Cigolle et al. "A Survey of Efficient Representations for
+  Independent Unit Vectors") to 2 normalized int8 or int16
+- uvs as half floats
+
+giving 12 bytes per vertex with int8 normals or 16 bytes with int16 normals. The attributes are
+read with the normalize flag of AbstractVAO.set_vertex_attribute_pointer so the shader sees the
+positions and normals in [-1, 1], see shaders/compact_diffuse_vertex.glsl for the decoding.
+"""
+
+import numpy as np
+import OpenGL.GL as gl
+
+from .mat4 import Mat4
+
+# largest value of a normalized int16 and int8, -max..max maps to -1..1
+_int16_max = 32767
+_int8_max = 127
+# interleaved layouts for each normal type, positions have a w value with int16 normals so every
+# attribute starts on a 4 byte boundary
+_layouts = {
+    np.dtype(np.int8): np.dtype(
+        [("position", "<i2", (3,)), ("normal", "i1", (2,)), ("uv", "<f2", (2,))]
+    ),
+    np.dtype(np.int16): np.dtype(
+        [("position", "<i2", (4,)), ("normal", "<i2", (2,)), ("uv", "<f2", (2,))]
+    ),
+}
+_gl_types = {np.dtype(np.int8): gl.GL_BYTE, np.dtype(np.int16): gl.GL_SHORT}
+
+
+def _normalized(values, dtype) -> np.ndarray:
+    "internal function to round [-1, 1] values to normalized integers"
+    scale = _int8_max if np.dtype(dtype) == np.int8 else _int16_max
+    return np.round(np.clip(values, -1.0, 1.0) * scale).astype(dtype)
+
+
+def quantize_positions(positions) -> tuple[np.ndarray, Mat4]:
+    """
+    Quantize positions to normalized int16 within their bounding box.
+
+    Args:
+        positions (array_like): (N,3) positions.
+
+    Returns:
+        tuple[np.ndarray, Mat4]: The (N,3) int16 positions and the dequantize matrix that
+            transforms the normalized positions (int16 / 32767) back to the bounding box.
+    """
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    if len(positions):
+        low, high = positions.min(axis=0), positions.max(axis=0)
+    else:
+        low = high = np.zeros(3)
+    centre = (low + high) / 2.0
+    # flat axes still need a scale the matrix can invert
+    half = np.where(high > low, (high - low) / 2.0, 1.0)
+    quantized = _normalized((positions - centre) / half, np.int16)
+    dequantize = Mat4.scale(*half.tolist())
+    dequantize.m[3][0], dequantize.m[3][1], dequantize.m[3][2] = centre.tolist()
+    return quantized, dequantize
+
+
+def encode_octahedral(normals, dtype=np.int8) -> np.ndarray:
+    """
+    Encode unit normals as 2 normalized integers by projecting them onto an octahedron and
+    unfolding it into a square.
+
+    Args:
+        normals (array_like): (N,3) normals, they don't have to be unit length.
+        dtype (np.dtype, optional): np.int8 or np.int16. Defaults to np.int8.
+
+    Returns:
+        np.ndarray: (N,2) encoded normals, zero length normals encode as +z.
+    """
+    normals = np.asarray(normals, dtype=np.float64).reshape(-1, 3)
+    total = np.abs(normals).sum(axis=1, keepdims=True)
+    n = np.divide(normals, total, out=np.zeros_like(normals), where=total > 0.0)
+    xy = n[:, :2]
+    # fold the lower half over the diagonals
+    lower = n[:, 2] < 0.0
+    signs = np.where(xy[lower] >= 0.0, 1.0, -1.0)
+    xy[lower] = (1.0 - np.abs(xy[lower][:, ::-1])) * signs
+    return _normalized(xy, dtype)
+
+
+def decode_octahedral(encoded) -> np.ndarray:
+    """
+    Decode octahedral encoded normals, the same as the GLSL decoding.
+
+    Args:
+        encoded (np.ndarray): (N,2) int8 or int16 encoded normals.
+
+    Returns:
+        np.ndarray: (N,3) float32 unit normals.
+    """
+    encoded = np.asarray(encoded)
+    scale = _int8_max if encoded.dtype == np.int8 else _int16_max
+    xy = np.maximum(encoded.astype(np.float32) / scale, -1.0).reshape(-1, 2)
+    z = 1.0 - np.abs(xy).sum(axis=1)
+    t = np.maximum(-z, 0.0)[:, None]
+    xy = xy - np.where(xy >= 0.0, t, -t)
+    n = np.column_stack((xy, z))
+    return n / np.linalg.norm(n, axis=1, keepdims=True)
+
+
+def pack_compact(mesh_data, normal_type=np.int8) -> tuple[np.ndarray, Mat4]:
+    """
+    Pack interleaved x,y,z,nx,ny,nz,u,v vertex data into the compact layout.
+
+    Args:
+        mesh_data (np.ndarray): The float vertex data, flat or (N,8).
+        normal_type (np.dtype, optional): np.int8 (12 bytes per vertex) or np.int16 (16 bytes
+            per vertex, more accurate normals). Defaults to np.int8.
+
+    Returns:
+        tuple[np.ndarray, Mat4]: The (N,) structured array with position, normal and uv fields
+            and the dequantize matrix of the positions.
+
+    Raises:
+        ValueError: If normal_type isn't np.int8 or np.int16.
+    """
+    layout = _layouts.get(np.dtype(normal_type))
+    if layout is None:
+        raise ValueError(f"normal_type must be np.int8 or np.int16 not {normal_type}")
+    mesh_data = np.asarray(mesh_data).reshape(-1, 8)
+    packed = np.zeros(len(mesh_data), dtype=layout)
+    positions, dequantize = quantize_positions(mesh_data[:, :3])
+    packed["position"][:, :3] = positions
+    packed["normal"] = encode_octahedral(mesh_data[:, 3:6], normal_type)
+    packed["uv"] = mesh_data[:, 6:8]
+    return packed, dequantize
+
+
+def set_compact_attribute_pointers(vao, normal_type=np.int8) -> None:
+    """
+    Set the attribute pointers of a bound VAO for data from pack_compact, 0 is the position, 1
+    the encoded normal and 2 the uv.
+
+    Args:
+        vao (AbstractVAO): The bound VAO.
+        normal_type (np.dtype, optional): The normal type the data was packed with.
+    """
+    layout = _layouts[np.dtype(normal_type)]
+    stride = layout.itemsize
+    vao.set_vertex_attribute_pointer(
+        0, 3, gl.GL_SHORT, stride, layout.fields["position"][1], normalize=True
+    )
+    vao.set_vertex_attribute_pointer(
+        1,
+        2,
+        _gl_types[np.dtype(normal_type)],
+        stride,
+        layout.fields["normal"][1],
+        normalize=True,
+    )
+    vao.set_vertex_attribute_pointer(
+        2, 2, gl.GL_HALF_FLOAT, stride, layout.fields["uv"][1]
+    )
@@ -0,0 +1,311 @@
+"""
+Mesh simplification for level of detail (LOD) generation using quadric error edge collapse
+(Garland and Heckbert "Surface Simplification Using Quadric Error Metrics"). Each vertex
+accumulates the area weighted plane quadrics of its triangles (with constraint planes along open
+borders) and the cheapest edges are collapsed from a priority queue, each collapse moves one
+vertex onto the other so vertex attributes are kept rather than interpolated.
+
+Vertices are grouped by position so the topology ignores attribute splits. Vertices with the same
+position but different normals or uvs (a seam) or in different draw ranges (a material boundary)
+can only collapse along the seam when preserve_seams is set, so texture coordinates don't smear
+across it. Collapses that would flip a triangle or make the mesh non manifold are skipped.
+
+Errors are relative to the size of the mesh (the largest side of its bounding box), an error of
+0.01 means the simplified surface is around 1% of the mesh size from the original.
+"""
+
+import heapq
+from math import sqrt
+
+import numpy as np
+
+# weight of the border constraint planes relative to the triangle planes
+_border_weight = 2.0
+# cosine of the largest rotation of a triangle's normal allowed by a collapse (about 75 degrees)
+_max_rotation = 0.25
+
+
+def _plane_quadrics(normals, points, weights) -> np.ndarray:
+    "internal function to get the 10 unique quadric values and weight of weighted planes"
+    d = -np.einsum("ij,ij->i", normals, points)
+    x, y, z = normals.T
+    values = np.stack(
+        (x * x, x * y, x * z, x * d, y * y, y * z, y * d, z * z, z * d, d * d), axis=1
+    )
+    return np.hstack((values * weights[:, None], weights[:, None]))
+
+
+def _quadric_errors(quadrics, points) -> np.ndarray:
+    "internal function to get the mean squared plane distance of (N,11) quadrics at (N,3) points"
+    q = quadrics.T
+    x, y, z = points.T
+    error = (
+        x * (q[0] * x + 2.0 * (q[1] * y + q[2] * z + q[3]))
+        + y * (q[4] * y + 2.0 * (q[5] * z + q[6]))
+        + z * (q[7] * z + 2.0 * q[8])
+        + q[9]
+    )
+    return np.maximum(error, 0.0) / np.maximum(q[10], 1e-30)
+
+
+def _initial_quadrics(positions, triangles) -> tuple[np.ndarray, np.ndarray]:
+    """
+    internal function to sum the area weighted plane quadrics of the triangles at each vertex,
+    with constraint planes through open border edges, and find the vertices on a border
+    """
+    corners = positions[triangles]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    lengths = np.linalg.norm(normals, axis=1)
+    normals /= np.maximum(lengths, 1e-30)[:, None]
+    triangle_quadrics = _plane_quadrics(normals, corners[:, 0], lengths / 2.0)
+    quadrics = np.zeros((len(positions), 11))
+    for i in range(3):
+        np.add.at(quadrics, triangles[:, i], triangle_quadrics)
+    # edges used by only one triangle
+    starts = triangles.ravel()
+    ends = triangles[:, [1, 2, 0]].ravel()
+    keys = np.minimum(starts, ends) * len(positions) + np.maximum(starts, ends)
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    border = counts[inverse.ravel()] == 1
+    starts, ends = starts[border], ends[border]
+    edges = positions[ends] - positions[starts]
+    planes = np.cross(edges, np.repeat(normals, 3, axis=0)[border])
+    plane_lengths = np.linalg.norm(planes, axis=1)
+    planes /= np.maximum(plane_lengths, 1e-30)[:, None]
+    weights = _border_weight * np.einsum("ij,ij->i", edges, edges)
+    border_quadrics = _plane_quadrics(planes, positions[starts], weights)
+    np.add.at(quadrics, starts, border_quadrics)
+    np.add.at(quadrics, ends, border_quadrics)
+    on_border = np.zeros(len(positions), dtype=bool)
+    on_border[starts] = True
+    on_border[ends] = True
+    return quadrics, on_border
+
+
+def simplify(
+    vertices,
+    indices,
+    target_count=0,
+    target_error=None,
+    ranges=None,
+    preserve_borders=False,
+    preserve_seams=True,
+) -> tuple[np.ndarray, list, float]:
+    """
+    Reduce the number of triangles of an indexed triangle mesh by collapsing edges, cheapest
+    first, until there are target_count triangles or the next collapse would be more than
+    target_error from the original surface.
+
+    Args:
+        vertices (np.ndarray): Vertex data with one row per vertex, the first 3 values are the
+            position, such as welded x,y,z,nx,ny,nz,u,v data (see base_mesh.weld_vertices).
+        indices (array_like): Triangle vertex indices, 3 per triangle.
+        target_count (int, optional): Number of triangles to reduce to. Defaults to 0 so only
+            target_error limits the simplification.
+        target_error (float, optional): The largest error allowed relative to the mesh size.
+            Defaults to no limit.
+        ranges (list, optional): (first index, index count) ranges that are drawn separately,
+            such as the materials of BaseMesh.draw_ranges, the boundaries between them are
+            treated as seams.
+        preserve_borders (bool, optional): If True vertices on open borders aren't moved so the
+            mesh still lines up with neighbouring meshes, otherwise borders only collapse along
+            themselves.
+        preserve_seams (bool, optional): If True vertices on attribute seams only collapse along
+            the seam. Defaults to True.
+
+    Returns:
+        tuple[np.ndarray, list, float]: The indices of the remaining triangles in their original
+            order with the same dtype, the new (first, count) of each range (the whole buffer if
+            ranges isn't given) and the largest relative error of the collapses.
+    """
+    indices = np.asarray(indices)
+    triangle_vertex = indices.reshape(-1, 3).astype(np.int64)
+    vertices = np.asarray(vertices)
+    if ranges is None:
+        ranges = [(0, len(indices))]
+    group = np.zeros(len(triangle_vertex), dtype=np.int64)
+    for i, (first, count) in enumerate(ranges):
+        group[first // 3 : (first + count) // 3] = i
+    # a wedge is a vertex of a range, topology uses positions
+    keys = triangle_vertex * len(ranges) + group[:, None]
+    wedge_keys, wedges = np.unique(keys, return_inverse=True)
+    wedge_vertex = wedge_keys // len(ranges)
+    wedges = wedges.reshape(-1, 3)
+    positions, position_index = np.unique(
+        vertices[:, :3].astype(np.float64), axis=0, return_inverse=True
+    )
+    triangles = position_index.reshape(-1)[triangle_vertex]
+    # triangles that are already degenerate are dropped
+    alive = (
+        (triangles[:, 0] != triangles[:, 1])
+        & (triangles[:, 1] != triangles[:, 2])
+        & (triangles[:, 2] != triangles[:, 0])
+    )
+    extent = float(np.ptp(positions, axis=0).max()) if len(positions) else 0.0
+    scale = 1.0 / max(extent, 1e-30) ** 2
+    max_error = target_error**2 if target_error is not None else np.inf
+    quadrics, on_border = _initial_quadrics(positions, triangles[alive])
+
+    # the collapse loop works on lists, it is faster than numpy for single values
+    position_list = positions.tolist()
+    quadric_list = quadrics.tolist()
+    triangle_list = triangles.tolist()
+    wedge_list = wedges.tolist()
+    alive_list = alive.tolist()
+    vertex_triangles = [set() for _ in position_list]
+    for t in np.flatnonzero(alive).tolist():
+        for p in triangle_list[t]:
+            vertex_triangles[p].add(t)
+    locked = (
+        on_border if preserve_borders else np.zeros(len(positions), bool)
+    ).tolist()
+    dead = [False] * len(position_list)
+    version = [0] * len(position_list)
+    rejected = [set() for _ in position_list]
+    live = int(alive.sum())
+
+    def collapse_error(u, v):
+        "the error of moving u to v, the combined quadric at the position of v"
+        q = [a + b for a, b in zip(quadric_list[u], quadric_list[v])]
+        x, y, z = position_list[v]
+        error = (
+            x * (q[0] * x + 2.0 * (q[1] * y + q[2] * z + q[3]))
+            + y * (q[4] * y + 2.0 * (q[5] * z + q[6]))
+            + z * (q[7] * z + 2.0 * q[8])
+            + q[9]
+        )
+        return max(error, 0.0) / max(q[10], 1e-30) * scale
+
+    def ring(p):
+        "the vertices around p"
+        result = set()
+        for t in vertex_triangles[p]:
+            result.update(triangle_list[t])
+        result.discard(p)
+        return result
+
+    def check(u, v):
+        "the wedge mapping and shared triangles of collapsing u to v or None if it isn't allowed"
+        u_triangles = vertex_triangles[u]
+        shared = u_triangles & vertex_triangles[v]
+        if not shared or locked[u]:
+            return None
+        ring_u = ring(u)
+        border = False
+        for n in ring_u:
+            count = len(u_triangles & vertex_triangles[n])
+            if count > 2:
+                return None
+            border |= count == 1
+        # borders only collapse along themselves and the rings may only share the vertices
+        # opposite the edge otherwise the mesh would fold
+        if border and len(shared) != 1:
+            return None
+        if len(ring_u & ring(v)) != len(shared):
+            return None
+        mapping = {}
+        fallback = None
+        for t in shared:
+            corners = triangle_list[t]
+            wu = wedge_list[t][corners.index(u)]
+            wv = wedge_list[t][corners.index(v)]
+            fallback = wv
+            if mapping.setdefault(wu, wv) != wv and preserve_seams:
+                return None
+        pu = position_list[u]
+        pv = position_list[v]
+        for t in u_triangles - shared:
+            corners = triangle_list[t]
+            corner = corners.index(u)
+            wu = wedge_list[t][corner]
+            if wu not in mapping:
+                if preserve_seams:
+                    return None
+                mapping[wu] = fallback
+            # the triangle must not flip, fold over or become degenerate
+            a = position_list[corners[corner - 2]]
+            b = position_list[corners[corner - 1]]
+            e1 = (b[0] - a[0], b[1] - a[1], b[2] - a[2])
+            old = (pu[0] - a[0], pu[1] - a[1], pu[2] - a[2])
+            new = (pv[0] - a[0], pv[1] - a[1], pv[2] - a[2])
+            n_old = (
+                e1[1] * old[2] - e1[2] * old[1],
+                e1[2] * old[0] - e1[0] * old[2],
+                e1[0] * old[1] - e1[1] * old[0],
+            )
+            n_new = (
+                e1[1] * new[2] - e1[2] * new[1],
+                e1[2] * new[0] - e1[0] * new[2],
+                e1[0] * new[1] - e1[1] * new[0],
+            )
+            dot = sum(o * n for o, n in zip(n_old, n_new))
+            if dot <= _max_rotation * sqrt(
+                sum(o * o for o in n_old) * sum(n * n for n in n_new)
+            ):
+                return None
+        return mapping, shared
+
+    def push(u, v):
+        "queue collapsing u to v"
+        heapq.heappush(heap, (collapse_error(u, v), u, v, version[u], version[v]))
+
+    # both directions of every edge
+    starts = triangles[alive].ravel()
+    ends = triangles[alive][:, [1, 2, 0]].ravel()
+    edges = np.stack((np.append(starts, ends), np.append(ends, starts)), axis=1)
+    edges = np.unique(edges, axis=0)
+    combined = quadrics[edges[:, 0]] + quadrics[edges[:, 1]]
+    errors = _quadric_errors(combined, positions[edges[:, 1]]) * scale
+    heap = [
+        (error, u, v, 0, 0) for error, (u, v) in zip(errors.tolist(), edges.tolist())
+    ]
+    heapq.heapify(heap)
+    reached = 0.0
+    while heap and live > target_count:
+        error, u, v, u_version, v_version = heapq.heappop(heap)
+        if dead[u] or dead[v] or version[u] != u_version or version[v] != v_version:
+            continue
+        if error > max_error:
+            break
+        result = check(u, v)
+        if result is None:
+            # try again if the neighbourhood changes
+            rejected[u].add((u, v))
+            rejected[v].add((u, v))
+            continue
+        mapping, shared = result
+        for t in shared:
+            alive_list[t] = False
+            for p in triangle_list[t]:
+                vertex_triangles[p].discard(t)
+        live -= len(shared)
+        for t in vertex_triangles[u]:
+            corner = triangle_list[t].index(u)
+            triangle_list[t][corner] = v
+            wedge_list[t][corner] = mapping[wedge_list[t][corner]]
+            vertex_triangles[v].add(t)
+        vertex_triangles[u] = set()
+        quadric_list[v] = [a + b for a, b in zip(quadric_list[u], quadric_list[v])]
+        dead[u] = True
+        version[v] += 1
+        reached = max(reached, error)
+        around = ring(v)
+        for n in around:
+            push(v, n)
+            push(n, v)
+        around.add(v)
+        for n in around:
+            for a, b in rejected[n]:
+                if not (dead[a] or dead[b]):
+                    push(a, b)
+            rejected[n].clear()
+
+    kept = np.array(alive_list, dtype=bool)
+    result = wedge_vertex[np.array(wedge_list, dtype=np.int64).reshape(-1, 3)[kept]]
+    new_ranges = []
+    first = 0
+    for start, count in ranges:
+        new_count = int(kept[start // 3 : (start + count) // 3].sum()) * 3
+        new_ranges.append((first, new_count))
+        first += new_count
+    return result.astype(indices.dtype).ravel(), new_ranges, float(np.sqrt(reached))
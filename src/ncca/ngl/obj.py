@@ -1,24 +1,26 @@
+import io
+import tempfile
+
+import numpy as np
+import OpenGL.GL as gl
+
 from .base_mesh import BaseMesh, Face
+from .mesh_cache import build_mesh_cache, load_mesh_cache
+from .mesh_normals import fill_triangle_normals
+from .obj_parser import (
+    ObjArrays,
+    ObjParseFaceError,
+    ObjParseNormalError,
+    ObjParseUVError,
+    ObjParseVertexError,
+    _NameTable,
+    open_obj,
+    write_triangles,
+)
 from .texture import Texture
 from .vec3 import Vec3
 
 
-class ObjParseVertexError(Exception):
-    pass
-
-
-class ObjParseNormalError(Exception):
-    pass
-
-
-class ObjParseUVError(Exception):
-    pass
-
-
-class ObjParseFaceError(Exception):
-    pass
-
-
 class Obj(BaseMesh):
     """
     OBJ mesh loader and exporter.
@@ -37,6 +39,16 @@ class Obj(BaseMesh):
         self._current_vertex_offset: int = 0
         self._current_normal_offset: int = 0
         self._current_uv_offset: int = 0
+        # o, g and usemtl names, faces store the index of the current one of each
+        self._objects = _NameTable()
+        self._groups = _NameTable()
+        self._materials = _NameTable()
+        self.objects: list[str] = self._objects.names
+        self.groups: list[str] = self._groups.names
+        self.materials: list[str] = self._materials.names
+        self.material_libs: list[str] = []
+        self.face_objects: list[int] = []
+        self.face_groups: list[int] = []
 
     def _parse_vertex(self, tokens: list[str]) -> None:
         """
@@ -113,18 +125,24 @@ class Obj(BaseMesh):
             try:
                 # note we need to subtract one from the list as obj index from 1
                 idx = int(vn[0]) - 1
+                if idx == -1:  # obj indices start at 1 so 0 isn't valid
+                    raise ObjParseFaceError
                 if idx < 0:  # negative index so grab the index
                     # note we index from 0 not 1 like obj so adjust
                     idx = self._current_vertex_offset + (idx + 1)
                 f.vertex.append(idx)
                 # same for UV
                 idx = int(vn[1]) - 1
+                if idx == -1:  # obj indices start at 1 so 0 isn't valid
+                    raise ObjParseFaceError
                 if idx < 0:  # negative index so grab the index
                     # note we index from 0 not 1 like obj so adjust
                     idx = self._current_uv_offset + (idx + 1)
                 f.uv.append(idx)
                 # same for normals
                 idx = int(vn[2]) - 1
+                if idx == -1:  # obj indices start at 1 so 0 isn't valid
+                    raise ObjParseFaceError
                 if idx < 0:  # negative index so grab the index
                     # note we index from 0 not 1 like obj so adjust
                     idx = self._current_normal_offset + (idx + 1)
@@ -148,6 +166,8 @@ class Obj(BaseMesh):
             try:
                 # note we need to subtract one from the list as obj index from 1
                 idx = int(token) - 1
+                if idx == -1:  # obj indices start at 1 so 0 isn't valid
+                    raise ObjParseFaceError
                 if idx < 0:  # negative index so grab the index
                     # note we index from 0 not 1 like obj so adjust
                     idx = self._current_vertex_offset + (idx + 1)
@@ -172,12 +192,16 @@ class Obj(BaseMesh):
             try:
                 # note we need to subtract one from the list as obj index from 1
                 idx = int(vn[0]) - 1
+                if idx == -1:  # obj indices start at 1 so 0 isn't valid
+                    raise ObjParseFaceError
                 if idx < 0:  # negative index so grab the index
                     # note we index from 0 not 1 like obj so adjust
                     idx = self._current_vertex_offset + (idx + 1)
                 f.vertex.append(idx)
                 # same for normals
                 idx = int(vn[1]) - 1
+                if idx == -1:  # obj indices start at 1 so 0 isn't valid
+                    raise ObjParseFaceError
                 if idx < 0:  # negative index so grab the index
                     # note we index from 0 not 1 like obj so adjust
                     idx = self._current_normal_offset + (idx + 1)
@@ -202,12 +226,16 @@ class Obj(BaseMesh):
             try:
                 # note we need to subtract one from the list as obj index from 1
                 idx = int(vn[0]) - 1
+                if idx == -1:  # obj indices start at 1 so 0 isn't valid
+                    raise ObjParseFaceError
                 if idx < 0:  # negative index so grab the index
                     # note we index from 0 not 1 like obj so adjust
                     idx = self._current_vertex_offset + (idx + 1)
                 f.vertex.append(idx)
                 # same for uv
                 idx = int(vn[1]) - 1
+                if idx == -1:  # obj indices start at 1 so 0 isn't valid
+                    raise ObjParseFaceError
                 if idx < 0:  # negative index so grab the index
                     # note we index from 0 not 1 like obj so adjust
                     idx = self._current_uv_offset + (idx + 1)
@@ -233,48 +261,248 @@ class Obj(BaseMesh):
         # if we have 1 / it is a VertUV format
         elif tokens[1].count("/") == 1:
             self._parse_face_vertex_uv(tokens)
+        self._add_face_state()
+
+    def _add_face_state(self) -> None:
+        """
+        Record the current object, group and material for the last face added.
+        """
+        self.face_objects.append(self._objects.current)
+        self.face_groups.append(self._groups.current)
+        self.face_materials.append(self._materials.current)
 
-    def load(self, file: str) -> bool:
+    def _parse_state(self, tokens: list[str]) -> None:
         """
-        Load an OBJ file and parse its contents into the mesh.
+        Parse an o, g, usemtl or mtllib line.
+
+        Args:
+            tokens: List of string tokens from the line.
+        """
+        if tokens[0] == "mtllib":
+            self.material_libs.extend(
+                lib for lib in tokens[1:] if lib not in self.material_libs
+            )
+            return
+        table = {"o": self._objects, "g": self._groups, "usemtl": self._materials}
+        table = table[tokens[0]]
+        table.current = table.index(" ".join(tokens[1:]))
+
+    def load(
+        self,
+        file: str,
+        fast: bool = False,
+        memory_limit: int = None,
+        workers: int = None,
+    ) -> bool:
+        """
+        Load an OBJ file and parse its contents into the mesh, files ending in .gz, .xz or .bz2
+        are decompressed as they are read.
 
         Args:
             file: Path to the OBJ file.
+            fast: If True parse the file with numpy (see ObjArrays) then fill in the mesh, the
+                result is the same but it is much quicker for large files.
+            memory_limit: Approximate ceiling in bytes on the memory used to parse each block of
+                the file when fast is True (see ObjArrays.iter_blocks).
+            workers: If more than 1 parse large files with this many processes, implies fast
+                (see ObjArrays.from_file).
 
         Returns:
             bool: True if loading was successful.
         """
-        with open(file, "r") as obj_file:
-            lines = obj_file.readlines()
-        for line in lines:
-            line = line.strip()  # strip whitespace
-            if len(line) > 0:  # skip empty lines
-                tokens = line.split()
-                if tokens[0] == "v":
-                    self._parse_vertex(tokens)
-                elif tokens[0] == "vn":
-                    self._parse_normal(tokens)
-                elif tokens[0] == "vt":
-                    self._parse_uv(tokens)
-                elif tokens[0] == "f":
-                    self._parse_face(tokens)
+        if workers is not None and workers > 1:
+            arrays = ObjArrays.from_file(
+                file,
+                np.float64,
+                workers,
+                self._current_vertex_offset,
+                self._current_uv_offset,
+                self._current_normal_offset,
+            )
+            self.add_arrays(arrays)
+            return True
+        if fast:
+            blocks = ObjArrays.iter_blocks(
+                file,
+                memory_limit=memory_limit,
+                dtype=np.float64,
+                vertex_offset=self._current_vertex_offset,
+                uv_offset=self._current_uv_offset,
+                normal_offset=self._current_normal_offset,
+            )
+            for arrays in blocks:
+                self.add_arrays(arrays)
+            return True
+        # iterate rather than readlines so compressed files are decoded a line at a time
+        with open_obj(file, "rt") as obj_file:
+            for line in obj_file:
+                line = line.strip()  # strip whitespace
+                if len(line) > 0:  # skip empty lines
+                    tokens = line.split()
+                    if tokens[0] == "v":
+                        self._parse_vertex(tokens)
+                    elif tokens[0] == "vn":
+                        self._parse_normal(tokens)
+                    elif tokens[0] == "vt":
+                        self._parse_uv(tokens)
+                    elif tokens[0] == "f":
+                        self._parse_face(tokens)
+                    elif tokens[0] in ("o", "g", "usemtl", "mtllib"):
+                        self._parse_state(tokens)
         return True
 
+    def add_arrays(self, arrays: ObjArrays) -> None:
+        """
+        Add parsed ObjArrays data to the mesh, face indices in arrays are expected to already
+        include the elements in the mesh (see the offsets of ObjArrays.from_bytes).
+
+        Args:
+            arrays: The data to add.
+        """
+        self.vertex.extend(Vec3(x, y, z) for x, y, z in arrays.vertex.tolist())
+        if arrays.colour is not None:
+            if not hasattr(self, "colour"):
+                self.colour = []
+            self.colour.extend(Vec3(r, g, b) for r, g, b in arrays.colour.tolist())
+        self.normals.extend(Vec3(x, y, z) for x, y, z in arrays.normals.tolist())
+        self.uv.extend(Vec3(u, v, w) for u, v, w in arrays.uv.tolist())
+        self.faces.extend(arrays.to_faces())
+        for table, face_state, names, face_names, end in (
+            (self._objects, self.face_objects, arrays.objects, arrays.face_object, 0),
+            (self._groups, self.face_groups, arrays.groups, arrays.face_group, 1),
+            (
+                self._materials,
+                self.face_materials,
+                arrays.materials,
+                arrays.face_material,
+                2,
+            ),
+        ):
+            face_state.extend(
+                table.merge(names, face_names, arrays._state_end[end]).tolist()
+            )
+        self.material_libs.extend(
+            lib for lib in arrays.material_libs if lib not in self.material_libs
+        )
+        self._current_vertex_offset += len(arrays.vertex)
+        self._current_normal_offset += len(arrays.normals)
+        self._current_uv_offset += len(arrays.uv)
+
     @classmethod
-    def from_file(cls, fname: str) -> "Obj":
+    def from_file(
+        cls,
+        fname: str,
+        fast: bool = False,
+        memory_limit: int = None,
+        cache: bool = False,
+        cache_dir: str = None,
+        workers: int = None,
+    ) -> "Obj":
         """
         Create an Obj instance from a file.
 
         Args:
             fname: Path to the OBJ file.
+            fast: If True use the numpy parser, see load.
+            memory_limit: Approximate ceiling in bytes on the parsing memory, see load.
+            cache: If True use load_cached to only set the triangle data ready for create_vao.
+            cache_dir: Directory for the cache, see load_cached.
+            workers: Number of processes used to parse large files, see load.
 
         Returns:
             Obj: The loaded Obj instance.
         """
         obj = Obj()
-        obj.load(fname)
+        if cache:
+            obj.load_cached(fname, cache_dir, memory_limit)
+        else:
+            obj.load(fname, fast, memory_limit, workers)
         return obj
 
+    def load_cached(
+        self,
+        file: str,
+        cache_dir: str = None,
+        memory_limit: int = None,
+        weld: bool = False,
+    ) -> None:
+        """
+        Set mesh_data and the extents from the binary cache of the file (see mesh_cache), the
+        file is parsed and the cache written first if there isn't a valid one. The cached data is
+        memory mapped so no text is parsed on later loads, the vertex, normals, uv and faces lists
+        are left empty so only create_vao and draw can be used.
+
+        Args:
+            file: Path to the OBJ file.
+            cache_dir: Directory for the cache, defaults to __nglcache__ next to the file.
+            memory_limit: Approximate ceiling in bytes on the memory used to parse each block.
+            weld: If True cache and set the welded vertices and mesh_indices so create_vao makes
+                an indexed VAO without welding them again.
+        """
+        cached = load_mesh_cache(file, cache_dir, weld)
+        if cached is None:
+            cached = build_mesh_cache(file, cache_dir, memory_limit, weld)
+        if cached is None:  # the cache couldn't be written so just use the parsed data
+            sink = io.BytesIO()
+            _, bounds, draw_ranges = write_triangles(
+                file, sink, memory_limit=memory_limit
+            )
+            mesh_data = np.frombuffer(sink.getbuffer(), np.float32).reshape(-1, 8)
+            fill_triangle_normals(mesh_data)
+            cached = {
+                "vertices": mesh_data,
+                "bounds": bounds,
+                "draw_ranges": draw_ranges,
+            }
+        self.mesh_data = cached["vertices"]
+        # the cache has no indices if it wasn't welded
+        self.mesh_indices = cached["indices"] if weld and "indices" in cached else None
+        self._set_draw_ranges(cached["draw_ranges"])
+        self.min_x, self.min_y, self.min_z = cached["bounds"][0].tolist()
+        self.max_x, self.max_y, self.max_z = cached["bounds"][1].tolist()
+
+    def _set_draw_ranges(self, draw_ranges: list) -> None:
+        """
+        Set draw_ranges for triangle data that didn't come from the faces, adding the materials.
+
+        Args:
+            draw_ranges: (material name, first vertex, vertex count) for each material.
+        """
+        self.draw_ranges = list(draw_ranges)
+        for name, _, _ in self.draw_ranges:
+            if name is not None:
+                self._materials.index(name)
+
+    def load_vao(self, file: str, memory_limit: int = None) -> None:
+        """
+        Stream an OBJ file straight to a VAO for very large files. The file is parsed a block at
+        a time and the triangle data is staged in a temporary file so only the vertices, normals
+        and uvs are held in memory, the vertex, normals, uv and faces lists are left empty. Files
+        without normals get smooth normals as create_vao would give them.
+
+        Args:
+            file: Path to the OBJ file.
+            memory_limit: Approximate ceiling in bytes on the memory used to parse each block.
+        """
+        with tempfile.TemporaryFile() as sink:
+            count, bounds, draw_ranges = write_triangles(
+                file, sink, memory_limit=memory_limit
+            )
+            sink.flush()
+            if count:
+                mesh_data = np.memmap(
+                    sink, dtype=np.float32, mode="r+", shape=(count, 8)
+                )
+                fill_triangle_normals(mesh_data)
+            else:
+                mesh_data = np.zeros((0, 8), dtype=np.float32)
+            self._create_vao_from_data(mesh_data, gl.GL_TRIANGLES)
+            del mesh_data
+        self._set_draw_ranges(draw_ranges)
+        self.min_x, self.min_y, self.min_z = bounds[0].tolist()
+        self.max_x, self.max_y, self.max_z = bounds[1].tolist()
+        self._set_bbox()
+
     def add_vertex(self, vertex: Vec3) -> None:
         """
         Add a vertex to the mesh.
@@ -320,97 +548,62 @@ class Obj(BaseMesh):
         Add a face to the mesh.
 
         Args:
-            face: The face to add.
+            face: The face to add, it uses the current object, group and material.
         """
         self.faces.append(face)
+        self._add_face_state()
 
-    def save(self, filename: str) -> None:
+    def save(self, filename: str, precision: int = None, compress: bool = None) -> None:
         """
         Save the mesh to an OBJ file.
 
         Args:
             filename: Path to the output OBJ file.
+            precision: Significant digits for the values, by default enough to read back exactly
+                the same values.
+            compress: If True gzip the file, defaults to True if filename ends in .gz.
         """
-        with open(filename, "w") as obj_file:
-            obj_file.write("# This file was created by nccapy/Geo/Obj.py exporter\n")
-            self._write_vertices(obj_file)
-            self._write_uvs(obj_file)
-            self._write_normals(obj_file)
-            self._write_faces(obj_file)
-
-    def _write_vertices(self, obj_file) -> None:
-        """
-        Write vertices (and optional colors) to the OBJ file.
-
-        Args:
-            obj_file: Open file object for writing.
-        """
-        for i, v in enumerate(self.vertex):
-            obj_file.write(f"v {v.x} {v.y} {v.z} ")
-            if hasattr(self, "colour"):  # write colour if present
-                obj_file.write(
-                    f"{self.colour[i].x} {self.colour[i].y} {self.colour[i].z} "
-                )
-            obj_file.write("\n")
-
-    def _write_uvs(self, obj_file) -> None:
-        """
-        Write UV coordinates to the OBJ file.
-
-        Args:
-            obj_file: Open file object for writing.
-        """
-        for v in self.uv:
-            obj_file.write(f"vt {v.x} {v.y} \n")
-
-    def _write_normals(self, obj_file) -> None:
-        """
-        Write normals to the OBJ file.
-
-        Args:
-            obj_file: Open file object for writing.
-        """
-        for v in self.normals:
-            obj_file.write(f"vn {v.x} {v.y} {v.z} \n")
-
-    def _write_faces(self, obj_file) -> None:
-        """
-        Write faces to the OBJ file.
-
-        Args:
-            obj_file: Open file object for writing.
-        """
-        for face in self.faces:
-            obj_file.write("f")
-            for i in range(len(face.vertex)):
-                obj_file.write(f" {face.vertex[i] + 1}")
-                if len(face.uv) != 0:
-                    obj_file.write(f"/{face.uv[i] + 1}")
-                if len(face.normal) != 0:
-                    if len(face.uv) == 0:
-                        obj_file.write("//")
-                    else:
-                        obj_file.write("/")
-                    obj_file.write(f"{face.normal[i] + 1}")
-            obj_file.write("\n")
+        ObjArrays.from_mesh(self).save(
+            filename,
+            precision,
+            compress,
+            header="This file was created by nccapy/Geo/Obj.py exporter",
+        )
 
     @classmethod
-    def obj_with_vao(cls, mesh_name: str, texture_name: str = None) -> "Obj":
+    def obj_with_vao(
+        cls,
+        mesh_name: str,
+        texture_name: str = None,
+        cache: bool = False,
+        cache_dir: str = None,
+        weld: bool = False,
+        optimize: bool = False,
+        compact: bool = False,
+    ) -> "Obj":
         """
         Load an OBJ mesh and optionally a texture, then create a VAO.
 
         Args:
             mesh_name: Path to the OBJ mesh file.
             texture_name: Optional path to the texture file.
+            cache: If True load the mesh with load_cached, much quicker when it has been loaded before.
+            cache_dir: Directory for the cache, see load_cached.
+            weld: If True create an indexed VAO of the unique vertices, see BaseMesh.create_vao.
+            optimize: If True also optimize the indexed VAO for the vertex cache.
+            compact: If True use the compact vertex format, see BaseMesh.create_vao.
 
         Returns:
             Obj: The loaded and VAO-initialized mesh.
         """
         mesh = Obj()
-        mesh.load(mesh_name)
+        if cache:
+            mesh.load_cached(mesh_name, cache_dir, weld=weld or optimize)
+        else:
+            mesh.load(mesh_name)
         if texture_name:
             texture = Texture(texture_name)
             mesh.texture_id = texture.set_texture_gl()
             print(f"{mesh.texture_id=}")
-        mesh.create_vao()
+        mesh.create_vao(weld=weld, optimize=optimize, compact=compact)
         return mesh
@@ -0,0 +1,1111 @@
+"""
+Fast OBJ parsing using numpy. The file is treated as an array of bytes so the lines are classified
+in bulk and all of the numbers for each type of line are parsed with a single numpy call, unlike
+Obj.load no python objects are created per line, vertex or face.
+"""
+
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import tempfile
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from .base_mesh import Face
+from .obj_writer import save_arrays
+from .triangulate import triangulate_faces
+
+
+class ObjParseVertexError(Exception):
+    pass
+
+
+class ObjParseNormalError(Exception):
+    pass
+
+
+class ObjParseUVError(Exception):
+    pass
+
+
+class ObjParseFaceError(Exception):
+    pass
+
+
+# line types, the value is used as an index into the keyword lengths
+_VERTEX, _UV, _NORMAL, _FACE, _OBJECT, _GROUP, _MATERIAL, _MTLLIB = range(1, 9)
+_keyword_length = np.array([0, 1, 2, 2, 1, 1, 1, 6, 6])
+# the o, g and usemtl directives, each face is given the index of the current name of each
+_STATES = (
+    ("objects", "face_object", _OBJECT),
+    ("groups", "face_group", _GROUP),
+    ("materials", "face_material", _MATERIAL),
+)
+# files are parsed in blocks of roughly this many bytes to bound the temporary memory used
+_block_size = 1 << 23
+# approximate peak temporary memory used by _parse_block per byte of the block, measured with
+# tracemalloc on face heavy files which need the most
+_memory_per_byte = 24
+_min_block_size = 1 << 16
+# files smaller than this aren't worth starting worker processes for
+_parallel_min_size = 1 << 22
+# compressed files are decoded as they are read, chosen by the file suffix
+_decompressors = {".gz": gzip.open, ".xz": lzma.open, ".bz2": bz2.open}
+# the ObjArrays attributes returned from worker processes
+_shared_arrays = (
+    "vertex",
+    "colour",
+    "normals",
+    "uv",
+    "face_sizes",
+    "face_vertex",
+    "face_uv",
+    "face_normal",
+    "face_object",
+    "face_group",
+    "face_material",
+    "_negative",
+)
+# the ObjArrays attributes returned from worker processes by pickling
+_pickled_attributes = (
+    "objects",
+    "groups",
+    "materials",
+    "material_libs",
+    "_state_end",
+)
+
+
+def open_obj(path, mode="rb"):
+    """
+    Open an OBJ file, files ending in .gz, .xz or .bz2 are decompressed as they are read so the
+    whole file is never inflated in memory or on disk.
+
+    Args:
+        path (str | os.PathLike): Path to the file.
+        mode (str, optional): "rb" for bytes or "rt" for text. Defaults to "rb".
+
+    Returns:
+        file object: The opened file.
+    """
+    opener = _decompressors.get(os.path.splitext(path)[1].lower(), open)
+    return opener(path, mode)
+
+
+def _run_starts(mask):
+    "internal function to get a mask of the first element of each run of True in mask"
+    starts = mask.copy()
+    starts[1:] &= ~mask[:-1]
+    return starts
+
+
+def _whitespace(buf):
+    "internal function to get a mask of the whitespace (including newlines) in a byte array"
+    return (buf == 32) | (buf == 9) | (buf == 10) | (buf == 13)
+
+
+def _split_lines(data):
+    """
+    internal function to classify the lines of a block of an OBJ file
+
+    Returns:
+        tuple: the kind of each line (0 for lines that are ignored) and a (N,) byte array of the
+            block where the text after the keyword of each line is terminated by a newline at
+            any trailing comment.
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    if len(buf) and buf[-1] != 10:
+        buf = np.append(buf, np.uint8(10))
+    ends = np.flatnonzero(buf == 10)
+    starts = np.empty_like(ends)
+    starts[:1] = 0
+    starts[1:] = ends[:-1] + 1
+    # first character of each line that isn't a space or tab, at worst this is the newline
+    text = np.flatnonzero((buf != 32) & (buf != 9))
+    first = text[np.searchsorted(text, starts)]
+    padded = np.concatenate((buf, np.zeros(2, dtype=np.uint8)))
+    c0 = padded[first]
+    c1 = padded[first + 1]
+    c2 = padded[first + 2]
+    blank1 = (c1 == 32) | (c1 == 9)
+    blank2 = (c2 == 32) | (c2 == 9)
+    kinds = np.zeros(len(ends), dtype=np.int8)
+    kinds[(c0 == ord("v")) & blank1] = _VERTEX
+    kinds[(c0 == ord("v")) & (c1 == ord("t")) & blank2] = _UV
+    kinds[(c0 == ord("v")) & (c1 == ord("n")) & blank2] = _NORMAL
+    kinds[(c0 == ord("f")) & blank1] = _FACE
+    # o, g and usemtl can be used without a name
+    end1 = blank1 | (c1 == 10) | (c1 == 13)
+    kinds[(c0 == ord("o")) & end1] = _OBJECT
+    kinds[(c0 == ord("g")) & end1] = _GROUP
+    # these are rare so just check the candidates
+    for line in np.flatnonzero((c0 == ord("u")) | (c0 == ord("m"))):
+        word = data[first[line] : first[line] + 7]
+        if word[6:] in (b"", b" ", b"\t", b"\r", b"\n"):
+            if word[:6] == b"usemtl":
+                kinds[line] = _MATERIAL
+            elif word[:6] == b"mtllib":
+                kinds[line] = _MTLLIB
+    # a comment ends the line early so replace the # with a newline
+    comments = np.flatnonzero(buf == ord("#"))
+    if len(comments):
+        buf = buf.copy()
+        after = np.searchsorted(comments, first)
+        has_comment = after < len(comments)
+        has_comment[has_comment] &= comments[after[has_comment]] < ends[has_comment]
+        ends[has_comment] = comments[after[has_comment]]
+        buf[ends] = 10
+    return kinds, first + _keyword_length[kinds], ends, buf
+
+
+def _label_lines(buf, kinds, starts, ends):
+    "internal function to label each byte of buf with the kind of line it is the payload of"
+    edges = np.zeros(len(buf) + 1, dtype=np.int8)
+    edges[starts] = kinds
+    edges[ends + 1] -= kinds
+    return np.cumsum(edges[:-1], dtype=np.int8)
+
+
+def _line_token_counts(tokens, newlines):
+    "internal function to count the tokens on each line from the sorted token and newline positions"
+    return np.diff(np.searchsorted(tokens, newlines), prepend=0)
+
+
+def _token_counts(text):
+    "internal function to count the whitespace separated tokens on each newline terminated line of text"
+    buf = np.frombuffer(text, dtype=np.uint8)
+    tokens = np.flatnonzero(_run_starts(~_whitespace(buf)))
+    return _line_token_counts(tokens, np.flatnonzero(buf == 10))
+
+
+def _parse_numbers(text, dtype, count, error):
+    "internal function to parse count whitespace separated numbers, raise error if this fails"
+    with warnings.catch_warnings():
+        # older numpy only warns if it stops early
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            values = np.fromstring(text, dtype=dtype, sep=" ")
+        except (ValueError, DeprecationWarning):
+            raise error
+    if len(values) != count:
+        raise error
+    return values
+
+
+def _parse_rows(text, lines, width, error):
+    """
+    internal function to parse the text of a block of v, vt or vn lines, returns the first width
+    values of each line as an (N,width) float64 array along with the flat values and the tokens per line
+    """
+    counts = _token_counts(text)
+    if np.any(counts < width):
+        raise error
+    values = _parse_numbers(text, np.float64, int(counts.sum()), error)
+    if np.all(counts == counts[0]):
+        rows = values.reshape(lines, -1)
+        return rows[:, :width], rows, counts
+    starts = np.cumsum(counts) - counts
+    return values[starts[:, np.newaxis] + np.arange(width)], values, counts
+
+
+def _parse_vertices(text, lines):
+    "internal function to parse v lines, returns (N,3) positions and the (M,3) colours if any"
+    vertex, values, counts = _parse_rows(text, lines, 3, ObjParseVertexError)
+    colour = None
+    # the non standard x y z r g b colour format
+    has_colour = counts == 6
+    if np.any(has_colour):
+        if values.ndim == 2:
+            colour = values[:, 3:6]
+        else:
+            starts = (np.cumsum(counts) - counts)[has_colour]
+            colour = values[starts[:, np.newaxis] + np.arange(3, 6)]
+    return vertex, colour
+
+
+def _parse_uvs(text, lines):
+    "internal function to parse vt lines, some DCC's use 3 values so uv is (N,3) with z=0.0 if not given"
+    uv = np.zeros((lines, 3))
+    uv[:, :2], values, counts = _parse_rows(text, lines, 2, ObjParseUVError)
+    has_z = counts == 3
+    if np.any(has_z):
+        if values.ndim == 2:
+            uv[:, 2] = values[:, 2]
+        else:
+            uv[has_z, 2] = values[(np.cumsum(counts) - counts)[has_z] + 2]
+    return uv
+
+
+def _parse_faces(text, lines, before, check=True):
+    """
+    internal function to parse f lines in any of the v, v/vt, v//vn or v/vt/vn formats
+
+    Args:
+        text (bytes): The newline terminated text after the f of each line.
+        lines (int): The number of lines.
+        before (numpy.ndarray): (3,F) number of v, vt and vn lines before each face, used to fix up
+            negative indices.
+        check (bool): If False negative indices that resolve to before the start of the text
+            aren't an error, they are fixed up later when the counts before the text are known.
+
+    Returns:
+        tuple: (F,) corners per face, (3,C) 0 based vertex, uv and normal index per corner,
+            -1 where the face doesn't have uvs or normals, and a (3,C) mask of the indices that
+            were negative in the file.
+    """
+    buf = np.frombuffer(text, dtype=np.uint8)
+    space = _whitespace(buf)
+    slash = buf == 47
+    digit = ((buf >= 48) & (buf <= 57)) | (buf == 45) | (buf == 43)
+    if not np.all(space | slash | digit):
+        raise ObjParseFaceError
+    tokens = np.flatnonzero(_run_starts(~space))
+    numbers = np.flatnonzero(_run_starts(digit))
+    # every corner must start with the vertex index
+    if not np.all(digit[tokens]):
+        raise ObjParseFaceError
+    sizes = _line_token_counts(tokens, np.flatnonzero(buf == 10))
+    if np.any(sizes == 0):
+        raise ObjParseFaceError
+    # a corner can't end with an empty slot (1/ or 1/2/)
+    if np.any(slash[:-1] & space[1:]):
+        raise ObjParseFaceError
+    # numbers following whitespace start a new corner, the slot in the corner is the number of
+    # slashes before it in the corner so v//vn skips the uv slot. The text ends with a newline so
+    # wrapping around for the numbers at the start is safe.
+    first = space[numbers - 1]
+    corner = np.cumsum(first) - 1
+    slashes = np.cumsum(slash) - slash
+    slot = slashes[numbers] - slashes[tokens[corner]]
+    if len(slot) and slot.max() > 2:
+        raise ObjParseFaceError
+    values = _parse_numbers(
+        text.replace(b"/", b" "), np.int64, len(numbers), ObjParseFaceError
+    )
+    # obj indices start at 1, 0 is used for unset below
+    if np.any(values == 0):
+        raise ObjParseFaceError
+    raw = np.zeros(
+        (3, len(tokens)), dtype=np.int64
+    )  # obj indices start at 1 so 0 is unset
+    raw[slot, corner] = values
+    # like Obj.load the format of a face is taken from its first corner
+    used = np.repeat(raw[:, np.cumsum(sizes) - sizes] != 0, sizes, axis=1)
+    if np.any(used & (raw == 0)):
+        raise ObjParseFaceError
+    # negative indices are relative to the number of elements read so far
+    offset = np.repeat(before, sizes, axis=1)
+    negative = raw < 0
+    index = np.where(raw > 0, raw - 1, offset + raw)
+    if check and np.any(index[negative] < 0):
+        # refers to an element before the start of the file, Obj.load keeps these but they
+        # would clash with -1 for unused
+        raise ObjParseFaceError
+    index[~used] = -1
+    return sizes, index, negative
+
+
+class _NameTable:
+    "internal list of the o, g or usemtl names seen so far and the current one"
+
+    def __init__(self):
+        self.names = []
+        self._lookup = {}
+        self.current = -1
+
+    def index(self, name):
+        "get the index of a name adding it if it is new"
+        if name not in self._lookup:
+            self._lookup[name] = len(self.names)
+            self.names.append(name)
+        return self._lookup[name]
+
+    def merge(self, names, face_index, end):
+        """
+        Map indices into names to this table, -1 (set before the data) becomes the current name
+        and end is the index of the last name set in the data or -1 if there isn't one.
+        """
+        # the extra value at the end is used for -1
+        mapping = np.array([self.index(n) for n in names] + [self.current], np.int32)
+        if end >= 0:
+            self.current = int(mapping[end])
+        return mapping[face_index]
+
+
+def _resolve_blocks(blocks):
+    """
+    internal generator to make the o, g and usemtl indices of parsed blocks relative to the whole
+    file, the names of each block are all of those in the file up to the end of the block
+    """
+    tables = [_NameTable() for _ in _STATES]
+    libs = []
+    for block in blocks:
+        for state, (table, (names, face_names, _)) in enumerate(zip(tables, _STATES)):
+            face_index = table.merge(
+                getattr(block, names),
+                getattr(block, face_names),
+                block._state_end[state],
+            )
+            setattr(block, face_names, face_index)
+            setattr(block, names, list(table.names))
+            block._state_end[state] = table.current
+        libs.extend(lib for lib in block.material_libs if lib not in libs)
+        block.material_libs = list(libs)
+        yield block
+
+
+class ObjArrays:
+    """
+    The contents of an OBJ file held in contiguous numpy arrays, this can be passed to OpenGL
+    directly and is much faster to load and smaller than the Vec3 / Face lists used by Obj.
+
+    Attributes:
+        vertex (numpy.ndarray): (N,3) positions.
+        colour (numpy.ndarray | None): (N,3) colours for files using the non standard v x y z r g b format.
+        normals (numpy.ndarray): (N,3) normals.
+        uv (numpy.ndarray): (N,3) texture coordinates, z is 0.0 unless the file gives 3 values.
+        face_sizes (numpy.ndarray): (F,) int32 number of corners of each face.
+        face_vertex (numpy.ndarray): int32 0 based vertex index of every face corner.
+        face_uv (numpy.ndarray): int32 0 based uv index of every face corner or -1 if not given.
+        face_normal (numpy.ndarray): int32 0 based normal index of every face corner or -1 if not given.
+        objects (list[str]): The o names in the order they are first used.
+        groups (list[str]): The g names in the order they are first used.
+        materials (list[str]): The usemtl names in the order they are first used.
+        material_libs (list[str]): The mtllib files.
+        face_object (numpy.ndarray): (F,) int32 index into objects of each face, -1 if not set.
+        face_group (numpy.ndarray): (F,) int32 index into groups of each face, -1 if not set.
+        face_material (numpy.ndarray): (F,) int32 index into materials of each face, -1 if not set.
+    """
+
+    def __init__(self, dtype=np.float32):
+        """
+        Initializes empty arrays.
+
+        Args:
+            dtype (numpy.dtype, optional): The type used for the values. Defaults to float32.
+        """
+        self.vertex = np.zeros((0, 3), dtype=dtype)
+        self.colour = None
+        self.normals = np.zeros((0, 3), dtype=dtype)
+        self.uv = np.zeros((0, 3), dtype=dtype)
+        self.face_sizes = np.zeros(0, dtype=np.int32)
+        self.face_vertex = np.zeros(0, dtype=np.int32)
+        self.face_uv = np.zeros(0, dtype=np.int32)
+        self.face_normal = np.zeros(0, dtype=np.int32)
+        # (3,C) mask of the negative face indices of blocks parsed without knowing the number of
+        # elements before them, they are rebased when the blocks are merged
+        self._negative = None
+        self.objects = []
+        self.groups = []
+        self.materials = []
+        self.material_libs = []
+        self.face_object = np.zeros(0, dtype=np.int32)
+        self.face_group = np.zeros(0, dtype=np.int32)
+        self.face_material = np.zeros(0, dtype=np.int32)
+        # index of the current object, group and material at the end of the data
+        self._state_end = [-1, -1, -1]
+
+    @classmethod
+    def _parse_block(
+        cls,
+        data,
+        vertex_offset=0,
+        uv_offset=0,
+        normal_offset=0,
+        dtype=np.float32,
+        check=True,
+    ):
+        """
+        internal method to parse a block of complete lines, the offsets are the element counts
+        before the block, if check is False negative face indices are kept in _negative to be
+        rebased later (see _parse_faces)
+        """
+        block = cls(dtype)
+        kinds, starts, ends, buf = _split_lines(data)
+        labels = _label_lines(buf, kinds, starts, ends)
+
+        def lines(kind):
+            return buf[labels == kind].tobytes(), int(np.count_nonzero(kinds == kind))
+
+        is_vertex = kinds == _VERTEX
+        is_uv = kinds == _UV
+        is_normal = kinds == _NORMAL
+        is_face = kinds == _FACE
+        if np.any(is_vertex):
+            vertex, colour = _parse_vertices(*lines(_VERTEX))
+            block.vertex = vertex.astype(dtype)
+            if colour is not None:
+                block.colour = colour.astype(dtype)
+        if np.any(is_uv):
+            block.uv = _parse_uvs(*lines(_UV)).astype(dtype)
+        if np.any(is_normal):
+            normals = _parse_rows(*lines(_NORMAL), 3, ObjParseNormalError)[0]
+            block.normals = normals.astype(dtype)
+        block._parse_states(buf, kinds, starts, ends)
+        if np.any(is_face):
+            before = np.stack(
+                (
+                    vertex_offset + np.cumsum(is_vertex)[is_face],
+                    uv_offset + np.cumsum(is_uv)[is_face],
+                    normal_offset + np.cumsum(is_normal)[is_face],
+                )
+            )
+            sizes, index, negative = _parse_faces(*lines(_FACE), before, check)
+            block.face_sizes = sizes.astype(np.int32)
+            block.face_vertex, block.face_uv, block.face_normal = index.astype(np.int32)
+            if not check and np.any(negative):
+                block._negative = negative
+        return block
+
+    def _parse_states(self, buf, kinds, starts, ends):
+        """
+        internal method to set the o, g, usemtl and mtllib data of a block, the names are local to
+        the block and faces before the first of each directive use -1, see _resolve_blocks
+        """
+
+        def text(line):
+            return buf[starts[line] : ends[line]].tobytes().decode(errors="replace")
+
+        for line in np.flatnonzero(kinds == _MTLLIB):
+            self.material_libs.extend(text(line).split())
+        face_lines = np.flatnonzero(kinds == _FACE)
+        for state, (names, face_names, kind) in enumerate(_STATES):
+            lines = np.flatnonzero(kinds == kind)
+            if len(lines) == 0:
+                setattr(self, face_names, np.full(len(face_lines), -1, dtype=np.int32))
+                continue
+            line_names = [" ".join(text(line).split()) for line in lines]
+            local = {name: i for i, name in enumerate(dict.fromkeys(line_names))}
+            index = np.array([local[name] for name in line_names], dtype=np.int32)
+            previous = np.searchsorted(lines, face_lines) - 1
+            setattr(
+                self,
+                face_names,
+                np.where(previous >= 0, index[previous], -1).astype(np.int32),
+            )
+            setattr(self, names, list(local))
+            self._state_end[state] = int(index[-1])
+
+    @classmethod
+    def concatenate(cls, blocks) -> "ObjArrays":
+        """
+        Join blocks of parsed data, face indices are expected to already be relative to the whole file.
+
+        Args:
+            blocks (iterable): ObjArrays to join in order.
+
+        Returns:
+            ObjArrays: a single set of arrays.
+        """
+        blocks = list(blocks)
+        if len(blocks) == 1:
+            return blocks[0]
+        result = cls()
+        if not blocks:
+            return result
+        for name in (
+            "vertex",
+            "normals",
+            "uv",
+            "face_sizes",
+            "face_vertex",
+            "face_uv",
+            "face_normal",
+            "face_object",
+            "face_group",
+            "face_material",
+        ):
+            setattr(result, name, np.concatenate([getattr(b, name) for b in blocks]))
+        # the names of each block include those of the earlier blocks
+        for name in ("objects", "groups", "materials", "material_libs", "_state_end"):
+            setattr(result, name, list(getattr(blocks[-1], name)))
+        colours = [b.colour for b in blocks if b.colour is not None]
+        if colours:
+            result.colour = np.concatenate(colours)
+        return result
+
+    @classmethod
+    def from_bytes(
+        cls, data, vertex_offset=0, uv_offset=0, normal_offset=0, dtype=np.float32
+    ) -> "ObjArrays":
+        """
+        Parse the contents of an OBJ file.
+
+        Args:
+            data (bytes): The file contents.
+            vertex_offset (int, optional): Vertices already loaded, used for negative face indices.
+            uv_offset (int, optional): UVs already loaded, used for negative face indices.
+            normal_offset (int, optional): Normals already loaded, used for negative face indices.
+            dtype (numpy.dtype, optional): The type used for the values. Defaults to float32.
+
+        Returns:
+            ObjArrays: The parsed data.
+
+        Raises:
+            ObjParseVertexError: If a v line can't be parsed.
+            ObjParseNormalError: If a vn line can't be parsed.
+            ObjParseUVError: If a vt line can't be parsed.
+            ObjParseFaceError: If an f line can't be parsed.
+        """
+        blocks = []
+        start = 0
+        while start < len(data):
+            end = data.find(b"\n", start + _block_size)
+            end = len(data) if end == -1 else end + 1
+            block = cls._parse_block(
+                data[start:end], vertex_offset, uv_offset, normal_offset, dtype
+            )
+            vertex_offset += len(block.vertex)
+            uv_offset += len(block.uv)
+            normal_offset += len(block.normals)
+            blocks.append(block)
+            start = end
+        return cls.concatenate(_resolve_blocks(blocks))
+
+    @classmethod
+    def from_file(
+        cls,
+        path,
+        dtype=np.float32,
+        workers=None,
+        vertex_offset=0,
+        uv_offset=0,
+        normal_offset=0,
+    ) -> "ObjArrays":
+        """
+        Load and parse an OBJ file.
+
+        Args:
+            path (str): Path to the OBJ file, which may be compressed (see open_obj).
+            dtype (numpy.dtype, optional): The type used for the values. Defaults to float32.
+            workers (int, optional): If more than 1 large uncompressed files are split into newline
+                aligned byte ranges which are parsed by this many processes.
+            vertex_offset (int, optional): Vertices already loaded, used for negative face indices.
+            uv_offset (int, optional): UVs already loaded, used for negative face indices.
+            normal_offset (int, optional): Normals already loaded, used for negative face indices.
+
+        Returns:
+            ObjArrays: The parsed data.
+        """
+        offsets = (vertex_offset, uv_offset, normal_offset)
+        if workers is not None and workers > 1:
+            ranges = _byte_ranges(path, workers)
+            if len(ranges) > 1:
+                return _parse_parallel(path, ranges, workers, dtype, *offsets)
+        return cls.concatenate(cls.iter_blocks(path, None, None, dtype, *offsets))
+
+    @classmethod
+    def iter_blocks(
+        cls,
+        file,
+        block_size=None,
+        memory_limit=None,
+        dtype=np.float32,
+        vertex_offset=0,
+        uv_offset=0,
+        normal_offset=0,
+    ):
+        """
+        Parse an OBJ file a block at a time, only one block of the file text is held in memory
+        so this can be used for files that are too large to load in one go.
+
+        Args:
+            file (str | os.PathLike | file object): Path to the OBJ file (which may be compressed,
+                see open_obj) or a file opened in binary mode.
+            block_size (int, optional): The number of bytes read for each block.
+            memory_limit (int, optional): Approximate ceiling in bytes on the memory used to parse
+                each block, used to pick the block size instead of block_size.
+            dtype (numpy.dtype, optional): The type used for the values. Defaults to float32.
+            vertex_offset (int, optional): Vertices already loaded, used for negative face indices.
+            uv_offset (int, optional): UVs already loaded, used for negative face indices.
+            normal_offset (int, optional): Normals already loaded, used for negative face indices.
+
+        Yields:
+            ObjArrays: The data in each block, face indices are relative to the whole file.
+
+        Raises:
+            ObjParseVertexError: If a v line can't be parsed.
+            ObjParseNormalError: If a vn line can't be parsed.
+            ObjParseUVError: If a vt line can't be parsed.
+            ObjParseFaceError: If an f line can't be parsed.
+        """
+        if memory_limit is not None:
+            block_size = max(memory_limit // _memory_per_byte, _min_block_size)
+        elif block_size is None:
+            block_size = _block_size
+        if isinstance(file, (str, os.PathLike)):
+            with open_obj(file) as obj_file:
+                yield from cls.iter_blocks(
+                    obj_file,
+                    block_size,
+                    None,
+                    dtype,
+                    vertex_offset,
+                    uv_offset,
+                    normal_offset,
+                )
+            return
+        blocks = cls._read_blocks(
+            file, block_size, dtype, vertex_offset, uv_offset, normal_offset
+        )
+        yield from _resolve_blocks(blocks)
+
+    @classmethod
+    def _read_blocks(
+        cls, file, block_size, dtype, vertex_offset, uv_offset, normal_offset
+    ):
+        "internal generator to parse a binary file a block at a time for iter_blocks"
+        tail = b""
+        while True:
+            chunk = file.read(block_size)
+            if chunk:
+                data = tail + chunk
+                end = data.rfind(b"\n") + 1
+                if end == 0:  # no complete line yet so keep reading
+                    tail = data
+                    continue
+                data, tail = data[:end], data[end:]
+            elif tail:  # last line without a newline
+                data, tail = tail, b""
+            else:
+                return
+            block = cls._parse_block(
+                data, vertex_offset, uv_offset, normal_offset, dtype
+            )
+            vertex_offset += len(block.vertex)
+            uv_offset += len(block.uv)
+            normal_offset += len(block.normals)
+            yield block
+
+    @classmethod
+    def from_arrays(
+        cls,
+        vertex,
+        faces=None,
+        normals=None,
+        uv=None,
+        face_normal=None,
+        face_uv=None,
+        colour=None,
+    ) -> "ObjArrays":
+        """
+        Create ObjArrays from numpy arrays, e.g. to write a mesh with save.
+
+        Args:
+            vertex (array_like): (N,3) positions.
+            faces (array_like, optional): (F,K) 0 based vertex indices of faces with K corners.
+            normals (array_like, optional): (M,3) normals.
+            uv (array_like, optional): (M,2) or (M,3) texture coordinates.
+            face_normal (array_like, optional): (F,K) 0 based normal indices, if not given and
+                there is a normal per vertex the vertex indices are used.
+            face_uv (array_like, optional): (F,K) 0 based uv indices, if not given and there is a
+                uv per vertex the vertex indices are used.
+            colour (array_like, optional): (N,3) vertex colours.
+
+        Returns:
+            ObjArrays: The data, the values keep the float type of vertex.
+        """
+        vertex = np.asarray(vertex)
+        if vertex.dtype.kind != "f":
+            vertex = vertex.astype(np.float32)
+        arrays = cls(vertex.dtype)
+        arrays.vertex = vertex.reshape(-1, 3)
+        if normals is not None:
+            arrays.normals = np.asarray(normals, dtype=vertex.dtype).reshape(-1, 3)
+        if uv is not None:
+            uv = np.asarray(uv, dtype=vertex.dtype)
+            arrays.uv = np.zeros((len(uv), 3), dtype=vertex.dtype)
+            arrays.uv[:, : uv.shape[1]] = uv
+        if colour is not None:
+            arrays.colour = np.asarray(colour, dtype=vertex.dtype).reshape(-1, 3)
+        if faces is None:
+            return arrays
+        faces = np.asarray(faces, dtype=np.int32)
+        if faces.ndim != 2:
+            raise ValueError("faces must be a (F,K) array")
+        arrays.face_sizes = np.full(len(faces), faces.shape[1], dtype=np.int32)
+        arrays.face_vertex = faces.ravel()
+        for name, index, values in (
+            ("face_normal", face_normal, arrays.normals),
+            ("face_uv", face_uv, arrays.uv),
+        ):
+            if index is None:
+                if len(values) == 0 or len(values) != len(arrays.vertex):
+                    index = np.full(faces.shape, -1)
+                else:
+                    index = faces
+            index = np.asarray(index, dtype=np.int32)
+            if index.shape != faces.shape:
+                raise ValueError(f"{name} must be the same shape as faces")
+            setattr(arrays, name, index.ravel())
+        no_state = np.full(len(faces), -1, dtype=np.int32)
+        arrays.face_object, arrays.face_group, arrays.face_material = (no_state,) * 3
+        return arrays
+
+    @classmethod
+    def from_mesh(cls, mesh) -> "ObjArrays":
+        """
+        Create ObjArrays from the Vec3 and Face lists of a mesh such as Obj.
+
+        Args:
+            mesh (BaseMesh): The mesh, the object, group and material data are used if it has them.
+
+        Returns:
+            ObjArrays: The data with float64 values.
+        """
+        arrays = cls(np.float64)
+
+        def values(vectors):
+            return np.array(
+                [(v.x, v.y, v.z) for v in vectors], dtype=np.float64
+            ).reshape(-1, 3)
+
+        arrays.vertex = values(mesh.vertex)
+        arrays.normals = values(mesh.normals)
+        # uvs can be Vec2 or Vec3
+        arrays.uv = np.array(
+            [(v.x, v.y, getattr(v, "z", 0.0)) for v in mesh.uv], dtype=np.float64
+        ).reshape(-1, 3)
+        if getattr(mesh, "colour", None):
+            arrays.colour = values(mesh.colour)
+        sizes = [len(face.vertex) for face in mesh.faces]
+        arrays.face_sizes = np.array(sizes, dtype=np.int32)
+        for name in ("vertex", "uv", "normal"):
+            index = []
+            for face, size in zip(mesh.faces, sizes):
+                face_index = getattr(face, name)
+                index.extend(face_index if face_index else [-1] * size)
+            setattr(arrays, f"face_{name}", np.array(index, dtype=np.int32))
+        for names, face_names, mesh_names, mesh_face_names in (
+            ("objects", "face_object", "objects", "face_objects"),
+            ("groups", "face_group", "groups", "face_groups"),
+            ("materials", "face_material", "materials", "face_materials"),
+        ):
+            face_state = getattr(mesh, mesh_face_names, [])
+            if len(face_state) == len(sizes):
+                setattr(arrays, names, list(getattr(mesh, mesh_names)))
+                setattr(arrays, face_names, np.array(face_state, dtype=np.int32))
+            else:
+                setattr(arrays, face_names, np.full(len(sizes), -1, dtype=np.int32))
+        arrays.material_libs = list(getattr(mesh, "material_libs", []))
+        return arrays
+
+    def save(
+        self, file, precision=None, compress=None, compresslevel=6, header=None
+    ) -> None:
+        """
+        Write the data to an OBJ file, whole arrays are formatted at once so this is much quicker
+        than writing the Vec3 and Face lists of a mesh.
+
+        Args:
+            file (str | os.PathLike | file object): Path to write to or a file opened in binary mode.
+            precision (int, optional): Significant digits for the values, by default enough to read
+                back exactly the same values.
+            compress (bool, optional): If True gzip the output, defaults to True for paths ending in .gz.
+            compresslevel (int, optional): The gzip compression level. Defaults to 6.
+            header (str, optional): A comment written at the start of the file.
+        """
+        save_arrays(file, self, precision, compress, compresslevel, header)
+
+    @property
+    def face_offsets(self) -> np.ndarray:
+        "(F,) index of the first corner of each face in the face_* arrays"
+        return np.cumsum(self.face_sizes) - self.face_sizes
+
+    def is_triangular(self) -> bool:
+        """
+        Check if all faces are triangles.
+
+        Returns:
+            bool: True if all faces are triangles.
+        """
+        return bool(np.all(self.face_sizes == 3))
+
+    def to_faces(self) -> list[Face]:
+        """
+        Convert the face arrays to the Face objects used by BaseMesh.
+
+        Returns:
+            list[Face]: One Face per face, uv and normal are empty lists if the face doesn't have them.
+        """
+        vertex = self.face_vertex.tolist()
+        uv = self.face_uv.tolist()
+        normal = self.face_normal.tolist()
+        faces = []
+        start = 0
+        new = Face.__new__  # all the attributes are set below so skip __init__
+        for size in self.face_sizes.tolist():
+            end = start + size
+            f = new(Face)
+            f.vertex = vertex[start:end]
+            f.uv = uv[start:end] if uv[start] >= 0 else []
+            f.normal = normal[start:end] if normal[start] >= 0 else []
+            faces.append(f)
+            start = end
+        return faces
+
+
+class _Pool:
+    "internal (N,3) float32 array that can be appended to, the capacity doubles so appending is cheap"
+
+    def __init__(self):
+        self._data = np.zeros((0, 3), dtype=np.float32)
+        self.size = 0
+
+    def extend(self, values):
+        end = self.size + len(values)
+        if end > len(self._data):
+            grown = np.empty((max(end, 2 * len(self._data)), 3), dtype=np.float32)
+            grown[: self.size] = self._data[: self.size]
+            self._data = grown
+        self._data[self.size : end] = values
+        self.size = end
+
+    @property
+    def values(self):
+        return self._data[: self.size]
+
+
+def iter_triangles(blocks, bounds=None):
+    """
+    Convert parsed blocks to the interleaved x,y,z,nx,ny,nz,u,v float32 triangle data used by
+    BaseMesh.create_vao (v is flipped for OpenGL), quads and polygons are split into triangles
+    (see triangulate.triangulate_faces). Only the vertices, normals and uvs are kept between
+    blocks, the faces are converted and dropped one block at a time.
+
+    Args:
+        blocks (iterable): ObjArrays blocks in file order e.g. from ObjArrays.iter_blocks.
+        bounds (numpy.ndarray, optional): (2,3) array set to the min and max of the vertices once
+            all of the blocks have been used.
+
+    Yields:
+        numpy.ndarray: (N,8) float32 vertex data for the faces of each block.
+    """
+    for _, data, _ in _triangle_blocks(blocks, bounds):
+        yield data
+
+
+def _triangle_blocks(blocks, bounds):
+    """
+    internal generator for iter_triangles which also gives the block each set of data is from
+    and the face of the block each vertex of the data is from
+    """
+    vertex, normals, uv = _Pool(), _Pool(), _Pool()
+    for block in blocks:
+        vertex.extend(block.vertex)
+        normals.extend(block.normals)
+        uv.extend(block.uv)
+        if len(block.face_sizes) == 0:
+            continue
+        if block.is_triangular():
+            corners = np.arange(len(block.face_vertex))
+            faces = np.repeat(np.arange(len(block.face_sizes)), 3)
+        else:
+            corners, faces = triangulate_faces(
+                vertex.values, block.face_vertex, block.face_sizes
+            )
+            corners = corners.reshape(-1)
+            faces = np.repeat(faces, 3)
+        data = np.zeros((len(corners), 8), dtype=np.float32)
+        data[:, :3] = vertex.values[block.face_vertex[corners]]
+        index = block.face_normal[corners]
+        used = index >= 0
+        data[used, 3:6] = normals.values[index[used]]
+        index = block.face_uv[corners]
+        used = index >= 0
+        data[used, 6:8] = uv.values[index[used], :2]
+        data[used, 7] = 1.0 - data[used, 7]
+        yield block, data, faces
+    if bounds is not None and vertex.size:
+        bounds[0] = vertex.values.min(axis=0)
+        bounds[1] = vertex.values.max(axis=0)
+
+
+def write_triangles(file, sink, block_size=None, memory_limit=None):
+    """
+    Stream an OBJ file to raw interleaved triangle data (see iter_triangles) without loading the
+    whole file, the data can be read back with numpy.fromfile or numpy.memmap. The triangles are
+    grouped by material in the order each is first used by a face, the first material goes
+    straight to the sink and the others are staged in temporary files.
+
+    Args:
+        file (str | os.PathLike | file object): Path to the OBJ file or a file opened in binary mode.
+        sink (file object): Binary file to write the float32 data to.
+        block_size (int, optional): The number of bytes read for each block.
+        memory_limit (int, optional): Approximate ceiling in bytes on the memory used to parse each block.
+
+    Returns:
+        tuple: The number of vertices written, a (2,3) float32 array of the min and max vertex
+            position (all zero if there are no vertices) and a list of (material name, first
+            vertex, vertex count) for each material like BaseMesh.draw_ranges, empty if the
+            file doesn't use materials.
+    """
+    bounds = np.zeros((2, 3), dtype=np.float32)
+    counts = {}
+    spools = {}
+    materials = []
+    blocks = ObjArrays.iter_blocks(file, block_size, memory_limit)
+    try:
+        for block, data, faces in _triangle_blocks(blocks, bounds):
+            corner_material = block.face_material[faces]
+            # unique sorts the values so put them back in the order they are used
+            used, first_use = np.unique(corner_material, return_index=True)
+            for material in used[np.argsort(first_use)].tolist():
+                if len(used) > 1:
+                    part = data[corner_material == material]
+                else:
+                    part = data
+                if material not in counts:
+                    counts[material] = 0
+                    if len(counts) > 1:  # the first material goes straight to the sink
+                        spools[material] = tempfile.TemporaryFile()
+                spools.get(material, sink).write(part)
+                counts[material] += len(part)
+            materials = block.materials
+        for spool in spools.values():
+            spool.seek(0)
+            shutil.copyfileobj(spool, sink)
+    finally:
+        for spool in spools.values():
+            spool.close()
+    ranges = []
+    first = 0
+    for material, count in counts.items():
+        name = materials[material] if material >= 0 else None
+        ranges.append((name, first, count))
+        first += count
+    if list(counts) == [-1]:
+        ranges = []
+    return first, bounds, ranges
+
+
+def _is_compressed(path):
+    "internal function to check if a path has the extension of a compressed file"
+    return os.path.splitext(path)[1].lower() in _decompressors
+
+
+def _byte_ranges(path, workers):
+    """
+    internal function to split a file into newline aligned (start, end) byte ranges for parallel
+    parsing, there are at least as many as workers unless the file is small or compressed (which
+    gives a single range) and each is at most _block_size bytes (plus the end of the last line) so
+    the memory used by each worker is bounded
+    """
+    size = os.path.getsize(path)
+    if size < _parallel_min_size or _is_compressed(path):
+        return [(0, size)]
+    step = min(_block_size, -(-size // workers))
+    starts = [0]
+    with open(path, "rb") as obj_file:
+        position = step
+        while position < size:
+            # move the split to the start of the next line
+            obj_file.seek(position)
+            position += len(obj_file.readline())
+            if position >= size:
+                break
+            starts.append(position)
+            position += step
+    return list(zip(starts, starts[1:] + [size]))
+
+
+def _parse_range(path, start, end, dtype):
+    """
+    internal function run in a worker process to parse a byte range of a file, the arrays are
+    copied into a shared memory block so only its name and layout are pickled
+
+    Returns:
+        tuple: the shared memory name, a list of (attribute, dtype, shape, offset) for the arrays
+            and a dict of the small attributes that are pickled
+    """
+    with open(path, "rb") as obj_file:
+        obj_file.seek(start)
+        data = obj_file.read(end - start)
+    block = ObjArrays._parse_block(data, dtype=dtype, check=False)
+    del data
+    arrays = [
+        (name, getattr(block, name))
+        for name in _shared_arrays
+        if getattr(block, name) is not None
+    ]
+    shared = shared_memory.SharedMemory(
+        create=True, size=max(1, sum(array.nbytes for _, array in arrays))
+    )
+    layout = []
+    offset = 0
+    for name, array in arrays:
+        np.ndarray(array.shape, array.dtype, buffer=shared.buf, offset=offset)[...] = (
+            array
+        )
+        layout.append((name, array.dtype.str, array.shape, offset))
+        offset += array.nbytes
+    # the parent process registers the block again when it attaches and unregisters it when it
+    # unlinks it so stop tracking it here, otherwise the tracker tries to free it a second time
+    resource_tracker.unregister(shared._name, "shared_memory")
+    shared.close()
+    return (
+        shared.name,
+        layout,
+        {name: getattr(block, name) for name in _pickled_attributes},
+    )
+
+
+def _read_shared(name, layout, attributes, dtype):
+    "internal function to copy the arrays returned by _parse_range out of shared memory and free it"
+    shared = shared_memory.SharedMemory(name=name)
+    try:
+        block = ObjArrays(dtype)
+        for attribute, value in attributes.items():
+            setattr(block, attribute, value)
+        for attribute, array_dtype, shape, offset in layout:
+            setattr(
+                block,
+                attribute,
+                np.ndarray(shape, array_dtype, buffer=shared.buf, offset=offset).copy(),
+            )
+        return block
+    finally:
+        shared.close()
+        shared.unlink()
+
+
+def _parse_parallel(
+    path, ranges, workers, dtype, vertex_offset, uv_offset, normal_offset
+):
+    """
+    internal function to parse byte ranges of a file in a process pool then merge the results,
+    negative face indices are rebased using the number of elements before each range
+    """
+    blocks = []
+    error = None
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_parse_range, path, start, end, np.dtype(dtype))
+            for start, end in ranges
+        ]
+        # wait for all of them even if one fails so every shared memory block is freed
+        for future in futures:
+            try:
+                blocks.append(_read_shared(*future.result(), dtype))
+            except Exception as e:
+                error = error or e
+    if error is not None:
+        raise error
+    offsets = [vertex_offset, uv_offset, normal_offset]
+    for block in blocks:
+        if block._negative is not None:
+            indices = (block.face_vertex, block.face_uv, block.face_normal)
+            for index, offset, negative in zip(indices, offsets, block._negative):
+                index[negative] += offset
+                if np.any(index[negative] < 0):
+                    raise ObjParseFaceError
+            block._negative = None
+        offsets[0] += len(block.vertex)
+        offsets[1] += len(block.uv)
+        offsets[2] += len(block.normals)
+    return ObjArrays.concatenate(_resolve_blocks(blocks))
@@ -0,0 +1,134 @@
+"""
+Fast OBJ writing from numpy arrays. Rather than formatting each value with its own call a chunk of
+rows is formatted with a single % operation and written as one buffer, optionally gzip compressed.
+"""
+
+import gzip
+import os
+
+import numpy as np
+
+# rows formatted in each % operation, bounds the temporary memory used
+_chunk_rows = 1 << 16
+# face corner formats indexed by has uv + 2 * has normal
+_corner_formats = ("%d", "%d/%d", "%d//%d", "%d/%d/%d")
+
+
+def _float_format(dtype, precision):
+    """
+    internal function to get the % format for a float type, by default the shortest text that
+    reads back as the same float64 (the same as the old per value writer) or 9 significant digits
+    which is enough to read back the same float32
+    """
+    if precision is not None:
+        return f"%.{precision}g"
+    return "%.9g" if np.dtype(dtype).itemsize <= 4 else "%r"
+
+
+def _write_rows(out, row, values, rows_per_line=1):
+    "internal function to write values formatted with row, each row uses rows_per_line rows of values"
+    chunk = _chunk_rows * rows_per_line
+    for start in range(0, len(values), chunk):
+        part = values[start : start + chunk]
+        text = row * (len(part) // rows_per_line) % tuple(part.ravel().tolist())
+        out.write(text.encode())
+
+
+def _write_faces(out, arrays):
+    """
+    internal function to write the f lines along with the o, g and usemtl lines where they change,
+    faces are written in runs with the same size, format and state so each run is formatted in bulk
+    """
+    sizes = arrays.face_sizes.astype(np.int64)
+    if len(sizes) == 0:
+        return
+    offsets = arrays.face_offsets
+    kind = (arrays.face_uv[offsets] >= 0) + 2 * (arrays.face_normal[offsets] >= 0)
+    tables = (
+        ("o", arrays.objects, arrays.face_object),
+        ("g", arrays.groups, arrays.face_group),
+        ("usemtl", arrays.materials, arrays.face_material),
+    )
+    tables = [t for t in tables if len(t[2]) == len(sizes)]
+    change = np.ones(len(sizes), dtype=bool)
+    change[1:] = (sizes[1:] != sizes[:-1]) | (kind[1:] != kind[:-1])
+    for _, _, face_state in tables:
+        change[1:] |= face_state[1:] != face_state[:-1]
+    starts = np.flatnonzero(change).tolist()
+    ends = starts[1:] + [len(sizes)]
+    # obj indices start at 1
+    columns = (arrays.face_vertex + 1, arrays.face_uv + 1, arrays.face_normal + 1)
+    current = [-1] * len(tables)
+    for start, end in zip(starts, ends):
+        for i, (keyword, names, face_state) in enumerate(tables):
+            state = int(face_state[start])
+            if state != current[i] and state >= 0:
+                out.write(f"{keyword} {names[state]}\n".encode())
+            current[i] = state
+        size = int(sizes[start])
+        face_kind = int(kind[start])
+        corners = slice(offsets[start], offsets[end - 1] + size)
+        used = [columns[0]] + [
+            column
+            for bit, column in ((1, columns[1]), (2, columns[2]))
+            if face_kind & bit
+        ]
+        values = np.stack([column[corners] for column in used], axis=1)
+        row = "f" + (" " + _corner_formats[face_kind]) * size + "\n"
+        _write_rows(out, row, values, size)
+
+
+def _write(out, arrays, precision, header):
+    "internal function to write the OBJ text for save_arrays to a binary file"
+    if header:
+        out.write(f"# {header}\n".encode())
+    if arrays.material_libs:
+        out.write(f"mtllib {' '.join(arrays.material_libs)}\n".encode())
+    value = _float_format(arrays.vertex.dtype, precision)
+    vertex = arrays.vertex
+    width = 3
+    if arrays.colour is not None and len(arrays.colour) == len(vertex):
+        # the non standard x y z r g b colour format
+        vertex = np.hstack((vertex, arrays.colour))
+        width = 6
+    _write_rows(out, "v" + f" {value}" * width + "\n", vertex)
+    # some DCC's use 3 values for uv so only write them if they are used
+    width = 3 if np.any(arrays.uv[:, 2] != 0.0) else 2
+    _write_rows(out, "vt" + f" {value}" * width + "\n", arrays.uv[:, :width])
+    _write_rows(out, "vn" + f" {value}" * 3 + "\n", arrays.normals)
+    _write_faces(out, arrays)
+
+
+def save_arrays(
+    file, arrays, precision=None, compress=None, compresslevel=6, header=None
+) -> None:
+    """
+    Write ObjArrays to an OBJ file.
+
+    Args:
+        file (str | os.PathLike | file object): Path to write to or a file opened in binary mode.
+        arrays (ObjArrays): The data to write, faces use the v, v/vt, v//vn or v/vt/vn format
+            depending on the uv and normal indices of their first corner.
+        precision (int, optional): Significant digits for the values, by default enough to read
+            back exactly the same values.
+        compress (bool, optional): If True gzip the output, defaults to True for paths ending in .gz.
+        compresslevel (int, optional): The gzip compression level. Defaults to 6.
+        header (str, optional): A comment written at the start of the file.
+    """
+    if not isinstance(file, (str, os.PathLike)):
+        if compress:
+            with gzip.GzipFile(
+                fileobj=file, mode="wb", compresslevel=compresslevel
+            ) as out:
+                _write(out, arrays, precision, header)
+        else:
+            _write(file, arrays, precision, header)
+        return
+    if compress is None:
+        compress = os.fspath(file).endswith(".gz")
+    if compress:
+        with gzip.open(file, "wb", compresslevel=compresslevel) as out:
+            _write(out, arrays, precision, header)
+    else:
+        with open(file, "wb", buffering=1 << 20) as out:
+            _write(out, arrays, precision, header)
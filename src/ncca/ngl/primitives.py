@@ -13,7 +13,9 @@ from typing import Dict, Union
 import numpy as np
 import OpenGL.GL as gl
 
+from . import mesh_quantize
 from .log import logger
+from .mat4 import Mat4
 from .simple_vao import VertexData
 from .vao_factory import VAOFactory, VAOType  # noqa
 from .vec3 import Vec3
@@ -69,15 +71,24 @@ def _circle_table(n: int) -> np.ndarray:
 class _primitive:
     """A private class to hold VAO data for a primitive."""
 
-    def __init__(self, prim_data: np.ndarray):
+    def __init__(self, prim_data: np.ndarray, compact: bool = False):
         """
         Initializes the primitive with the given data.
 
         Args:
             prim_data: A numpy array containing the vertex data (x,y,z,nx,ny,nz,u,v).
+            compact: If True upload the compact vertex format, see mesh_quantize.
         """
         self.vao = VAOFactory.create_vao(VAOType.SIMPLE, gl.GL_TRIANGLES)
+        # the matrix for the dequantize uniform of compact data
+        self.dequantize = None
         with self.vao:
+            if compact:
+                packed, self.dequantize = mesh_quantize.pack_compact(prim_data)
+                self.vao.set_data(VertexData(packed.view(np.uint8), len(packed)))
+                mesh_quantize.set_compact_attribute_pointers(self.vao)
+                self.vao.set_num_indices(len(packed))
+                return
             data = VertexData(data=prim_data.data, size=prim_data.size)
             self.vao.set_data(data)
             vert_data_size = 8 * 4  # 4 is sizeof float and 8 is x,y,z,nx,ny,nz,uv
@@ -98,23 +109,55 @@ class Primitives:
     # and generate pipelines for drawing
     _primitives: Dict[str, _primitive] = {}
     _loaded: bool = False
+    # the format the default primitives were loaded in
+    _compact: bool = False
 
     @classmethod
-    def load_default_primitives(cls) -> None:
-        """Loads the default primitives from the PrimData directory."""
+    def load_default_primitives(cls, compact: bool = False) -> None:
+        """
+        Loads the default primitives from the PrimData directory.
+
+        Args:
+            compact: If True use the compact vertex format (see mesh_quantize), draw them with a
+                shader such as DefaultShader.COMPACT_DIFFUSE and set its dequantize uniform to
+                Primitives.dequantize(name). If the defaults are already loaded in the other
+                format they are loaded again.
+        """
         logger.info("Loading default primitives...")
+        if cls._loaded and compact != cls._compact:
+            logger.info(f"Reloading default primitives with {compact=}")
+            cls._loaded = False
         if not cls._loaded:
             prim_folder = Path(__file__).parent / "PrimData"
             prims = np.load(prim_folder / "Primitives.npz")
             for p in prims.items():
+                old = cls._primitives.get(p[0])
+                if old is not None:
+                    old.vao.remove_vao()
                 prim_data = p[1]
-                prim = _primitive(prim_data)
+                prim = _primitive(prim_data, compact)
                 cls._primitives[p[0]] = prim
             cls._loaded = True
+            cls._compact = compact
+
+    @classmethod
+    def dequantize(cls, name: Union[str, Prims]) -> Mat4 | None:
+        """
+        Get the matrix for the dequantize uniform of a compact primitive.
+
+        Args:
+            name: The name of the primitive, either as a string or a Prims enum.
+
+        Returns:
+            Mat4 | None: The matrix, None if the primitive isn't compact or doesn't exist.
+        """
+        key = name.value if isinstance(name, Prims) else name
+        prim = cls._primitives.get(key)
+        return prim.dequantize if prim is not None else None
 
     @classmethod
     def create_line_grid(
-        cls, name: str, width: float, depth: float, steps: int
+        cls, name: str, width: float, depth: float, steps: int, compact: bool = False
     ) -> None:
         """
         Creates a line grid primitive.
@@ -124,6 +167,7 @@ class Primitives:
             width: The width of the grid.
             depth: The depth of the grid.
             steps: The number of steps in the grid.
+            compact: If True use the compact vertex format, see load_default_primitives.
         """
         # Calculate the step size for each grid value
         wstep = width / steps
@@ -154,12 +198,24 @@ class Primitives:
 
         # Convert the list to a NumPy array
         data_array = np.array(data, dtype=np.float32)
-        prim = _primitive(data_array)
+        if compact:
+            # the compact format packs x,y,z,nx,ny,nz,u,v so add empty normals and uvs
+            data_array = np.hstack(
+                (data_array, np.zeros((len(data_array), 5), np.float32))
+            )
+        prim = _primitive(data_array, compact)
         cls._primitives[name] = prim
 
     @classmethod
     def create_triangle_plane(
-        cls, name: str, width: float, depth: float, w_p: int, d_p: int, v_n: Vec3
+        cls,
+        name: str,
+        width: float,
+        depth: float,
+        w_p: int,
+        d_p: int,
+        v_n: Vec3,
+        compact: bool = False,
     ) -> None:
         """
         Creates a triangle plane primitive.
@@ -171,6 +227,7 @@ class Primitives:
             w_p: The number of width partitions.
             d_p: The number of depth partitions.
             v_n: The normal vector for the plane.
+            compact: If True use the compact vertex format, see load_default_primitives.
         """
         w2 = width / 2.0
         d2 = depth / 2.0
@@ -212,7 +269,7 @@ class Primitives:
             d += d_step
 
         data_array = np.array(data, dtype=np.float32)
-        prim = _primitive(data_array)
+        prim = _primitive(data_array, compact)
         cls._primitives[name] = prim
 
     @classmethod
@@ -233,7 +290,9 @@ class Primitives:
             return
 
     @classmethod
-    def create_sphere(cls, name: str, radius: float, precision: int) -> None:
+    def create_sphere(
+        cls, name: str, radius: float, precision: int, compact: bool = False
+    ) -> None:
         """
         Creates a sphere primitive.
 
@@ -241,6 +300,7 @@ class Primitives:
             name: The name of the primitive.
             radius: The radius of the sphere.
             precision: The precision of the sphere (number of slices).
+            compact: If True use the compact vertex format, see load_default_primitives.
         """
         # Sphere code based on a function Written by Paul Bourke.
         # http://astronomy.swin.edu.au/~pbourke/opengl/sphere/
@@ -311,12 +371,18 @@ class Primitives:
                 data.append([x3, y3, z3, nx3, ny3, nz3, u3, v3])
 
         data_array = np.array(data, dtype=np.float32)
-        prim = _primitive(data_array)
+        prim = _primitive(data_array, compact)
         cls._primitives[name] = prim
 
     @classmethod
     def create_cone(
-        cls, name: str, base: float, height: float, slices: int, stacks: int
+        cls,
+        name: str,
+        base: float,
+        height: float,
+        slices: int,
+        stacks: int,
+        compact: bool = False,
     ) -> None:
         """
         Creates a cone primitive.
@@ -327,6 +393,7 @@ class Primitives:
             height: The height of the cone.
             slices: The number of divisions around the cone.
             stacks: The number of divisions along the cone's height.
+            compact: If True use the compact vertex format, see load_default_primitives.
         """
         z_step = height / (stacks if stacks > 0 else 1)
         r_step = base / (stacks if stacks > 0 else 1)
@@ -430,19 +497,25 @@ class Primitives:
             r1 -= r_step
 
         data_array = np.array(data, dtype=np.float32)
-        prim = _primitive(data_array)
+        prim = _primitive(data_array, compact)
         cls._primitives[name] = prim
 
     @classmethod
     def create_capsule(
-        cls, name: str, radius: float, height: float, precision: int
+        cls,
+        name: str,
+        radius: float,
+        height: float,
+        precision: int,
+        compact: bool = False,
     ) -> None:
         """
         Creates a capsule primitive.
         The capsule is aligned along the y-axis.
         It is composed of a cylinder and two hemispherical caps.
         based on code from here https://code.google.com/p/rgine/source/browse/trunk/RGine/opengl/src/RGLShapes.cpp
-        and adapted
+        and adapted, if compact is True the compact vertex format is used (see
+        load_default_primitives)
         """
         if radius <= 0.0:
             raise ValueError("Radius must be positive")
@@ -511,17 +584,24 @@ class Primitives:
                     data.extend([nx, ny + o, nz, nx, ny, nz, 0.0, 0.0])
 
         data_array = np.array(data, dtype=np.float32)
-        prim = _primitive(data_array)
+        prim = _primitive(data_array, compact)
         cls._primitives[name] = prim
 
     @classmethod
     def create_cylinder(
-        cls, name: str, radius: float, height: float, slices: int, stacks: int
+        cls,
+        name: str,
+        radius: float,
+        height: float,
+        slices: int,
+        stacks: int,
+        compact: bool = False,
     ) -> None:
         """
         Creates a cylinder primitive.
         The cylinder is aligned along the y-axis.
         This method generates the cylinder walls, but not the top and bottom caps.
+        If compact is True the compact vertex format is used, see load_default_primitives.
         """
         if radius <= 0.0:
             raise ValueError("Radius must be positive")
@@ -569,11 +649,13 @@ class Primitives:
                 data.extend(p_tr)
 
         data_array = np.array(data, dtype=np.float32)
-        prim = _primitive(data_array)
+        prim = _primitive(data_array, compact)
         cls._primitives[name] = prim
 
     @classmethod
-    def create_disk(cls, name: str, radius: float, slices: int) -> None:
+    def create_disk(
+        cls, name: str, radius: float, slices: int, compact: bool = False
+    ) -> None:
         """
         Creates a disk primitive.
 
@@ -581,6 +663,7 @@ class Primitives:
             name: The name of the primitive.
             radius: The radius of the disk.
             slices: The number of slices to divide the disk into.
+            compact: If True use the compact vertex format, see load_default_primitives.
         """
         if radius <= 0.0:
             raise ValueError("Radius must be positive")
@@ -619,7 +702,7 @@ class Primitives:
             data.extend(p1)
 
         data_array = np.array(data, dtype=np.float32)
-        prim = _primitive(data_array)
+        prim = _primitive(data_array, compact)
         cls._primitives[name] = prim
 
     @classmethod
@@ -630,6 +713,7 @@ class Primitives:
         major_radius: float,
         sides: int,
         rings: int,
+        compact: bool = False,
     ) -> None:
         """
         Creates a torus primitive.
@@ -640,6 +724,7 @@ class Primitives:
             major_radius: The major radius of the torus.
             sides: The number of sides for each ring.
             rings: The number of rings for the torus.
+            compact: If True use the compact vertex format, see load_default_primitives.
         """
         if minor_radius <= 0 or major_radius <= 0:
             raise ValueError("Radii must be positive")
@@ -702,5 +787,5 @@ class Primitives:
                 data.extend(p4)
 
         data_array = np.array(data, dtype=np.float32)
-        prim = _primitive(data_array)
+        prim = _primitive(data_array, compact)
         cls._primitives[name] = prim
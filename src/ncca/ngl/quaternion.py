@@ -8,8 +8,14 @@ Attributes:
 """
 
 import math
+import struct
 
-from .mat4 import Mat4
+import numpy as np
+
+from .mat4 import Mat4, Mat4Type
+from .mat4_array import _rot_order
+
+_pack = struct.Struct("4f").pack
 
 
 class Quaternion:
@@ -44,9 +50,11 @@ class Quaternion:
 
         """
         matrix = mat.get_matrix()
-        T = 1.0 + matrix[0] + matrix[5] + matrix[10]
-        if T > 0.00000001:  # to avoid large distortions!
-            scale = math.sqrt(T) * 2.0
+        trace = matrix[0] + matrix[5] + matrix[10]
+        # use the largest of the trace and the diagonal (Shepperd's method) so the square root
+        # and the divisions are well conditioned, the trace on its own fails near 180 degrees
+        if trace >= max(matrix[0], matrix[5], matrix[10]):
+            scale = math.sqrt(1.0 + trace) * 2.0
             x = (matrix[6] - matrix[9]) / scale
             y = (matrix[8] - matrix[2]) / scale
             z = (matrix[1] - matrix[4]) / scale
@@ -74,6 +82,134 @@ class Quaternion:
 
         return Quaternion(s, x, y, z)
 
+    @staticmethod
+    def from_euler(x: float, y: float, z: float, order: str = "xyz") -> "Quaternion":
+        """
+        Creates a new Quaternion from Euler angles.
+
+        Args:
+            x (float): Rotation around the X axis in degrees.
+            y (float): Rotation around the Y axis in degrees.
+            z (float): Rotation around the Z axis in degrees.
+            order (str): The rotation order as used by Transform e.g. "xyz" or "zyx".
+
+        Returns:
+            Quaternion: A new Quaternion, to_mat4 of this matches Transform for the same order.
+
+        Raises:
+            ValueError: If the order is unknown.
+        """
+        if order not in _rot_order:
+            raise ValueError(f"unknown rotation order {order}")
+        angles = {"x": x, "y": y, "z": z}
+        result = Quaternion()
+        for axis in _rot_order[order]:
+            half = math.radians(angles[axis]) * 0.5
+            q = Quaternion(math.cos(half))
+            setattr(q, axis, math.sin(half))
+            result = result * q
+        return result
+
+    @staticmethod
+    def slerp(a: "Quaternion", b: "Quaternion", t: float) -> "Quaternion":
+        """
+        Spherical linear interpolation between two unit Quaternions along the shortest path.
+
+        Args:
+            a (Quaternion): The start rotation (t=0).
+            b (Quaternion): The end rotation (t=1).
+            t (float): The interpolation value.
+
+        Returns:
+            Quaternion: A new unit Quaternion.
+        """
+        cos_theta = a.dot(b)
+        sign = 1.0
+        if cos_theta < 0.0:
+            cos_theta = -cos_theta
+            sign = -1.0
+        if cos_theta > 0.9995:
+            # very close so the lerp is accurate and avoids the divide by sin(theta)
+            wa = 1.0 - t
+            wb = t * sign
+        else:
+            theta = math.acos(cos_theta)
+            sin_theta = math.sin(theta)
+            wa = math.sin((1.0 - t) * theta) / sin_theta
+            wb = math.sin(t * theta) / sin_theta * sign
+        return Quaternion(
+            wa * a.s + wb * b.s,
+            wa * a.x + wb * b.x,
+            wa * a.y + wb * b.y,
+            wa * a.z + wb * b.z,
+        ).normalize()
+
+    def dot(self, rhs: "Quaternion") -> float:
+        """
+        Calculates the dot product of two Quaternions.
+
+        Args:
+            rhs (Quaternion): The other Quaternion.
+
+        Returns:
+            float: The dot product.
+        """
+        return self.s * rhs.s + self.x * rhs.x + self.y * rhs.y + self.z * rhs.z
+
+    def length(self) -> float:
+        """
+        Calculates the length (magnitude) of the Quaternion.
+
+        Returns:
+            float: The length.
+        """
+        return math.sqrt(
+            self.s * self.s + self.x * self.x + self.y * self.y + self.z * self.z
+        )
+
+    def normalize(self) -> "Quaternion":
+        """
+        Normalizes the Quaternion to unit length in place.
+
+        Returns:
+            Quaternion: This Quaternion.
+
+        Raises:
+            ZeroDivisionError: If the length of the Quaternion is zero.
+        """
+        length = self.length()
+        try:
+            self.s /= length
+            self.x /= length
+            self.y /= length
+            self.z /= length
+        except ZeroDivisionError:
+            raise ZeroDivisionError("Quaternion.normalize length is zero")
+        return self
+
+    def to_mat4(self) -> "Mat4":
+        """
+        Converts a unit Quaternion to a rotation matrix, this is the inverse of from_mat4.
+
+        Returns:
+            Mat4: A new rotation matrix.
+        """
+        s, x, y, z = self.s, self.x, self.y, self.z
+        xx, yy, zz = x * x, y * y, z * z
+        xy, xz, yz = x * y, x * z, y * z
+        sx, sy, sz = s * x, s * y, s * z
+        # Mat4 is row vector layout so this is the transpose of the usual column form
+        result = Mat4.from_list(
+            [
+                [1.0 - 2.0 * (yy + zz), 2.0 * (xy + sz), 2.0 * (xz - sy), 0.0],
+                [2.0 * (xy - sz), 1.0 - 2.0 * (xx + zz), 2.0 * (yz + sx), 0.0],
+                [2.0 * (xz + sy), 2.0 * (yz - sx), 1.0 - 2.0 * (xx + yy), 0.0],
+                [0.0, 0.0, 0.0, 1.0],
+            ]
+        )
+        result.matrix_type = Mat4Type.RIGID
+        return result
+
     def __add__(self, rhs):
         return Quaternion(
             self.s + rhs.s, self.x + rhs.x, self.y + rhs.y, self.z + rhs.z
@@ -95,6 +231,8 @@ class Quaternion:
         return self.__sub__(rhs)
 
     def __mul__(self, rhs):
+        if not isinstance(rhs, Quaternion):
+            return NotImplemented  # lets QuaternionArray handle q * array
         return Quaternion(
             self.s * rhs.s - self.x * rhs.x - self.y * rhs.y - self.z * rhs.z,
             self.s * rhs.x + self.x * rhs.s + self.y * rhs.z - self.z * rhs.y,
@@ -102,6 +240,28 @@ class Quaternion:
             self.s * rhs.z + self.x * rhs.y - self.y * rhs.x + self.z * rhs.s,
         )
 
+    def tobytes(self) -> bytes:
+        """
+        Packs the Quaternion as float32 values in s, x, y, z order.
+
+        Returns:
+            bytes: The 4 packed float32 values.
+
+        """
+        return _pack(self.s, self.x, self.y, self.z)
+
+    def __buffer__(self, flags):
+        """
+        Buffer protocol (python 3.12+) so memoryview(q) can read the packed float32 values.
+        """
+        return memoryview(self.tobytes()).cast("f")
+
+    def __array__(self, dtype=None, copy=None):
+        """
+        NumPy array protocol so np.asarray(q) gives a float32 array in s, x, y, z order.
+        """
+        return np.array((self.s, self.x, self.y, self.z), dtype=dtype or np.float32)
+
     def __str__(self) -> str:
         """
         Returns a string representation of the Quaternion.
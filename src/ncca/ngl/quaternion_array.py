@@ -0,0 +1,367 @@
+"""
+A container for batches of ngl.Quaternion values held in a single (N,4) float32 numpy array
+in s, x, y, z order (the same order as Quaternion).
+
+All operations are vectorized so whole skeletons or crowds can be processed in a few numpy calls.
+"""
+
+import numpy as np
+
+from .mat4_array import Mat4Array, _rot_order
+from .quaternion import Quaternion
+
+
+class QuaternionArray:
+    """
+    A class to hold an array of Quaternions and perform batched operations on them.
+    """
+
+    def __init__(self, values=None):
+        """
+        Initializes the QuaternionArray.
+
+        Args:
+            values (iterable | int | numpy.ndarray, optional): An iterable of Quaternion objects,
+                an integer or a numpy array of shape (N,4). If an integer, the array is initialized
+                with that many identity Quaternions. Defaults to None (an empty array).
+        """
+        if values is None:
+            self._data = np.zeros((0, 4), dtype=np.float32)
+        elif isinstance(values, int):
+            self._data = np.tile(
+                np.array([1.0, 0.0, 0.0, 0.0], dtype=np.float32), (values, 1)
+            )
+        elif isinstance(values, np.ndarray):
+            if values.size % 4 != 0:
+                raise ValueError("array size must be a multiple of 4")
+            self._data = np.array(values, dtype=np.float32).reshape(-1, 4)
+        else:
+            rows = []
+            for q in values:
+                if not isinstance(q, Quaternion):
+                    raise TypeError("All elements must be of type Quaternion")
+                rows.append((q.s, q.x, q.y, q.z))
+            self._data = np.array(rows, dtype=np.float32).reshape(-1, 4)
+
+    @classmethod
+    def _from_array(cls, array):
+        "internal method to wrap an existing (N,4) float32 array without copying"
+        v = cls.__new__(cls)
+        v._data = array
+        return v
+
+    @staticmethod
+    def _operand(value):
+        "internal method to get an (N,4) or (4,) array from a QuaternionArray or Quaternion"
+        if isinstance(value, QuaternionArray):
+            return value._data
+        elif isinstance(value, Quaternion):
+            return np.array((value.s, value.x, value.y, value.z), dtype=np.float32)
+        return None
+
+    @classmethod
+    def from_euler(cls, angles, order: str = "xyz") -> "QuaternionArray":
+        """
+        Create an array of Quaternions from Euler angles.
+
+        Args:
+            angles (array_like): (N,3) x,y,z rotations in degrees.
+            order (str): rotation order as used by Transform e.g. "xyz" or "zyx".
+
+        Returns:
+            QuaternionArray: N unit Quaternions, element i matches Quaternion.from_euler(*angles[i], order).
+
+        Raises:
+            ValueError: If the order is unknown.
+        """
+        if order not in _rot_order:
+            raise ValueError(f"unknown rotation order {order}")
+        half = np.radians(np.asarray(angles, dtype=np.float64).reshape(-1, 3)) * 0.5
+        result = np.zeros((len(half), 4), dtype=np.float32)
+        result[:, 0] = 1.0
+        for axis in _rot_order[order]:
+            index = "xyz".index(axis)
+            q = np.zeros_like(result)
+            q[:, 0] = np.cos(half[:, index])
+            q[:, index + 1] = np.sin(half[:, index])
+            result = cls._mul(result, q)
+        return cls._from_array(result)
+
+    @classmethod
+    def from_mat4(cls, matrices) -> "QuaternionArray":
+        """
+        Create an array of Quaternions from rotation matrices, this uses the same method as
+        Quaternion.from_mat4 for each element.
+
+        Args:
+            matrices (Mat4Array | numpy.ndarray | iterable): (N,4,4) matrices or Mat4 objects.
+
+        Returns:
+            QuaternionArray: N Quaternions.
+        """
+        if isinstance(matrices, Mat4Array):
+            m = matrices.to_numpy()
+        elif isinstance(matrices, np.ndarray):
+            m = matrices.reshape(-1, 4, 4)
+        else:
+            m = Mat4Array(matrices).to_numpy()
+        m = m.astype(np.float64)
+        m00, m11, m22 = m[:, 0, 0], m[:, 1, 1], m[:, 2, 2]
+        trace = m00 + m11 + m22
+        # the same four branches as Quaternion.from_mat4 picked per element, the last is the default
+        case_t = trace >= np.maximum(np.maximum(m00, m11), m22)
+        case_x = ~case_t & (m00 > m11) & (m00 > m22)
+        case_y = ~case_t & ~case_x & (m11 > m22)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scale = np.select(
+                [case_t, case_x, case_y],
+                [
+                    np.sqrt(1.0 + trace) * 2.0,
+                    np.sqrt(1.0 + m00 - m11 - m22) * 2.0,
+                    np.sqrt(1.0 + m11 - m00 - m22) * 2.0,
+                ],
+                np.sqrt(1.0 + m22 - m00 - m11) * 2.0,
+            )
+        m01, m02, m10 = m[:, 0, 1], m[:, 0, 2], m[:, 1, 0]
+        m12, m20, m21 = m[:, 1, 2], m[:, 2, 0], m[:, 2, 1]
+        result = np.empty((len(m), 4), dtype=np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result[:, 0] = np.select(
+                [case_t, case_x, case_y],
+                [0.25 * scale, (m12 - m21) / scale, (m20 - m02) / scale],
+                (m01 - m10) / scale,
+            )
+            result[:, 1] = np.select(
+                [case_t, case_x, case_y],
+                [(m12 - m21) / scale, 0.25 * scale, (m10 + m01) / scale],
+                (m20 + m02) / scale,
+            )
+            result[:, 2] = np.select(
+                [case_t, case_x, case_y],
+                [(m20 - m02) / scale, (m10 + m01) / scale, 0.25 * scale],
+                (m21 + m12) / scale,
+            )
+            result[:, 3] = np.select(
+                [case_t, case_x, case_y],
+                [(m01 - m10) / scale, (m02 + m20) / scale, (m21 + m12) / scale],
+                0.25 * scale,
+            )
+        return cls._from_array(result.astype(np.float32))
+
+    @staticmethod
+    def _mul(a, b):
+        "internal batched Hamilton product of (N,4) or (4,) arrays, the same as Quaternion.__mul__"
+        s1, x1, y1, z1 = a[..., 0], a[..., 1], a[..., 2], a[..., 3]
+        s2, x2, y2, z2 = b[..., 0], b[..., 1], b[..., 2], b[..., 3]
+        return np.stack(
+            (
+                s1 * s2 - x1 * x2 - y1 * y2 - z1 * z2,
+                s1 * x2 + x1 * s2 + y1 * z2 - z1 * y2,
+                s1 * y2 - x1 * z2 + y1 * s2 + z1 * x2,
+                s1 * z2 + x1 * y2 - y1 * x2 + z1 * s2,
+            ),
+            axis=-1,
+        ).astype(np.float32, copy=False)
+
+    def __mul__(self, rhs):
+        """
+        Batched Quaternion multiplication.
+
+        Args:
+            rhs (QuaternionArray | Quaternion): Either an array of the same length (element wise) or
+                a single Quaternion applied to every element.
+
+        Returns:
+            QuaternionArray: self[i] * rhs[i] (or self[i] * rhs) for every element.
+        """
+        value = self._operand(rhs)
+        if value is None:
+            return NotImplemented
+        if value.ndim == 2 and len(value) != len(self):
+            raise ValueError("QuaternionArray sizes must match for multiplication")
+        return QuaternionArray._from_array(self._mul(self._data, value))
+
+    def __rmul__(self, lhs):
+        """
+        Batched multiplication with a single Quaternion on the left.
+
+        Args:
+            lhs (Quaternion): The Quaternion applied to every element.
+
+        Returns:
+            QuaternionArray: lhs * self[i] for every element.
+        """
+        if isinstance(lhs, Quaternion):
+            return QuaternionArray._from_array(
+                self._mul(self._operand(lhs), self._data)
+            )
+        return NotImplemented
+
+    def dot(self, rhs) -> np.ndarray:
+        """
+        dot product of every element with rhs
+
+        Args:
+            rhs (QuaternionArray | Quaternion): Either an array of the same length or a single Quaternion.
+
+        Returns:
+            numpy.ndarray: (N,) dot products.
+        """
+        value = self._operand(rhs)
+        if value is None:
+            raise TypeError(f"can't dot with {rhs=}")
+        return np.sum(self._data * value, axis=1, dtype=np.float32)
+
+    def length(self) -> np.ndarray:
+        """
+        length of every Quaternion
+
+        Returns:
+            numpy.ndarray: (N,) lengths.
+        """
+        return np.sqrt(np.einsum("ij,ij->i", self._data, self._data))
+
+    def normalize(self) -> "QuaternionArray":
+        """
+        Normalize every Quaternion to unit length in place.
+
+        Returns:
+            QuaternionArray: this array.
+
+        Raises:
+            ZeroDivisionError: If any of the Quaternions has zero length.
+        """
+        lengths = self.length()
+        if np.any(lengths == 0.0):
+            raise ZeroDivisionError(
+                "QuaternionArray.normalize array contains a zero length Quaternion"
+            )
+        self._data /= lengths[:, np.newaxis]
+        return self
+
+    @staticmethod
+    def slerp(a, b, t) -> "QuaternionArray":
+        """
+        Spherical linear interpolation along the shortest path, for every element.
+
+        Args:
+            a (QuaternionArray | Quaternion): The start rotations (t=0).
+            b (QuaternionArray | Quaternion): The end rotations (t=1).
+            t (float | array_like): A single interpolation value or one per element.
+
+        Returns:
+            QuaternionArray: The interpolated unit Quaternions.
+        """
+        qa = QuaternionArray._operand(a)
+        qb = QuaternionArray._operand(b)
+        if qa is None or qb is None:
+            raise TypeError("slerp needs QuaternionArray or Quaternion values")
+        qa, qb = np.broadcast_arrays(np.atleast_2d(qa), np.atleast_2d(qb))
+        t = np.asarray(t, dtype=np.float32)
+        t = t.reshape(-1, 1) if t.ndim else t
+        cos_theta = np.sum(qa * qb, axis=1, keepdims=True)
+        # take the shortest path
+        sign = np.where(cos_theta < 0.0, -1.0, 1.0).astype(np.float32)
+        cos_theta = np.abs(cos_theta)
+        theta = np.arccos(np.clip(cos_theta, 0.0, 1.0))
+        sin_theta = np.sin(theta)
+        # very close so lerp is accurate and avoids the divide by sin(theta)
+        close = cos_theta > 0.9995
+        safe_sin = np.where(close, 1.0, sin_theta)
+        wa = np.where(close, 1.0 - t, np.sin((1.0 - t) * theta) / safe_sin)
+        wb = np.where(close, t, np.sin(t * theta) / safe_sin) * sign
+        result = QuaternionArray._from_array((wa * qa + wb * qb).astype(np.float32))
+        return result.normalize()
+
+    def to_mat4_array(self) -> Mat4Array:
+        """
+        Convert every unit Quaternion to a rotation matrix, element i matches self[i].to_mat4().
+
+        Returns:
+            Mat4Array: N rotation matrices.
+        """
+        s, x, y, z = (
+            self._data[:, 0],
+            self._data[:, 1],
+            self._data[:, 2],
+            self._data[:, 3],
+        )
+        xx, yy, zz = x * x, y * y, z * z
+        xy, xz, yz = x * y, x * z, y * z
+        sx, sy, sz = s * x, s * y, s * z
+        m = np.zeros((len(self._data), 4, 4), dtype=np.float32)
+        # Mat4 is row vector layout so this is the transpose of the usual column form
+        m[:, 0, 0] = 1.0 - 2.0 * (yy + zz)
+        m[:, 0, 1] = 2.0 * (xy + sz)
+        m[:, 0, 2] = 2.0 * (xz - sy)
+        m[:, 1, 0] = 2.0 * (xy - sz)
+        m[:, 1, 1] = 1.0 - 2.0 * (xx + zz)
+        m[:, 1, 2] = 2.0 * (yz + sx)
+        m[:, 2, 0] = 2.0 * (xz + sy)
+        m[:, 2, 1] = 2.0 * (yz - sx)
+        m[:, 2, 2] = 1.0 - 2.0 * (xx + yy)
+        m[:, 3, 3] = 1.0
+        return Mat4Array._from_array(m)
+
+    def __getitem__(self, index):
+        """
+        Get the Quaternion at the specified index.
+
+        Args:
+            index (int | slice): The index of the element.
+
+        Returns:
+            Quaternion | QuaternionArray: A copy of the element or a QuaternionArray sharing the data for a slice.
+        """
+        if isinstance(index, (int, np.integer)):
+            return Quaternion(*self._data[index].tolist())
+        return QuaternionArray._from_array(self._data[index])
+
+    def __setitem__(self, index, value):
+        """
+        Set the Quaternion at the specified index.
+
+        Args:
+            index (int): The index of the element to set.
+            value (Quaternion): The new Quaternion.
+        """
+        if not isinstance(value, Quaternion):
+            raise TypeError("Only Quaternion objects can be assigned")
+        self._data[index] = (value.s, value.x, value.y, value.z)
+
+    def __len__(self):
+        """
+        Return the number of elements in the array.
+        """
+        return len(self._data)
+
+    def __iter__(self):
+        """
+        Return an iterator for the array, each element is a Quaternion copy.
+        """
+        for row in self._data.tolist():
+            yield Quaternion(*row)
+
+    def to_numpy(self):
+        """
+        Get the Quaternions as a numpy array, this is the backing store (no copy).
+
+        Returns:
+            numpy.ndarray: The (N,4) float32 array in s, x, y, z order.
+        """
+        return self._data
+
+    def __repr__(self):
+        return f"QuaternionArray({self._data.tolist()!r})"
+
+    def __str__(self):
+        return str(self._data.tolist())
+
+    def sizeof(self):
+        """
+        Return the size of the array in bytes.
+
+        Returns:
+            int: The size of the array in bytes.
+        """
+        return self._data.nbytes
@@ -19,6 +19,7 @@ class DefaultShader(enum.Enum):
     TEXT = "nglTextShader"
     DIFFUSE = "nglDiffuseShader"
     CHECKER = "nglCheckerShader"
+    COMPACT_DIFFUSE = "nglCompactDiffuseShader"
 
 
 class _ShaderLib:
@@ -422,6 +423,11 @@ class _ShaderLib:
                 "vertex": shader_folder / "checker_vertex.glsl",
                 "fragment": shader_folder / "checker_fragment.glsl",
             },
+            # diffuse shading of compact vertices, see mesh_quantize
+            DefaultShader.COMPACT_DIFFUSE: {
+                "vertex": shader_folder / "compact_diffuse_vertex.glsl",
+                "fragment": shader_folder / "diffuse_fragment.glsl",
+            },
         }
 
         # Load each default shader program
@@ -8,6 +8,7 @@ from .log import logger
 from .mat2 import Mat2
 from .mat3 import Mat3
 from .mat4 import Mat4
+from .mat4_array import Mat4Array
 from .shader import Shader
 from .vec2 import Vec2
 from .vec3 import Vec3
@@ -307,17 +308,12 @@ class ShaderProgram:
             elif isinstance(val, float):
                 gl.glUniform1f(loc, val)
             elif isinstance(val, Mat2):
-                gl.glUniformMatrix2fv(
-                    loc, 1, gl.GL_FALSE, (ctypes.c_float * 4)(*val.get_matrix())
-                )
+                # Mat2 is held in row order so let OpenGL transpose to the get_matrix layout
+                gl.glUniformMatrix2fv(loc, 1, gl.GL_TRUE, val.as_float32())
             elif isinstance(val, Mat3):
-                gl.glUniformMatrix3fv(
-                    loc, 1, gl.GL_FALSE, (ctypes.c_float * 9)(*val.get_matrix())
-                )
+                gl.glUniformMatrix3fv(loc, 1, gl.GL_FALSE, val.as_float32())
             elif isinstance(val, Mat4):
-                gl.glUniformMatrix4fv(
-                    loc, 1, gl.GL_FALSE, (ctypes.c_float * 16)(*val.get_matrix())
-                )
+                gl.glUniformMatrix4fv(loc, 1, gl.GL_FALSE, val.as_float32())
             elif isinstance(val, Vec2):
                 gl.glUniform2f(loc, *val)
             elif isinstance(val, Vec3):
@@ -434,10 +430,41 @@ class ShaderProgram:
         if loc != -1:
             gl.glUniform1iv(loc, len(values), (ctypes.c_int * len(values))(*values))
 
+    @staticmethod
+    def _pack_matrices(matrices: Any, size: int) -> np.ndarray:
+        """
+        Pack matrices into a single contiguous float32 buffer ready for glUniformMatrix*fv.
+
+        Args:
+            matrices: A Mat4Array, numpy array of matrices or a list of Mat objects / flat lists
+            size: The matrix dimension (2, 3 or 4)
+
+        Returns:
+            np.ndarray: An (N, size*size) float32 array, array input is not copied if already float32
+        """
+        if isinstance(matrices, Mat4Array):
+            matrices = matrices.to_numpy()
+        if isinstance(matrices, np.ndarray):
+            return np.ascontiguousarray(matrices, dtype=np.float32).reshape(
+                -1, size * size
+            )
+        if len(matrices) == 1 and isinstance(matrices[0], (Mat3, Mat4)):
+            # single matrix so we can use the storage directly
+            return matrices[0].as_float32().reshape(1, size * size)
+        data = np.empty((len(matrices), size * size), dtype=np.float32)
+        for i, matrix in enumerate(matrices):
+            if isinstance(matrix, (Mat3, Mat4)):
+                data[i] = matrix.as_float32().ravel()
+            elif hasattr(matrix, "get_matrix"):
+                data[i] = matrix.get_matrix()
+            else:
+                data[i] = matrix
+        return data
+
     def set_uniform_matrix2fv(
         self,
         name: str,
-        matrices: List[Union[Mat2, List[float]]],
+        matrices: Union[List[Union[Mat2, List[float]]], np.ndarray],
         transpose: bool = False,
     ) -> None:
         """
@@ -445,29 +472,25 @@ class ShaderProgram:
 
         Args:
             name: The name of the uniform variable
-            matrices: List of 2x2 matrices (Mat2 objects or lists of 4 floats)
+            matrices: List of 2x2 matrices (Mat2 objects or lists of 4 floats) or a float32
+                array of shape (N, 2, 2) which is uploaded without copying
             transpose: Whether to transpose the matrices
         """
         """Set a mat2 array uniform"""
         loc = self.get_uniform_location(name)
         if loc != -1:
-            flat_values = []
-            for matrix in matrices:
-                if hasattr(matrix, "get_matrix"):
-                    flat_values.extend(matrix.get_matrix())
-                else:
-                    flat_values.extend(matrix)
+            data = self._pack_matrices(matrices, 2)
             gl.glUniformMatrix2fv(
                 loc,
-                len(matrices),
+                len(data),
                 gl.GL_TRUE if transpose else gl.GL_FALSE,
-                (ctypes.c_float * len(flat_values))(*flat_values),
+                data,
             )
 
     def set_uniform_matrix3fv(
         self,
         name: str,
-        matrices: List[Union[Mat3, List[float]]],
+        matrices: Union[List[Union[Mat3, List[float]]], np.ndarray],
         transpose: bool = False,
     ) -> None:
         """
@@ -475,29 +498,25 @@ class ShaderProgram:
 
         Args:
             name: The name of the uniform variable
-            matrices: List of 3x3 matrices (Mat3 objects or lists of 9 floats)
+            matrices: List of 3x3 matrices (Mat3 objects or lists of 9 floats) or a float32
+                array of shape (N, 3, 3) which is uploaded without copying
             transpose: Whether to transpose the matrices
         """
         """Set a mat3 array uniform"""
         loc = self.get_uniform_location(name)
         if loc != -1:
-            flat_values = []
-            for matrix in matrices:
-                if hasattr(matrix, "get_matrix"):
-                    flat_values.extend(matrix.get_matrix())
-                else:
-                    flat_values.extend(matrix)
+            data = self._pack_matrices(matrices, 3)
             gl.glUniformMatrix3fv(
                 loc,
-                len(matrices),
+                len(data),
                 gl.GL_TRUE if transpose else gl.GL_FALSE,
-                (ctypes.c_float * len(flat_values))(*flat_values),
+                data,
             )
 
     def set_uniform_matrix4fv(
         self,
         name: str,
-        matrices: List[Union[Mat4, List[float]]],
+        matrices: Union[List[Union[Mat4, List[float]]], Mat4Array, np.ndarray],
         transpose: bool = False,
     ) -> None:
         """
@@ -505,23 +524,19 @@ class ShaderProgram:
 
         Args:
             name: The name of the uniform variable
-            matrices: List of 4x4 matrices (Mat4 objects or lists of 16 floats)
+            matrices: List of 4x4 matrices (Mat4 objects or lists of 16 floats) or a Mat4Array /
+                float32 array of shape (N, 4, 4) which is uploaded without copying
             transpose: Whether to transpose the matrices
         """
         """Set a mat4 array uniform"""
         loc = self.get_uniform_location(name)
         if loc != -1:
-            flat_values = []
-            for matrix in matrices:
-                if hasattr(matrix, "get_matrix"):
-                    flat_values.extend(matrix.get_matrix())
-                else:
-                    flat_values.extend(matrix)
+            data = self._pack_matrices(matrices, 4)
             gl.glUniformMatrix4fv(
                 loc,
-                len(matrices),
+                len(data),
                 gl.GL_TRUE if transpose else gl.GL_FALSE,
-                (ctypes.c_float * len(flat_values))(*flat_values),
+                data,
             )
 
     def get_uniform_1f(self, name: str) -> float:
@@ -0,0 +1,34 @@
+#version 410
+out vec3 fragmentNormal;
+out vec3 fragmentPosition;
+
+// compact vertices from mesh_quantize, normalized int16 positions in the bounding box
+// and octahedral encoded normals
+layout(location=0) in vec3 inVert;
+layout(location=1) in vec2 inNormal;
+
+uniform mat4 MVP;
+uniform mat4 MV;
+uniform mat3 normalMatrix;
+// maps the [-1, 1] positions back to the bounding box of the mesh
+uniform mat4 dequantize;
+
+vec3 octahedralDecode(vec2 e)
+{
+  vec3 n = vec3(e, 1.0 - abs(e.x) - abs(e.y));
+  float t = max(-n.z, 0.0);
+  n.xy -= vec2(n.x >= 0.0 ? t : -t, n.y >= 0.0 ? t : -t);
+  return normalize(n);
+}
+
+void main()
+{
+  // the dequantize matrix only scales and moves the positions so normals are unchanged
+  fragmentNormal = normalMatrix * octahedralDecode(inNormal);
+
+  vec4 position = dequantize * vec4(inVert, 1.0);
+  vec4 viewPosition = MV * position;
+  fragmentPosition = viewPosition.xyz;
+
+  gl_Position = MVP * position;
+}
@@ -1,3 +1,5 @@
+import ctypes
+
 import numpy as np
 import OpenGL.GL as gl
 
@@ -18,7 +20,8 @@ class IndexVertexData(VertexData):
             logger.error("SimpleIndexVAO: Unsupported index type")
             raise TypeError(f"Unsupported index type: {index_type}")
 
-        self.indices = np.array(indices, dtype=numpy_dtype)
+        # no copy if the indices already have the type, they are uploaded as they are
+        self.indices = np.asarray(indices, dtype=numpy_dtype)
         self.index_type = index_type
 
 
@@ -28,6 +31,7 @@ class SimpleIndexVAO(AbstractVAO):
         self.buffer = gl.glGenBuffers(1)
         self.idx_buffer = gl.glGenBuffers(1)
         self.index_type = gl.GL_UNSIGNED_INT
+        self.index_size = 4
 
     def draw(self):
         if self.bound and self.allocated:
@@ -35,6 +39,13 @@ class SimpleIndexVAO(AbstractVAO):
         else:
             logger.error("SimpleIndexVAO not bound or not allocated")
 
+    def draw_range(self, first, count):
+        if self.bound and self.allocated:
+            offset = ctypes.c_void_p(first * self.index_size)
+            gl.glDrawElements(self.mode, count, self.index_type, offset)
+        else:
+            logger.error("SimpleIndexVAO not bound or not allocated")
+
     def set_data(self, data):
         if not isinstance(data, IndexVertexData):
             logger.error("SimpleIndexVAO: Unsupported index type")
@@ -51,6 +62,7 @@ class SimpleIndexVAO(AbstractVAO):
         self.allocated = True
         self.indices_count = len(data.indices)
         self.index_type = data.index_type
+        self.index_size = data.indices.itemsize
 
     def remove_vao(self):
         gl.glDeleteBuffers(1, [self.buffer])
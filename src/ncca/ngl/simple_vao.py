@@ -15,6 +15,12 @@ class SimpleVAO(AbstractVAO):
         else:
             logger.error("SimpleVAO not bound or not allocated")
 
+    def draw_range(self, first, count):
+        if self.bound and self.allocated:
+            gl.glDrawArrays(self.mode, first, count)
+        else:
+            logger.error("SimpleVAO not bound or not allocated")
+
     def set_data(self, data):
         if not isinstance(data, VertexData):
             logger.error("SimpleVAO: Invalid data type")
@@ -2,10 +2,56 @@
 Class to represent a transform using translate, rotate and scale,
 """
 
-from .mat4 import Mat4
+import math
+
+from .mat4 import Mat4, Mat4Type
 from .vec3 import Vec3
 
 
+def _euler_rotation(order, cx, sx, cy, sy, cz, sz):
+    """
+    closed form of the rotation part of Transform for each order, this is the same as
+    composing the Mat4.rotate_* matrices using Transform.rot_order but without the
+    matrix multiplies. The cos / sin values can be floats or numpy arrays.
+    """
+    if order == "xyz":
+        return (
+            (cy * cz, cy * sz, -sy),
+            (sx * sy * cz - cx * sz, sx * sy * sz + cx * cz, sx * cy),
+            (cx * sy * cz + sx * sz, cx * sy * sz - sx * cz, cx * cy),
+        )
+    elif order == "yzx":
+        return (
+            (cy * cz, cx * cy * sz + sx * sy, sx * cy * sz - cx * sy),
+            (-sz, cx * cz, sx * cz),
+            (sy * cz, cx * sy * sz - sx * cy, sx * sy * sz + cx * cy),
+        )
+    elif order == "zxy":
+        return (
+            (sx * sy * sz + cy * cz, cx * sz, sx * cy * sz - sy * cz),
+            (sx * sy * cz - cy * sz, cx * cz, sx * cy * cz + sy * sz),
+            (cx * sy, -sx, cx * cy),
+        )
+    elif order == "xzy":
+        return (
+            (cy * cz, sz, -sy * cz),
+            (sx * sy - cx * cy * sz, cx * cz, cx * sy * sz + sx * cy),
+            (sx * cy * sz + cx * sy, -sx * cz, cx * cy - sx * sy * sz),
+        )
+    elif order == "yxz":
+        return (
+            (cy * cz - sx * sy * sz, sx * sy * cz + cy * sz, -cx * sy),
+            (-cx * sz, cx * cz, sx),
+            (sx * cy * sz + sy * cz, sy * sz - sx * cy * cz, cx * cy),
+        )
+    # zyx
+    return (
+        (cy * cz, sx * sy * cz + cx * sz, sx * sz - cx * sy * cz),
+        (-cy * sz, cx * cz - sx * sy * sz, cx * sy * sz + sx * cz),
+        (sy, -sx * cy, cx * cy),
+    )
+
+
 class TransformRotationOrder(Exception):
     pass
 
@@ -27,6 +73,12 @@ class Transform:
         self.matrix = Mat4()
         self.need_recalc = True
         self.order = "xyz"
+        # the values the cached parts were built from so only the parts that have changed are
+        # rebuilt, the attributes are public so they are compared rather than flagged by setters
+        self._rotation_key = None
+        self._scale_key = None
+        self._rotation_rows = None
+        self._rotation_scale = None
 
     def _set_value(self, args):
         v = Vec3()
@@ -78,16 +130,41 @@ class Transform:
     def get_matrix(self):
         "return a transform matrix based on rotation order"
         if self.need_recalc is True:
-            scale = Mat4.scale(self.scale.x, self.scale.y, self.scale.z)
-            rx = Mat4.rotate_x(self.rotation.x)  # noqa: F841
-            ry = Mat4.rotate_y(self.rotation.y)  # noqa: F841
-            rz = Mat4.rotate_z(self.rotation.z)  # noqa: F841
-            rotation_scale = eval(self.rot_order.get(self.order)) @ scale
-            self.matrix = rotation_scale
-            self.matrix.m[3][0] = self.position.x
-            self.matrix.m[3][1] = self.position.y
-            self.matrix.m[3][2] = self.position.z
-            self.matrix.m[3][3] = 1.0
+            rotation_key = (
+                self.rotation.x,
+                self.rotation.y,
+                self.rotation.z,
+                self.order,
+            )
+            if rotation_key != self._rotation_key:
+                x = math.radians(self.rotation.x)
+                y = math.radians(self.rotation.y)
+                z = math.radians(self.rotation.z)
+                self._rotation_rows = _euler_rotation(
+                    self.order,
+                    math.cos(x),
+                    math.sin(x),
+                    math.cos(y),
+                    math.sin(y),
+                    math.cos(z),
+                    math.sin(z),
+                )
+                self._rotation_key = rotation_key
+                self._scale_key = None
+            scale = (self.scale.x, self.scale.y, self.scale.z)
+            if scale != self._scale_key:
+                # scale @ rotation scales each row of the rotation
+                self._rotation_scale = [
+                    [row[0] * s, row[1] * s, row[2] * s, 0.0]
+                    for row, s in zip(self._rotation_rows, scale)
+                ]
+                self._scale_key = scale
+            rows = [list(row) for row in self._rotation_scale]
+            rows.append([self.position.x, self.position.y, self.position.z, 1.0])
+            rigid = all(abs(s) == 1.0 for s in scale)
+            self.matrix = self.matrix._from_rows(
+                rows, Mat4Type.RIGID if rigid else Mat4Type.AFFINE
+            )
             self.need_recalc = False
         return self.matrix
 
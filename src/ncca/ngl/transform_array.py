@@ -0,0 +1,222 @@
+"""
+A container for N translate, rotate and scale transforms held in (N,3) float32 numpy arrays,
+all of the model matrices are built in one vectorized call so this is much faster than using
+a Transform per object when there are a lot of them.
+"""
+
+import numpy as np
+
+from .mat4_array import Mat4Array
+from .transform import Transform, TransformRotationOrder, _euler_rotation
+
+
+class TransformArray:
+    """
+    A class to hold the position, rotation and scale of N objects and generate a Mat4Array
+    of their transform matrices. As with Transform the rotation is only rebuilt when the
+    rotations or order have changed.
+    """
+
+    def __init__(self, count: int = 0, order: str = "xyz"):
+        """
+        Initializes the TransformArray.
+
+        Args:
+            count (int, optional): The number of transforms, each is set to the identity. Defaults to 0.
+            order (str, optional): The rotation order used for every transform. Defaults to "xyz".
+
+        Raises:
+            TransformRotationOrder: If the order is not one of the Transform.rot_order keys.
+        """
+        if order not in Transform.rot_order:
+            raise TransformRotationOrder
+        self._positions = np.zeros((count, 3), dtype=np.float32)
+        self._rotations = np.zeros((count, 3), dtype=np.float32)
+        self._scales = np.ones((count, 3), dtype=np.float32)
+        self.order = order
+        self._matrices = None
+        self._rotation_rows = None
+        self._rotation_dirty = True
+        self.need_recalc = True
+
+    @classmethod
+    def from_arrays(
+        cls, positions=None, rotations=None, scales=None, order: str = "xyz"
+    ) -> "TransformArray":
+        """
+        Create a TransformArray from position, rotation and scale arrays.
+
+        Args:
+            positions (array_like, optional): (N,3) positions.
+            rotations (array_like, optional): (N,3) x,y,z rotations in degrees.
+            scales (array_like, optional): (N,3) scale values.
+            order (str, optional): The rotation order. Defaults to "xyz".
+
+        Returns:
+            TransformArray: N transforms, any array not given is left at the default.
+
+        Raises:
+            ValueError: If no arrays are given or they are different lengths.
+        """
+        given = [
+            np.asarray(a).reshape(-1, 3)
+            for a in (positions, rotations, scales)
+            if a is not None
+        ]
+        if not given:
+            raise ValueError("need at least one of positions, rotations or scales")
+        tx = cls(len(given[0]), order)
+        if positions is not None:
+            tx.set_positions(positions)
+        if rotations is not None:
+            tx.set_rotations(rotations)
+        if scales is not None:
+            tx.set_scales(scales)
+        return tx
+
+    def _check_values(self, values):
+        "internal method to convert values to a (N,3) float32 array of the correct length"
+        values = np.asarray(values, dtype=np.float32).reshape(-1, 3)
+        if len(values) != len(self):
+            raise ValueError(f"expected {len(self)} values got {len(values)}")
+        return values
+
+    @staticmethod
+    def _read_only(array):
+        "internal method to return a view that can't be edited, changes must go via the setters"
+        view = array.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def positions(self) -> np.ndarray:
+        "read only (N,3) view of the positions"
+        return self._read_only(self._positions)
+
+    @property
+    def rotations(self) -> np.ndarray:
+        "read only (N,3) view of the rotations in degrees"
+        return self._read_only(self._rotations)
+
+    @property
+    def scales(self) -> np.ndarray:
+        "read only (N,3) view of the scales"
+        return self._read_only(self._scales)
+
+    def set_positions(self, values):
+        """
+        Set all of the positions.
+
+        Args:
+            values (array_like): (N,3) positions.
+        """
+        self._positions[:] = self._check_values(values)
+        self.need_recalc = True
+
+    def set_rotations(self, values):
+        """
+        Set all of the rotations.
+
+        Args:
+            values (array_like): (N,3) x,y,z rotations in degrees.
+        """
+        self._rotations[:] = self._check_values(values)
+        self.need_recalc = True
+        self._rotation_dirty = True
+
+    def set_scales(self, values):
+        """
+        Set all of the scales.
+
+        Args:
+            values (array_like): (N,3) scale values.
+        """
+        self._scales[:] = self._check_values(values)
+        self.need_recalc = True
+
+    def set_order(self, order: str):
+        """
+        Set the rotation order used by all of the transforms.
+
+        Args:
+            order (str): The rotation order e.g. "xyz" or "zyx".
+
+        Raises:
+            TransformRotationOrder: If the order is not one of the Transform.rot_order keys.
+        """
+        if order not in Transform.rot_order:
+            raise TransformRotationOrder
+        self.order = order
+        self.need_recalc = True
+        self._rotation_dirty = True
+
+    def __len__(self):
+        """
+        Return the number of transforms in the array.
+        """
+        return len(self._positions)
+
+    def __getitem__(self, index: int) -> Transform:
+        """
+        Get a copy of the transform at the specified index.
+
+        Args:
+            index (int): The index of the element.
+
+        Returns:
+            Transform: A new Transform with the same values, changes are not written back.
+        """
+        tx = Transform()
+        tx.set_position(*self._positions[index].tolist())
+        tx.set_rotation(*self._rotations[index].tolist())
+        tx.set_scale(*self._scales[index].tolist())
+        tx.set_order(self.order)
+        return tx
+
+    def __setitem__(self, index: int, value: Transform):
+        """
+        Set the position, rotation and scale at the specified index from a Transform.
+
+        Args:
+            index (int): The index of the element to set.
+            value (Transform): The transform to copy, its order is ignored.
+        """
+        if not isinstance(value, Transform):
+            raise TypeError("Only Transform objects can be assigned")
+        self._positions[index] = list(value.position)
+        self._rotations[index] = list(value.rotation)
+        self._scales[index] = list(value.scale)
+        self.need_recalc = True
+        self._rotation_dirty = True
+
+    def get_matrices(self) -> Mat4Array:
+        """
+        Get the transform matrices, this matches calling Transform.get_matrix for each element.
+
+        Returns:
+            Mat4Array: N transform matrices, a new array is created when any value has changed.
+        """
+        if self.need_recalc is True:
+            if self._rotation_dirty:
+                radians = np.radians(self._rotations.astype(np.float64))
+                c = np.cos(radians)
+                s = np.sin(radians)
+                rows = _euler_rotation(
+                    self.order, c[:, 0], s[:, 0], c[:, 1], s[:, 1], c[:, 2], s[:, 2]
+                )
+                # (3,3,N) -> (N,3,3)
+                self._rotation_rows = np.moveaxis(
+                    np.array(rows, dtype=np.float32), 2, 0
+                )
+                self._rotation_dirty = False
+            m = np.zeros((len(self), 4, 4), dtype=np.float32)
+            # scale @ rotation scales each row of the rotation
+            m[:, :3, :3] = self._rotation_rows * self._scales[:, :, np.newaxis]
+            m[:, 3, :3] = self._positions
+            m[:, 3, 3] = 1.0
+            self._matrices = Mat4Array._from_array(m)
+            self.need_recalc = False
+        return self._matrices
+
+    def __str__(self):
+        return f"TransformArray({len(self)} transforms, order {self.order})"
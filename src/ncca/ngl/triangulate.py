@@ -0,0 +1,119 @@
+"""
+Triangulation of polygon faces for packing meshes into triangle VAOs. Convex faces are fan split
+with numpy, all faces with the same number of corners at once, only concave faces are ear clipped
+one at a time. Faces are assumed to be roughly planar, each is projected onto the plane of its
+Newell normal.
+"""
+
+import numpy as np
+
+
+def _newell_normals(points):
+    "internal function to get the (unnormalized) Newell normal of (F,N,3) polygons"
+    following = np.roll(points, -1, axis=1)
+    return np.cross(points, following).sum(axis=1)
+
+
+def _concave(points, normals):
+    "internal function to find which of (F,N,3) polygons have a corner turning against the normal"
+    edges = np.roll(points, -1, axis=1) - points
+    turns = np.einsum("fij,fj->fi", np.cross(np.roll(edges, 1, axis=1), edges), normals)
+    # allow for rounding on straight edges
+    tolerance = 1e-9 * np.abs(turns).max(axis=1, initial=0.0)
+    return (turns < -tolerance[:, None]).any(axis=1)
+
+
+def _project(points, normal):
+    "internal function to project a polygon to 2D with a counter clockwise winding"
+    axis = int(np.argmax(np.abs(normal)))
+    u, v = [(1, 2), (2, 0), (0, 1)][axis]
+    if normal[axis] < 0.0:
+        u, v = v, u
+    return points[:, u].tolist(), points[:, v].tolist()
+
+
+def _ear_clip(xs, ys):
+    """
+    internal function to triangulate a counter clockwise 2D polygon by ear clipping, if no ear
+    can be found (a self intersecting polygon) the rest is fan split
+    """
+
+    def cross(a, b, c):
+        return (xs[b] - xs[a]) * (ys[c] - ys[a]) - (ys[b] - ys[a]) * (xs[c] - xs[a])
+
+    remaining = list(range(len(xs)))
+    triangles = []
+    while len(remaining) > 3:
+        count = len(remaining)
+        for i in range(count):
+            a, b, c = remaining[i - 1], remaining[i], remaining[(i + 1) % count]
+            if cross(a, b, c) <= 0.0:  # reflex or straight corner
+                continue
+            if any(
+                cross(a, b, p) >= 0.0
+                and cross(b, c, p) >= 0.0
+                and cross(c, a, p) >= 0.0
+                for p in remaining
+                if p not in (a, b, c)
+            ):
+                continue
+            triangles.append((a, b, c))
+            del remaining[i]
+            break
+        else:
+            first = remaining[0]
+            triangles.extend(
+                (first, remaining[k], remaining[k + 1]) for k in range(1, count - 1)
+            )
+            return triangles
+    triangles.append(tuple(remaining))
+    return triangles
+
+
+def triangulate_faces(
+    positions, face_vertex, face_sizes
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Split polygon faces into triangles, the triangles of each face keep its winding and are
+    given in face order. Faces with fewer than 3 corners are dropped.
+
+    Args:
+        positions (np.ndarray): (N,3) vertex positions.
+        face_vertex (np.ndarray): The vertex index of each face corner, the corners of all of the
+            faces one after the other.
+        face_sizes (np.ndarray): The number of corners of each face.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (T,3) indices into the face corner arrays of the corners of
+            each triangle and the (T,) index of the face each triangle is from.
+    """
+    sizes = np.asarray(face_sizes, dtype=np.int64)
+    offsets = np.zeros(len(sizes), dtype=np.int64)
+    np.cumsum(sizes[:-1], out=offsets[1:])
+    triangle_counts = np.maximum(sizes - 2, 0)
+    firsts = np.zeros(len(sizes), dtype=np.int64)
+    np.cumsum(triangle_counts[:-1], out=firsts[1:])
+    corners = np.empty((int(triangle_counts.sum()), 3), dtype=np.int64)
+    faces = np.empty(len(corners), dtype=np.int64)
+    face_vertex = np.asarray(face_vertex)
+    for size in np.unique(sizes[sizes >= 3]).tolist():
+        group = np.flatnonzero(sizes == size)
+        group_corners = offsets[group, None] + np.arange(size)
+        concave = np.zeros(len(group), dtype=bool)
+        if size > 3:
+            points = np.asarray(positions, dtype=np.float64)[face_vertex[group_corners]]
+            normals = _newell_normals(points)
+            concave = _concave(points, normals)
+            for i in np.flatnonzero(concave).tolist():
+                xs, ys = _project(points[i], normals[i])
+                first = firsts[group[i]]
+                corners[first : first + size - 2] = group_corners[i][_ear_clip(xs, ys)]
+                faces[first : first + size - 2] = group[i]
+        # fan split the convex faces, (0, k, k + 1) for each triangle
+        k = np.arange(1, size - 1)
+        fan = np.stack((np.zeros(size - 2, dtype=np.int64), k, k + 1), axis=1)
+        convex = group[~concave]
+        rows = firsts[convex, None] + np.arange(size - 2)
+        corners[rows] = offsets[convex, None, None] + fan
+        faces[rows] = convex[:, None]
+    return corners, faces
@@ -5,7 +5,7 @@ Most of these functions are based on functions found in other libraries such as
 
 import math
 
-from .mat4 import Mat4
+from .mat4 import Mat4, Mat4Type
 
 
 def clamp(num, low, high):
@@ -41,6 +41,7 @@ def look_at(eye, look, up):
     result.m[3][0] = -eye.dot(v)
     result.m[3][1] = -eye.dot(u)
     result.m[3][2] = eye.dot(n)
+    result.matrix_type = Mat4Type.RIGID  # v, u and n are orthonormal
     return result
 
 
@@ -68,6 +69,7 @@ def ortho(left, right, bottom, top, near, far):
     m.m[3][0] = -(right + left) / (right - left)
     m.m[3][1] = -(top + bottom) / (top - bottom)
     m.m[3][2] = -(far + near) / (far - near)
+    m.matrix_type = Mat4Type.AFFINE
     return m
 
 
@@ -4,9 +4,14 @@ Simple float only Vec2 class for 3D graphics, very similar to the pyngl ones
 
 import ctypes
 import math
+import struct
+
+import numpy as np
 
 from .util import clamp
 
+_pack = struct.Struct("2f").pack
+
 
 class Vec2:
     """
@@ -335,6 +340,26 @@ class Vec2:
             self.x * rhs.m[0][2] + self.y * rhs.m[1][2] + self.z * rhs.m[2][2],
         )
 
+    def tobytes(self) -> bytes:
+        """
+        pack the vector as float32 values ideal for OpenGL buffers
+        Returns:
+            bytes: The packed x,y values.
+        """
+        return _pack(self.x, self.y)
+
+    def __buffer__(self, flags):
+        """
+        buffer protocol (python 3.12+) so memoryview(v) can read the packed float32 values
+        """
+        return memoryview(self.tobytes()).cast("f")
+
+    def __array__(self, dtype=None, copy=None):
+        """
+        numpy array protocol so np.asarray(v) gives a float32 array of the components
+        """
+        return np.array((self.x, self.y), dtype=dtype or np.float32)
+
 
 # Helper function to create properties
 def _create_property(attr_name):
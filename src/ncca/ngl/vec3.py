@@ -4,11 +4,14 @@ Simple float only Vec3 class for 3D graphics, very similar to the pyngl ones
 
 import ctypes
 import math
+import struct
 
 import numpy as np
 
 from .util import clamp
 
+_pack = struct.Struct("3f").pack
+
 
 class Vec3:
     """
@@ -261,6 +264,79 @@ class Vec3:
             self.x * rhs.y - self.y * rhs.x,
         )
 
+    @staticmethod
+    def cross_into(a, b, out):
+        """
+        cross product a x b written to out so no new vector is created
+        Args:
+            a (Vec3): The left-hand side vector.
+            b (Vec3): The right-hand side vector.
+            out (Vec3): The vector to write the result to, this can be a or b.
+        Returns:
+            Vec3: out
+        """
+        x = a.y * b.z - a.z * b.y
+        y = a.z * b.x - a.x * b.z
+        z = a.x * b.y - a.y * b.x
+        out.x = x
+        out.y = y
+        out.z = z
+        return out
+
+    @staticmethod
+    def add_into(a, b, out):
+        """
+        vector addition a+b written to out so no new vector is created
+        Args:
+            a (Vec3): The left-hand side vector.
+            b (Vec3): The right-hand side vector.
+            out (Vec3): The vector to write the result to, this can be a or b.
+        Returns:
+            Vec3: out
+        """
+        out.x = a.x + b.x
+        out.y = a.y + b.y
+        out.z = a.z + b.z
+        return out
+
+    @staticmethod
+    def sub_into(a, b, out):
+        """
+        vector subtraction a-b written to out so no new vector is created
+        Args:
+            a (Vec3): The left-hand side vector.
+            b (Vec3): The right-hand side vector.
+            out (Vec3): The vector to write the result to, this can be a or b.
+        Returns:
+            Vec3: out
+        """
+        out.x = a.x - b.x
+        out.y = a.y - b.y
+        out.z = a.z - b.z
+        return out
+
+    @staticmethod
+    def mul_into(a, rhs, out):
+        """
+        piecewise scalar multiplication a*rhs written to out so no new vector is created
+        Args:
+            a (Vec3): The vector to multiply.
+            rhs (float): The scalar to multiply by.
+            out (Vec3): The vector to write the result to, this can be a.
+        Returns:
+            Vec3: out
+        Raises:
+            ValueError: If the right-hand side is not a float.
+        """
+        if not isinstance(rhs, (float, int)):
+            raise ValueError(
+                f"can only do piecewise multiplication with a scalar {rhs=}"
+            )
+        out.x = a.x * rhs
+        out.y = a.y * rhs
+        out.z = a.z * rhs
+        return out
+
     def normalize(self):
         """
         normalize the vector to unit length
@@ -386,10 +462,11 @@ class Vec3:
         Returns:
             Vec3: A new vector that is the result of multiplying this vector by the matrix.
         """
+        m = rhs._rows()  # python floats even if rhs is float32 backed
         return Vec3(
-            self.x * rhs.m[0][0] + self.y * rhs.m[1][0] + self.z * rhs.m[2][0],
-            self.x * rhs.m[0][1] + self.y * rhs.m[1][1] + self.z * rhs.m[2][1],
-            self.x * rhs.m[0][2] + self.y * rhs.m[1][2] + self.z * rhs.m[2][2],
+            self.x * m[0][0] + self.y * m[1][0] + self.z * m[2][0],
+            self.x * m[0][1] + self.y * m[1][1] + self.z * m[2][1],
+            self.x * m[0][2] + self.y * m[1][2] + self.z * m[2][2],
         )
 
     def to_list(self):
@@ -398,6 +475,26 @@ class Vec3:
     def to_numpy(self):
         return np.array([self.x, self.y, self.z])
 
+    def tobytes(self) -> bytes:
+        """
+        pack the vector as float32 values ideal for OpenGL buffers
+        Returns:
+            bytes: The packed x,y,z values.
+        """
+        return _pack(self.x, self.y, self.z)
+
+    def __buffer__(self, flags):
+        """
+        buffer protocol (python 3.12+) so memoryview(v) can read the packed float32 values
+        """
+        return memoryview(self.tobytes()).cast("f")
+
+    def __array__(self, dtype=None, copy=None):
+        """
+        numpy array protocol so np.asarray(v) gives a float32 array of the components
+        """
+        return np.array((self.x, self.y, self.z), dtype=dtype or np.float32)
+
 
 # Helper function to create properties
 def _create_property(attr_name):
@@ -4,11 +4,14 @@ Simple Float only Vec3 class for 3D graphics, very similar to the pyngl ones
 
 import ctypes
 import math
+import struct
 
 import numpy as np
 
 from .log import logger
 
+_pack = struct.Struct("4f").pack
+
 
 class Vec4:
     __slots__ = ["_x", "_y", "_z", "_w"]
@@ -191,23 +194,12 @@ class Vec4:
 
     def __matmul__(self, rhs):
         "Vec4 @ Mat4 matrix multiplication"
+        m = rhs._rows()  # python floats even if rhs is float32 backed
         return Vec4(
-            self.x * rhs.m[0][0]
-            + self.y * rhs.m[1][0]
-            + self.z * rhs.m[2][0]
-            + self.w * rhs.m[3][0],
-            self.x * rhs.m[0][1]
-            + self.y * rhs.m[1][1]
-            + self.z * rhs.m[2][1]
-            + self.w * rhs.m[3][1],
-            self.x * rhs.m[0][2]
-            + self.y * rhs.m[1][2]
-            + self.z * rhs.m[2][2]
-            + self.w * rhs.m[3][2],
-            self.x * rhs.m[0][3]
-            + self.y * rhs.m[1][3]
-            + self.z * rhs.m[2][3]
-            + self.w * rhs.m[3][3],
+            self.x * m[0][0] + self.y * m[1][0] + self.z * m[2][0] + self.w * m[3][0],
+            self.x * m[0][1] + self.y * m[1][1] + self.z * m[2][1] + self.w * m[3][1],
+            self.x * m[0][2] + self.y * m[1][2] + self.z * m[2][2] + self.w * m[3][2],
+            self.x * m[0][3] + self.y * m[1][3] + self.z * m[2][3] + self.w * m[3][3],
         )
 
     def __repr__(self):
@@ -224,6 +216,26 @@ class Vec4:
     def to_numpy(self):
         return np.array([self.x, self.y, self.z, self.w])
 
+    def tobytes(self) -> bytes:
+        """
+        pack the vector as float32 values ideal for OpenGL buffers
+        Returns:
+            bytes: The packed x,y,z,w values.
+        """
+        return _pack(self.x, self.y, self.z, self.w)
+
+    def __buffer__(self, flags):
+        """
+        buffer protocol (python 3.12+) so memoryview(v) can read the packed float32 values
+        """
+        return memoryview(self.tobytes()).cast("f")
+
+    def __array__(self, dtype=None, copy=None):
+        """
+        numpy array protocol so np.asarray(v) gives a float32 array of the components
+        """
+        return np.array((self.x, self.y, self.z, self.w), dtype=dtype or np.float32)
+
 
 # Helper function to create properties
 def _create_property(attr_name):
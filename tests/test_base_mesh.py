@@ -1,7 +1,24 @@
+import numpy as np
 import OpenGL.GL as gl
 import pytest
 
-from ncca.ngl import BaseMesh, Face, Image, ImageModes, ShaderLib, Texture, Vec2, Vec3
+from ncca.ngl import (
+    BaseMesh,
+    DefaultShader,
+    Face,
+    Image,
+    ImageModes,
+    Mat4,
+    Obj,
+    ObjParseFaceError,
+    ShaderLib,
+    SimpleIndexVAO,
+    Texture,
+    Vec2,
+    Vec3,
+    base_mesh,
+)
+from ncca.ngl.base_mesh import weld_vertices
 
 
 def test_is_triangular():
@@ -77,11 +94,13 @@ def test_init_defaults():
 
 def test_create_vao_non_triangular(opengl_context):
     mesh = BaseMesh()
+    mesh.vertex = [Vec3(0.0, 0.0, 0.0), Vec3(1.0, 0.0, 0.0), Vec3(1.0, 1.0, 0.0)]
+    mesh.vertex.append(Vec3(0.0, 1.0, 0.0))
     face1 = Face()
-    face1.vertex = [1, 2, 3, 4]
+    face1.vertex = [0, 1, 2, 3]
     mesh.faces = [face1]
-    with pytest.raises(RuntimeError):
-        mesh.create_vao()
+    mesh.create_vao()
+    assert mesh.vao.num_indices() == 6
 
 
 def test_create_vao(opengl_context):
@@ -247,3 +266,235 @@ def test_draw_with_texture(opengl_context, tmp_path):
     mesh.texture_id = t.set_texture_gl()
     mesh.draw()
     gl.glDeleteTextures(1, [mesh.texture_id])
+
+
+def test_pack_triangles():
+    mesh = BaseMesh()
+    mesh.vertex = [Vec3(0.0, 0.5, 0.0), Vec3(-0.5, -0.5, 0.0), Vec3(0.5, -0.5, 0.25)]
+    face = Face()
+    face.vertex = [2, 0, 1]
+    mesh.faces = [face]
+    data = mesh._pack_triangles()
+    assert data.dtype == np.float32
+    assert data[:, :3].tolist() == [
+        [0.5, -0.5, 0.25],
+        [0.0, 0.5, 0.0],
+        [-0.5, -0.5, 0.0],
+    ]
+    assert np.all(data[:, 6:] == 0.0)
+    # normals are generated if the mesh has none
+    normal = np.cross(data[1, :3] - data[0, :3], data[2, :3] - data[0, :3])
+    normal /= np.linalg.norm(normal)
+    np.testing.assert_allclose(data[:, 3:6], [normal] * 3, rtol=1e-6)
+    mesh.normals = [Vec3(0.0, 0.0, 1.0), Vec3(0.0, 1.0, 0.0)]
+    mesh.uv = [Vec2(0.5, 1.0), Vec2(0.25, 0.75)]
+    face.normal = [1, 0, 0]
+    face.uv = [0, 1, 1]
+    data = mesh._pack_triangles()
+    # v is flipped for OpenGL
+    assert data[:, 3:].tolist() == [
+        [0, 1, 0, 0.5, 0.0],
+        [0, 0, 1, 0.25, 0.25],
+        [0, 0, 1, 0.25, 0.25],
+    ]
+
+
+def test_pack_triangles_bad_index():
+    # the negative indices of this file are out of range once they are resolved
+    mesh = Obj.from_file("tests/files/SimpleNegativeAll.obj")
+    with pytest.raises(ObjParseFaceError, match="face 0 uses vertex index -2"):
+        mesh._pack_triangles()
+    mesh = BaseMesh()
+    mesh.vertex = [Vec3(0.0, 0.0, 0.0), Vec3(1.0, 0.0, 0.0), Vec3(0.0, 1.0, 0.0)]
+    mesh.normals = [Vec3(0.0, 0.0, 1.0)]
+    mesh.uv = [Vec2(0.0, 0.0)]
+    for _ in range(2):
+        face = Face()
+        face.vertex = [0, 1, 2]
+        face.normal = [0, 0, 0]
+        mesh.faces.append(face)
+    face.uv = [0, 0, 1]
+    with pytest.raises(
+        ObjParseFaceError, match="face 1 uses uv index 1 but the mesh only has 1"
+    ):
+        mesh._pack_triangles()
+    face.uv = []
+    face.normal = [0, 3, 0]
+    with pytest.raises(ObjParseFaceError, match="face 1 uses normal index 3"):
+        mesh._pack_triangles()
+    face.normal = []
+    face.vertex = [0, 1, 3]
+    with pytest.raises(ObjParseFaceError, match="face 1 uses vertex index 3"):
+        mesh._pack_triangles()
+
+
+def test_weld_vertices():
+    a = [0, 0, 0, 0, 0, 1, 0, 0]
+    b = [1, 0, 0, 0, 0, 1, 1, 0]
+    c = [0, 1, 0, 0, 0, 1, 0, 1]
+    d = [1, 1, 0, 0, 0, 1, 1, 1]
+    # same position as b with a different uv isn't welded
+    e = [1, 0, 0, 0, 0, 1, 0.5, 0]
+    mesh_data = np.array([b, a, c, b, c, d, e, c, d], dtype=np.float32)
+    vertices, indices = weld_vertices(mesh_data)
+    assert indices.dtype == np.uint32
+    assert indices.tolist() == [0, 1, 2, 0, 2, 3, 4, 2, 3]
+    assert vertices.tolist() == [b, a, c, d, e]
+    np.testing.assert_array_equal(vertices[indices], mesh_data)
+    vertices, indices = weld_vertices(np.zeros(0, dtype=np.float32))
+    assert vertices.shape == (0, 8) and len(indices) == 0
+
+
+def test_create_vao_weld(opengl_context):
+    mesh = Obj.from_file("tests/files/Materials.obj")
+    mesh.create_vao(weld=True)
+    assert isinstance(mesh.vao, SimpleIndexVAO)
+    assert mesh.vao.index_type == gl.GL_UNSIGNED_SHORT
+    assert mesh.vao.num_indices() == 15
+    mesh.draw()
+    mesh.draw(lambda name: None)
+
+
+def test_create_vao_optimize(opengl_context):
+    mesh = Obj.from_file("tests/files/Materials.obj")
+    mesh.create_vao(optimize=True)
+    assert isinstance(mesh.vao, SimpleIndexVAO)
+    assert mesh.vao.num_indices() == 15
+    mesh.draw(lambda name: None)
+
+
+@pytest.mark.parametrize("weld", [False, True])
+def test_create_vao_compact(opengl_context, weld):
+    ShaderLib.use(DefaultShader.COMPACT_DIFFUSE)
+    mesh = Obj.from_file("tests/files/Materials.obj")
+    mesh.create_vao(weld=weld, compact=True)
+    assert mesh.vao.num_indices() == 15
+    assert isinstance(mesh.dequantize, Mat4)
+    ShaderLib.set_uniform("dequantize", mesh.dequantize)
+    mesh.draw(lambda name: None)
+    mesh.create_vao()
+    assert mesh.dequantize is None
+
+
+def test_pack_polygons():
+    mesh = Obj.from_file("tests/files/Concave.obj")
+    data = mesh._pack_triangles()
+    # the L shaped hexagon, a quad and a triangle
+    assert len(data) == (4 + 2 + 1) * 3
+    # every triangle faces +z
+    p = data[:, :3].reshape(-1, 3, 3)
+    assert np.all(np.cross(p[:, 1] - p[:, 0], p[:, 2] - p[:, 0])[:, 2] > 0)
+    assert data[:, 3:6].tolist() == [[0.0, 0.0, 1.0]] * len(data)
+
+
+def test_draw_ranges_polygons():
+    mesh = Obj.from_file("tests/files/Concave.obj")
+    mesh.face_materials = [1, 0, 1]
+    mesh.materials = ["a", "b"]
+    mesh._pack_triangles()
+    assert mesh.draw_ranges == [("b", 0, 15), ("a", 15, 6)]
+
+
+def _welded_cube():
+    "a unit cube sharing its 8 vertices between the quads"
+    mesh = BaseMesh()
+    mesh.vertex = [Vec3(x, y, z) for z in (0, 1) for y in (0, 1) for x in (0, 1)]
+    for quad in [
+        [0, 2, 3, 1], [4, 5, 7, 6], [0, 1, 5, 4],
+        [3, 2, 6, 7], [1, 3, 7, 5], [0, 4, 6, 2],
+    ]:  # fmt: skip
+        face = Face()
+        face.vertex = quad
+        mesh.faces.append(face)
+    return mesh
+
+
+def test_calc_normals():
+    mesh = _welded_cube()
+    mesh.calc_normals()
+    assert len(mesh.normals) == 8
+    for face in mesh.faces:
+        assert face.normal == face.vertex
+    for vertex, normal in zip(mesh.vertex, mesh.normals):
+        direction = (vertex - Vec3(0.5, 0.5, 0.5)).normalize()
+        assert normal.dot(direction) == pytest.approx(1.0)
+
+
+def test_calc_normals_crease():
+    mesh = _welded_cube()
+    mesh.calc_normals(crease_angle=45.0)
+    # the corners of each face share its normal
+    assert len(mesh.normals) == 6
+    for face in mesh.faces:
+        assert len(set(face.normal)) == 1
+    data = mesh._pack_triangles()
+    p = data[:, :3].reshape(-1, 3, 3)
+    face_normals = np.cross(p[:, 1] - p[:, 0], p[:, 2] - p[:, 0])
+    np.testing.assert_allclose(data[::3, 3:6], face_normals)
+    with pytest.raises(ValueError):
+        mesh.calc_normals(weighting="uniform")
+
+
+def _subdivided_plane(n):
+    "a mesh of an n x n grid of quads over the unit square with a bump in the middle"
+    mesh = BaseMesh()
+    for i in range(n + 1):
+        for j in range(n + 1):
+            x, y = i / n, j / n
+            mesh.vertex.append(Vec3(x, y, 0.3 * np.sin(x * np.pi) * np.sin(y * np.pi)))
+            mesh.uv.append(Vec2(x, y))
+    for i in range(n):
+        for j in range(n):
+            v = i * (n + 1) + j
+            face = Face()
+            face.vertex = [v, v + n + 1, v + n + 2, v + 1]
+            face.uv = face.vertex
+            mesh.faces.append(face)
+    return mesh
+
+
+def test_simplify():
+    mesh = _subdivided_plane(12)
+    mesh.face_materials = [0] * 72 + [1] * 72
+    mesh.materials = ["red", "blue"]
+    lod = mesh.simplify(target_count=60)
+    assert isinstance(lod, BaseMesh)
+    assert lod.mesh_data.dtype == np.float32
+    assert lod.mesh_data.shape == (180, 8)
+    assert lod.materials == mesh.materials
+    assert [name for name, _, _ in lod.draw_ranges] == ["red", "blue"]
+    assert lod.draw_ranges[1][1] == lod.draw_ranges[0][2]
+    assert lod.draw_ranges[1][1] + lod.draw_ranges[1][2] == 180
+    # the corners of the square are kept
+    assert (lod.min_x, lod.max_x, lod.min_y, lod.max_y) == (0.0, 1.0, 0.0, 1.0)
+    # the vertices are unchanged copies of the originals
+    original = {tuple(row) for row in mesh._pack_triangles().tolist()}
+    assert {tuple(row) for row in lod.mesh_data.tolist()} <= original
+
+
+def test_generate_lods():
+    mesh = BaseMesh()
+    mesh.mesh_data = _subdivided_plane(12)._pack_triangles()
+    lods = mesh.generate_lods((0.5, 0.25))
+    assert [len(lod.mesh_data) // 3 for lod in lods] == [144, 72]
+    assert mesh.generate_lods((0.5,), target_error=0.0)[0].mesh_data.shape[0] > 144 * 3
+
+
+def test_generate_lods_welds_once(monkeypatch):
+    mesh = BaseMesh()
+    mesh.mesh_data = _subdivided_plane(12)._pack_triangles()
+    calls = []
+
+    def counted(mesh_data):
+        calls.append(len(mesh_data))
+        return weld_vertices(mesh_data)
+
+    monkeypatch.setattr(base_mesh, "weld_vertices", counted)
+    lods = mesh.generate_lods((0.5, 0.25, 0.125))
+    assert calls == [len(mesh.mesh_data)]
+    assert [len(lod.mesh_data) // 3 for lod in lods] == [144, 72, 36]
+    # already welded data isn't welded again
+    mesh.mesh_data, mesh.mesh_indices = weld_vertices(mesh.mesh_data)
+    calls.clear()
+    assert len(mesh.generate_lods((0.5,))[0].mesh_data) // 3 == 144
+    assert calls == []
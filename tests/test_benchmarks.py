@@ -0,0 +1,48 @@
+import pytest
+
+from benchmarks import bench_math
+
+
+def test_benchmarks_run():
+    results = bench_math.run_benchmarks(repeat=1, min_time=0.0)
+    assert set(results) == set(bench_math.BENCHMARKS)
+    for name in (
+        "vec3_add",
+        "mat4_mat_mul",
+        "mat4_inverse_general",
+        "transform_get_matrix",
+        "look_at",
+        "perspective",
+        "vec3_array_to_numpy",
+        "bezier_get_point_on_curve",
+    ):
+        assert results[name] > 0.0
+
+
+def test_compare():
+    baseline = {"a": 1.0, "b": 1.0}
+    rows = bench_math.compare({"a": 1.1, "b": 1.3, "c": 2.0}, baseline, 0.2)
+    assert rows[0] == ("a", 1.0, 1.1, pytest.approx(0.1), False)
+    assert rows[1] == ("b", 1.0, 1.3, pytest.approx(0.3), True)
+    assert rows[2] == ("c", None, 2.0, None, False)
+
+
+def test_baseline_round_trip(tmp_path):
+    path = tmp_path / "baseline.json"
+    assert bench_math.load_baseline(path) == {}
+    bench_math.save_baseline(path, {"vec3_add": 1e-6})
+    assert bench_math.load_baseline(path) == {"vec3_add": 1e-6}
+
+
+def test_main_flags_regression(tmp_path, capsys):
+    path = tmp_path / "baseline.json"
+    bench_math.save_baseline(path, {"perspective": 1e-12})
+    code = bench_math.main(
+        ["--baseline", str(path), "-k", "perspective", "--repeat", "1"]
+    )
+    assert code == 1
+    assert "REGRESSION" in capsys.readouterr().out
+    assert (
+        bench_math.main(["--baseline", str(path), "-k", "perspective", "--save"]) == 0
+    )
+    assert bench_math.load_baseline(path)["perspective"] > 1e-12
@@ -0,0 +1,259 @@
+import base64
+import json
+
+import numpy as np
+import OpenGL.GL as gl
+import pytest
+
+from ncca.ngl import Gltf, GltfError, MultiBufferVAO, SimpleIndexVAO
+
+_positions = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], dtype=np.float32)
+_normals = np.tile(np.array([0, 0, 1], dtype=np.float32), (4, 1))
+_uvs = np.array([[0, 1], [1, 1], [1, 0], [0, 0]], dtype=np.float32)
+_indices = np.array([0, 1, 2, 0, 2, 3], dtype=np.uint16)
+
+
+def _quad(gap=0):
+    "the glTF JSON and binary data of an indexed quad with each attribute in its own view"
+    binary = b""
+    views = []
+    accessors = []
+    for values, kind in (
+        (_positions, "VEC3"),
+        (_normals, "VEC3"),
+        (_uvs, "VEC2"),
+        (_indices, "SCALAR"),
+    ):
+        views.append(
+            {"buffer": 0, "byteOffset": len(binary), "byteLength": values.nbytes}
+        )
+        component = gl.GL_FLOAT if values.dtype == np.float32 else gl.GL_UNSIGNED_SHORT
+        accessors.append(
+            {
+                "bufferView": len(views) - 1,
+                "componentType": component,
+                "count": len(values),
+                "type": kind,
+            }
+        )
+        binary += values.tobytes() + b"\0" * gap
+    accessors[0]["min"] = [0, 0, 0]
+    accessors[0]["max"] = [1, 1, 0]
+    document = {
+        "asset": {"version": "2.0"},
+        "buffers": [{"byteLength": len(binary)}],
+        "bufferViews": views,
+        "accessors": accessors,
+        "meshes": [
+            {
+                "name": "quad",
+                "primitives": [
+                    {
+                        "attributes": {"POSITION": 0, "NORMAL": 1, "TEXCOORD_0": 2},
+                        "indices": 3,
+                    }
+                ],
+            }
+        ],
+    }
+    return document, binary
+
+
+def _write_glb(path, document, binary):
+    "write a .glb with the JSON and BIN chunks padded to 4 bytes"
+    text = json.dumps(document).encode()
+    text += b" " * (-len(text) % 4)
+    binary += b"\0" * (-len(binary) % 4)
+    length = 12 + 8 + len(text) + 8 + len(binary)
+    with open(path, "wb") as f:
+        f.write(np.array([0x46546C67, 2, length], dtype="<u4").tobytes())
+        f.write(np.array([len(text), 0x4E4F534A], dtype="<u4").tobytes() + text)
+        f.write(np.array([len(binary), 0x004E4942], dtype="<u4").tobytes() + binary)
+
+
+def _write_quad(tmp_path):
+    "write the quad as quad.glb in tmp_path"
+    path = tmp_path / "quad.glb"
+    _write_glb(path, *_quad())
+    return path
+
+
+def _check_quad(gltf):
+    assert len(gltf.meshes) == 1 and gltf.meshes[0].name == "quad"
+    primitive = gltf.meshes[0].primitives[0]
+    assert primitive.mode == gl.GL_TRIANGLES
+    np.testing.assert_array_equal(primitive.attributes["POSITION"], _positions)
+    np.testing.assert_array_equal(primitive.attributes["NORMAL"], _normals)
+    np.testing.assert_array_equal(primitive.attributes["TEXCOORD_0"], _uvs)
+    np.testing.assert_array_equal(primitive.indices, _indices)
+    assert primitive.indices.dtype == np.uint16
+    return primitive
+
+
+def test_load_glb(tmp_path):
+    gltf = Gltf.from_file(_write_quad(tmp_path))
+    primitive = _check_quad(gltf)
+    # the accessors are read only views of the mapped file
+    assert isinstance(gltf.buffers[0], np.memmap)
+    assert np.shares_memory(primitive.attributes["POSITION"], gltf.buffers[0])
+    assert not primitive.attributes["POSITION"].flags.writeable
+
+
+def test_load_gltf_external(tmp_path):
+    document, binary = _quad()
+    document["buffers"][0]["uri"] = "quad%20data.bin"
+    (tmp_path / "quad data.bin").write_bytes(binary)
+    (tmp_path / "quad.gltf").write_text(json.dumps(document))
+    _check_quad(Gltf.from_file(str(tmp_path / "quad.gltf")))
+
+
+def test_load_gltf_embedded(tmp_path):
+    document, binary = _quad()
+    encoded = base64.b64encode(binary).decode()
+    document["buffers"][0]["uri"] = f"data:application/octet-stream;base64,{encoded}"
+    (tmp_path / "quad.gltf").write_text(json.dumps(document))
+    _check_quad(Gltf.from_file(tmp_path / "quad.gltf"))
+
+
+def test_load_errors(tmp_path):
+    document, binary = _quad()
+    (tmp_path / "quad.gltf").write_text(json.dumps(document))
+    # the buffer has no uri and there is no BIN chunk
+    with pytest.raises(GltfError):
+        Gltf.from_file(tmp_path / "quad.gltf")
+    document["asset"]["version"] = "1.0"
+    _write_glb(tmp_path / "quad.glb", document, binary)
+    with pytest.raises(GltfError):
+        Gltf.from_file(tmp_path / "quad.glb")
+
+
+def test_interleaved_and_sparse(tmp_path):
+    interleaved = np.hstack((_positions, _uvs)).astype(np.float32)
+    replaced = np.array([1, 3], dtype=np.uint8)
+    values = np.array([[5, 5, 5], [6, 6, 6]], dtype=np.float32)
+    binary = interleaved.tobytes() + replaced.tobytes() + b"\0\0" + values.tobytes()
+    document = {
+        "asset": {"version": "2.0"},
+        "buffers": [{"byteLength": len(binary)}],
+        "bufferViews": [
+            {"buffer": 0, "byteOffset": 0, "byteLength": 80, "byteStride": 20},
+            {"buffer": 0, "byteOffset": 80, "byteLength": 2},
+            {"buffer": 0, "byteOffset": 84, "byteLength": 24},
+        ],
+        "accessors": [
+            {"bufferView": 0, "componentType": 5126, "count": 4, "type": "VEC3"},
+            {
+                "bufferView": 0,
+                "byteOffset": 12,
+                "componentType": 5126,
+                "count": 4,
+                "type": "VEC2",
+            },
+            {
+                "bufferView": 0,
+                "componentType": 5126,
+                "count": 4,
+                "type": "VEC3",
+                "sparse": {
+                    "count": 2,
+                    "indices": {"bufferView": 1, "componentType": 5121},
+                    "values": {"bufferView": 2},
+                },
+            },
+            {"componentType": 5126, "count": 4, "type": "VEC3"},
+        ],
+        "meshes": [
+            {
+                "primitives": [
+                    {
+                        "attributes": {"POSITION": 0, "TEXCOORD_0": 1, "NORMAL": 3},
+                        "mode": 6,
+                    }
+                ]
+            }
+        ],
+    }
+    _write_glb(tmp_path / "fan.glb", document, binary)
+    gltf = Gltf.from_file(tmp_path / "fan.glb")
+    np.testing.assert_array_equal(gltf.accessor(0), _positions)
+    np.testing.assert_array_equal(gltf.accessor(1), _uvs)
+    assert gltf.accessor(0).strides == (20, 4)
+    sparse = gltf.accessor(2)
+    np.testing.assert_array_equal(sparse[[0, 2]], _positions[[0, 2]])
+    np.testing.assert_array_equal(sparse[[1, 3]], values)
+    assert np.all(gltf.accessor(3) == 0.0)
+    primitive = gltf.meshes[0].primitives[0]
+    assert primitive.mode == gl.GL_TRIANGLE_FAN and primitive.indices is None
+    # the interleaved attributes share one stream and the normals are made
+    streams = primitive._streams()
+    assert [len(stream.attributes) for stream in streams] == [2, 1]
+    assert (streams[0].start, streams[0].end) == (0, 80)
+
+
+def test_vertex_buffer(tmp_path):
+    gltf = Gltf.from_file(_write_quad(tmp_path))
+    primitive = gltf.meshes[0].primitives[0]
+    streams = primitive._streams()
+    data, offsets = primitive._vertex_buffer(streams)
+    # the attributes are next to each other so the vertex data is a view of the file
+    assert np.shares_memory(data, gltf.buffers[0])
+    assert offsets == [0, 48, 96] and data.nbytes == 128
+    # far apart attributes are packed
+    _write_glb(tmp_path / "gaps.glb", *_quad(gap=64))
+    primitive = Gltf.from_file(tmp_path / "gaps.glb").meshes[0].primitives[0]
+    data, offsets = primitive._vertex_buffer(primitive._streams())
+    assert offsets == [0, 48, 96] and data.nbytes == 128
+    assert data[48:96].view(np.float32).reshape(4, 3).tolist() == _normals.tolist()
+
+
+def test_mesh_instances(tmp_path):
+    document, binary = _quad()
+    angle = np.radians(90.0) / 2.0
+    document["nodes"] = [
+        {"translation": [1, 2, 3], "children": [1, 2]},
+        {
+            "mesh": 0,
+            "rotation": [0, 0, np.sin(angle), np.cos(angle)],
+            "scale": [2, 2, 2],
+        },
+        {"mesh": 0, "matrix": [1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 5, 0, 0, 1]},
+        {"mesh": 0},
+    ]
+    document["scenes"] = [{"nodes": [0]}, {"nodes": [3]}]
+    _write_glb(tmp_path / "scene.glb", document, binary)
+    gltf = Gltf.from_file(tmp_path / "scene.glb")
+    instances = gltf.mesh_instances()
+    assert len(instances) == 2 and instances[0][1] is gltf.meshes[0]
+    # rotated 90 degrees about z, scaled then moved by the parent
+    np.testing.assert_allclose(
+        instances[0][0].transform_points([[1, 0, 0]]), [[1, 4, 3]], atol=1e-6
+    )
+    np.testing.assert_allclose(
+        instances[1][0].transform_points([[0, 0, 0]]), [[6, 2, 3]], atol=1e-6
+    )
+    assert len(gltf.mesh_instances(1)) == 1
+    # without nodes each mesh is drawn where it is
+    assert len(Gltf.from_file(_write_quad(tmp_path)).mesh_instances()) == 1
+
+
+def test_create_vaos(opengl_context, tmp_path):
+    gltf = Gltf.from_file(_write_quad(tmp_path))
+    gltf.create_vaos()
+    primitive = gltf.meshes[0].primitives[0]
+    assert isinstance(primitive.vao, SimpleIndexVAO)
+    assert primitive.vao.num_indices() == 6
+    assert primitive.vao.index_type == gl.GL_UNSIGNED_SHORT
+    gltf.meshes[0].draw()
+
+
+def test_create_vao_multi_buffer(opengl_context, tmp_path):
+    document, binary = _quad()
+    del document["meshes"][0]["primitives"][0]["indices"]
+    _write_glb(tmp_path / "quad.glb", document, binary)
+    gltf = Gltf.from_file(tmp_path / "quad.glb")
+    gltf.create_vaos()
+    primitive = gltf.meshes[0].primitives[0]
+    assert isinstance(primitive.vao, MultiBufferVAO)
+    assert len(primitive.vao.vbo_ids) == 3
+    assert primitive.vao.num_indices() == 4
+    primitive.draw()
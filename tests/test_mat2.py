@@ -1,7 +1,9 @@
+import sys
+
 import numpy as np
 import pytest
 
-from ncca.ngl import Mat2, Vec2
+from ncca.ngl import Mat2, Mat2Error, Vec2
 
 
 def test_default_identity():
@@ -56,6 +58,26 @@ def test_str_representation():
     assert s == "Mat2([7, 8], [9, 10])"
 
 
+def test_float32_storage():
+    m = Mat2.from_numpy([[1, 2], [3, 4]])
+    assert m.is_float32
+    assert m.as_float32() is m.m
+    assert m.get_matrix() == [1.0, 3.0, 2.0, 4.0]
+    result = m @ Mat2([[2, 0], [1, 2]])
+    assert result.is_float32
+    assert result.m.tolist() == [[4.0, 4.0], [10.0, 8.0]]
+    assert str(m) == "Mat2([1.0, 2.0], [3.0, 4.0])"
+    Mat2.set_float32_storage(True)
+    try:
+        assert Mat2().is_float32
+        assert Mat2([1, 2, 3, 4]).to_list() == [1.0, 3.0, 2.0, 4.0]
+    finally:
+        Mat2.set_float32_storage(False)
+    for values in ([1, 2, 3], np.zeros((3, 3)), []):
+        with pytest.raises(Mat2Error):
+            Mat2.from_numpy(values)
+
+
 def test_invalid_matmul_type():
     m = Mat2()
     with pytest.raises(ValueError):
@@ -68,3 +90,22 @@ def test_internal_mat_mul():
     result = a._mat_mul(b)
     assert isinstance(result, Mat2)
     assert result.m == [[1 * 2 + 2 * 1, 1 * 0 + 2 * 2], [3 * 2 + 4 * 1, 3 * 0 + 4 * 2]]
+
+
+def test_array_protocol():
+    m = Mat2([[1.0, 2.0], [3.0, 4.0]])
+    # the same column-major order as get_matrix and tobytes
+    assert np.asarray(m).tolist() == [[1.0, 3.0], [2.0, 4.0]]
+    assert np.asarray(m).tolist() == m.to_numpy().tolist()
+    assert np.asarray(m).dtype == np.float32
+    assert m.tobytes() == np.array(m.get_matrix(), dtype=np.float32).tobytes()
+    assert np.asarray(m).tobytes() == m.tobytes()
+    f = Mat2.from_numpy(np.eye(2))
+    assert np.shares_memory(np.asarray(f), f.m)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="__buffer__ needs python 3.12")
+def test_buffer_protocol():
+    m = Mat2([[1.0, 2.0], [3.0, 4.0]])
+    assert memoryview(m).tolist() == [[1.0, 3.0], [2.0, 4.0]]
+    assert memoryview(m).tobytes() == m.tobytes()
@@ -1,4 +1,7 @@
+import sys
+
 import mat3Data  # this is generated from the julia file gen_mat4_tests.jl
+import numpy as np
 import pytest
 
 from ncca.ngl import Mat3, Mat3Error, Mat3NotSquare, Mat4, Vec3
@@ -241,3 +244,47 @@ def test_from_mat4():
     assert m3.get_matrix() == pytest.approx(
         [1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0]
     )
+
+
+def test_float32_storage():
+    a = Mat3.from_numpy(np.arange(1, 10, dtype=np.float32))
+    assert a.is_float32
+    assert a.as_float32() is a.m
+    assert a[2][1] == 8
+    b = Mat3.from_list([2, 0, 0, 0, 3, 0, 0, 0, 4])
+    c = Mat3.from_numpy(b.to_numpy())
+    assert (c @ a).get_matrix() == pytest.approx(
+        (b @ Mat3.from_list(list(range(1, 10)))).get_matrix()
+    )
+    assert c.inverse().is_float32
+    assert c.inverse().get_matrix() == pytest.approx(b.inverse().get_matrix())
+    assert Mat3.from_mat4(Mat4.from_numpy(Mat4.scale(2, 3, 4).to_numpy())).is_float32
+    with pytest.raises(Mat3NotSquare):
+        _ = Mat3.from_numpy([1, 2])
+    Mat3.set_float32_storage(True)
+    try:
+        assert Mat3().is_float32
+        assert Mat3.zero().is_float32
+    finally:
+        Mat3.set_float32_storage(False)
+
+
+def test_array_protocol():
+    m = Mat3.from_numpy(np.arange(9))
+    assert np.asarray(m) is m.m
+    assert np.array(m).base is None
+    assert np.asarray(m, dtype=np.float64).dtype == np.float64
+    lm = Mat3()
+    assert np.asarray(lm).tolist() == lm.m
+    assert lm.tobytes() == np.array(lm.get_matrix(), dtype=np.float32).tobytes()
+    assert m.tobytes() == np.array(m.get_matrix(), dtype=np.float32).tobytes()
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="__buffer__ needs python 3.12")
+def test_buffer_protocol():
+    m = Mat3.from_numpy(np.arange(9))
+    view = memoryview(m)
+    assert view.shape == (3, 3)
+    view[0, 1] = 20.0
+    assert m.m[0][1] == 20.0
+    assert memoryview(Mat3()).tolist() == Mat3().m
@@ -1,7 +1,21 @@
+import sys
+
 import mat4Data  # noqa
+import numpy as np
 import pytest
 
-from ncca.ngl import Mat4, Mat4Error, Mat4NotSquare, Vec4
+from ncca.ngl import (
+    Mat4,
+    Mat4Error,
+    Mat4NotSquare,
+    Mat4Type,
+    Vec3,
+    Vec3Array,
+    Vec4,
+    look_at,
+    ortho,
+    perspective,
+)
 
 
 def test_ctor():
@@ -295,3 +309,310 @@ def test_ngl():
         ]
     )
     assert test.to_list() == pytest.approx(result.to_list(), abs=1e-3)
+
+
+def test_float32_storage():
+    a = Mat4.from_numpy(np.arange(1, 17, dtype=np.float32))
+    assert a.is_float32
+    assert a.m.dtype == np.float32
+    assert a.m.flags["C_CONTIGUOUS"]
+    # no copy for upload
+    assert a.as_float32() is a.m
+    assert a[1][2] == 7
+    a[1][2] = 20.0
+    assert a.m[1][2] == 20.0
+    with pytest.raises(Mat4NotSquare):
+        _ = Mat4.from_numpy([1, 2, 3])
+    b = Mat4()
+    assert not b.is_float32
+    assert b.as_float32().dtype == np.float32
+
+
+def test_float32_matches_list():
+    t1 = Mat4.rotate_x(45.0)
+    t2 = Mat4.rotate_y(35.0)
+    t3 = Mat4.translate(1.0, 2.0, 3.0)
+    f1 = Mat4.from_numpy(t1.to_numpy())
+    f2 = Mat4.from_numpy(t2.to_numpy())
+    f3 = Mat4.from_numpy(t3.to_numpy())
+    result = f3 @ f2 @ f1
+    assert result.is_float32
+    assert result.get_matrix() == pytest.approx((t3 @ t2 @ t1).get_matrix(), abs=1e-6)
+    # mixed storage gives float32
+    assert (t3 @ f2).is_float32
+    assert (f1 + t2).get_matrix() == pytest.approx((t1 + t2).get_matrix(), abs=1e-6)
+    assert (f1 - t2).get_matrix() == pytest.approx((t1 - t2).get_matrix(), abs=1e-6)
+    inv = result.inverse()
+    assert inv.is_float32
+    assert inv.get_matrix() == pytest.approx(
+        (t3 @ t2 @ t1).inverse().get_matrix(), abs=1e-5
+    )
+    assert result.determinant() == pytest.approx(1.0, abs=1e-5)
+    assert f1.get_transpose().get_matrix() == pytest.approx(
+        t1.get_transpose().get_matrix(), abs=1e-6
+    )
+    v = f3 @ Vec4(1, 2, 3, 1)
+    assert isinstance(v.x, float)
+    assert str(f1) == str(Mat4.from_list(f1.get_matrix()))
+
+
+def test_set_float32_storage():
+    Mat4.set_float32_storage(True)
+    try:
+        assert Mat4().is_float32
+        assert Mat4.identity().is_float32
+        assert Mat4.zero().is_float32
+        assert Mat4.translate(1, 2, 3).is_float32
+        assert Mat4.from_list(list(range(16))).is_float32
+        m = Mat4.scale(2, 3, 4) * 2
+        assert m.get_matrix() == pytest.approx(
+            [4, 0, 0, 0, 0, 6, 0, 0, 0, 0, 8, 0, 0, 0, 0, 2]
+        )
+    finally:
+        Mat4.set_float32_storage(False)
+    assert not Mat4().is_float32
+
+
+def test_array_protocol():
+    m = Mat4.from_numpy(np.arange(16))
+    assert np.asarray(m) is m.m
+    assert np.array(m).base is None
+    assert np.asarray(m, dtype=np.float64).dtype == np.float64
+    lm = Mat4()
+    assert np.asarray(lm).tolist() == lm.m
+    assert lm.tobytes() == np.array(lm.get_matrix(), dtype=np.float32).tobytes()
+    assert m.tobytes() == np.array(m.get_matrix(), dtype=np.float32).tobytes()
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="__buffer__ needs python 3.12")
+def test_buffer_protocol():
+    m = Mat4.from_numpy(np.arange(16))
+    view = memoryview(m)
+    assert view.shape == (4, 4)
+    view[0, 1] = 20.0
+    assert m.m[0][1] == 20.0
+    assert memoryview(Mat4()).tolist() == Mat4().m
+
+
+def test_matrix_type():
+    assert Mat4().matrix_type == Mat4Type.GENERAL
+    assert Mat4.identity().matrix_type == Mat4Type.IDENTITY
+    assert Mat4.translate(1, 2, 3).matrix_type == Mat4Type.TRANSLATION
+    assert Mat4.rotate_x(20).matrix_type == Mat4Type.RIGID
+    assert Mat4.scale(-1, 1, 1).matrix_type == Mat4Type.RIGID
+    assert Mat4.scale(1, 2, 3).matrix_type == Mat4Type.AFFINE
+    assert Mat4.from_list([1] * 16).matrix_type == Mat4Type.GENERAL
+    assert (Mat4.translate(1, 2, 3) @ Mat4.rotate_y(45)).matrix_type == Mat4Type.RIGID
+    assert (Mat4.scale(1, 2, 3) @ Mat4.rotate_z(45)).matrix_type == Mat4Type.AFFINE
+    assert (Mat4.scale(1, 2, 3) @ Mat4()).matrix_type == Mat4Type.GENERAL
+    eye = look_at(Vec3(0, 2, 5), Vec3(0, 0, 0), Vec3(0, 1, 0))
+    assert eye.matrix_type == Mat4Type.RIGID
+    assert ortho(-1, 1, -1, 1, 0.1, 10).matrix_type == Mat4Type.AFFINE
+    m = Mat4.rotate_x(20)
+    m.transpose()
+    assert m.matrix_type == Mat4Type.GENERAL
+    m.matrix_type = Mat4Type.RIGID
+    assert m.matrix_type == Mat4Type.RIGID
+
+
+def test_fast_inverse_matches_general():
+    mats = [
+        Mat4.identity(),
+        Mat4.translate(1, -2, 3),
+        Mat4.translate(1, 2, 3) @ Mat4.rotate_x(30) @ Mat4.rotate_y(-20),
+        look_at(Vec3(1, 2, 5), Vec3(0, 0, 0), Vec3(0, 1, 0)),
+        Mat4.translate(1, 2, 3) @ Mat4.rotate_z(10) @ Mat4.scale(2, 3, 0.5),
+        ortho(-2, 3, -1, 1, 0.1, 10),
+    ]
+    for m in mats:
+        general = Mat4.from_list(m.get_matrix())
+        fast = m.inverse()
+        assert fast.matrix_type == m.matrix_type
+        assert fast.get_matrix() == pytest.approx(
+            general.inverse().get_matrix(), abs=1e-6
+        )
+        assert m.inverse_affine().get_matrix() == pytest.approx(
+            fast.get_matrix(), abs=1e-6
+        )
+        f32 = Mat4.from_numpy(m.as_float32())
+        f32.matrix_type = m.matrix_type
+        assert f32.inverse().is_float32
+
+
+def test_inverse_edited_by_hand():
+    # flags are checked before use so editing m directly is still safe
+    m = Mat4.identity()
+    m.m[0][0] = 2.0
+    assert m.inverse().get_matrix() == pytest.approx(Mat4.scale(0.5, 1, 1).get_matrix())
+    m = Mat4.identity()
+    m.m[1][1] = 2.0
+    product = m @ Mat4.rotate_x(30)
+    assert (product @ product.inverse()).get_matrix() == pytest.approx(
+        Mat4().get_matrix(), abs=1e-6
+    )
+    assert product.matrix_type == Mat4Type.GENERAL
+    t = Mat4.translate(1, 2, 3)
+    t.m[2][3] = -1.0
+    assert t.inverse().get_matrix() == pytest.approx(
+        Mat4.from_list(t.get_matrix()).inverse().get_matrix()
+    )
+
+
+@pytest.mark.parametrize("float32", [False, True])
+def test_inverse_edited_rotation(float32):
+    # a scaled rotation isn't orthonormal so the transpose can't be used
+    m = Mat4.rotate_y(30)
+    if float32:
+        m = Mat4.from_numpy(m.as_float32())
+        m.matrix_type = Mat4Type.RIGID
+    m[0][0] = 2.0
+    identity = Mat4().get_matrix()
+    assert (m @ m.inverse()).get_matrix() == pytest.approx(identity, abs=1e-6)
+    r = Mat4.rotate_x(20)
+    r.m[1][2] = 0.5
+    product = Mat4.translate(1, 2, 3) @ r
+    assert (product @ product.inverse()).get_matrix() == pytest.approx(
+        identity, abs=1e-6
+    )
+    normals = np.array([[1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=np.float32)
+    expected = normals @ np.linalg.inv(np.asarray(r.m, dtype=np.float64)[:3, :3]).T
+    expected /= np.linalg.norm(expected, axis=1, keepdims=True)
+    np.testing.assert_allclose(r.transform_normals(normals), expected, atol=1e-6)
+
+
+@pytest.mark.parametrize("edit", [(0, 0, 3.0), (1, 0, 0.5), (3, 1, 2.0), (0, 3, 0.25)])
+def test_edited_identity_product_inverse(edit):
+    # products of edited matrices are checked when their type is used
+    i, j, value = edit
+    for other in (Mat4.identity(), Mat4.translate(1, 2, 3), Mat4.rotate_y(40)):
+        m = Mat4.identity()
+        m.m[i][j] = value
+        product = m @ other
+        expected = Mat4.from_list(product.get_matrix()).inverse()
+        assert product.inverse().get_matrix() == pytest.approx(
+            expected.get_matrix(), abs=1e-6
+        )
+
+
+def test_inverse_affine_errors():
+    with pytest.raises(Mat4Error):
+        Mat4.from_list([1] * 16).inverse_affine()
+    with pytest.raises(Mat4Error):
+        Mat4.scale(0, 1, 1).inverse()
+
+
+def test_set_identity():
+    a = Mat4.translate(1, 2, 3) @ Mat4.rotate_x(20)
+    m = a.m
+    assert a.set_identity() is a
+    assert a.m is m
+    assert a.get_matrix() == Mat4().get_matrix()
+    assert a.matrix_type == Mat4Type.IDENTITY
+    b = Mat4.from_numpy(np.arange(16))
+    m = b.m
+    b.set_identity()
+    assert b.m is m
+    assert b.get_matrix() == Mat4().get_matrix()
+
+
+@pytest.mark.parametrize("float32", [False, True])
+def test_mul_into(float32):
+    make = Mat4.from_numpy if float32 else Mat4.from_list
+    a = make(np.arange(16, dtype=np.float32).reshape(4, 4).tolist())
+    b = Mat4.rotate_y(30) @ Mat4.translate(1, 2, 3)
+    expected = (a @ b).get_matrix()
+    out = Mat4()
+    m = out.m
+    assert Mat4.mul_into(a, b, out) is out
+    assert out.m is m
+    assert out.get_matrix() == pytest.approx(expected, rel=1e-5)
+    out = Mat4.from_numpy(np.zeros(16))
+    Mat4.mul_into(a, b, out)
+    assert out.get_matrix() == pytest.approx(expected, rel=1e-5)
+    # the output can be one of the inputs
+    Mat4.mul_into(a, b, a)
+    assert a.get_matrix() == pytest.approx(expected, rel=1e-5)
+
+
+def test_mul_into_type():
+    out = Mat4()
+    Mat4.mul_into(Mat4.translate(1, 2, 3), Mat4.rotate_z(45), out)
+    assert out.matrix_type == Mat4Type.RIGID
+
+
+def test_add_into():
+    a = Mat4.from_list(list(range(16)))
+    b = Mat4.from_list(list(range(16, 32)))
+    expected = (a + b).get_matrix()
+    out = Mat4()
+    m = out.m
+    assert Mat4.add_into(a, b, out) is out
+    assert out.m is m
+    assert out.get_matrix() == pytest.approx(expected)
+    out = Mat4.from_numpy(np.zeros(16))
+    Mat4.add_into(a, b, out)
+    assert out.get_matrix() == pytest.approx(expected)
+    Mat4.add_into(a, b, a)
+    assert a.get_matrix() == pytest.approx(expected)
+
+
+def _transform_test_matrix():
+    return Mat4.translate(1, -2, 3) @ Mat4.rotate_y(30) @ Mat4.scale(2, 1, 0.5)
+
+
+def test_transform_points():
+    m = _transform_test_matrix()
+    points = np.array([[1, 2, 3], [-1, 0, 4], [0, 0, 0]], dtype=np.float32)
+    result = m.transform_points(points)
+    assert result.shape == (3, 3)
+    assert result.dtype == np.float32
+    for p, r in zip(points, result):
+        expected = Vec4(*p.tolist(), 1.0) @ m
+        assert r.tolist() == pytest.approx([expected.x, expected.y, expected.z])
+    from_array = m.transform_points(Vec3Array(points))
+    np.testing.assert_array_equal(from_array, result)
+    with pytest.raises(ValueError):
+        m.transform_points(np.zeros(4))
+
+
+def test_transform_points_perspective_divide():
+    m = perspective(45.0, 1.0, 0.1, 100.0)
+    points = np.array([[0.5, -0.5, -2.0], [1.0, 2.0, -10.0]], dtype=np.float32)
+    result = m.transform_points(points, perspective_divide=True)
+    for p, r in zip(points, result):
+        clip = Vec4(*p.tolist(), 1.0) @ m
+        assert r.tolist() == pytest.approx(
+            [clip.x / clip.w, clip.y / clip.w, clip.z / clip.w], rel=1e-5
+        )
+
+
+def test_transform_directions():
+    m = _transform_test_matrix()
+    dirs = np.array([[1, 0, 0], [0, 1, 1]], dtype=np.float32)
+    result = m.transform_directions(dirs)
+    for d, r in zip(dirs, result):
+        expected = Vec4(*d.tolist(), 0.0) @ m
+        assert r.tolist() == pytest.approx([expected.x, expected.y, expected.z])
+
+
+@pytest.mark.parametrize("rigid", [True, False])
+def test_transform_normals(rigid):
+    if rigid:
+        m = Mat4.translate(1, 2, 3) @ Mat4.rotate_x(40) @ Mat4.rotate_z(-25)
+    else:
+        m = _transform_test_matrix()
+    rng = np.random.default_rng(3)
+    normals = rng.uniform(-1, 1, (10, 3)).astype(np.float32)
+    tangents = np.cross(normals, rng.uniform(-1, 1, (10, 3))).astype(np.float32)
+    result = m.transform_normals(normals)
+    # the transformed normals stay perpendicular to the transformed tangents
+    moved = m.transform_directions(tangents)
+    assert np.abs(np.sum(result * moved, axis=1)) == pytest.approx(
+        np.zeros(10), abs=1e-5
+    )
+    assert np.linalg.norm(result, axis=1) == pytest.approx(np.ones(10), rel=1e-5)
+    raw = m.transform_normals(normals, normalize=False)
+    if rigid:
+        np.testing.assert_allclose(raw, m.transform_directions(normals), atol=1e-6)
+    with pytest.raises(Mat4Error):
+        Mat4.scale(1, 0, 1).transform_normals(normals)
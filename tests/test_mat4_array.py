@@ -0,0 +1,199 @@
+import numpy as np
+import pytest
+
+from ncca.ngl import Mat4, Mat4Array, Mat4Error, Transform
+
+
+def _random_mats(count, seed=1234):
+    rng = np.random.default_rng(seed)
+    return [
+        Mat4.from_list(rng.uniform(-2.0, 2.0, (4, 4)).tolist()) for _ in range(count)
+    ]
+
+
+def test_init():
+    a = Mat4Array()
+    assert len(a) == 0
+    a = Mat4Array(3)
+    assert len(a) == 3
+    for m in a:
+        assert m.get_matrix() == pytest.approx(Mat4().get_matrix())
+    a = Mat4Array([Mat4.translate(1, 2, 3), Mat4.scale(2, 2, 2)])
+    assert len(a) == 2
+    assert a[0].get_matrix() == pytest.approx(Mat4.translate(1, 2, 3).get_matrix())
+    with pytest.raises(TypeError):
+        Mat4Array([1, 2, 3])
+    a = Mat4Array(np.zeros((5, 16)))
+    assert a.to_numpy().shape == (5, 4, 4)
+    assert a.to_numpy().dtype == np.float32
+    with pytest.raises(ValueError):
+        Mat4Array(np.zeros(15))
+
+
+def test_getitem_is_view():
+    a = Mat4Array(2)
+    m = a[1]
+    m.m[3][0] = 5.0
+    assert a.to_numpy()[1, 3, 0] == 5.0
+    s = a[0:1]
+    assert isinstance(s, Mat4Array)
+    assert len(s) == 1
+
+
+def test_setitem_append_extend():
+    a = Mat4Array(1)
+    a[0] = Mat4.translate(1, 2, 3)
+    assert a[0].get_matrix() == pytest.approx(Mat4.translate(1, 2, 3).get_matrix())
+    with pytest.raises(TypeError):
+        a[0] = 1
+    a.append(Mat4.scale(1, 2, 3))
+    assert len(a) == 2
+    with pytest.raises(TypeError):
+        a.append([1, 2, 3])
+    a.extend([Mat4(), Mat4()])
+    assert len(a) == 4
+    a.extend(Mat4Array(2))
+    assert len(a) == 6
+
+
+def test_matmul():
+    lhs = _random_mats(8)
+    rhs = _random_mats(8, seed=42)
+    result = Mat4Array(lhs) @ Mat4Array(rhs)
+    for i in range(8):
+        expected = lhs[i] @ rhs[i]
+        assert result[i].get_matrix() == pytest.approx(
+            expected.get_matrix(), rel=1e-4, abs=1e-5
+        )
+
+
+def test_matmul_single():
+    mats = _random_mats(4)
+    single = Mat4.rotate_y(35.0)
+    right = Mat4Array(mats) @ single
+    left = single @ Mat4Array(mats)
+    assert isinstance(left, Mat4Array)
+    for i in range(4):
+        assert right[i].get_matrix() == pytest.approx(
+            (mats[i] @ single).get_matrix(), rel=1e-4, abs=1e-5
+        )
+        assert left[i].get_matrix() == pytest.approx(
+            (single @ mats[i]).get_matrix(), rel=1e-4, abs=1e-5
+        )
+
+
+def test_matmul_errors():
+    with pytest.raises(Mat4Error):
+        Mat4Array(2) @ Mat4Array(3)
+    with pytest.raises(TypeError):
+        Mat4Array(2) @ 2
+
+
+def test_transpose():
+    mats = _random_mats(4)
+    result = Mat4Array(mats).transpose()
+    for i in range(4):
+        assert result[i].get_matrix() == pytest.approx(
+            mats[i].get_transpose().get_matrix()
+        )
+
+
+def test_inverse():
+    mats = [
+        Mat4.translate(1, 2, 3) @ Mat4.rotate_x(20),
+        Mat4.scale(2, 3, 4),
+        Mat4.rotate_z(45),
+    ]
+    result = Mat4Array(mats).inverse()
+    for i in range(len(mats)):
+        assert result[i].get_matrix() == pytest.approx(
+            mats[i].inverse().get_matrix(), abs=1e-5
+        )
+    with pytest.raises(Mat4Error):
+        Mat4Array(np.zeros((2, 4, 4))).inverse()
+
+
+def test_determinant():
+    mats = _random_mats(5)
+    det = Mat4Array(mats).determinant()
+    assert det.shape == (5,)
+    for i in range(5):
+        assert det[i] == pytest.approx(mats[i].determinant(), rel=1e-4)
+
+
+def test_builders():
+    t = Mat4Array.translate([[1, 2, 3], [4, 5, 6]])
+    assert t[1].get_matrix() == pytest.approx(Mat4.translate(4, 5, 6).get_matrix())
+    s = Mat4Array.scale([[1, 2, 3]])
+    assert s[0].get_matrix() == pytest.approx(Mat4.scale(1, 2, 3).get_matrix())
+    angles = [0.0, 30.0, 90.0, -45.0]
+    rx = Mat4Array.rotate_x(angles)
+    ry = Mat4Array.rotate_y(angles)
+    rz = Mat4Array.rotate_z(angles)
+    for i, a in enumerate(angles):
+        assert rx[i].get_matrix() == pytest.approx(
+            Mat4.rotate_x(a).get_matrix(), abs=1e-6
+        )
+        assert ry[i].get_matrix() == pytest.approx(
+            Mat4.rotate_y(a).get_matrix(), abs=1e-6
+        )
+        assert rz[i].get_matrix() == pytest.approx(
+            Mat4.rotate_z(a).get_matrix(), abs=1e-6
+        )
+
+
+@pytest.mark.parametrize("order", ["xyz", "yzx", "zxy", "xzy", "yxz", "zyx"])
+def test_from_trs_matches_transform(order):
+    rng = np.random.default_rng(7)
+    count = 6
+    pos = rng.uniform(-10, 10, (count, 3))
+    rot = rng.uniform(-180, 180, (count, 3))
+    scale = rng.uniform(0.1, 3, (count, 3))
+    result = Mat4Array.from_trs(pos, rot, scale, order=order)
+    for i in range(count):
+        tx = Transform()
+        tx.set_position(*pos[i])
+        tx.set_rotation(*rot[i])
+        tx.set_scale(*scale[i])
+        tx.set_order(order)
+        assert result[i].get_matrix() == pytest.approx(
+            tx.get_matrix().get_matrix(), rel=1e-4, abs=1e-4
+        )
+
+
+def test_from_trs_errors():
+    with pytest.raises(ValueError):
+        Mat4Array.from_trs()
+    with pytest.raises(ValueError):
+        Mat4Array.from_trs([[0, 0, 0]], [[0, 0, 0], [1, 1, 1]])
+    with pytest.raises(ValueError):
+        Mat4Array.from_trs([[0, 0, 0]], order="abc")
+
+
+def test_to_list_and_sizeof():
+    a = Mat4Array([Mat4.translate(1, 2, 3)])
+    assert a.to_list() == pytest.approx(Mat4.translate(1, 2, 3).get_matrix())
+    assert a.sizeof() == 64
+    assert Mat4Array(10).sizeof() == 640
+    assert a.to_numpy() is a.to_numpy()
+
+
+def test_inverse_affine():
+    mats = [
+        Mat4.translate(1, 2, 3) @ Mat4.rotate_x(20),
+        Mat4.translate(-1, 0, 3) @ Mat4.rotate_y(-60) @ Mat4.rotate_z(10),
+    ]
+    a = Mat4Array(mats)
+    expected = a.inverse().to_numpy()
+    np.testing.assert_allclose(a.inverse_affine().to_numpy(), expected, atol=1e-5)
+    np.testing.assert_allclose(
+        a.inverse_affine(rigid=True).to_numpy(), expected, atol=1e-5
+    )
+    scaled = Mat4Array([Mat4.scale(1, 2, 4) @ Mat4.translate(1, 2, 3)])
+    np.testing.assert_allclose(
+        scaled.inverse_affine().to_numpy(), scaled.inverse().to_numpy(), atol=1e-5
+    )
+    with pytest.raises(Mat4Error):
+        Mat4Array([Mat4.from_list([1] * 16)]).inverse_affine()
+    with pytest.raises(Mat4Error):
+        Mat4Array([Mat4.scale(0, 1, 1)]).inverse_affine()
@@ -0,0 +1,138 @@
+import gzip
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from ncca.ngl import Obj, ObjArrays, mesh_cache, obj_parser
+from ncca.ngl.base_mesh import weld_vertices
+
+
+@pytest.fixture
+def mesh(tmp_path):
+    path = tmp_path / "Triangle1.obj"
+    shutil.copy("tests/files/Triangle1.obj", path)
+    return path
+
+
+def _expected(path):
+    return next(obj_parser.iter_triangles([ObjArrays.from_file(path)]))
+
+
+def test_cache_paths(mesh, tmp_path):
+    paths = mesh_cache.cache_paths(mesh)
+    assert set(paths) == {"vertices", "indices", "ranges", "materials", "bounds"}
+    assert all(p.parent == tmp_path / "__nglcache__" for p in paths.values())
+    assert mesh_cache.cache_paths(mesh, tmp_path / "other")["bounds"].parent == (
+        tmp_path / "other"
+    )
+    os.utime(mesh, ns=(0, 0))
+    assert mesh_cache.cache_paths(mesh) != paths
+
+
+def test_build_and_load(mesh):
+    assert mesh_cache.load_mesh_cache(mesh) is None
+    built = mesh_cache.build_mesh_cache(mesh)
+    cached = mesh_cache.load_mesh_cache(mesh)
+    for data in (built, cached):
+        assert isinstance(data["vertices"], np.memmap)
+        np.testing.assert_array_equal(data["vertices"], _expected(mesh))
+        assert data["indices"].dtype == np.uint32
+        assert len(data["indices"]) == 0
+        assert data["bounds"].tolist() == [[-2.0, 0.0, 0.0], [2.0, 4.0, 0.0]]
+    assert not list(mesh.parent.glob("__nglcache__/*.tmp"))
+
+
+def test_stale_cache(mesh):
+    mesh_cache.build_mesh_cache(mesh)
+    old = mesh_cache.cache_paths(mesh)
+    os.utime(mesh, ns=(0, 0))
+    assert mesh_cache.load_mesh_cache(mesh) is None
+    mesh_cache.build_mesh_cache(mesh)
+    assert not any(p.exists() for p in old.values())
+    assert all(p.exists() for p in mesh_cache.cache_paths(mesh).values())
+
+
+def test_unwritable_cache(mesh, tmp_path):
+    blocked = tmp_path / "blocked"
+    blocked.write_text("not a directory")
+    assert mesh_cache.build_mesh_cache(mesh, blocked) is None
+    obj = Obj.from_file(mesh, cache=True, cache_dir=blocked)
+    np.testing.assert_array_equal(obj.mesh_data, _expected(mesh))
+
+
+def test_quads(tmp_path):
+    path = tmp_path / "quad.obj"
+    path.write_text("v 0 0 0\nv 1 0 0\nv 1 1 0\nv 0 1 0\nf 1 2 3 4\n")
+    cached = mesh_cache.build_mesh_cache(path)
+    assert cached["vertices"].shape == (6, 8)
+
+
+def test_obj_from_file_cache(mesh, tmp_path):
+    obj = Obj.from_file(mesh, cache=True, cache_dir=tmp_path / "cache")
+    assert obj.faces == []
+    np.testing.assert_array_equal(obj.mesh_data, _expected(mesh))
+    assert (obj.min_x, obj.max_x, obj.min_y, obj.max_y) == (-2.0, 2.0, 0.0, 4.0)
+    # second load comes from the cache
+    obj = Obj.from_file(mesh, cache=True, cache_dir=tmp_path / "cache")
+    assert isinstance(obj.mesh_data, np.memmap)
+
+
+def test_cache_draw_ranges(tmp_path):
+    obj = Obj.from_file("tests/files/Materials.obj", cache=True, cache_dir=tmp_path)
+    expected = [(None, 0, 3), ("red", 3, 6), ("blue", 9, 6)]
+    assert obj.draw_ranges == expected
+    assert obj.materials == ["red", "blue"]
+    cached = mesh_cache.load_mesh_cache("tests/files/Materials.obj", tmp_path)
+    assert cached["draw_ranges"] == expected
+    assert cached["materials"].tolist() == ["red", "blue"]
+
+
+def test_compressed_cache(tmp_path):
+    path = tmp_path / "Triangle1.obj.gz"
+    path.write_bytes(gzip.compress(open("tests/files/Triangle1.obj", "rb").read()))
+    obj = Obj.from_file(path, cache=True)
+    np.testing.assert_array_equal(obj.mesh_data, _expected("tests/files/Triangle1.obj"))
+    assert mesh_cache.load_mesh_cache(path) is not None
+
+
+def test_welded_cache(tmp_path):
+    path = tmp_path / "quad.obj"
+    path.write_text("v 0 0 0\nv 1 0 0\nv 1 1 0\nv 0 1 0\nf 1 2 3 4\n")
+    triangles = mesh_cache.build_mesh_cache(path)["vertices"]
+    expected = weld_vertices(triangles)
+    for _ in range(2):
+        obj = Obj()
+        obj.load_cached(path, weld=True)
+        assert isinstance(obj.mesh_indices, np.memmap)
+        np.testing.assert_array_equal(obj.mesh_data, expected[0])
+        np.testing.assert_array_equal(obj.mesh_indices, expected[1])
+    # the welded entry is kept next to the triangle data
+    assert all(p.exists() for p in mesh_cache.cache_paths(path).values())
+    assert len(mesh_cache.load_mesh_cache(path)["indices"]) == 0
+    obj.load_cached(path)
+    assert obj.mesh_indices is None
+    assert obj.mesh_data.shape == (6, 8)
+
+
+_pyramid = (
+    "v 0 0 0\nv 1 0 0\nv 1 0 1\nv 0 0 1\nv 0.5 1 0.5\n"
+    "f 1 2 3 4\nf 1 5 2\nf 2 5 3\nf 3 5 4\nf 4 5 1\n"
+)
+
+
+@pytest.mark.parametrize("file", ["TriangleVertsOnly.obj", "pyramid.obj"])
+def test_cache_generated_normals(file, tmp_path):
+    path = tmp_path / file
+    if file == "pyramid.obj":
+        path.write_text(_pyramid)
+    else:
+        shutil.copy(f"tests/files/{file}", path)
+    expected = Obj.from_file(path)._pack_triangles()
+    assert expected[:, 3:6].any()
+    obj = Obj()
+    obj.load_cached(path)
+    np.testing.assert_allclose(obj.mesh_data, expected, atol=1e-6)
+    obj.load_cached(path, weld=True)
+    np.testing.assert_allclose(obj.mesh_data[obj.mesh_indices], expected, atol=1e-6)
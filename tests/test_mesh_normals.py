@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+from ncca.ngl import mesh_normals
+
+# a welded unit cube with counter clockwise quads facing out
+_cube_positions = np.array(
+    [
+        [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+        [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1],
+    ],
+    dtype=np.float64,
+)  # fmt: skip
+_cube_faces = np.array(
+    [
+        0, 3, 2, 1,  4, 5, 6, 7,  0, 1, 5, 4,
+        2, 3, 7, 6,  1, 2, 6, 5,  0, 4, 7, 3,
+    ]
+)  # fmt: skip
+_cube_sizes = np.full(6, 4)
+
+
+def test_face_normals():
+    normals, areas = mesh_normals.face_normals(
+        _cube_positions, _cube_faces, _cube_sizes
+    )
+    np.testing.assert_allclose(
+        normals, [[0, 0, -1], [0, 0, 1], [0, -1, 0], [0, 1, 0], [1, 0, 0], [-1, 0, 0]]
+    )
+    np.testing.assert_allclose(areas, 1.0)
+    # degenerate faces have a zero normal
+    normals, areas = mesh_normals.face_normals([[0, 0, 0], [1, 0, 0]], [0, 1, 1], [3])
+    assert normals.tolist() == [[0.0, 0.0, 0.0]] and areas.tolist() == [0.0]
+
+
+def test_vertex_normals():
+    normals = mesh_normals.vertex_normals(_cube_positions, _cube_faces, _cube_sizes)
+    # each corner points away from the centre
+    expected = (_cube_positions - 0.5) / np.linalg.norm(_cube_positions - 0.5, axis=1)[
+        :, None
+    ]
+    np.testing.assert_allclose(normals, expected, atol=1e-12)
+    # unused vertices have a zero normal
+    positions = np.vstack((_cube_positions, [[5, 5, 5]]))
+    normals = mesh_normals.vertex_normals(positions, _cube_faces, _cube_sizes)
+    assert normals[-1].tolist() == [0.0, 0.0, 0.0]
+
+
+def test_vertex_normals_weighting():
+    # a fan of a large triangle on the floor and a small one on a wall around vertex 0
+    positions = [[0, 0, 0], [4, 0, 0], [0, 0, -4], [0, 1, 0], [1, 0, 0]]
+    faces = [0, 1, 2, 0, 4, 3]
+    angle = mesh_normals.vertex_normals(positions, faces, [3, 3])[0]
+    area = mesh_normals.vertex_normals(positions, faces, [3, 3], weighting="area")[0]
+    # both faces have a right angle at vertex 0 so the angle weighting doesn't depend on size
+    np.testing.assert_allclose(angle, np.array([0, 1, 1]) / np.sqrt(2))
+    assert area[1] > 0.9 and area[2] < 0.2
+    with pytest.raises(ValueError):
+        mesh_normals.vertex_normals(positions, faces, [3, 3], weighting="uniform")
+
+
+def test_corner_normals():
+    smooth = mesh_normals.corner_normals(_cube_positions, _cube_faces, _cube_sizes)
+    vertex = mesh_normals.vertex_normals(_cube_positions, _cube_faces, _cube_sizes)
+    np.testing.assert_array_equal(smooth, vertex[_cube_faces])
+    # the cube's edges are all sharper than the crease so each corner uses its face normal
+    creased = mesh_normals.corner_normals(
+        _cube_positions, _cube_faces, _cube_sizes, crease_angle=30.0
+    )
+    normals, _ = mesh_normals.face_normals(_cube_positions, _cube_faces, _cube_sizes)
+    np.testing.assert_allclose(creased, np.repeat(normals, 4, axis=0))
+    # a crease above 90 degrees smooths across them
+    creased = mesh_normals.corner_normals(
+        _cube_positions, _cube_faces, _cube_sizes, crease_angle=91.0
+    )
+    np.testing.assert_allclose(creased, smooth)
+
+
+def test_corner_normals_partial_crease():
+    # two floor triangles and a wall sharing the edge from vertex 0 to 1
+    positions = [[0, 0, 0], [1, 0, 0], [1, 0, -1], [0, 0, 1], [0, 1, 0]]
+    faces = [0, 1, 2, 0, 3, 1, 0, 1, 4]
+    normals = mesh_normals.corner_normals(positions, faces, [3, 3, 3], crease_angle=45)
+    # the floor corners are smoothed with each other but not the wall
+    np.testing.assert_allclose(normals[:6], [[0, 1, 0]] * 6, atol=1e-12)
+    np.testing.assert_allclose(normals[6:], [[0, 0, 1]] * 3, atol=1e-12)
+
+
+def test_corner_normals_high_valence(monkeypatch):
+    # a cone fan, the apex is shared by every face
+    count = 1500
+    angles = np.linspace(0.0, 2.0 * np.pi, count, endpoint=False)
+    ring = np.column_stack((np.cos(angles), np.sin(angles), np.zeros(count)))
+    positions = np.vstack(([[0.0, 0.0, 1.0]], ring))
+    ring_index = np.arange(1, count + 1)
+    faces = np.column_stack(
+        (np.zeros(count, dtype=int), ring_index, np.roll(ring_index, -1))
+    ).reshape(-1)
+    sizes = np.full(count, 3)
+    normals = mesh_normals.corner_normals(positions, faces, sizes, crease_angle=10.0)
+    # every apex angle is the same so the apex corners are the plain average of the faces
+    # within the crease angle
+    face, _ = mesh_normals.face_normals(positions, faces, sizes)
+    within = face @ face.T >= np.cos(np.radians(10.0))
+    np.testing.assert_allclose(
+        normals[0::3], mesh_normals._normalize(within @ face), atol=1e-12
+    )
+    # the pairs are compared in chunks of corners which doesn't change the result
+    monkeypatch.setattr(mesh_normals, "_pair_chunk_size", 1000)
+    chunked = mesh_normals.corner_normals(positions, faces, sizes, crease_angle=10.0)
+    np.testing.assert_allclose(chunked, normals, atol=1e-12)
@@ -0,0 +1,119 @@
+import numpy as np
+import OpenGL.GL as gl
+import pytest
+
+from ncca.ngl import IndexVertexData, mesh_optimizer
+
+
+def _grid(n, seed=0):
+    "shuffled triangles of an n x n grid and its vertex positions"
+    i, j = np.meshgrid(np.arange(n), np.arange(n), indexing="ij")
+    v = (i * (n + 1) + j).ravel()
+    triangles = np.concatenate(
+        (np.stack((v, v + 1, v + n + 1), 1), np.stack((v + 1, v + n + 2, v + n + 1), 1))
+    )
+    triangles = triangles[np.random.default_rng(seed).permutation(len(triangles))]
+    k = np.arange((n + 1) ** 2)
+    positions = np.stack((k // (n + 1), k % (n + 1), np.zeros(len(k))), 1)
+    return triangles.astype(np.uint32).ravel(), positions.astype(np.float32)
+
+
+def _triangle_set(indices, positions):
+    "the triangles as position tuples, rotated so each starts at its smallest corner"
+    result = []
+    for triangle in positions[np.asarray(indices).reshape(-1, 3)].tolist():
+        start = triangle.index(min(triangle))
+        result.append(tuple(map(tuple, triangle[start:] + triangle[:start])))
+    return sorted(result)
+
+
+def test_cache_stats():
+    assert mesh_optimizer.cache_stats([]) == (0.0, 0.0)
+    # the second triangle shares 2 vertices
+    assert mesh_optimizer.cache_stats([0, 1, 2, 2, 1, 3]) == (2.0, 1.0)
+    assert mesh_optimizer.cache_stats([0, 1, 2, 2, 1, 3], 8) == (2.0, 0.5)
+    # a cache of 3 has lost vertex 0 by the last triangle
+    acmr, _ = mesh_optimizer.cache_stats([0, 1, 2, 3, 4, 5, 0, 1, 2], cache_size=3)
+    assert acmr == 3.0
+
+
+def test_optimize_vertex_cache():
+    indices, positions = _grid(24)
+    acmr, atvr = mesh_optimizer.cache_stats(indices)
+    optimized = mesh_optimizer.optimize_vertex_cache(indices)
+    assert optimized.dtype == indices.dtype
+    assert _triangle_set(optimized, positions) == _triangle_set(indices, positions)
+    new_acmr, new_atvr = mesh_optimizer.cache_stats(optimized)
+    assert new_acmr < 0.8 < acmr
+    assert new_atvr < atvr
+    assert len(mesh_optimizer.optimize_vertex_cache(np.zeros(0, np.uint32))) == 0
+
+
+def test_optimize_vertex_cache_islands():
+    # separate triangles need the fallback to the next unused triangle
+    indices = np.arange(30, dtype=np.uint32)
+    optimized = mesh_optimizer.optimize_vertex_cache(indices)
+    assert sorted(optimized.tolist()) == indices.tolist()
+
+
+def test_optimize_overdraw():
+    # two quads facing out from the centre either side of it and a quad facing in
+    positions = np.array(
+        [
+            [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1],
+            [0, 0, -1], [0, 1, -1], [1, 1, -1], [1, 0, -1],
+            [0, 0, 0.5], [0, 1, 0.5], [1, 1, 0.5], [1, 0, 0.5],
+        ],
+        dtype=np.float32,
+    )  # fmt: skip
+    indices = np.array(
+        [8, 9, 10, 8, 10, 11, 0, 1, 2, 0, 2, 3, 4, 5, 6, 4, 6, 7], dtype=np.uint16
+    )
+    optimized = mesh_optimizer.optimize_overdraw(indices, positions, cache_size=4)
+    assert _triangle_set(optimized, positions) == _triangle_set(indices, positions)
+    # the inward facing cluster is drawn last
+    assert optimized[-6:].tolist() == [8, 9, 10, 8, 10, 11]
+
+
+@pytest.mark.parametrize("threshold", [1.0, 1.05, 1.5])
+def test_optimize_overdraw_acmr(threshold):
+    indices, grid = _grid(40)
+    # wrap the grid around a sphere so the clusters face different ways
+    theta, phi = grid[:, 0] / 40 * np.pi, grid[:, 1] / 40 * 2 * np.pi
+    positions = np.stack(
+        (np.sin(theta) * np.cos(phi), np.sin(theta) * np.sin(phi), np.cos(theta)), 1
+    )
+    indices = mesh_optimizer.optimize_vertex_cache(indices)
+    optimized = mesh_optimizer.optimize_overdraw(indices, positions, threshold)
+    assert _triangle_set(optimized, positions) == _triangle_set(indices, positions)
+    before, _ = mesh_optimizer.cache_stats(indices)
+    after, _ = mesh_optimizer.cache_stats(optimized)
+    assert after <= threshold * before
+
+
+def test_optimize_vertex_fetch():
+    vertices = np.arange(10, dtype=np.float32).reshape(5, 2)
+    indices = np.array([3, 1, 4, 4, 1, 3], dtype=np.uint16)
+    new_vertices, new_indices = mesh_optimizer.optimize_vertex_fetch(vertices, indices)
+    assert new_indices.dtype == np.uint16
+    assert new_indices.tolist() == [0, 1, 2, 2, 1, 0]
+    np.testing.assert_array_equal(new_vertices[new_indices], vertices[indices])
+
+
+@pytest.mark.parametrize("overdraw", [False, True])
+def test_optimize_index_data(overdraw):
+    indices, positions = _grid(12)
+    vertices = np.hstack((positions, np.zeros((len(positions), 5), np.float32)))
+    data = IndexVertexData(vertices, len(vertices), indices, gl.GL_UNSIGNED_INT)
+    # the first range must stay in place
+    ranges = [(0, 60), (60, len(indices) - 60)]
+    optimized = mesh_optimizer.optimize_index_data(data, ranges, overdraw)
+    assert optimized.index_type == gl.GL_UNSIGNED_INT
+    assert optimized.indices.dtype == np.uint32
+    assert optimized.size == len(optimized.data)
+    for first, count in ranges:
+        new = optimized.data[optimized.indices[first : first + count], :3]
+        old = positions[indices[first : first + count]]
+        assert _triangle_set(range(count), new) == _triangle_set(range(count), old)
+    acmr, _ = mesh_optimizer.cache_stats(optimized.indices)
+    assert acmr < mesh_optimizer.cache_stats(indices)[0]
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from ncca.ngl import mesh_quantize
+
+
+def _sphere_normals(count, seed=0):
+    "random unit normals covering the whole sphere and the axes"
+    normals = np.random.default_rng(seed).normal(size=(count, 3))
+    axes = np.vstack((np.eye(3), -np.eye(3)))
+    normals = np.vstack((normals, axes))
+    return normals / np.linalg.norm(normals, axis=1, keepdims=True)
+
+
+def test_quantize_positions():
+    positions = np.random.default_rng(1).uniform(-5.0, 20.0, size=(1000, 3))
+    positions[:, 2] *= 0.01
+    quantized, dequantize = mesh_quantize.quantize_positions(positions)
+    assert quantized.dtype == np.int16
+    assert quantized.min() == -32767 and quantized.max() == 32767
+    # the shader reads normalized int16 and applies the dequantize matrix
+    decoded = dequantize.transform_points(quantized / 32767.0)
+    extent = positions.max(axis=0) - positions.min(axis=0)
+    assert np.all(np.abs(decoded - positions) <= extent / 65534 + 1e-5)
+
+
+def test_quantize_positions_flat():
+    positions = [[1.0, 2.0, 3.0], [2.0, 2.0, 3.0]]
+    quantized, dequantize = mesh_quantize.quantize_positions(positions)
+    assert quantized.tolist() == [[-32767, 0, 0], [32767, 0, 0]]
+    np.testing.assert_allclose(
+        dequantize.transform_points(quantized / 32767.0), positions
+    )
+
+
+@pytest.mark.parametrize("dtype, tolerance", [(np.int8, 0.02), (np.int16, 1e-3)])
+def test_octahedral(dtype, tolerance):
+    normals = _sphere_normals(5000)
+    encoded = mesh_quantize.encode_octahedral(normals, dtype)
+    assert encoded.dtype == dtype and encoded.shape == (len(normals), 2)
+    decoded = mesh_quantize.decode_octahedral(encoded)
+    np.testing.assert_allclose(np.linalg.norm(decoded, axis=1), 1.0, rtol=1e-5)
+    angles = np.arccos(np.clip(np.einsum("ij,ij->i", decoded, normals), -1.0, 1.0))
+    assert angles.max() < tolerance
+    # the axes are exact
+    np.testing.assert_allclose(decoded[-6:], normals[-6:], atol=1e-6)
+
+
+def test_octahedral_unnormalized():
+    encoded = mesh_quantize.encode_octahedral([[0, 0, 0], [0, 0, -3.0], [2.0, 2.0, 0]])
+    decoded = mesh_quantize.decode_octahedral(encoded)
+    np.testing.assert_allclose(decoded[0], [0, 0, 1])
+    np.testing.assert_allclose(decoded[1], [0, 0, -1])
+    np.testing.assert_allclose(decoded[2], [np.sqrt(0.5), np.sqrt(0.5), 0], atol=0.02)
+
+
+@pytest.mark.parametrize("normal_type, size", [(np.int8, 12), (np.int16, 16)])
+def test_pack_compact(normal_type, size):
+    data = np.load("src/ncca/ngl/PrimData/teapot.npy").reshape(-1, 8)
+    packed, dequantize = mesh_quantize.pack_compact(data, normal_type)
+    assert packed.dtype.itemsize == size and len(packed) == len(data)
+    assert packed.view(np.uint8).nbytes * 32 == data.nbytes * size
+    positions = dequantize.transform_points(packed["position"][:, :3] / 32767.0)
+    np.testing.assert_allclose(positions, data[:, :3], atol=1e-4)
+    normals = mesh_quantize.decode_octahedral(packed["normal"])
+    assert np.einsum("ij,ij->i", normals, data[:, 3:6]).min() > 0.999
+    np.testing.assert_allclose(packed["uv"].astype(np.float32), data[:, 6:], atol=1e-3)
+    with pytest.raises(ValueError):
+        mesh_quantize.pack_compact(data, np.float32)
@@ -0,0 +1,106 @@
+import numpy as np
+
+from ncca.ngl import mesh_simplify
+
+
+def _grid(n, height=0.0):
+    "an n x n grid of triangles over the unit square with a bump of height in the middle"
+    i, j = np.meshgrid(np.arange(n), np.arange(n), indexing="ij")
+    v = (i * (n + 1) + j).ravel()
+    triangles = np.concatenate(
+        (np.stack((v, v + 1, v + n + 1), 1), np.stack((v + 1, v + n + 2, v + n + 1), 1))
+    )
+    k = np.arange((n + 1) ** 2)
+    x, y = k // (n + 1) / n, k % (n + 1) / n
+    z = height * np.sin(x * np.pi) * np.sin(y * np.pi)
+    return np.stack((x, y, z), 1), triangles.astype(np.uint32).ravel()
+
+
+def _normals(positions, indices):
+    "the unnormalized normal of each triangle"
+    p = positions[np.asarray(indices, dtype=np.int64).reshape(-1, 3)]
+    return np.cross(p[:, 1] - p[:, 0], p[:, 2] - p[:, 0])
+
+
+def test_simplify_flat():
+    positions, indices = _grid(10)
+    result, ranges, error = mesh_simplify.simplify(
+        positions, indices, target_error=1e-6
+    )
+    # a flat square only needs its corners
+    assert result.dtype == np.uint32
+    assert len(result) == 6 and ranges == [(0, 6)]
+    assert sorted(set(result.tolist())) == [0, 10, 110, 120]
+    assert error == 0.0
+    assert np.all(_normals(positions, result)[:, 2] < 0.0)
+
+
+def test_simplify_preserve_borders():
+    positions, indices = _grid(10)
+    result, _, _ = mesh_simplify.simplify(positions, indices, preserve_borders=True)
+    border = np.flatnonzero(
+        np.any((positions[:, :2] == 0.0) | (positions[:, :2] == 1.0), axis=1)
+    )
+    assert set(result.tolist()) == set(border.tolist())
+
+
+def test_simplify_target():
+    positions, indices = _grid(16, 0.3)
+    result, _, error = mesh_simplify.simplify(positions, indices, target_count=100)
+    assert len(result) == 100 * 3
+    assert 0.0 < error < 0.05
+    # no triangles are flipped
+    assert np.all(_normals(positions, result)[:, 2] < 0.0)
+    # the error limit stops early, more error removes more triangles
+    counts = []
+    for target_error in (0.001, 0.01, 0.05):
+        result, _, error = mesh_simplify.simplify(
+            positions, indices, target_error=target_error
+        )
+        assert error <= target_error
+        counts.append(len(result))
+    assert counts[0] > counts[1] > counts[2]
+
+
+def test_simplify_seams():
+    # the right half of the grid uses copies of its vertices, as if it had different uvs
+    positions, indices = _grid(8, 0.2)
+    triangles = indices.reshape(-1, 3).astype(np.int64)
+    right = positions[triangles].mean(axis=1)[:, 0] > 0.5
+    vertices = np.hstack((positions, np.zeros((len(positions), 1))))
+    copies = np.hstack((positions, np.ones((len(positions), 1))))
+    triangles[right] += len(positions)
+    vertices = np.vstack((vertices, copies))
+    indices = triangles.ravel()
+    result, _, _ = mesh_simplify.simplify(vertices, indices, target_count=20)
+    # each triangle stays on its own side of the seam and the seam stays straight
+    kept = vertices[result.reshape(-1, 3)]
+    assert np.all(kept[:, :, 3] == kept[:, :1, 3])
+    seam = vertices[np.unique(result)]
+    assert np.count_nonzero(seam[:, 0] == 0.5) >= 4
+    left = kept[kept[:, 0, 3] == 0.0][:, :, 0]
+    assert np.all(left <= 0.5)
+    # without preserving seams the seam vertices can move
+    result, _, _ = mesh_simplify.simplify(
+        vertices, indices, target_count=20, preserve_seams=False
+    )
+    assert len(result) <= 60
+
+
+def test_simplify_ranges():
+    positions, indices = _grid(8, 0.2)
+    ranges = [(0, 192), (192, len(indices) - 192)]
+    result, new_ranges, _ = mesh_simplify.simplify(
+        positions, indices, target_count=30, ranges=ranges
+    )
+    assert new_ranges[0][0] == 0
+    assert new_ranges[1][0] == new_ranges[0][1]
+    assert sum(count for _, count in new_ranges) == len(result) == 90
+
+
+def test_simplify_empty():
+    result, ranges, error = mesh_simplify.simplify(
+        np.zeros((0, 3)), np.zeros(0, dtype=np.uint16)
+    )
+    assert len(result) == 0 and result.dtype == np.uint16
+    assert ranges == [(0, 0)] and error == 0.0
@@ -1,13 +1,22 @@
+import bz2
+import gzip
+import io
+import lzma
+
+import numpy as np
 import pytest
 
 from ncca.ngl import (
     Face,
     Obj,
+    ObjArrays,
     ObjParseFaceError,
     ObjParseNormalError,
     ObjParseUVError,
     ObjParseVertexError,
+    Vec2,
     Vec3,
+    obj_parser,
 )
 
 validfiles = [
@@ -311,3 +320,416 @@ def test_obj_with_vao(opengl_context):
     assert mesh.texture_id != 0
     # check if vao is created
     assert mesh.vao is not None
+
+
+def _mesh_data(obj):
+    return (
+        [list(v) for v in obj.vertex],
+        [list(v) for v in obj.normals],
+        [list(v) for v in obj.uv],
+        [(f.vertex, f.uv, f.normal) for f in obj.faces],
+        [list(c) for c in getattr(obj, "colour", [])],
+        (obj.objects, obj.groups, obj.materials, obj.material_libs),
+        (obj.face_objects, obj.face_groups, obj.face_materials),
+    )
+
+
+extrafiles = ["tests/files/TriColour.obj", "tests/files/Materials.obj"]
+
+
+@pytest.mark.parametrize("file", validfiles + extrafiles)
+def test_fast_load_matches(file):
+    assert _mesh_data(Obj.from_file(file, fast=True)) == _mesh_data(Obj.from_file(file))
+
+
+@pytest.mark.parametrize(
+    "face", [b"f 0 1 2", b"f 1/ 2/ 3/", b"f 1/1/ 2/1/ 3/1/", b"f 1///1 2///1 3///1"]
+)
+def test_fast_load_face_errors_match(tmp_path, face):
+    # index 0 and empty slots are errors for both parsers
+    path = tmp_path / "bad.obj"
+    path.write_bytes(b"v 0 0 0\nv 1 0 0\nv 0 1 0\nvt 0 0\nvn 0 0 1\n" + face + b"\n")
+    with pytest.raises(ObjParseFaceError):
+        Obj.from_file(str(path))
+    with pytest.raises(ObjParseFaceError):
+        Obj.from_file(str(path), fast=True)
+
+
+def test_fast_load_errors():
+    with pytest.raises(ObjParseVertexError):
+        Obj.from_file("tests/files/BrokenFloats.obj", fast=True)
+    with pytest.raises(ObjParseNormalError):
+        Obj.from_file("tests/files/BrokenNormals.obj", fast=True)
+    with pytest.raises(ObjParseUVError):
+        Obj.from_file("tests/files/BrokenUV.obj", fast=True)
+    with pytest.raises(ObjParseFaceError):
+        ObjArrays.from_bytes(b"v 0 0 0\nf 1/a/1 1/1/1 1/1/1\n")
+    with pytest.raises(ObjParseFaceError):
+        ObjArrays.from_bytes(b"v 0 0 0\nf 1/1/1/1 1 1\n")
+    with pytest.raises(ObjParseVertexError):
+        ObjArrays.from_bytes(b"v 0 0\n")
+
+
+def test_obj_arrays():
+    arrays = ObjArrays.from_file("tests/files/Triangle1.obj")
+    assert arrays.vertex.dtype == np.float32
+    assert arrays.vertex.shape == (3, 3)
+    assert arrays.normals.shape == (3, 3)
+    assert arrays.uv.shape == (3, 3)
+    assert arrays.vertex[1].tolist() == [0.0, 4.0, 0.0]
+    assert arrays.face_sizes.tolist() == [3]
+    assert arrays.face_vertex.dtype == np.int32
+    assert arrays.face_vertex.tolist() == [0, 1, 2]
+    assert arrays.face_uv.tolist() == [0, 1, 2]
+    assert arrays.face_normal.tolist() == [0, 1, 2]
+    assert arrays.colour is None
+    assert arrays.is_triangular()
+
+
+def test_obj_arrays_formats():
+    data = (
+        b"# comment\r\n"
+        b"v 0 0 0 # trailing comment\r\n"
+        b"  v 1 0 0\r\n"
+        b"v\t1 1 0\r\n"
+        b"v 0 1 0\r\n"
+        b"vt 0 0 0.5\n"
+        b"vn 0 0 1\n"
+        b"f 1 2 3 4\n"
+        b"f 1/1 2/1 3/1\n"
+        b"f -4//-1 -3//-1 -2//-1\n"
+        b"f 1/1/1 2/1/1 3/1/1\n"
+    )
+    arrays = ObjArrays.from_bytes(data)
+    assert arrays.vertex.shape == (4, 3)
+    assert arrays.uv.tolist() == [[0.0, 0.0, 0.5]]
+    assert arrays.face_sizes.tolist() == [4, 3, 3, 3]
+    assert arrays.face_offsets.tolist() == [0, 4, 7, 10]
+    assert not arrays.is_triangular()
+    assert arrays.face_vertex.tolist() == [0, 1, 2, 3, 0, 1, 2, 0, 1, 2, 0, 1, 2]
+    assert arrays.face_uv.tolist() == [-1] * 4 + [0] * 3 + [-1] * 3 + [0] * 3
+    assert arrays.face_normal.tolist() == [-1] * 7 + [0] * 6
+    faces = arrays.to_faces()
+    assert faces[0].uv == [] and faces[0].normal == []
+    assert faces[2].uv == [] and faces[2].normal == [0, 0, 0]
+
+
+def test_obj_arrays_blocks(monkeypatch):
+    # negative indices need the counts from earlier blocks
+    monkeypatch.setattr(obj_parser, "_block_size", 16)
+    arrays = ObjArrays.from_file("tests/files/CubeNegativeIndex.obj")
+    expected = ObjArrays.from_bytes(
+        open("tests/files/CubeNegativeIndex.obj", "rb").read()
+    )
+    assert arrays.face_vertex.tolist() == list(range(24))
+    np.testing.assert_array_equal(arrays.vertex, expected.vertex)
+    arrays = ObjArrays.from_file("tests/files/TriColour.obj")
+    assert arrays.colour.tolist() == [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+
+
+def test_iter_blocks():
+    expected = ObjArrays.from_file("tests/files/CubeNegativeIndex.obj")
+    # blocks smaller than a line are extended to the next newline
+    blocks = list(ObjArrays.iter_blocks("tests/files/CubeNegativeIndex.obj", 7))
+    assert len(blocks) > 1
+    arrays = ObjArrays.concatenate(blocks)
+    np.testing.assert_array_equal(arrays.vertex, expected.vertex)
+    np.testing.assert_array_equal(arrays.face_vertex, expected.face_vertex)
+    np.testing.assert_array_equal(arrays.face_normal, expected.face_normal)
+    # no newline at the end of the last line
+    stream = io.BytesIO(b"v 0 0 0\nv 1 0 0\nv 0 1 0\nf -3 -2 -1")
+    arrays = ObjArrays.concatenate(ObjArrays.iter_blocks(stream, 9))
+    assert arrays.face_vertex.tolist() == [0, 1, 2]
+    assert list(ObjArrays.iter_blocks(io.BytesIO(b""))) == []
+
+
+def test_iter_blocks_memory_limit():
+    data = b"v 0 0 0\n" * 100000
+    blocks = list(ObjArrays.iter_blocks(io.BytesIO(data), memory_limit=1 << 22))
+    limit = (1 << 22) // obj_parser._memory_per_byte
+    assert len(blocks) == -(-len(data) // limit)
+    assert sum(len(b.vertex) for b in blocks) == 100000
+
+
+def test_iter_triangles():
+    bounds = np.zeros((2, 3), dtype=np.float32)
+    blocks = ObjArrays.iter_blocks("tests/files/Triangle1.obj", 20)
+    data = np.concatenate(list(obj_parser.iter_triangles(blocks, bounds)))
+    obj = Obj.from_file("tests/files/Triangle1.obj")
+    assert data.shape == (3, 8)
+    for row, vertex, normal, uv in zip(
+        data, obj.faces[0].vertex, obj.faces[0].normal, obj.faces[0].uv
+    ):
+        v, n, t = obj.vertex[vertex], obj.normals[normal], obj.uv[uv]
+        expected = [v.x, v.y, v.z, n.x, n.y, n.z, t.x, 1 - t.y]
+        assert row.tolist() == pytest.approx(expected)
+    assert bounds.tolist() == [[-2.0, 0.0, 0.0], [2.0, 4.0, 0.0]]
+    # missing normals and uvs are zero
+    data = next(obj_parser.iter_triangles([ObjArrays.from_file(validfiles[2])]))
+    assert np.all(data[:, 3:] == 0.0)
+    # quads are split into triangles
+    quad = ObjArrays.from_bytes(b"v 0 0 0\nv 1 0 0\nv 1 1 0\nv 0 1 0\nf 1 2 3 4\n")
+    data = next(obj_parser.iter_triangles([quad]))
+    assert data[:, :2].tolist() == [[0, 0], [1, 0], [1, 1], [0, 0], [1, 1], [0, 1]]
+
+
+@pytest.mark.parametrize(
+    "file", ["tests/files/CubeNegativeIndex.obj", "tests/files/Concave.obj"]
+)
+def test_iter_triangles_polygons(file):
+    # the streamed data matches packing the faces of the mesh
+    obj = Obj.from_file(file)
+    expected = obj._pack_triangles()
+    blocks = ObjArrays.iter_blocks(file, 16)
+    data = np.concatenate(list(obj_parser.iter_triangles(blocks)))
+    if not obj.normals:  # only packing generates normals
+        data[:, 3:6] = expected[:, 3:6]
+    np.testing.assert_array_equal(data, expected)
+
+
+def test_write_triangles():
+    sink = io.BytesIO()
+    count, bounds, ranges = obj_parser.write_triangles(
+        "tests/files/Triangle1.obj", sink, block_size=64
+    )
+    blocks = [ObjArrays.from_file("tests/files/Triangle1.obj")]
+    expected = np.concatenate(list(obj_parser.iter_triangles(blocks)))
+    assert count == len(expected)
+    data = np.frombuffer(sink.getvalue(), dtype=np.float32).reshape(-1, 8)
+    np.testing.assert_array_equal(data, expected)
+    assert bounds.tolist() == [[-2.0, 0.0, 0.0], [2.0, 4.0, 0.0]]
+    assert ranges == [("initialShadingGroup", 0, 3)]
+
+
+def test_fast_load_memory_limit():
+    obj = Obj.from_file("tests/files/CubeNegativeIndex.obj", True, memory_limit=1)
+    expected = Obj.from_file("tests/files/CubeNegativeIndex.obj")
+    assert _mesh_data(obj) == _mesh_data(expected)
+
+
+@pytest.fixture
+def small_ranges(monkeypatch):
+    # split even the small test files into several byte ranges
+    monkeypatch.setattr(obj_parser, "_parallel_min_size", 0)
+    monkeypatch.setattr(obj_parser, "_block_size", 64)
+
+
+def test_byte_ranges(small_ranges):
+    file = "tests/files/CubeNegativeIndex.obj"
+    data = open(file, "rb").read()
+    ranges = obj_parser._byte_ranges(file, 2)
+    assert len(ranges) > 2
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start and data[start - 1 : start] == b"\n"
+
+
+@pytest.mark.parametrize("file", validfiles + extrafiles)
+def test_parallel_load_matches(small_ranges, file):
+    assert _mesh_data(Obj.from_file(file, workers=2)) == _mesh_data(Obj.from_file(file))
+
+
+def test_parallel_load_offsets(small_ranges):
+    obj = Obj()
+    obj.load("tests/files/Triangle1.obj")
+    obj.load("tests/files/CubeNegativeIndex.obj", workers=2)
+    expected = Obj()
+    expected.load("tests/files/Triangle1.obj")
+    expected.load("tests/files/CubeNegativeIndex.obj")
+    assert _mesh_data(obj) == _mesh_data(expected)
+
+
+def test_parallel_load_errors(small_ranges):
+    with pytest.raises(ObjParseVertexError):
+        ObjArrays.from_file("tests/files/BrokenFloats.obj", workers=2)
+    with pytest.raises(ObjParseFaceError):
+        ObjArrays.from_file("tests/files/SimpleNegativeAll.obj", workers=2)
+
+
+def test_materials():
+    obj = Obj.from_file("tests/files/Materials.obj")
+    assert obj.material_libs == ["Materials.mtl"]
+    assert obj.objects == ["quads"]
+    assert obj.groups == ["left", "right"]
+    assert obj.materials == ["red", "blue"]
+    assert obj.face_objects == [0] * 5
+    assert obj.face_groups == [-1, 0, 0, 1, 1]
+    assert obj.face_materials == [-1, 0, 1, 0, 1]
+    faces = obj._faces_by_material()
+    assert faces == [obj.faces[i] for i in (0, 1, 3, 2, 4)]
+    assert obj.draw_ranges == [(None, 0, 3), ("red", 3, 6), ("blue", 9, 6)]
+    # faces added later use the current state
+    obj.add_face(Face())
+    assert obj.face_materials[-1] == 1 and obj.face_groups[-1] == 1
+    arrays = ObjArrays.from_file("tests/files/Materials.obj")
+    assert arrays.materials == ["red", "blue"]
+    assert arrays.face_material.tolist() == [-1, 0, 1, 0, 1]
+    assert arrays.face_group.tolist() == [-1, 0, 0, 1, 1]
+
+
+def test_materials_state_across_loads():
+    obj = Obj()
+    obj.load("tests/files/Materials.obj")
+    obj.load("tests/files/Triangle1.obj", fast=True)
+    expected = Obj()
+    expected.load("tests/files/Materials.obj")
+    expected.load("tests/files/Triangle1.obj")
+    assert _mesh_data(obj) == _mesh_data(expected)
+    assert obj.materials == ["red", "blue", "initialShadingGroup"]
+
+
+def test_write_triangles_materials():
+    sink = io.BytesIO()
+    count, _, ranges = obj_parser.write_triangles(
+        "tests/files/Materials.obj", sink, block_size=64
+    )
+    obj = Obj.from_file("tests/files/Materials.obj")
+    assert count == 15
+    assert ranges == [(None, 0, 3), ("red", 3, 6), ("blue", 9, 6)]
+    data = np.frombuffer(sink.getvalue(), dtype=np.float32).reshape(-1, 8)
+    positions = [
+        list(obj.vertex[i]) for face in obj._faces_by_material() for i in face.vertex
+    ]
+    assert data[:, :3].tolist() == positions
+
+
+def test_draw_ranges():
+    class VAO:
+        calls = []
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            pass
+
+        def draw(self):
+            self.calls.append("draw")
+
+        def draw_range(self, first, count):
+            self.calls.append((first, count))
+
+    obj = Obj.from_file("tests/files/Materials.obj")
+    obj._faces_by_material()
+    obj.vao = VAO()
+    obj.draw()
+    assert VAO.calls == ["draw"]
+    bound = []
+    obj.draw(bound.append)
+    assert bound == [None, "red", "blue"]
+    assert VAO.calls[1:] == [(0, 3), (3, 6), (9, 6)]
+
+
+def _face_names(obj):
+    tables = zip(_mesh_data(obj)[5], _mesh_data(obj)[6])
+    return [[names[i] if i >= 0 else None for i in state] for names, state in tables]
+
+
+@pytest.mark.parametrize("file", validfiles + extrafiles)
+def test_save_round_trip(file, tmp_path):
+    obj = Obj.from_file(file)
+    obj.save(tmp_path / "saved.obj")
+    saved = Obj.from_file(tmp_path / "saved.obj")
+    assert _mesh_data(saved)[:5] == _mesh_data(obj)[:5]
+    # names without faces are not written so compare the names used by each face
+    assert _face_names(saved) == _face_names(obj)
+    assert saved.material_libs == obj.material_libs
+
+
+def test_save_vec2_uv(tmp_path):
+    obj = Obj.from_file("tests/files/Triangle1.obj")
+    uv = [Vec2(v.x, v.y) for v in obj.uv]
+    obj.uv = uv
+    obj.save(tmp_path / "saved.obj")
+    saved = Obj.from_file(tmp_path / "saved.obj")
+    assert [(v.x, v.y) for v in saved.uv] == [(v.x, v.y) for v in uv]
+
+
+def test_save_gzip(tmp_path):
+    obj = Obj.from_file("tests/files/Materials.obj")
+    obj.save(tmp_path / "saved.obj.gz")
+    with gzip.open(tmp_path / "saved.obj.gz") as file:
+        data = file.read()
+    assert data.startswith(b"# This file was created")
+    (tmp_path / "saved.obj").write_bytes(data)
+    assert _mesh_data(Obj.from_file(tmp_path / "saved.obj")) == _mesh_data(obj)
+    sink = io.BytesIO()
+    ObjArrays.from_mesh(obj).save(sink, compress=True)
+    assert gzip.decompress(sink.getvalue()) == data.split(b"\n", 1)[1]
+
+
+def test_save_arrays():
+    vertex = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], dtype=np.float32)
+    arrays = ObjArrays.from_arrays(
+        vertex, [[0, 1, 2], [0, 2, 3]], normals=[[0, 0, 1]] * 4, uv=vertex[:, :2]
+    )
+    sink = io.BytesIO()
+    arrays.save(sink)
+    lines = sink.getvalue().decode().splitlines()
+    assert lines[0] == "v 0 0 0"
+    assert lines[4] == "vt 0 0"
+    assert lines[-1] == "f 1/1/1 3/3/3 4/4/4"
+    loaded = ObjArrays.from_bytes(sink.getvalue())
+    np.testing.assert_array_equal(loaded.vertex, vertex)
+    np.testing.assert_array_equal(loaded.face_vertex, arrays.face_vertex)
+    np.testing.assert_array_equal(loaded.face_normal, arrays.face_vertex)
+    arrays = ObjArrays.from_arrays(vertex, [[0, 1, 2, 3]], normals=[[0, 0, 1]])
+    sink = io.BytesIO()
+    arrays.save(sink)
+    assert sink.getvalue().decode().splitlines()[-1] == "f 1 2 3 4"
+    with pytest.raises(ValueError):
+        ObjArrays.from_arrays(vertex, [[0, 1, 2]], face_uv=[[0, 1]])
+
+
+def test_save_precision():
+    arrays = ObjArrays.from_arrays(np.array([[1 / 3, 0.1, 2.0]]))
+    sink = io.BytesIO()
+    arrays.save(sink)
+    assert ObjArrays.from_bytes(sink.getvalue(), dtype=np.float64).vertex[0, 0] == 1 / 3
+    sink = io.BytesIO()
+    arrays.save(sink, precision=4)
+    assert sink.getvalue() == b"v 0.3333 0.1 2\n"
+
+
+def test_save_mixed_faces():
+    data = (
+        b"v 0 0 0\nv 1 0 0\nv 1 1 0\nv 0 1 0\nvt 0 0\nvn 0 0 1\n"
+        b"f 1 2 3 4\nf 1/1 2/1 3/1\nf 1//1 2//1 3//1\nf 1/1/1 2/1/1 3/1/1\n"
+    )
+    arrays = ObjArrays.from_bytes(data)
+    sink = io.BytesIO()
+    arrays.save(sink)
+    assert sink.getvalue().decode().splitlines()[-4:] == [
+        "f 1 2 3 4",
+        "f 1/1 2/1 3/1",
+        "f 1//1 2//1 3//1",
+        "f 1/1/1 2/1/1 3/1/1",
+    ]
+
+
+@pytest.fixture(params=["gz", "xz", "bz2"])
+def compressed(request, tmp_path):
+    compress = {"gz": gzip.compress, "xz": lzma.compress, "bz2": bz2.compress}
+    path = tmp_path / f"Materials.obj.{request.param}"
+    data = open("tests/files/Materials.obj", "rb").read()
+    path.write_bytes(compress[request.param](data))
+    return path
+
+
+def test_load_compressed(compressed):
+    expected = _mesh_data(Obj.from_file("tests/files/Materials.obj"))
+    assert _mesh_data(Obj.from_file(compressed)) == expected
+    assert _mesh_data(Obj.from_file(compressed, fast=True)) == expected
+    blocks = list(ObjArrays.iter_blocks(compressed, 16))
+    assert len(blocks) > 1
+    arrays = ObjArrays.concatenate(blocks)
+    expected = ObjArrays.from_file("tests/files/Materials.obj")
+    np.testing.assert_array_equal(arrays.vertex, expected.vertex)
+    np.testing.assert_array_equal(arrays.face_material, expected.face_material)
+
+
+def test_parallel_load_compressed(small_ranges, compressed):
+    # compressed files can't be split so they are parsed in one process
+    assert obj_parser._byte_ranges(compressed, 4) == [(0, compressed.stat().st_size)]
+    expected = _mesh_data(Obj.from_file("tests/files/Materials.obj"))
+    assert _mesh_data(Obj.from_file(compressed, workers=4)) == expected
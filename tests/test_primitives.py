@@ -1,6 +1,8 @@
+import numpy as np
 import pytest
 
-from ncca.ngl import Primitives, Vec3
+from ncca.ngl import Mat4, Primitives, Vec3
+from ncca.ngl.primitives import _primitive
 
 
 # Helper to clear primitives between tests
@@ -137,3 +139,33 @@ def test_create_torus_invalid_sides_rings():
         Primitives.create_torus(
             "bad_torus", major_radius=2.0, minor_radius=1.0, sides=8, rings=2
         )
+
+
+def test_compact_primitive():
+    data = np.load("src/ncca/ngl/PrimData/cube.npy")
+    Primitives._primitives["compact_cube"] = _primitive(data, compact=True)
+    prim = Primitives._primitives["compact_cube"]
+    assert prim.vao.num_indices() == data.size // 8
+    assert isinstance(Primitives.dequantize("compact_cube"), Mat4)
+    Primitives._primitives["cube"] = _primitive(data)
+    assert Primitives.dequantize("cube") is None
+    assert Primitives.dequantize("missing") is None
+
+
+def test_compact_create():
+    Primitives.create_sphere("compact_sphere", radius=1.0, precision=8, compact=True)
+    Primitives.create_line_grid("compact_grid", 2.0, 2.0, 2, compact=True)
+    assert isinstance(Primitives.dequantize("compact_sphere"), Mat4)
+    assert isinstance(Primitives.dequantize("compact_grid"), Mat4)
+    Primitives.create_sphere("sphere", radius=1.0, precision=8)
+    assert Primitives.dequantize("sphere") is None
+
+
+def test_reload_compact_defaults():
+    Primitives.load_default_primitives()
+    assert Primitives.dequantize("cube") is None
+    # the defaults are loaded again in the format asked for
+    Primitives.load_default_primitives(compact=True)
+    assert isinstance(Primitives.dequantize("cube"), Mat4)
+    Primitives.load_default_primitives()
+    assert Primitives.dequantize("cube") is None
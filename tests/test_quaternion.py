@@ -1,6 +1,9 @@
+import sys
+
+import numpy as np
 import pytest
 
-from ncca.ngl import Mat4, Quaternion
+from ncca.ngl import Mat4, Quaternion, Transform
 
 
 def test_quaternion():
@@ -131,3 +134,68 @@ def test_str_repr():
     quat = Quaternion(1.0, 2.0, 3.0, 4.0)
     assert str(quat) == "Quaternion(1.0, [2.0, 3.0, 4.0])"
     assert repr(quat) == "Quaternion(1.0, [2.0, 3.0, 4.0])"
+
+
+def test_array_protocol():
+    q = Quaternion(0.5, 1.0, 2.0, 3.0)
+    n = np.asarray(q)
+    assert n.dtype == np.float32
+    assert n.tolist() == [0.5, 1.0, 2.0, 3.0]
+    assert q.tobytes() == n.tobytes()
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="__buffer__ needs python 3.12")
+def test_buffer_protocol():
+    assert memoryview(Quaternion(0.5, 1.0, 2.0, 3.0)).tolist() == [0.5, 1.0, 2.0, 3.0]
+
+
+def test_normalize():
+    q = Quaternion(1, 1, 1, 1)
+    assert q.length() == pytest.approx(2.0)
+    assert q.normalize() is q
+    assert q.length() == pytest.approx(1.0)
+    with pytest.raises(ZeroDivisionError):
+        Quaternion(0, 0, 0, 0).normalize()
+
+
+def test_euler_to_mat4():
+    for order in ["xyz", "yzx", "zxy", "xzy", "yxz", "zyx"]:
+        tx = Transform()
+        tx.set_rotation(25, -40, 70)
+        tx.set_order(order)
+        q = Quaternion.from_euler(25, -40, 70, order)
+        assert q.to_mat4().get_matrix() == pytest.approx(
+            tx.get_matrix().get_matrix(), abs=1e-6
+        )
+        back = Quaternion.from_mat4(q.to_mat4())
+        assert [back.s, back.x, back.y, back.z] == pytest.approx([q.s, q.x, q.y, q.z])
+    with pytest.raises(ValueError):
+        Quaternion.from_euler(0, 0, 0, "abc")
+
+
+@pytest.mark.parametrize("angle", [179.0, 179.99, 180.0, -179.99])
+def test_from_mat4_near_180(angle):
+    axis = np.array([1.0, -2.0, 0.5])
+    axis /= np.linalg.norm(axis)
+    half = np.radians(angle) / 2.0
+    q = Quaternion(np.cos(half), *(axis * np.sin(half)))
+    # a float32 matrix as it would be stored for the GPU
+    matrix = Mat4.from_numpy(q.to_mat4().to_numpy().astype(np.float32))
+    back = Quaternion.from_mat4(matrix)
+    expected = np.array([q.s, q.x, q.y, q.z])
+    result = np.array([back.s, back.x, back.y, back.z])
+    # q and -q are the same rotation
+    sign = 1.0 if np.dot(expected, result) >= 0.0 else -1.0
+    assert sign * result == pytest.approx(expected, abs=1e-5)
+
+
+def test_slerp():
+    a = Quaternion.from_euler(0, 0, 0)
+    b = Quaternion.from_euler(90, 0, 0)
+    half = Quaternion.slerp(a, b, 0.5)
+    expected = Quaternion.from_euler(45, 0, 0)
+    assert [half.s, half.x, half.y, half.z] == pytest.approx(
+        [expected.s, expected.x, expected.y, expected.z]
+    )
+    same = Quaternion.slerp(a, a, 0.3)
+    assert [same.s, same.x] == pytest.approx([1.0, 0.0])
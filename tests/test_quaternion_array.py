@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from ncca.ngl import Mat4, Mat4Array, Quaternion, QuaternionArray
+
+ORDERS = ["xyz", "yzx", "zxy", "xzy", "yxz", "zyx"]
+
+
+def _random_angles(count, seed=3):
+    return np.random.default_rng(seed).uniform(-180.0, 180.0, (count, 3))
+
+
+def _close(q, expected, abs=1e-5):
+    return [q.s, q.x, q.y, q.z] == pytest.approx(
+        [expected.s, expected.x, expected.y, expected.z], abs=abs
+    )
+
+
+def test_init():
+    a = QuaternionArray()
+    assert len(a) == 0
+    a = QuaternionArray(3)
+    assert len(a) == 3
+    assert _close(a[2], Quaternion())
+    a = QuaternionArray([Quaternion(0.5, 1, 2, 3), Quaternion()])
+    assert _close(a[0], Quaternion(0.5, 1, 2, 3))
+    assert a.to_numpy().shape == (2, 4)
+    assert a.sizeof() == 32
+    with pytest.raises(TypeError):
+        QuaternionArray([1, 2, 3, 4])
+    with pytest.raises(ValueError):
+        QuaternionArray(np.zeros(5))
+    a[1] = Quaternion(0, 1, 0, 0)
+    assert _close(a[1], Quaternion(0, 1, 0, 0))
+    assert len(list(a)) == 2
+
+
+@pytest.mark.parametrize("order", ORDERS)
+def test_from_euler(order):
+    angles = _random_angles(10)
+    a = QuaternionArray.from_euler(angles, order)
+    for i, q in enumerate(a):
+        assert _close(q, Quaternion.from_euler(*angles[i], order))
+
+
+def test_multiply():
+    a = QuaternionArray.from_euler(_random_angles(6, seed=1))
+    b = QuaternionArray.from_euler(_random_angles(6, seed=2))
+    single = Quaternion.from_euler(10, 20, 30)
+    ab = a * b
+    a_single = a * single
+    single_a = single * a
+    for i in range(6):
+        assert _close(ab[i], a[i] * b[i])
+        assert _close(a_single[i], a[i] * single)
+        assert _close(single_a[i], single * a[i])
+    with pytest.raises(ValueError):
+        a * QuaternionArray(2)
+
+
+def test_normalize_length_dot():
+    a = QuaternionArray([Quaternion(2, 0, 0, 0), Quaternion(1, 1, 1, 1)])
+    np.testing.assert_allclose(a.length(), [2.0, 2.0])
+    assert a.dot(Quaternion())[1] == pytest.approx(1.0)
+    a.normalize()
+    np.testing.assert_allclose(a.length(), [1.0, 1.0], rtol=1e-6)
+    with pytest.raises(ZeroDivisionError):
+        QuaternionArray([Quaternion(0, 0, 0, 0)]).normalize()
+
+
+def test_slerp():
+    a = QuaternionArray.from_euler(_random_angles(20, seed=5))
+    b = QuaternionArray.from_euler(_random_angles(20, seed=6))
+    t = np.linspace(0.0, 1.0, 20)
+    result = QuaternionArray.slerp(a, b, t)
+    for i in range(20):
+        assert _close(result[i], Quaternion.slerp(a[i], b[i], t[i]), abs=1e-4)
+    assert _close(QuaternionArray.slerp(a, b, 0.0)[3], a[3])
+    end = QuaternionArray.slerp(a, Quaternion(), 1.0)
+    assert abs(end[0].s) == pytest.approx(1.0, abs=1e-5)
+
+
+def test_to_mat4_array():
+    angles = _random_angles(8)
+    a = QuaternionArray.from_euler(angles)
+    m = a.to_mat4_array()
+    assert isinstance(m, Mat4Array)
+    for i in range(8):
+        expected = (
+            Mat4.rotate_z(angles[i][2])
+            @ Mat4.rotate_y(angles[i][1])
+            @ Mat4.rotate_x(angles[i][0])
+        )
+        assert m[i].get_matrix() == pytest.approx(expected.get_matrix(), abs=1e-5)
+        assert m[i].get_matrix() == pytest.approx(a[i].to_mat4().get_matrix(), abs=1e-5)
+
+
+def test_from_mat4():
+    angles = _random_angles(8)
+    mats = QuaternionArray.from_euler(angles).to_mat4_array()
+    result = QuaternionArray.from_mat4(mats)
+    for i in range(8):
+        assert _close(result[i], Quaternion.from_mat4(mats[i]), abs=1e-4)
+    # these take the other branches in Quaternion.from_mat4
+    odd = [
+        Mat4.from_list([-1.0, 1, 1, 1, 1, -10, 1, 1, 1, 1, -10, 1, 1, 1, 1, 1]),
+        Mat4.from_list([-20.0, 1, 1, 1, 1, -10, 1, 1, 1, 1, -18, 1, 1, 1, 1, 1]),
+        Mat4.from_list([-20.0, 1, 1, 1, 1, -10, 1, 1, 1, 1, -8, 1, 1, 1, 1, 1]),
+        Mat4.rotate_x(180.0),
+    ]
+    result = QuaternionArray.from_mat4(odd)
+    for i, m in enumerate(odd):
+        assert _close(result[i], Quaternion.from_mat4(m), abs=1e-4)
+
+
+def test_from_mat4_near_180():
+    axes = np.random.default_rng(5).normal(size=(16, 3))
+    axes /= np.linalg.norm(axes, axis=1, keepdims=True)
+    half = np.radians(np.linspace(179.0, 181.0, 16)) / 2.0
+    values = np.column_stack((np.cos(half), axes * np.sin(half)[:, None]))
+    q = QuaternionArray(values)
+    back = QuaternionArray.from_mat4(q.to_mat4_array()).to_numpy()
+    # q and -q are the same rotation
+    signs = np.sign(np.einsum("ij,ij->i", back, values))[:, None]
+    np.testing.assert_allclose(signs * back, values, atol=1e-5)
@@ -2,6 +2,7 @@
 Note opengl_context created once in conftest.py
 """
 
+import numpy as np
 import OpenGL.GL as gl
 import pytest
 
@@ -493,6 +494,35 @@ def test_shaderprogram_array_uniform_methods(opengl_context, array_uniform_shade
     array_uniform_shader.set_uniform_matrix4fv("mat4Array", mat4_list)
 
 
+def test_shaderprogram_float32_matrix_uniforms(
+    opengl_context, uniform_shader, array_uniform_shader
+):
+    """float32 backed matrices and numpy arrays are uploaded directly"""
+    uniform_shader.use()
+    values = list(range(1, 17))
+    mat = Mat4.from_numpy(np.array(values, dtype=np.float32))
+    uniform_shader.set_uniform("testMat4", mat)
+    assert uniform_shader.get_uniform_mat4("testMat4") == pytest.approx(values)
+    mat = Mat3.from_numpy(np.arange(1, 10, dtype=np.float32))
+    uniform_shader.set_uniform("testMat3", mat)
+    assert uniform_shader.get_uniform_mat3("testMat3") == pytest.approx(
+        mat.get_matrix()
+    )
+    mat = Mat2.from_numpy([1.0, 2.0, 3.0, 4.0])
+    uniform_shader.set_uniform("testMat2", mat)
+    assert uniform_shader.get_uniform_mat2("testMat2") == pytest.approx(
+        mat.get_matrix()
+    )
+
+    array_uniform_shader.use()
+    stack = np.arange(32, dtype=np.float32).reshape(2, 4, 4)
+    array_uniform_shader.set_uniform_matrix4fv("mat4Array", stack)
+    array_uniform_shader.set_uniform_matrix4fv(
+        "mat4Array", [Mat4(), Mat4.from_numpy(np.arange(16, dtype=np.float32))]
+    )
+    array_uniform_shader.set_uniform_matrix3fv("mat3Array", np.zeros((2, 3, 3)))
+
+
 def test_shaderprogram_array_uniform_methods_not_found(
     opengl_context, array_uniform_shader
 ):
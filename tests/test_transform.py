@@ -1,6 +1,6 @@
 import pytest
 
-from ncca.ngl import Transform, TransformRotationOrder, Vec3, Vec4
+from ncca.ngl import Mat4, Mat4Type, Transform, TransformRotationOrder, Vec3, Vec4
 
 orders = ["xyz", "yzx", "zxy", "xzy", "yxz", "zyx"]
 
@@ -158,3 +158,69 @@ def test_rotation_orders():
     result=[0.7424038052558899, 0.6503721475601196, 0.16078753769397736, 0.0, -0.5198368430137634, 0.4078224301338196, 0.7506334781646729, 0.0, 0.4226182997226715, -0.6408563852310181, 0.6408563256263733, 0.0, 0.0, 0.0, 0.0, 1.0]
     # fmt: on
     assert tx.get_matrix().get_matrix() == pytest.approx(result, rel=1e-4)
+
+
+@pytest.mark.parametrize("order", orders)
+def test_matches_composed_rotations(order):
+    tx = Transform()
+    tx.set_position(1.0, -2.0, 3.0)
+    tx.set_rotation(-30.0, 65.0, 110.0)
+    tx.set_scale(2.0, 0.5, -1.5)
+    tx.set_order(order)
+    r = {
+        "x": Mat4.rotate_x(-30.0),
+        "y": Mat4.rotate_y(65.0),
+        "z": Mat4.rotate_z(110.0),
+    }
+    a, b, c = (r[axis] for axis in reversed(order))
+    expected = a @ b @ c @ Mat4.scale(2.0, 0.5, -1.5)
+    expected.m[3][0:3] = [1.0, -2.0, 3.0]
+    assert tx.get_matrix().get_matrix() == pytest.approx(
+        expected.get_matrix(), abs=1e-12
+    )
+
+
+def test_dirty_components():
+    tx = Transform()
+    tx.set_rotation(10, 20, 30)
+    tx.set_scale(2, 2, 2)
+    first = tx.get_matrix()
+    assert tx.get_matrix() is first
+    rotation = tx._rotation_rows
+    tx.set_position(4, 5, 6)
+    moved = tx.get_matrix()
+    # only the translation changed so the rotation isn't rebuilt
+    assert tx._rotation_rows is rotation
+    assert moved is not first
+    assert moved.get_matrix()[12:15] == pytest.approx([4, 5, 6])
+    assert moved.get_matrix()[:12] == pytest.approx(first.get_matrix()[:12])
+    tx.set_scale(1, 1, 1)
+    tx.get_matrix()
+    assert tx._rotation_rows is rotation
+    tx.set_order("zyx")
+    tx.get_matrix()
+    assert tx._rotation_rows is not rotation
+
+
+def test_attributes_set_directly():
+    # the attributes are public so setting them and need_recalc still updates the matrix
+    tx = Transform()
+    tx.set_rotation(10, 20, 30)
+    tx.get_matrix()
+    tx.rotation = Vec3(0.0, 45.0, 0.0)
+    tx.scale = Vec3(2.0, 2.0, 2.0)
+    tx.need_recalc = True
+    expected = Mat4.rotate_y(45.0) @ Mat4.scale(2.0, 2.0, 2.0)
+    assert tx.get_matrix().get_matrix() == pytest.approx(expected.get_matrix())
+    tx.rotation.y = 90.0
+    tx.need_recalc = True
+    expected = Mat4.rotate_y(90.0) @ Mat4.scale(2.0, 2.0, 2.0)
+    assert tx.get_matrix().get_matrix() == pytest.approx(expected.get_matrix())
+
+
+def test_matrix_type():
+    tx = Transform()
+    tx.set_rotation(10, 20, 30)
+    assert tx.get_matrix().matrix_type == Mat4Type.RIGID
+    tx.set_scale(1, 2, 1)
+    assert tx.get_matrix().matrix_type == Mat4Type.AFFINE
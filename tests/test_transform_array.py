@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from ncca.ngl import Mat4Array, Transform, TransformArray, TransformRotationOrder
+
+orders = ["xyz", "yzx", "zxy", "xzy", "yxz", "zyx"]
+
+
+def _random_trs(count, seed=7):
+    rng = np.random.default_rng(seed)
+    return (
+        rng.uniform(-10, 10, (count, 3)),
+        rng.uniform(-180, 180, (count, 3)),
+        rng.uniform(0.1, 3, (count, 3)),
+    )
+
+
+def test_ctor():
+    tx = TransformArray()
+    assert len(tx) == 0
+    assert len(tx.get_matrices()) == 0
+    tx = TransformArray(4)
+    assert len(tx) == 4
+    assert tx.order == "xyz"
+    matrices = tx.get_matrices()
+    assert isinstance(matrices, Mat4Array)
+    np.testing.assert_array_equal(
+        matrices.to_numpy(), np.tile(np.identity(4), (4, 1, 1))
+    )
+    with pytest.raises(TransformRotationOrder):
+        TransformArray(2, order="abc")
+
+
+@pytest.mark.parametrize("order", orders)
+def test_matches_transform(order):
+    pos, rot, scale = _random_trs(8)
+    tx = TransformArray.from_arrays(pos, rot, scale, order=order)
+    matrices = tx.get_matrices()
+    for i in range(len(tx)):
+        single = Transform()
+        single.set_position(*pos[i])
+        single.set_rotation(*rot[i])
+        single.set_scale(*scale[i])
+        single.set_order(order)
+        assert matrices[i].get_matrix() == pytest.approx(
+            single.get_matrix().get_matrix(), rel=1e-4, abs=1e-4
+        )
+        assert tx[i].get_matrix().get_matrix() == pytest.approx(
+            single.get_matrix().get_matrix(), rel=1e-4, abs=1e-4
+        )
+
+
+def test_matches_from_trs():
+    pos, rot, scale = _random_trs(16)
+    tx = TransformArray.from_arrays(pos, rot, scale, order="zxy")
+    expected = Mat4Array.from_trs(pos, rot, scale, order="zxy")
+    np.testing.assert_allclose(
+        tx.get_matrices().to_numpy(), expected.to_numpy(), atol=1e-5
+    )
+
+
+def test_setters_and_dirty():
+    pos, rot, scale = _random_trs(5)
+    tx = TransformArray(5)
+    tx.set_rotations(rot)
+    first = tx.get_matrices()
+    assert tx.get_matrices() is first
+    rotation = tx._rotation_rows
+    tx.set_positions(pos)
+    moved = tx.get_matrices()
+    assert moved is not first
+    assert tx._rotation_rows is rotation
+    np.testing.assert_allclose(moved.to_numpy()[:, 3, :3], pos, rtol=1e-6)
+    tx.set_scales(scale)
+    tx.get_matrices()
+    assert tx._rotation_rows is rotation
+    tx.set_order("yxz")
+    tx.get_matrices()
+    assert tx._rotation_rows is not rotation
+    with pytest.raises(TransformRotationOrder):
+        tx.set_order("xxx")
+    with pytest.raises(ValueError):
+        tx.set_positions(np.zeros((4, 3)))
+    with pytest.raises(ValueError):
+        tx.positions[0, 0] = 1.0
+
+
+def test_item_access():
+    tx = TransformArray(3)
+    single = Transform()
+    single.set_position(1, 2, 3)
+    single.set_rotation(10, 20, 30)
+    single.set_scale(2, 2, 2)
+    tx[1] = single
+    assert tx.positions[1].tolist() == pytest.approx([1, 2, 3])
+    assert tx[1].get_matrix().get_matrix() == pytest.approx(
+        single.get_matrix().get_matrix(), abs=1e-5
+    )
+    assert tx.get_matrices()[1].get_matrix() == pytest.approx(
+        single.get_matrix().get_matrix(), abs=1e-5
+    )
+    with pytest.raises(TypeError):
+        tx[0] = 1
+
+
+def test_from_arrays_errors():
+    with pytest.raises(ValueError):
+        TransformArray.from_arrays()
+    with pytest.raises(ValueError):
+        TransformArray.from_arrays([[0, 0, 0]], [[0, 0, 0], [1, 1, 1]])
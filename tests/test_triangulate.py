@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from ncca.ngl.triangulate import triangulate_faces
+
+
+def _areas(positions, triangles):
+    p = positions[triangles]
+    return np.cross(p[:, 1] - p[:, 0], p[:, 2] - p[:, 0])[:, 2] / 2
+
+
+def test_fan():
+    positions = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [0.5, 2, 0]])
+    face_vertex = np.array([0, 1, 2, 3, 0, 1, 2, 4, 3])
+    corners, faces = triangulate_faces(positions, face_vertex, [4, 5])
+    assert faces.tolist() == [0, 0, 1, 1, 1]
+    assert corners.tolist() == [[0, 1, 2], [0, 2, 3], [4, 5, 6], [4, 6, 7], [4, 7, 8]]
+
+
+def test_ear_clip():
+    # L shape and a dart with a reflex corner, fan splitting from the first corner fails both
+    positions = np.array(
+        [[2, 1, 0], [1, 1, 0], [1, 2, 0], [0, 2, 0], [0, 0, 0], [2, 0, 0],
+         [0, 0, 0], [2, 1, 0], [0, 2, 0], [0.5, 1, 0]],
+        dtype=np.float32,
+    )  # fmt: skip
+    face_vertex = np.arange(10)
+    corners, faces = triangulate_faces(positions, face_vertex, [6, 4])
+    assert faces.tolist() == [0, 0, 0, 0, 1, 1]
+    areas = _areas(positions, face_vertex[corners])
+    assert np.all(areas > 0)
+    assert areas[:4].sum() == pytest.approx(3.0)
+    assert areas[4:].sum() == pytest.approx(1.5)
+
+
+@pytest.mark.parametrize("flip", [False, True])
+def test_winding(flip):
+    # clockwise polygons and other planes keep their winding
+    positions = np.array(
+        [[0, 0, 0], [0, 2, 0], [0, 2, 1], [0, 1, 1], [0, 1, 2], [0, 0, 2]], float
+    )
+    face_vertex = np.arange(6)[::-1] if flip else np.arange(6)
+    corners, _ = triangulate_faces(positions, face_vertex, [6])
+    p = positions[face_vertex[corners]]
+    normals = np.cross(p[:, 1] - p[:, 0], p[:, 2] - p[:, 0])
+    assert np.all(normals[:, 0] < 0 if flip else normals[:, 0] > 0)
+    assert np.abs(normals[:, 0]).sum() / 2 == pytest.approx(3.0)
+
+
+def test_small_faces():
+    positions = np.zeros((3, 3))
+    corners, faces = triangulate_faces(positions, np.array([0, 1, 0, 1, 2]), [2, 3])
+    assert corners.tolist() == [[2, 3, 4]]
+    assert faces.tolist() == [1]
+    corners, faces = triangulate_faces(positions, np.zeros(0, int), [])
+    assert corners.shape == (0, 3)
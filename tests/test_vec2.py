@@ -1,6 +1,8 @@
 import ctypes
 import math
+import sys
 
+import numpy as np
 import pytest
 
 from ncca.ngl import Vec2
@@ -214,3 +216,20 @@ def test_rmul():
 
 def test_sizeof():
     assert Vec2.sizeof() == 2 * ctypes.sizeof(ctypes.c_float)
+
+
+def test_array_protocol():
+    a = Vec2(1, 2)
+    n = np.asarray(a)
+    assert n.dtype == np.float32
+    assert n.tolist() == [1.0, 2.0]
+    assert np.asarray(a, dtype=np.float64).dtype == np.float64
+    assert a.tobytes() == np.array([1.0, 2.0], dtype=np.float32).tobytes()
+    assert len(a.tobytes()) == Vec2.sizeof()
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="__buffer__ needs python 3.12")
+def test_buffer_protocol():
+    m = memoryview(Vec2(1, 2))
+    assert m.format == "f"
+    assert m.tolist() == [1.0, 2.0]
@@ -1,7 +1,7 @@
 import numpy as np
 import pytest
 
-from ncca.ngl import Vec2, Vec2Array
+from ncca.ngl import Mat4, Vec2, Vec2Array
 
 
 def test_init():
@@ -115,3 +115,23 @@ def test_sizeof():
     assert a.sizeof() == 3 * Vec2.sizeof()
     a.append(Vec2())
     assert a.sizeof() == 4 * Vec2.sizeof()
+
+
+def test_vectorized():
+    values = [Vec2(1, 2), Vec2(3, -4)]
+    other = [Vec2(0.5, 1), Vec2(2, 2)]
+    a = Vec2Array(values)
+    b = Vec2Array(other)
+    for i, v in enumerate(a + b):
+        assert v == values[i] + other[i]
+    dots = a.dot(b)
+    cross = a.cross(b)
+    lengths = a.length()
+    for i in range(2):
+        assert dots[i] == pytest.approx(values[i].dot(other[i]))
+        assert cross[i] == pytest.approx(values[i].cross(other[i]))
+        assert lengths[i] == pytest.approx(values[i].length())
+    a.normalize()
+    np.testing.assert_array_almost_equal(a.length(), [1.0, 1.0])
+    moved = Vec2Array(values).transform(Mat4.translate(1, 2, 3))
+    assert moved[0] == Vec2(2, 4)
@@ -1,6 +1,8 @@
 import copy
 import ctypes
+import sys
 
+import numpy as np
 import pytest
 
 from ncca.ngl import Mat3, Vec3
@@ -322,3 +324,46 @@ def test_division():
         b = a / Vec3(0.0, 1.0, 1.0)
     with pytest.raises(ValueError):
         b = a / "hello"
+
+
+def test_array_protocol():
+    a = Vec3(1, 2, 3)
+    n = np.asarray(a)
+    assert n.dtype == np.float32
+    assert n.tolist() == [1.0, 2.0, 3.0]
+    assert np.asarray(a, dtype=np.float64).dtype == np.float64
+    assert a.tobytes() == np.array([1.0, 2.0, 3.0], dtype=np.float32).tobytes()
+    assert len(a.tobytes()) == Vec3.sizeof()
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="__buffer__ needs python 3.12")
+def test_buffer_protocol():
+    m = memoryview(Vec3(1, 2, 3))
+    assert m.format == "f"
+    assert m.tolist() == [1.0, 2.0, 3.0]
+
+
+def test_into_methods():
+    a = Vec3(1.0, 2.0, 3.0)
+    b = Vec3(-2.0, 0.5, 4.0)
+    out = Vec3()
+    assert Vec3.add_into(a, b, out) is out
+    assert out == a + b
+    assert Vec3.sub_into(a, b, out) is out
+    assert out == a - b
+    assert Vec3.mul_into(a, 2.5, out) is out
+    assert out == a * 2.5
+    assert Vec3.cross_into(a, b, out) is out
+    assert out == a.cross(b)
+    with pytest.raises(ValueError):
+        Vec3.mul_into(a, "a", out)
+
+
+def test_into_aliased():
+    a = Vec3(1.0, 2.0, 3.0)
+    b = Vec3(-2.0, 0.5, 4.0)
+    expected = a.cross(b)
+    Vec3.cross_into(a, b, a)
+    assert a == expected
+    Vec3.add_into(a, b, b)
+    assert b == expected + Vec3(-2.0, 0.5, 4.0)
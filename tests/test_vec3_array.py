@@ -1,7 +1,7 @@
 import numpy as np
 import pytest
 
-from ncca.ngl import Vec3, Vec3Array
+from ncca.ngl import Mat4, Vec3, Vec3Array, Vec4
 
 
 def test_init():
@@ -130,3 +130,94 @@ def test_setitem():
     # Test index out of range
     with pytest.raises(IndexError):
         a[2] = Vec3()
+
+
+def test_numpy_storage():
+    """Test the data is held in a single float32 array and indexing returns views"""
+    a = Vec3Array(np.arange(6))
+    assert len(a) == 2
+    assert a[1] == Vec3(3, 4, 5)
+    v = a[0]
+    v.x = 10.0
+    assert a.to_numpy()[0] == 10.0
+    v.normalize()
+    assert a[0].length() == pytest.approx(1.0)
+    assert isinstance(a[0:1], Vec3Array)
+    with pytest.raises(ValueError):
+        Vec3Array(np.zeros(4))
+
+
+def test_append_grows():
+    a = Vec3Array()
+    for i in range(100):
+        a.append(Vec3(i, i, i))
+    assert len(a) == 100
+    assert a.sizeof() == 100 * Vec3.sizeof()
+    assert a[99] == Vec3(99, 99, 99)
+    a.extend(Vec3Array([Vec3(1, 2, 3)]))
+    assert a[100] == Vec3(1, 2, 3)
+
+
+def test_arithmetic():
+    values = [Vec3(1, 2, 3), Vec3(4, 5, 6)]
+    other = [Vec3(0.5, -1, 2), Vec3(3, 2, 1)]
+    a = Vec3Array(values)
+    b = Vec3Array(other)
+    for i, v in enumerate(a + b):
+        assert v == values[i] + other[i]
+    for i, v in enumerate(a - b):
+        assert v == values[i] - other[i]
+    for i, v in enumerate(a * 2.0):
+        assert v == values[i] * 2.0
+    for i, v in enumerate(2.0 * a):
+        assert v == values[i] * 2.0
+    for i, v in enumerate(a / 2.0):
+        assert v == values[i] / 2.0
+    for i, v in enumerate(a + Vec3(1, 1, 1)):
+        assert v == values[i] + Vec3(1, 1, 1)
+    scaled = a * np.array([1.0, 2.0])
+    assert scaled[1] == values[1] * 2.0
+    with pytest.raises(TypeError):
+        a + "not a vec3"
+
+
+def test_dot_cross_length():
+    values = [Vec3(1, 2, 3), Vec3(4, 5, 6), Vec3(-1, 0.5, 2)]
+    other = [Vec3(0.5, -1, 2), Vec3(3, 2, 1), Vec3(0, 1, 0)]
+    a = Vec3Array(values)
+    b = Vec3Array(other)
+    dots = a.dot(b)
+    lengths = a.length()
+    cross = a.cross(b)
+    for i in range(3):
+        assert dots[i] == pytest.approx(values[i].dot(other[i]))
+        assert lengths[i] == pytest.approx(values[i].length())
+        assert cross[i] == values[i].cross(other[i])
+    assert a.length_squared()[0] == pytest.approx(14.0)
+    assert a.cross(Vec3(0, 1, 0))[0] == Vec3(1, 2, 3).cross(Vec3(0, 1, 0))
+
+
+def test_normalize():
+    a = Vec3Array([Vec3(1, 2, 3), Vec3(0, 0, 5)])
+    assert a.normalize() is a
+    np.testing.assert_array_almost_equal(a.length(), [1.0, 1.0])
+    assert a[1] == Vec3(0, 0, 1)
+    with pytest.raises(ZeroDivisionError):
+        Vec3Array([Vec3(0, 0, 0)]).normalize()
+
+
+def test_transform():
+    values = [Vec3(1, 2, 3), Vec3(-4, 5, 0.5)]
+    m = Mat4.translate(1, 2, 3) @ Mat4.rotate_y(45) @ Mat4.scale(2, 2, 2)
+    result = Vec3Array(values).transform(m)
+    for i, v in enumerate(values):
+        expected = Vec4(v.x, v.y, v.z, 1.0) @ m
+        assert list(result[i]) == pytest.approx([expected.x, expected.y, expected.z])
+
+
+def test_view_array_protocol():
+    a = Vec3Array([Vec3(1, 2, 3), Vec3(4, 5, 6)])
+    n = np.asarray(a[1])
+    assert np.shares_memory(n, a.to_numpy())
+    assert n.tolist() == [4.0, 5.0, 6.0]
+    assert a[1].tobytes() == Vec3(4, 5, 6).tobytes()
@@ -1,5 +1,7 @@
 import ctypes
+import sys
 
+import numpy as np
 import pytest
 
 from ncca.ngl import Mat4, Vec4
@@ -279,3 +281,20 @@ def test_coverage_vec4():
         a = a * "fail"
     a = 2.0 * a
     assert a.w == pytest.approx(2.0)
+
+
+def test_array_protocol():
+    a = Vec4(1, 2, 3, 4)
+    n = np.asarray(a)
+    assert n.dtype == np.float32
+    assert n.tolist() == [1.0, 2.0, 3.0, 4.0]
+    assert np.asarray(a, dtype=np.float64).dtype == np.float64
+    assert a.tobytes() == np.array([1.0, 2.0, 3.0, 4.0], dtype=np.float32).tobytes()
+    assert len(a.tobytes()) == Vec4.sizeof()
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="__buffer__ needs python 3.12")
+def test_buffer_protocol():
+    m = memoryview(Vec4(1, 2, 3, 4))
+    assert m.format == "f"
+    assert m.tolist() == [1.0, 2.0, 3.0, 4.0]
@@ -1,7 +1,7 @@
 import numpy as np
 import pytest
 
-from ncca.ngl import Vec4, Vec4Array
+from ncca.ngl import Mat4, Vec4, Vec4Array
 
 
 def test_init():
@@ -115,3 +115,17 @@ def test_sizeof():
     assert a.sizeof() == 3 * Vec4.sizeof()
     a.append(Vec4())
     assert a.sizeof() == 4 * Vec4.sizeof()
+
+
+def test_vectorized():
+    values = [Vec4(1, 2, 3, 1), Vec4(3, -4, 5, 0)]
+    a = Vec4Array(values)
+    for i, v in enumerate(a * 2.0):
+        assert v == values[i] * 2.0
+    dots = a.dot(Vec4(1, 1, 1, 1))
+    assert dots[0] == pytest.approx(7.0)
+    assert a.length()[1] == pytest.approx(values[1].length())
+    m = Mat4.translate(1, 2, 3) @ Mat4.rotate_x(30)
+    result = a.transform(m)
+    for i, v in enumerate(values):
+        assert list(result[i]) == pytest.approx(list(v @ m), abs=1e-5)